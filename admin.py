@@ -1,4 +1,9 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 # Import models
 from context_text_proquest_hnp.models import Proquest_HNP_Object_Type
@@ -7,6 +12,9 @@ from context_text_proquest_hnp.models import Proquest_HNP_Newspaper
 from context_text_proquest_hnp.models import Proquest_HNP_Newspaper_Archive
 from context_text_proquest_hnp.models import PHNP_Newspaper_Object_Type
 from context_text_proquest_hnp.models import PHNP_Newspaper_Archive_Object_Type
+from context_text_proquest_hnp.models import Proquest_HNP_Checkpoint
+from context_text_proquest_hnp.models import PHNP_Checkpoint_Archive
+from context_text_proquest_hnp.models import PHNP_Archive_Work_Item
 
 # default admins
 #admin.site.register( Proquest_HNP_Object_Type )
@@ -17,6 +25,102 @@ from context_text_proquest_hnp.models import PHNP_Newspaper_Archive_Object_Type
 #admin.site.register( PHNP_Newspaper_Archive_Object_Type )
 
 
+#-------------------------------------------------------------------------------
+# ! ==> shared admin helpers
+#-------------------------------------------------------------------------------
+
+
+class ApproximateCountPaginator( Paginator ):
+
+    '''
+    Paginator for large tables.  On PostgreSQL, an unfiltered change list uses
+        the planner's row estimate from pg_class instead of COUNT(*), which
+        has to scan the whole table.  Filtered lists, small tables, and other
+        databases are counted exactly.
+    '''
+
+    # only trust the estimate above this many rows.
+    EXACT_COUNT_THRESHOLD = 10000
+
+    DB_VENDOR_POSTGRESQL = "postgresql"
+    SQL_ESTIMATE_ROW_COUNT = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+
+    @cached_property
+    def count( self ):
+
+        # return reference
+        count_OUT = None
+
+        # declare variables
+        object_list = None
+        db_connection = None
+        estimate_row = None
+
+        object_list = self.object_list
+        if ( ( isinstance( object_list, QuerySet ) == True ) and ( not object_list.query.where ) ):
+
+            db_connection = connections[ object_list.db ]
+            if ( db_connection.vendor == self.DB_VENDOR_POSTGRESQL ):
+
+                with db_connection.cursor() as cursor:
+
+                    cursor.execute( self.SQL_ESTIMATE_ROW_COUNT, [ object_list.model._meta.db_table ] )
+                    estimate_row = cursor.fetchone()
+
+                #-- END with cursor --#
+
+                if ( ( estimate_row is not None ) and ( estimate_row[ 0 ] is not None ) and ( estimate_row[ 0 ] > self.EXACT_COUNT_THRESHOLD ) ):
+
+                    count_OUT = int( estimate_row[ 0 ] )
+
+                #-- END check to see if estimate is big enough to use --#
+
+            #-- END check to see if PostgreSQL --#
+
+        #-- END check to see if unfiltered QuerySet --#
+
+        # no estimate - count.
+        if ( count_OUT is None ):
+
+            count_OUT = super( ApproximateCountPaginator, self ).count
+
+        #-- END check to see if estimate --#
+
+        return count_OUT
+
+    #-- END method count() --#
+
+#-- END class ApproximateCountPaginator --#
+
+
+class Proquest_HNP_NewspaperListFilter( admin.RelatedFieldListFilter ):
+
+    '''
+    List filter for FKs to Proquest_HNP_Newspaper.  Proquest_HNP_Newspaper's
+        __str__() includes the related context_text Newspaper's name, so load
+        the choices with the newspaper joined in, rather than one query per
+        paper.
+    '''
+
+    def field_choices( self, field, request, model_admin ):
+
+        # return reference
+        choice_list_OUT = None
+
+        # declare variables
+        paper_qs = None
+        paper_instance = None
+
+        paper_qs = Proquest_HNP_Newspaper.objects.select_related( "newspaper" ).order_by( "paper_identifier" )
+        choice_list_OUT = [ ( paper_instance.pk, str( paper_instance ) ) for paper_instance in paper_qs ]
+
+        return choice_list_OUT
+
+    #-- END method field_choices() --#
+
+#-- END class Proquest_HNP_NewspaperListFilter --#
+
+
 #-------------------------------------------------------------------------------
 # ! ==> Proquest_HNP_Object_Type Admin definition
 #-------------------------------------------------------------------------------
@@ -74,6 +178,7 @@ class Proquest_HNP_Object_Type_Raw_ValueAdmin( admin.ModelAdmin ):
     #]
 
     list_display = ( 'id', 'proquest_hnp_object_type', 'raw_value' )
+    list_select_related = ( 'proquest_hnp_object_type', )
     #list_display_links = ( 'headline', )
     #list_filter = [ 'location' ]
     search_fields = [ 'raw_value', 'id' ]
@@ -92,12 +197,14 @@ admin.site.register( Proquest_HNP_Object_Type_Raw_Value, Proquest_HNP_Object_Typ
 # type inline
 class PHNPNA_PHNP_Newspaper_Archive_Object_TypeInline( admin.TabularInline ):
 
-    # ajax-based autocomplete
-    autocomplete_fields = [ 'proquest_hnp_object_type' ]
-    
+    # counts are set when the archive is summarized, so read-only here (edit
+    #     individual rows in the PHNP_Newspaper_Archive_Object_Type admin).
     model = PHNP_Newspaper_Archive_Object_Type
-    extra = 1
+    extra = 0
+    can_delete = False
+    show_change_link = True
     fk_name = 'proquest_hnp_newspaper_archive'
+    readonly_fields = [ 'proquest_hnp_object_type', 'item_count' ]
 
     fieldsets = [
         (
@@ -117,7 +224,19 @@ class PHNPNA_PHNP_Newspaper_Archive_Object_TypeInline( admin.TabularInline ):
 
     ordering = [ 'proquest_hnp_object_type__raw_value' ]
 
-#-- END class PHNPN_PHNP_Newspaper_Object_TypeInline --#
+    def get_queryset( self, request ):
+
+        return super( PHNPNA_PHNP_Newspaper_Archive_Object_TypeInline, self ).get_queryset( request ).select_related( 'proquest_hnp_newspaper_archive__proquest_hnp_newspaper', 'proquest_hnp_object_type' )
+
+    #-- END method get_queryset() --#
+
+    def has_add_permission( self, request, obj = None ):
+
+        return False
+
+    #-- END method has_add_permission() --#
+
+#-- END class PHNPNA_PHNP_Newspaper_Archive_Object_TypeInline --#
 
 
 class Proquest_HNP_Newspaper_ArchiveAdmin( admin.ModelAdmin ):
@@ -138,15 +257,27 @@ class Proquest_HNP_Newspaper_ArchiveAdmin( admin.ModelAdmin ):
                 "classes" : ( "collapse", )
             }
         ),
+        (
+            "Manifest (as of last summary)",
+            {
+                "fields" : [ "manifest_file_count", "manifest_total_bytes", "manifest_newest_mtime_ns", "manifest_fingerprint", "manifest_updated" ],
+                "classes" : ( "collapse", )
+            }
+        ),
     ]
 
+    readonly_fields = [ "manifest_file_count", "manifest_total_bytes", "manifest_newest_mtime_ns", "manifest_fingerprint", "manifest_updated" ]
+
     inlines = [
         PHNPNA_PHNP_Newspaper_Archive_Object_TypeInline,
     ]
 
     list_display = ( 'id', 'proquest_hnp_newspaper', 'archive_identifier', 'start_date', 'end_date' )
     list_display_links = ( 'id', 'archive_identifier' )
-    list_filter = [ 'proquest_hnp_newspaper' ]
+    list_filter = [ ( 'proquest_hnp_newspaper', Proquest_HNP_NewspaperListFilter ) ]
+    list_select_related = ( 'proquest_hnp_newspaper__newspaper', )
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     search_fields = [ 'archive_identifier', 'start_date', 'end_date', 'compressed_file_path', 'uncompressed_folder_path', 'id' ]
     #date_hierarchy = 'pub_date'
 
@@ -163,12 +294,14 @@ admin.site.register( Proquest_HNP_Newspaper_Archive, Proquest_HNP_Newspaper_Arch
 # type inline
 class PHNPN_PHNP_Newspaper_Object_TypeInline( admin.TabularInline ):
 
-    # ajax-based autocomplete
-    autocomplete_fields = [ 'proquest_hnp_object_type' ]
-    
+    # counts are rolled up from the paper's archives, so read-only here (edit
+    #     individual rows in the PHNP_Newspaper_Object_Type admin).
     model = PHNP_Newspaper_Object_Type
-    extra = 1
+    extra = 0
+    can_delete = False
+    show_change_link = True
     fk_name = 'proquest_hnp_newspaper'
+    readonly_fields = [ 'proquest_hnp_object_type', 'item_count' ]
 
     fieldsets = [
         (
@@ -186,6 +319,20 @@ class PHNPN_PHNP_Newspaper_Object_TypeInline( admin.TabularInline ):
         #),
     ]
 
+    ordering = [ 'proquest_hnp_object_type__raw_value' ]
+
+    def get_queryset( self, request ):
+
+        return super( PHNPN_PHNP_Newspaper_Object_TypeInline, self ).get_queryset( request ).select_related( 'proquest_hnp_newspaper', 'proquest_hnp_object_type' )
+
+    #-- END method get_queryset() --#
+
+    def has_add_permission( self, request, obj = None ):
+
+        return False
+
+    #-- END method has_add_permission() --#
+
 #-- END class PHNPN_PHNP_Newspaper_Object_TypeInline --#
 
 
@@ -249,6 +396,9 @@ class PHNP_Newspaper_Object_TypeAdmin( admin.ModelAdmin ):
     list_display = ( 'id', 'proquest_hnp_newspaper', 'proquest_hnp_object_type', 'item_count' )
     #list_display_links = ( 'headline', )
     #list_filter = [ 'location' ]
+    list_select_related = ( 'proquest_hnp_newspaper__newspaper', 'proquest_hnp_object_type' )
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     search_fields = [ 'item_count', 'id' ]
     #date_hierarchy = 'pub_date'
 
@@ -281,7 +431,10 @@ class PHNP_Newspaper_Archive_Object_TypeAdmin( admin.ModelAdmin ):
 
     list_display = ( 'id', 'proquest_hnp_newspaper_archive', 'proquest_hnp_object_type', 'item_count' )
     #list_display_links = ( 'headline', )
-    list_filter = [ 'proquest_hnp_newspaper_archive__proquest_hnp_newspaper', 'proquest_hnp_object_type' ]
+    list_filter = [ ( 'proquest_hnp_newspaper_archive__proquest_hnp_newspaper', Proquest_HNP_NewspaperListFilter ), 'proquest_hnp_object_type' ]
+    list_select_related = ( 'proquest_hnp_newspaper_archive__proquest_hnp_newspaper', 'proquest_hnp_object_type' )
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     search_fields = [ 'item_count', 'id' ]
     #date_hierarchy = 'pub_date'
 
@@ -290,3 +443,105 @@ class PHNP_Newspaper_Archive_Object_TypeAdmin( admin.ModelAdmin ):
 admin.site.register( PHNP_Newspaper_Archive_Object_Type, PHNP_Newspaper_Archive_Object_TypeAdmin )
 
 
+#-------------------------------------------------------------------------------
+# ! ==> Proquest_HNP_Checkpoint admin definition
+#-------------------------------------------------------------------------------
+
+
+# finished archive inline
+class PHNPC_PHNP_Checkpoint_ArchiveInline( admin.TabularInline ):
+
+    # recorded by the run, so read-only here.
+    model = PHNP_Checkpoint_Archive
+    extra = 0
+    can_delete = False
+    fk_name = 'proquest_hnp_checkpoint'
+    readonly_fields = [ 'archive_identifier', 'create_date' ]
+    fields = [ 'archive_identifier', 'create_date' ]
+    ordering = [ 'create_date' ]
+
+    def has_add_permission( self, request, obj = None ):
+
+        return False
+
+    #-- END method has_add_permission() --#
+
+#-- END class PHNPC_PHNP_Checkpoint_ArchiveInline --#
+
+
+class Proquest_HNP_CheckpointAdmin( admin.ModelAdmin ):
+
+    fieldsets = [
+        (
+            None,
+            {
+                'fields' : [ 'proquest_hnp_newspaper', 'run_type', 'phase', 'use_zip_files', 'archive_count', 'create_date', 'last_modified' ]
+            }
+        ),
+    ]
+
+    inlines = [
+        PHNPC_PHNP_Checkpoint_ArchiveInline,
+    ]
+
+    # set by runs - change phase to "abandoned" to keep a run from resuming.
+    readonly_fields = [ 'proquest_hnp_newspaper', 'run_type', 'use_zip_files', 'archive_count', 'create_date', 'last_modified' ]
+
+    list_display = ( 'id', 'proquest_hnp_newspaper', 'run_type', 'phase', 'use_zip_files', 'archive_count', 'create_date', 'last_modified' )
+    list_display_links = ( 'id', )
+    list_filter = [ ( 'proquest_hnp_newspaper', Proquest_HNP_NewspaperListFilter ), 'run_type', 'phase' ]
+    list_select_related = ( 'proquest_hnp_newspaper', )
+    search_fields = [ 'proquest_hnp_newspaper__paper_identifier', 'id' ]
+
+#-- END Proquest_HNP_CheckpointAdmin admin model --#
+
+admin.site.register( Proquest_HNP_Checkpoint, Proquest_HNP_CheckpointAdmin )
+
+
+#-------------------------------------------------------------------------------
+# ! ==> PHNP_Archive_Work_Item admin definition
+#-------------------------------------------------------------------------------
+
+
+class PHNP_Archive_Work_ItemAdmin( admin.ModelAdmin ):
+
+    fieldsets = [
+        (
+            None,
+            {
+                'fields' : [ 'proquest_hnp_newspaper', 'phase', 'archive_identifier', 'archive_path', 'use_zip_files', 'status' ]
+            }
+        ),
+        (
+            "Lease",
+            {
+                'fields' : [ 'lease_owner', 'lease_expires', 'heartbeat', 'attempt_count', 'error_message', 'create_date', 'last_modified' ]
+            }
+        ),
+    ]
+
+    # set by workers.
+    readonly_fields = [ 'proquest_hnp_newspaper', 'phase', 'archive_identifier', 'archive_path', 'use_zip_files', 'lease_owner', 'lease_expires', 'heartbeat', 'attempt_count', 'error_message', 'create_date', 'last_modified' ]
+
+    list_display = ( 'id', 'proquest_hnp_newspaper', 'phase', 'archive_identifier', 'status', 'attempt_count', 'lease_owner', 'lease_expires' )
+    list_display_links = ( 'id', 'archive_identifier' )
+    list_filter = [ ( 'proquest_hnp_newspaper', Proquest_HNP_NewspaperListFilter ), 'phase', 'status' ]
+    list_select_related = ( 'proquest_hnp_newspaper', )
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    search_fields = [ 'archive_identifier', 'lease_owner', 'error_message', 'id' ]
+    actions = [ 'requeue_work_items' ]
+
+    def requeue_work_items( self, request, queryset ):
+
+        # put back in the queue, with a fresh set of attempts.
+        update_count = queryset.update( status = PHNP_Archive_Work_Item.STATUS_QUEUED, lease_owner = None, lease_expires = None, attempt_count = 0, last_modified = timezone.now() )
+        self.message_user( request, "{} work items queued.".format( update_count ) )
+
+    #-- END method requeue_work_items() --#
+
+    requeue_work_items.short_description = "Queue selected work items again"
+
+#-- END PHNP_Archive_Work_ItemAdmin admin model --#
+
+admin.site.register( PHNP_Archive_Work_Item, PHNP_Archive_Work_ItemAdmin )
@@ -0,0 +1,470 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+'''
+End-to-end benchmarks for ProquestHNPNewspaperHelper, run against a synthetic
+    corpus (see synthetic_hnp.py) and an SQLite database.  Writes one JSON
+    document with the environment, the corpus parameters, and per-step
+    results (seconds, files/sec, MB/sec, database queries, peak RSS).
+
+By default, Django is configured with the apps this application needs and a
+    new SQLite database in the work folder, and migrations are run - even if
+    DJANGO_SETTINGS_MODULE is set, so the synthetic paper, archives and counts
+    never end up in a real database.  To benchmark against the database in
+    DJANGO_SETTINGS_MODULE instead, pass --use-project-db.  The context,
+    context_text and python_utilities packages must be importable.
+
+    python -m context_text_proquest_hnp.benchmarks.run_benchmarks --archive-count 4 --records-per-archive 2000 --output-file results.json
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+# django classes
+import django
+from django.conf import settings
+
+# context_text_proquest_hnp
+from context_text_proquest_hnp.benchmarks.synthetic_hnp import add_generator_arguments
+from context_text_proquest_hnp.benchmarks.synthetic_hnp import SyntheticHNPCorpusGenerator
+
+#===============================================================================
+# constants
+#===============================================================================
+
+
+# apps to install when no settings module is set.
+DEFAULT_INSTALLED_APP_LIST = [
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "taggit",
+    "context",
+    "context_text",
+    "context_text_proquest_hnp",
+]
+
+# result keys
+RESULT_STEP = "step"
+RESULT_REPEAT = "repeat"
+RESULT_SECONDS = "seconds"
+RESULT_FILE_COUNT = "file_count"
+RESULT_FILES_PER_SECOND = "files_per_second"
+RESULT_BYTES = "bytes"
+RESULT_MB_PER_SECOND = "mb_per_second"
+RESULT_QUERY_COUNT = "query_count"
+RESULT_PEAK_RSS_KB = "peak_rss_kb"
+RESULT_PEAK_CHILD_RSS_KB = "peak_child_rss_kb"
+RESULT_PHASE_METRICS = "phase_metrics"
+
+# steps
+STEP_UNCOMPRESS = "uncompress_paper_zip_files"
+STEP_SUMMARIZE = "summarize_archive_files"
+STEP_MAP = "map_archive_folder_files_to_types"
+STEP_PROCESS_FOLDERS = "process_paper_object_types-folders"
+STEP_PROCESS_ZIPS = "process_paper_object_types-zips"
+STEP_PROCESS_PARALLEL = "process_paper_object_types-folders-parallel"
+STEP_LIST = [ STEP_UNCOMPRESS, STEP_SUMMARIZE, STEP_MAP, STEP_PROCESS_FOLDERS, STEP_PROCESS_ZIPS, STEP_PROCESS_PARALLEL ]
+
+#===============================================================================
+# functions (in alphabetical order by name)
+#===============================================================================
+
+
+def build_step_result( step_name_IN, repeat_IN, seconds_IN, file_count_IN, byte_count_IN, query_count_IN ):
+
+    '''
+    Returns the result dictionary for one timed step.  Peak RSS is the
+        high-water mark for the process so far (and for worker processes, in
+        peak_child_rss_kb), so it only ever grows across steps.  ru_maxrss is
+        kilobytes on Linux, bytes on macOS - converted to kilobytes here.
+    '''
+
+    # return reference
+    result_dict_OUT = None
+
+    # declare variables
+    rss_divisor = None
+
+    rss_divisor = 1
+    if ( sys.platform == "darwin" ):
+
+        rss_divisor = 1024
+
+    #-- END check to see if macOS --#
+
+    result_dict_OUT = {}
+    result_dict_OUT[ RESULT_STEP ] = step_name_IN
+    result_dict_OUT[ RESULT_REPEAT ] = repeat_IN
+    result_dict_OUT[ RESULT_SECONDS ] = seconds_IN
+    result_dict_OUT[ RESULT_FILE_COUNT ] = file_count_IN
+    result_dict_OUT[ RESULT_BYTES ] = byte_count_IN
+    result_dict_OUT[ RESULT_FILES_PER_SECOND ] = None
+    result_dict_OUT[ RESULT_MB_PER_SECOND ] = None
+    if ( seconds_IN > 0 ):
+
+        result_dict_OUT[ RESULT_FILES_PER_SECOND ] = file_count_IN / seconds_IN
+        result_dict_OUT[ RESULT_MB_PER_SECOND ] = ( byte_count_IN / ( 1024 * 1024 ) ) / seconds_IN
+
+    #-- END check to see if any time elapsed --#
+
+    result_dict_OUT[ RESULT_QUERY_COUNT ] = query_count_IN
+    result_dict_OUT[ RESULT_PEAK_RSS_KB ] = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss // rss_divisor
+    result_dict_OUT[ RESULT_PEAK_CHILD_RSS_KB ] = resource.getrusage( resource.RUSAGE_CHILDREN ).ru_maxrss // rss_divisor
+
+    return result_dict_OUT
+
+#-- END function build_step_result() --#
+
+
+def configure_django( work_folder_IN, use_project_db_IN = False ):
+
+    '''
+    Sets up Django.  If use_project_db_IN is True, uses the settings (and
+        database) in DJANGO_SETTINGS_MODULE, which must be set.  Otherwise,
+        ignores DJANGO_SETTINGS_MODULE and configures a new SQLite database
+        in work_folder_IN and migrates it.  Returns a description of the
+        database used.
+    '''
+
+    # return reference
+    database_OUT = None
+
+    # declare variables
+    database_path = None
+
+    # imported here so the generator can be used without Django set up.
+    from django.core.management import call_command
+
+    if ( use_project_db_IN == True ):
+
+        # use project settings - asked for explicitly.
+        django.setup()
+        database_OUT = "{} (from {})".format( settings.DATABASES[ "default" ][ "ENGINE" ], os.environ[ "DJANGO_SETTINGS_MODULE" ] )
+
+    else:
+
+        # new SQLite database (settings.configure() takes precedence over
+        #     DJANGO_SETTINGS_MODULE).
+        database_path = os.path.join( work_folder_IN, "benchmark.sqlite3" )
+        settings.configure( SECRET_KEY = "benchmark",
+                            INSTALLED_APPS = DEFAULT_INSTALLED_APP_LIST,
+                            DATABASES = { "default" : { "ENGINE" : "django.db.backends.sqlite3", "NAME" : database_path } },
+                            USE_TZ = True )
+        django.setup()
+        call_command( "migrate", verbosity = 0 )
+        database_OUT = "sqlite3 ({})".format( database_path )
+
+    #-- END check to see if settings module set --#
+
+    return database_OUT
+
+#-- END function configure_django() --#
+
+
+def create_helper( corpus_dict_IN, destination_folder_IN, is_quiet_IN = True ):
+
+    '''
+    Returns a ProquestHNPNewspaperHelper for the synthetic paper, with the
+        Proquest_HNP_Newspaper created if needed.  Quiet by default, so
+        progress output is not part of what is timed.
+    '''
+
+    # return reference
+    helper_OUT = None
+
+    # imported here, after Django is set up.
+    from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+
+    helper_OUT = ProquestHNPNewspaperHelper()
+    helper_OUT.is_quiet = is_quiet_IN
+    helper_OUT.paper_identifier = corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_PAPER_IDENTIFIER ]
+    helper_OUT.paper_start_year = int( corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_START_DATE ][ 0 : 4 ] )
+    helper_OUT.paper_end_year = int( corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_END_DATE ][ 0 : 4 ] )
+    helper_OUT.source_paper_path = corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_PAPER_FOLDER ]
+    helper_OUT.destination_paper_path = destination_folder_IN
+    helper_OUT.get_PHNP_newspaper()
+
+    return helper_OUT
+
+#-- END function create_helper() --#
+
+
+def list_archive_folders( destination_folder_IN ):
+
+    # return reference
+    path_list_OUT = None
+
+    # declare variables
+    folder_name = None
+
+    path_list_OUT = []
+    for folder_name in sorted( os.listdir( destination_folder_IN ) ):
+
+        if ( ( folder_name.startswith( "." ) == False ) and ( os.path.isdir( os.path.join( destination_folder_IN, folder_name ) ) == True ) ):
+
+            path_list_OUT.append( "{}/{}".format( destination_folder_IN, folder_name ) )
+
+        #-- END check to see if archive folder --#
+
+    #-- END loop over destination folder --#
+
+    return path_list_OUT
+
+#-- END function list_archive_folders() --#
+
+
+def run_benchmarks( corpus_dict_IN, work_folder_IN, repeat_count_IN = 1, worker_count_IN = 2, step_list_IN = None, is_quiet_IN = True ):
+
+    '''
+    Runs the selected steps (default: all of STEP_LIST) repeat_count_IN times
+        each, in order, and returns the list of step result dictionaries.  The
+        uncompress step extracts into a fresh folder each time; the steps that
+        follow read the folders it last extracted, and always re-read every
+        archive (skip_unchanged_IN = False).
+    '''
+
+    # return reference
+    result_list_OUT = None
+
+    # declare variables
+    step_list = None
+    destination_folder = None
+    helper = None
+    connection = None
+    file_count = None
+    compressed_bytes = None
+    uncompressed_bytes = None
+    repeat_index = None
+    step_name = None
+    archive_path = None
+    query_context = None
+    start_time = None
+    seconds = None
+    byte_count = None
+    step_result_dict = None
+
+    # imported here, after Django is set up.
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from context_text_proquest_hnp.proquest_hnp_metrics import ProquestHNPMetrics
+
+    # init
+    step_list = step_list_IN
+    if ( step_list is None ):
+
+        step_list = STEP_LIST
+
+    #-- END check to see if step list passed in --#
+
+    destination_folder = os.path.join( work_folder_IN, "uncompressed" )
+    file_count = corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_RECORD_COUNT ]
+    compressed_bytes = corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_COMPRESSED_BYTES ]
+    uncompressed_bytes = corpus_dict_IN[ SyntheticHNPCorpusGenerator.CORPUS_UNCOMPRESSED_BYTES ]
+    result_list_OUT = []
+
+    for step_name in step_list:
+
+        for repeat_index in range( repeat_count_IN ):
+
+            # fresh extract for the uncompress step, and before any step that needs folders.
+            if ( ( step_name == STEP_UNCOMPRESS ) or ( os.path.exists( destination_folder ) == False ) ):
+
+                shutil.rmtree( destination_folder, ignore_errors = True )
+                os.makedirs( destination_folder )
+
+            #-- END check to see if fresh destination needed --#
+
+            if ( ( step_name != STEP_UNCOMPRESS ) and ( len( list_archive_folders( destination_folder ) ) == 0 ) ):
+
+                # steps that read folders need an extract to read.
+                create_helper( corpus_dict_IN, destination_folder ).uncompress_paper_zip_files()
+
+            #-- END check to see if extract needed --#
+
+            helper = create_helper( corpus_dict_IN, destination_folder, is_quiet_IN = is_quiet_IN )
+            byte_count = uncompressed_bytes
+
+            with CaptureQueriesContext( connection ) as query_context:
+
+                start_time = time.perf_counter()
+
+                if ( step_name == STEP_UNCOMPRESS ):
+
+                    helper.uncompress_paper_zip_files()
+                    byte_count = compressed_bytes
+
+                elif ( step_name == STEP_SUMMARIZE ):
+
+                    for archive_path in list_archive_folders( destination_folder ):
+
+                        helper.summarize_archive_files( archive_path, print_logging_IN = False )
+
+                    #-- END loop over archive folders --#
+
+                elif ( step_name == STEP_MAP ):
+
+                    for archive_path in list_archive_folders( destination_folder ):
+
+                        helper.map_archive_folder_files_to_types( archive_path, print_logging_IN = False )
+
+                    #-- END loop over archive folders --#
+
+                elif ( step_name == STEP_PROCESS_FOLDERS ):
+
+                    helper.process_paper_object_types( skip_unchanged_IN = False )
+
+                elif ( step_name == STEP_PROCESS_ZIPS ):
+
+                    helper.process_paper_object_types( use_zip_files_IN = True, skip_unchanged_IN = False )
+                    byte_count = compressed_bytes
+
+                elif ( step_name == STEP_PROCESS_PARALLEL ):
+
+                    helper.process_paper_object_types( worker_count_IN = worker_count_IN, skip_unchanged_IN = False )
+
+                #-- END check to see which step --#
+
+                seconds = time.perf_counter() - start_time
+
+            #-- END with CaptureQueriesContext --#
+
+            step_result_dict = build_step_result( step_name, repeat_index, seconds, file_count, byte_count, len( query_context.captured_queries ) )
+            step_result_dict[ RESULT_PHASE_METRICS ] = helper.get_metrics_dict()[ ProquestHNPMetrics.METRICS_TOTALS ]
+            result_list_OUT.append( step_result_dict )
+
+        #-- END loop over repeats --#
+
+    #-- END loop over steps --#
+
+    return result_list_OUT
+
+#-- END function run_benchmarks() --#
+
+
+def main( argument_list_IN = None ):
+
+    # declare variables
+    argument_parser = None
+    arguments = None
+    work_folder = None
+    is_temporary_work_folder = None
+    database = None
+    generator = None
+    corpus_dict = None
+    result_list = None
+    output_dict = None
+    output_json = None
+    output_file = None
+
+    argument_parser = argparse.ArgumentParser( description = "Benchmark ProquestHNPNewspaperHelper against a synthetic ProQuest HNP corpus." )
+    argument_parser.add_argument( "--work-folder", default = None, help = "folder for the corpus, extracted files, and SQLite database (default: new temporary folder, removed when done)" )
+    argument_parser.add_argument( "--output-file", default = "benchmark_results.json", help = "write JSON results here (\"-\" for standard output)" )
+    argument_parser.add_argument( "--repeat", type = int, default = 1, help = "times to run each step" )
+    argument_parser.add_argument( "--worker-count", type = int, default = 2, help = "workers for the parallel step" )
+    argument_parser.add_argument( "--verbose", action = "store_true", help = "print the helper's progress messages (off by default, so they are not timed)" )
+    argument_parser.add_argument( "--step", action = "append", choices = STEP_LIST, default = None, help = "step to run (repeatable, default: all)" )
+    argument_parser.add_argument( "--use-project-db", action = "store_true", help = "write to the database in DJANGO_SETTINGS_MODULE instead of a temporary SQLite database" )
+    add_generator_arguments( argument_parser )
+    arguments = argument_parser.parse_args( argument_list_IN )
+    if ( ( arguments.use_project_db == True ) and ( os.environ.get( "DJANGO_SETTINGS_MODULE", "" ) == "" ) ):
+
+        argument_parser.error( "--use-project-db needs DJANGO_SETTINGS_MODULE to be set" )
+
+    #-- END check to see if project settings available --#
+
+    # work folder
+    work_folder = arguments.work_folder
+    is_temporary_work_folder = False
+    if ( work_folder is None ):
+
+        work_folder = tempfile.mkdtemp( prefix = "phnp-benchmark-" )
+        is_temporary_work_folder = True
+
+    #-- END check to see if work folder passed in --#
+
+    try:
+
+        database = configure_django( work_folder, use_project_db_IN = arguments.use_project_db )
+
+        # corpus
+        generator = SyntheticHNPCorpusGenerator()
+        generator.set_from_arguments( arguments )
+        corpus_dict = generator.generate( os.path.join( work_folder, "compressed" ) )
+
+        # run
+        result_list = run_benchmarks( corpus_dict,
+                                      work_folder,
+                                      repeat_count_IN = arguments.repeat,
+                                      worker_count_IN = arguments.worker_count,
+                                      step_list_IN = arguments.step,
+                                      is_quiet_IN = ( arguments.verbose == False ) )
+
+        output_dict = {}
+        output_dict[ "run_at" ] = datetime.datetime.utcnow().isoformat()
+        output_dict[ "environment" ] = { "python" : platform.python_version(),
+                                         "django" : django.get_version(),
+                                         "platform" : platform.platform(),
+                                         "cpu_count" : os.cpu_count(),
+                                         "database" : database }
+        output_dict[ "corpus" ] = corpus_dict
+        output_dict[ "results" ] = result_list
+        output_json = json.dumps( output_dict, indent = 4 )
+
+        if ( arguments.output_file != "-" ):
+
+            with open( arguments.output_file, "w" ) as output_file:
+
+                output_file.write( output_json )
+
+            #-- END with open output file --#
+
+        else:
+
+            print( output_json )
+
+        #-- END check to see where to output --#
+
+    finally:
+
+        if ( is_temporary_work_folder == True ):
+
+            shutil.rmtree( work_folder, ignore_errors = True )
+
+        #-- END check to see if temporary work folder --#
+
+    #-- END try-finally --#
+
+#-- END function main() --#
+
+
+if __name__ == "__main__":
+
+    main()
+
+#-- END check to see if run as script --#
@@ -0,0 +1,378 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+'''
+Deterministic generator for synthetic ProQuest HNP data: Record XML files,
+    packed into archive .zip files named the way ProQuest delivers them.  Uses
+    only the standard library (no Django), so it can also be run on its own:
+
+    python -m context_text_proquest_hnp.benchmarks.synthetic_hnp --output-folder /tmp/hnp --archive-count 4 --records-per-archive 1000
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import argparse
+import datetime
+import json
+import os
+import random
+from xml.sax.saxutils import escape
+import zipfile
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class SyntheticHNPCorpusGenerator( object ):
+
+    '''
+    Generates a synthetic ProQuest HNP paper: archive_count .zip files in
+        "<output_folder>/<paper_identifier>/", each holding
+        records_per_archive Record XML files.  Archives split the date range
+        evenly and in order, ObjectType values are drawn from type_mix
+        (value to weight - "|" in a value produces multiple <ObjectType>
+        elements), and each <FullText> is about full_text_size bytes.  The
+        same seed always produces the same files.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # defaults
+    DEFAULT_PAPER_IDENTIFIER = "SyntheticPaper"
+    DEFAULT_ARCHIVE_COUNT = 4
+    DEFAULT_RECORDS_PER_ARCHIVE = 1000
+    DEFAULT_TYPE_MIX = {
+        "Article" : 60,
+        "Advertisement" : 20,
+        "Article|Front Page" : 5,
+        "Editorial" : 5,
+        "Obituary" : 4,
+        "Letter to the Editor" : 3,
+        "Classified Advertisement" : 3,
+    }
+    DEFAULT_START_DATE = datetime.date( 1950, 1, 1 )
+    DEFAULT_END_DATE = datetime.date( 1959, 12, 31 )
+    DEFAULT_FULL_TEXT_SIZE = 4000
+    DEFAULT_SEED = 1
+    DEFAULT_FIRST_RECORD_ID = 100000000
+
+    # words to build text from.
+    WORD_LIST = [ "the", "city", "council", "voted", "on", "a", "new", "plan", "for", "school", "board", "mayor", "said", "week", "state", "police", "reported", "fire", "street", "market", "prices", "rose", "fell", "election", "county", "court", "judge", "federal", "river", "bridge" ]
+
+    # corpus description keys
+    CORPUS_PAPER_IDENTIFIER = "paper_identifier"
+    CORPUS_PAPER_FOLDER = "paper_folder"
+    CORPUS_ARCHIVE_COUNT = "archive_count"
+    CORPUS_RECORDS_PER_ARCHIVE = "records_per_archive"
+    CORPUS_RECORD_COUNT = "record_count"
+    CORPUS_TYPE_MIX = "type_mix"
+    CORPUS_START_DATE = "start_date"
+    CORPUS_END_DATE = "end_date"
+    CORPUS_FULL_TEXT_SIZE = "full_text_size"
+    CORPUS_SEED = "seed"
+    CORPUS_ZIP_FILE_LIST = "zip_file_list"
+    CORPUS_COMPRESSED_BYTES = "compressed_bytes"
+    CORPUS_UNCOMPRESSED_BYTES = "uncompressed_bytes"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # declare variables
+        self.paper_identifier = self.DEFAULT_PAPER_IDENTIFIER
+        self.archive_count = self.DEFAULT_ARCHIVE_COUNT
+        self.records_per_archive = self.DEFAULT_RECORDS_PER_ARCHIVE
+        self.type_mix = dict( self.DEFAULT_TYPE_MIX )
+        self.start_date = self.DEFAULT_START_DATE
+        self.end_date = self.DEFAULT_END_DATE
+        self.full_text_size = self.DEFAULT_FULL_TEXT_SIZE
+        self.seed = self.DEFAULT_SEED
+        self.first_record_id = self.DEFAULT_FIRST_RECORD_ID
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def build_full_text( self, random_IN ):
+
+        '''
+        Returns roughly full_text_size bytes of words drawn with random_IN.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        word_list = None
+        byte_count = None
+        word = None
+
+        word_list = []
+        byte_count = 0
+        while ( byte_count < self.full_text_size ):
+
+            word = random_IN.choice( self.WORD_LIST )
+            word_list.append( word )
+            byte_count += len( word ) + 1
+
+        #-- END loop to build text --#
+
+        value_OUT = " ".join( word_list )
+
+        return value_OUT
+
+    #-- END method build_full_text() --#
+
+
+    def build_record_xml( self, record_id_IN, object_type_IN, pub_date_IN, random_IN ):
+
+        '''
+        Returns the text of one Record XML file, laid out like ProQuest HNP
+            records (FullText last).
+        '''
+
+        # return reference
+        xml_OUT = None
+
+        # declare variables
+        line_list = None
+        object_type = None
+
+        line_list = []
+        line_list.append( '<?xml version="1.0" encoding="UTF-8"?>' )
+        line_list.append( "<Record>" )
+        line_list.append( "<Version>1</Version>" )
+        line_list.append( "<RecordID>{}</RecordID>".format( record_id_IN ) )
+        line_list.append( "<DateTimeStamp>{}000000</DateTimeStamp>".format( pub_date_IN.strftime( "%Y%m%d" ) ) )
+        line_list.append( "<Publisher><PublisherName>Synthetic Publishing Co.</PublisherName></Publisher>" )
+        line_list.append( "<RecordTitle>{}</RecordTitle>".format( escape( "Synthetic headline {}".format( record_id_IN ) ) ) )
+        for object_type in object_type_IN.split( "|" ):
+
+            line_list.append( "<ObjectType>{}</ObjectType>".format( escape( object_type ) ) )
+
+        #-- END loop over object types --#
+
+        line_list.append( "<Contributor><ContribRole>Author</ContribRole><OriginalForm>By Synthetic Reporter {}</OriginalForm></Contributor>".format( random_IN.randint( 1, 50 ) ) )
+        line_list.append( "<Language><RawLang>English</RawLang></Language>" )
+        line_list.append( "<NumericPubDate>{}</NumericPubDate>".format( pub_date_IN.strftime( "%Y%m%d" ) ) )
+        line_list.append( "<AlphaPubDate>{}</AlphaPubDate>".format( pub_date_IN.strftime( "%b %d, %Y" ) ) )
+        line_list.append( "<StartPage>{}</StartPage>".format( random_IN.randint( 1, 60 ) ) )
+        line_list.append( "<URLDocView>https://example.com/docview/{}</URLDocView>".format( record_id_IN ) )
+        line_list.append( "<Copyright>Copyright Synthetic Publishing Co.</Copyright>" )
+        line_list.append( "<FullText>{}</FullText>".format( escape( self.build_full_text( random_IN ) ) ) )
+        line_list.append( "</Record>" )
+
+        xml_OUT = "\n".join( line_list )
+
+        return xml_OUT
+
+    #-- END method build_record_xml() --#
+
+
+    def generate( self, output_folder_IN ):
+
+        '''
+        Writes the archive .zip files into "<output_folder_IN>/<paper_identifier>/"
+            and returns a dictionary describing the corpus (parameters, zip
+            file paths, compressed and uncompressed byte counts).
+        '''
+
+        # return reference
+        corpus_dict_OUT = None
+
+        # declare variables
+        my_random = None
+        paper_folder = None
+        type_list = None
+        weight_list = None
+        day_count = None
+        days_per_archive = None
+        archive_index = None
+        archive_start_ordinal = None
+        archive_end_ordinal = None
+        zip_file_path = None
+        zip_file_list = None
+        zip_file = None
+        record_index = None
+        record_id = None
+        object_type = None
+        pub_date = None
+        record_xml = None
+        record_bytes = None
+        compressed_bytes = None
+        uncompressed_bytes = None
+
+        # init
+        my_random = random.Random( self.seed )
+        paper_folder = os.path.join( output_folder_IN, self.paper_identifier )
+        if ( os.path.exists( paper_folder ) == False ):
+
+            os.makedirs( paper_folder )
+
+        #-- END check to see if paper folder exists --#
+
+        type_list = sorted( self.type_mix.keys() )
+        weight_list = [ self.type_mix[ object_type ] for object_type in type_list ]
+        day_count = ( self.end_date - self.start_date ).days + 1
+        days_per_archive = max( 1, day_count // self.archive_count )
+        record_id = self.first_record_id
+        zip_file_list = []
+        compressed_bytes = 0
+        uncompressed_bytes = 0
+
+        for archive_index in range( self.archive_count ):
+
+            # dates for this archive
+            archive_start_ordinal = self.start_date.toordinal() + ( archive_index * days_per_archive )
+            archive_end_ordinal = min( archive_start_ordinal + days_per_archive - 1, self.end_date.toordinal() )
+            if ( archive_index == ( self.archive_count - 1 ) ):
+
+                archive_end_ordinal = self.end_date.toordinal()
+
+            #-- END check to see if last archive --#
+
+            zip_file_path = os.path.join( paper_folder, "{}_{:05d}.zip".format( self.paper_identifier, archive_index + 1 ) )
+            with zipfile.ZipFile( zip_file_path, "w", zipfile.ZIP_DEFLATED ) as zip_file:
+
+                for record_index in range( self.records_per_archive ):
+
+                    record_id += 1
+                    object_type = my_random.choices( type_list, weights = weight_list )[ 0 ]
+                    pub_date = datetime.date.fromordinal( my_random.randint( archive_start_ordinal, archive_end_ordinal ) )
+                    record_xml = self.build_record_xml( record_id, object_type, pub_date, my_random )
+                    record_bytes = record_xml.encode( "utf-8" )
+                    uncompressed_bytes += len( record_bytes )
+                    zip_file.writestr( "{}.xml".format( record_id ), record_bytes )
+
+                #-- END loop over records --#
+
+            #-- END with ZipFile --#
+
+            compressed_bytes += os.path.getsize( zip_file_path )
+            zip_file_list.append( zip_file_path )
+
+        #-- END loop over archives --#
+
+        corpus_dict_OUT = {}
+        corpus_dict_OUT[ self.CORPUS_PAPER_IDENTIFIER ] = self.paper_identifier
+        corpus_dict_OUT[ self.CORPUS_PAPER_FOLDER ] = paper_folder
+        corpus_dict_OUT[ self.CORPUS_ARCHIVE_COUNT ] = self.archive_count
+        corpus_dict_OUT[ self.CORPUS_RECORDS_PER_ARCHIVE ] = self.records_per_archive
+        corpus_dict_OUT[ self.CORPUS_RECORD_COUNT ] = self.archive_count * self.records_per_archive
+        corpus_dict_OUT[ self.CORPUS_TYPE_MIX ] = self.type_mix
+        corpus_dict_OUT[ self.CORPUS_START_DATE ] = self.start_date.isoformat()
+        corpus_dict_OUT[ self.CORPUS_END_DATE ] = self.end_date.isoformat()
+        corpus_dict_OUT[ self.CORPUS_FULL_TEXT_SIZE ] = self.full_text_size
+        corpus_dict_OUT[ self.CORPUS_SEED ] = self.seed
+        corpus_dict_OUT[ self.CORPUS_ZIP_FILE_LIST ] = zip_file_list
+        corpus_dict_OUT[ self.CORPUS_COMPRESSED_BYTES ] = compressed_bytes
+        corpus_dict_OUT[ self.CORPUS_UNCOMPRESSED_BYTES ] = uncompressed_bytes
+
+        return corpus_dict_OUT
+
+    #-- END method generate() --#
+
+
+    def set_from_arguments( self, arguments_IN ):
+
+        '''
+        Sets generator parameters from parsed command line arguments (see
+            add_generator_arguments()).
+        '''
+
+        self.paper_identifier = arguments_IN.paper_identifier
+        self.archive_count = arguments_IN.archive_count
+        self.records_per_archive = arguments_IN.records_per_archive
+        self.full_text_size = arguments_IN.full_text_size
+        self.seed = arguments_IN.seed
+        self.start_date = datetime.datetime.strptime( arguments_IN.start_date, "%Y-%m-%d" ).date()
+        self.end_date = datetime.datetime.strptime( arguments_IN.end_date, "%Y-%m-%d" ).date()
+        if ( arguments_IN.type_mix is not None ):
+
+            self.type_mix = json.loads( arguments_IN.type_mix )
+
+        #-- END check to see if type mix passed in --#
+
+    #-- END method set_from_arguments() --#
+
+
+#-- END class SyntheticHNPCorpusGenerator --#
+
+
+#===============================================================================
+# functions (in alphabetical order by name)
+#===============================================================================
+
+
+def add_generator_arguments( argument_parser_IN ):
+
+    '''
+    Adds the corpus generator's options to an argparse parser.
+    '''
+
+    argument_parser_IN.add_argument( "--paper-identifier", default = SyntheticHNPCorpusGenerator.DEFAULT_PAPER_IDENTIFIER )
+    argument_parser_IN.add_argument( "--archive-count", type = int, default = SyntheticHNPCorpusGenerator.DEFAULT_ARCHIVE_COUNT )
+    argument_parser_IN.add_argument( "--records-per-archive", type = int, default = SyntheticHNPCorpusGenerator.DEFAULT_RECORDS_PER_ARCHIVE )
+    argument_parser_IN.add_argument( "--full-text-size", type = int, default = SyntheticHNPCorpusGenerator.DEFAULT_FULL_TEXT_SIZE, help = "approximate bytes of FullText per record" )
+    argument_parser_IN.add_argument( "--start-date", default = SyntheticHNPCorpusGenerator.DEFAULT_START_DATE.isoformat(), help = "YYYY-MM-DD" )
+    argument_parser_IN.add_argument( "--end-date", default = SyntheticHNPCorpusGenerator.DEFAULT_END_DATE.isoformat(), help = "YYYY-MM-DD" )
+    argument_parser_IN.add_argument( "--type-mix", default = None, help = "JSON object of ObjectType value to weight" )
+    argument_parser_IN.add_argument( "--seed", type = int, default = SyntheticHNPCorpusGenerator.DEFAULT_SEED )
+
+#-- END function add_generator_arguments() --#
+
+
+def main( argument_list_IN = None ):
+
+    # declare variables
+    argument_parser = None
+    arguments = None
+    generator = None
+    corpus_dict = None
+
+    argument_parser = argparse.ArgumentParser( description = "Generate a synthetic ProQuest HNP paper (archive .zip files of Record XML)." )
+    argument_parser.add_argument( "--output-folder", required = True )
+    add_generator_arguments( argument_parser )
+    arguments = argument_parser.parse_args( argument_list_IN )
+
+    generator = SyntheticHNPCorpusGenerator()
+    generator.set_from_arguments( arguments )
+    corpus_dict = generator.generate( arguments.output_folder )
+    print( json.dumps( corpus_dict, indent = 4 ) )
+
+#-- END function main() --#
+
+
+if __name__ == "__main__":
+
+    main()
+
+#-- END check to see if run as script --#
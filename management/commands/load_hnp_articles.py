@@ -0,0 +1,151 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.proquest_hnp_article_loader import ProquestHNPArticleLoader
+from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+    '''
+    Loads a paper's HNP Records into context_text Articles - for example, the
+        articles from the 1950s:
+
+        python manage.py load_hnp_articles <paper_identifier> --object-type Article --object-type "Article|Front Page" --start-date 1950 --end-date 1959
+    '''
+
+    help = "Loads a paper's ProQuest HNP Record XML into context_text Article and Article_Text rows for the paper's Newspaper."
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # a date argument of just a year covers the whole year.
+    YEAR_START_SUFFIX = "0101"
+    YEAR_END_SUFFIX = "1231"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "paper_identifier", help = "paper_identifier of the Proquest_HNP_Newspaper to load." )
+        parser.add_argument( "--object-type", action = "append", dest = "object_type_list", default = None, help = "ObjectType value to load (multiple values joined with \"|\", as in the type counts).  Repeat for more than one.  Default is all types." )
+        parser.add_argument( "--start-date", default = None, help = "First NumericPubDate to load - YYYYMMDD, or YYYY for January 1." )
+        parser.add_argument( "--end-date", default = None, help = "Last NumericPubDate to load - YYYYMMDD, or YYYY for December 31." )
+        parser.add_argument( "--batch-size", type = int, default = ProquestHNPArticleLoader.DEFAULT_BATCH_SIZE, help = "Articles per bulk insert (default {}).".format( ProquestHNPArticleLoader.DEFAULT_BATCH_SIZE ) )
+        parser.add_argument( "--zip", action = "store_true", dest = "use_zip_files", help = "Read the archive .zip files in the paper's compressed folder, rather than the extracted archive folders." )
+        parser.add_argument( "--quiet", action = "store_true", help = "Do not print progress for each archive." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        my_helper = None
+        start_pub_date_int = None
+        end_pub_date_int = None
+        article_loader = None
+        status_map = None
+
+        # paper
+        my_helper = ProquestHNPNewspaperHelper()
+        if ( my_helper.initialize_from_database( options[ "paper_identifier" ] ) is None ):
+
+            raise CommandError( "No Proquest_HNP_Newspaper with paper_identifier \"{}\".".format( options[ "paper_identifier" ] ) )
+
+        #-- END check to see if paper found --#
+
+        my_helper.is_quiet = options[ "quiet" ]
+
+        # filters
+        start_pub_date_int = self.parse_pub_date( options[ "start_date" ], self.YEAR_START_SUFFIX )
+        end_pub_date_int = self.parse_pub_date( options[ "end_date" ], self.YEAR_END_SUFFIX )
+
+        # load
+        article_loader = ProquestHNPArticleLoader( my_helper,
+                                                   object_type_list_IN = options[ "object_type_list" ],
+                                                   start_pub_date_int_IN = start_pub_date_int,
+                                                   end_pub_date_int_IN = end_pub_date_int,
+                                                   batch_size_IN = options[ "batch_size" ] )
+        status_map = article_loader.load_paper( use_zip_files_IN = options[ "use_zip_files" ] )
+        if ( status_map is None ):
+
+            raise CommandError( "Proquest_HNP_Newspaper \"{}\" has no related Newspaper - set one before loading articles.".format( options[ "paper_identifier" ] ) )
+
+        #-- END check to see if loaded --#
+
+        self.stdout.write( ", ".join( "{}: {}".format( status, status_map[ status ] ) for status in ProquestHNPArticleLoader.STATUS_LIST ) )
+
+    #-- END method handle() --#
+
+
+    def parse_pub_date( self, value_IN, year_suffix_IN ):
+
+        '''
+        Converts a date argument (YYYYMMDD, or YYYY plus year_suffix_IN) to an
+            int NumericPubDate.  Returns None if no value.
+        '''
+
+        # return reference
+        pub_date_int_OUT = None
+
+        # declare variables
+        value = None
+
+        if ( value_IN is not None ):
+
+            value = value_IN.strip().replace( "-", "" )
+            if ( len( value ) == 4 ):
+
+                value += year_suffix_IN
+
+            #-- END check to see if just year --#
+
+            if ( ( len( value ) != 8 ) or ( value.isdigit() == False ) ):
+
+                raise CommandError( "Date \"{}\" is not YYYYMMDD or YYYY.".format( value_IN ) )
+
+            #-- END check to see if valid --#
+
+            pub_date_int_OUT = int( value )
+
+        #-- END check to see if value --#
+
+        return pub_date_int_OUT
+
+    #-- END method parse_pub_date() --#
+
+
+#-- END class Command --#
@@ -0,0 +1,104 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import datetime
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+    '''
+    Summarizes a paper's archives and stores its ObjectType counts (see
+        ProquestHNPNewspaperHelper.process_paper_object_types()).  An
+        interrupted run is resumed from its checkpoint the next time this is
+        run - to start over instead:
+
+        python manage.py process_hnp_object_types <paper_identifier> --restart
+    '''
+
+    help = "Summarizes a ProQuest HNP paper's archives and stores its ObjectType counts, resuming an interrupted run unless --restart is passed."
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "paper_identifier", help = "paper_identifier of the Proquest_HNP_Newspaper to process." )
+        parser.add_argument( "--restart", action = "store_true", help = "Ignore the checkpoint of an interrupted run, and start a new run." )
+        parser.add_argument( "--checkpoint-max-age", type = float, default = ProquestHNPNewspaperHelper.DEFAULT_CHECKPOINT_MAX_AGE.days, help = "Days an interrupted run can go without progress and still be resumed, 0 = no limit (default {}).".format( ProquestHNPNewspaperHelper.DEFAULT_CHECKPOINT_MAX_AGE.days ) )
+        parser.add_argument( "--workers", type = int, default = 1, help = "Number of worker processes to summarize archives in (default 1)." )
+        parser.add_argument( "--zip", action = "store_true", dest = "use_zip_files", help = "Read the archive .zip files in the paper's compressed folder, rather than the extracted archive folders." )
+        parser.add_argument( "--all", action = "store_true", dest = "process_all", help = "Summarize every archive, even those unchanged since they were last summarized." )
+        parser.add_argument( "--skip-duplicates", action = "store_true", dest = "skip_duplicate_records", help = "Leave Records whose RecordID is in an earlier archive out of the paper-level counts." )
+        parser.add_argument( "--read-ahead", type = int, default = ProquestHNPNewspaperHelper.DEFAULT_READ_AHEAD_COUNT, help = "Number of Record files to read ahead of parsing, 0 = off (default {}).".format( ProquestHNPNewspaperHelper.DEFAULT_READ_AHEAD_COUNT ) )
+        parser.add_argument( "--quiet", action = "store_true", help = "Do not print progress for each archive." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        my_helper = None
+        object_type_to_count_map = None
+
+        # paper
+        my_helper = ProquestHNPNewspaperHelper()
+        if ( my_helper.initialize_from_database( options[ "paper_identifier" ] ) is None ):
+
+            raise CommandError( "No Proquest_HNP_Newspaper with paper_identifier \"{}\".".format( options[ "paper_identifier" ] ) )
+
+        #-- END check to see if paper found --#
+
+        my_helper.is_quiet = options[ "quiet" ]
+        my_helper.read_ahead_count = options[ "read_ahead" ]
+        my_helper.skip_duplicate_records = options[ "skip_duplicate_records" ]
+        my_helper.checkpoint_max_age = None
+        if ( options[ "checkpoint_max_age" ] > 0 ):
+
+            my_helper.checkpoint_max_age = datetime.timedelta( days = options[ "checkpoint_max_age" ] )
+
+        #-- END check to see if checkpoint age limit --#
+
+        # process
+        object_type_to_count_map = my_helper.process_paper_object_types( worker_count_IN = options[ "workers" ],
+                                                                         use_zip_files_IN = options[ "use_zip_files" ],
+                                                                         skip_unchanged_IN = ( options[ "process_all" ] == False ),
+                                                                         restart_IN = options[ "restart" ] )
+
+        self.stdout.write( "{} ObjectType values, {} Records".format( len( object_type_to_count_map ), sum( object_type_to_count_map.values() ) ) )
+
+    #-- END method handle() --#
+
+
+#-- END class Command --#
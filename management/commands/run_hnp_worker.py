@@ -0,0 +1,154 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.models import PHNP_Archive_Work_Item
+from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+from context_text_proquest_hnp.proquest_hnp_work_queue import ProquestHNPWorkQueue
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+    '''
+    Runs a work queue worker for one phase of a paper (see
+        ProquestHNPWorkQueue).  Queue the paper's archives once, then start as
+        many workers as you like, on any host that shares the database and
+        the archive storage - for example:
+
+        python manage.py run_hnp_worker <paper_identifier> uncompress --enqueue
+        python manage.py run_hnp_worker <paper_identifier> summarize --enqueue --wait
+
+    If summarize items failed, the paper totals are not rebuilt - queue them
+        again, or rebuild the totals from what is stored:
+
+        python manage.py run_hnp_worker <paper_identifier> summarize --retry-failed
+        python manage.py run_hnp_worker <paper_identifier> summarize --rollup
+    '''
+
+    help = "Processes a ProQuest HNP paper's archives from the database work queue, alongside any other workers for the paper."
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "paper_identifier", help = "paper_identifier of the Proquest_HNP_Newspaper to work on." )
+        parser.add_argument( "phase", choices = PHNP_Archive_Work_Item.WORKER_PHASE_LIST, help = "Phase to work on." )
+        parser.add_argument( "--enqueue", action = "store_true", help = "First add a work item for each of the paper's archives not already queued in this phase." )
+        parser.add_argument( "--reset", action = "store_true", help = "First delete the paper's work items in this phase (use with --enqueue to start over)." )
+        parser.add_argument( "--retry-failed", action = "store_true", help = "First queue the paper's failed work items in this phase again, with their attempts reset." )
+        parser.add_argument( "--rollup", action = "store_true", help = "summarize only - once done working, rebuild the paper totals, even if some items failed or the totals look current." )
+        parser.add_argument( "--zip", action = "store_true", dest = "use_zip_files", help = "Summarize the archive .zip files in the paper's compressed folder, rather than the extracted archive folders." )
+        parser.add_argument( "--all", action = "store_true", dest = "process_all", help = "Summarize every archive, even those unchanged since they were last summarized." )
+        parser.add_argument( "--lease-seconds", type = int, default = ProquestHNPWorkQueue.DEFAULT_LEASE_SECONDS, help = "Seconds a lease lasts without a heartbeat (default {}).".format( ProquestHNPWorkQueue.DEFAULT_LEASE_SECONDS ) )
+        parser.add_argument( "--max-attempts", type = int, default = ProquestHNPWorkQueue.DEFAULT_MAX_ATTEMPTS, help = "Attempts before an item is marked failed (default {}).".format( ProquestHNPWorkQueue.DEFAULT_MAX_ATTEMPTS ) )
+        parser.add_argument( "--max-items", type = int, default = None, help = "Stop after processing this many items." )
+        parser.add_argument( "--wait", action = "store_true", help = "When nothing can be claimed, wait for items still queued or leased to other workers, rather than stopping." )
+        parser.add_argument( "--poll-seconds", type = int, default = ProquestHNPWorkQueue.DEFAULT_POLL_SECONDS, help = "Seconds between checks with --wait (default {}).".format( ProquestHNPWorkQueue.DEFAULT_POLL_SECONDS ) )
+        parser.add_argument( "--skip-duplicates", action = "store_true", dest = "skip_duplicate_records", help = "Leave Records whose RecordID is in an earlier archive out of the paper-level counts." )
+        parser.add_argument( "--read-ahead", type = int, default = ProquestHNPNewspaperHelper.DEFAULT_READ_AHEAD_COUNT, help = "Number of Record files to read ahead of parsing, 0 = off (default {}).".format( ProquestHNPNewspaperHelper.DEFAULT_READ_AHEAD_COUNT ) )
+        parser.add_argument( "--quiet", action = "store_true", help = "Do not print progress for each archive." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        my_helper = None
+        work_queue = None
+        new_count = None
+        status_map = None
+        queue_status_map = None
+
+        # paper
+        my_helper = ProquestHNPNewspaperHelper()
+        if ( my_helper.initialize_from_database( options[ "paper_identifier" ] ) is None ):
+
+            raise CommandError( "No Proquest_HNP_Newspaper with paper_identifier \"{}\".".format( options[ "paper_identifier" ] ) )
+
+        #-- END check to see if paper found --#
+
+        my_helper.is_quiet = options[ "quiet" ]
+        my_helper.read_ahead_count = options[ "read_ahead" ]
+        my_helper.skip_duplicate_records = options[ "skip_duplicate_records" ]
+
+        if ( ( options[ "rollup" ] == True ) and ( options[ "phase" ] != PHNP_Archive_Work_Item.PHASE_SUMMARIZE ) ):
+
+            raise CommandError( "--rollup only applies to the {} phase.".format( PHNP_Archive_Work_Item.PHASE_SUMMARIZE ) )
+
+        #-- END check to see if rollup in right phase --#
+
+        # queue
+        work_queue = ProquestHNPWorkQueue( my_helper,
+                                           options[ "phase" ],
+                                           use_zip_files_IN = options[ "use_zip_files" ],
+                                           lease_seconds_IN = options[ "lease_seconds" ],
+                                           max_attempts_IN = options[ "max_attempts" ] )
+        work_queue.skip_unchanged = ( options[ "process_all" ] == False )
+        work_queue.rollup_when_done = ( options[ "rollup" ] == False )
+        if ( options[ "reset" ] == True ):
+
+            self.stdout.write( "{} work items deleted".format( work_queue.reset_work_items() ) )
+
+        #-- END check to see if reset --#
+
+        if ( options[ "enqueue" ] == True ):
+
+            new_count = work_queue.enqueue_paper_archives()
+            self.stdout.write( "{} work items queued".format( new_count ) )
+
+        #-- END check to see if enqueue --#
+
+        if ( options[ "retry_failed" ] == True ):
+
+            self.stdout.write( "{} failed work items queued again".format( work_queue.requeue_failed_work_items() ) )
+
+        #-- END check to see if retrying failed items --#
+
+        # work
+        status_map = work_queue.run_worker( max_item_count_IN = options[ "max_items" ],
+                                            wait_IN = options[ "wait" ],
+                                            poll_seconds_IN = options[ "poll_seconds" ] )
+        if ( options[ "rollup" ] == True ):
+
+            self.stdout.write( "rollup - {}".format( work_queue.run_rollup( force_IN = True ) ) )
+
+        #-- END check to see if explicit rollup --#
+
+        queue_status_map = work_queue.get_status_map()
+
+        self.stdout.write( "worker {} - {}".format( work_queue.worker_id, ", ".join( "{}: {}".format( status, status_map[ status ] ) for status in ProquestHNPWorkQueue.STATUS_LIST ) ) )
+        self.stdout.write( "queue - {}".format( ", ".join( "{}: {}".format( status, queue_status_map[ status ] ) for status in PHNP_Archive_Work_Item.STATUS_LIST ) ) )
+
+    #-- END method handle() --#
+
+
+#-- END class Command --#
@@ -0,0 +1,103 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import datetime
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+    '''
+    Extracts a paper's archive .zip files into its uncompressed folder (see
+        ProquestHNPNewspaperHelper.uncompress_paper_zip_files()).  An
+        interrupted run is resumed from its checkpoint the next time this is
+        run - to start over instead:
+
+        python manage.py uncompress_hnp_paper <paper_identifier> --restart
+    '''
+
+    help = "Extracts a ProQuest HNP paper's archive .zip files, resuming an interrupted run unless --restart is passed."
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "paper_identifier", help = "paper_identifier of the Proquest_HNP_Newspaper to extract." )
+        parser.add_argument( "--restart", action = "store_true", help = "Ignore the checkpoint of an interrupted run, and start a new run." )
+        parser.add_argument( "--checkpoint-max-age", type = float, default = ProquestHNPNewspaperHelper.DEFAULT_CHECKPOINT_MAX_AGE.days, help = "Days an interrupted run can go without progress and still be resumed, 0 = no limit (default {}).".format( ProquestHNPNewspaperHelper.DEFAULT_CHECKPOINT_MAX_AGE.days ) )
+        parser.add_argument( "--workers", type = int, default = 1, help = "Number of threads to extract zip files in (default 1)." )
+        parser.add_argument( "--quiet", action = "store_true", help = "Do not print progress for each zip file." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        my_helper = None
+        result_list = None
+
+        # paper
+        my_helper = ProquestHNPNewspaperHelper()
+        if ( my_helper.initialize_from_database( options[ "paper_identifier" ] ) is None ):
+
+            raise CommandError( "No Proquest_HNP_Newspaper with paper_identifier \"{}\".".format( options[ "paper_identifier" ] ) )
+
+        #-- END check to see if paper found --#
+
+        if ( ( my_helper.source_paper_path is None ) or ( my_helper.destination_paper_path is None ) ):
+
+            raise CommandError( "Proquest_HNP_Newspaper \"{}\" needs both a compressed and an uncompressed folder path.".format( options[ "paper_identifier" ] ) )
+
+        #-- END check to see if paths --#
+
+        my_helper.is_quiet = options[ "quiet" ]
+        my_helper.checkpoint_max_age = None
+        if ( options[ "checkpoint_max_age" ] > 0 ):
+
+            my_helper.checkpoint_max_age = datetime.timedelta( days = options[ "checkpoint_max_age" ] )
+
+        #-- END check to see if checkpoint age limit --#
+
+        # extract
+        my_helper.make_dest_paper_folder()
+        result_list = my_helper.uncompress_paper_zip_files( worker_count_IN = options[ "workers" ],
+                                                            restart_IN = options[ "restart" ] )
+
+        self.stdout.write( "{} zip files extracted".format( len( result_list ) ) )
+
+    #-- END method handle() --#
+
+
+#-- END class Command --#
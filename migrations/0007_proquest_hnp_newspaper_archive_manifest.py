@@ -0,0 +1,38 @@
+# Generated by Django 2.2.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text_proquest_hnp', '0006_auto_20190821_1820'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proquest_hnp_newspaper_archive',
+            name='manifest_file_count',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='proquest_hnp_newspaper_archive',
+            name='manifest_fingerprint',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='proquest_hnp_newspaper_archive',
+            name='manifest_newest_mtime_ns',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='proquest_hnp_newspaper_archive',
+            name='manifest_total_bytes',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='proquest_hnp_newspaper_archive',
+            name='manifest_updated',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 2.2.4 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+def remove_duplicate_rows( apps, schema_editor ):
+
+    '''
+    Before adding the unique constraints, remove rows that would violate
+        them, keeping the oldest (lowest id) row in each group.  Counts on the
+        kept rows are corrected the next time an archive or paper is
+        summarized.
+    '''
+
+    # declare variables
+    model_name = None
+    field_name_list = None
+    model_class = None
+    duplicate_qs = None
+    duplicate_dict = None
+    keep_id = None
+
+    for model_name, field_name_list in [ ( "PHNP_Newspaper_Archive_Object_Type", [ "proquest_hnp_newspaper_archive_id", "proquest_hnp_object_type_id" ] ),
+                                         ( "PHNP_Newspaper_Object_Type", [ "proquest_hnp_newspaper_id", "proquest_hnp_object_type_id" ] ) ]:
+
+        model_class = apps.get_model( "context_text_proquest_hnp", model_name )
+        duplicate_qs = model_class.objects.values( *field_name_list ).annotate( keep_id = models.Min( "id" ), row_count = models.Count( "id" ) ).filter( row_count__gt = 1 ).order_by()
+        for duplicate_dict in duplicate_qs:
+
+            keep_id = duplicate_dict.pop( "keep_id" )
+            duplicate_dict.pop( "row_count" )
+            model_class.objects.filter( **duplicate_dict ).exclude( id = keep_id ).delete()
+
+        #-- END loop over duplicate groups --#
+
+    #-- END loop over models --#
+
+#-- END function remove_duplicate_rows() --#
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text_proquest_hnp', '0007_proquest_hnp_newspaper_archive_manifest'),
+    ]
+
+    operations = [
+        migrations.RunPython( remove_duplicate_rows, migrations.RunPython.noop ),
+        migrations.AddConstraint(
+            model_name='phnp_newspaper_archive_object_type',
+            constraint=models.UniqueConstraint(fields=('proquest_hnp_newspaper_archive', 'proquest_hnp_object_type'), name='phnp_archive_object_type_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='phnp_newspaper_object_type',
+            constraint=models.UniqueConstraint(fields=('proquest_hnp_newspaper', 'proquest_hnp_object_type'), name='phnp_paper_object_type_unique'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 2.2.4 on 2026-10-18 11:20
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_raw_value_hash( apps, schema_editor ):
+
+    '''
+    Sets raw_value_hash (SHA-256 hex digest of raw_value) on existing object
+        types and raw value synonyms.  New rows get it when saved.
+    '''
+
+    # declare variables
+    model_name = None
+    model_class = None
+    update_list = None
+    instance = None
+
+    for model_name in [ "Proquest_HNP_Object_Type", "Proquest_HNP_Object_Type_Raw_Value" ]:
+
+        model_class = apps.get_model( "context_text_proquest_hnp", model_name )
+        update_list = []
+        for instance in model_class.objects.filter( raw_value__isnull = False ).only( "id", "raw_value" ).iterator():
+
+            instance.raw_value_hash = hashlib.sha256( instance.raw_value.encode( "utf-8" ) ).hexdigest()
+            update_list.append( instance )
+
+        #-- END loop over rows --#
+
+        model_class.objects.bulk_update( update_list, [ "raw_value_hash" ], batch_size = 1000 )
+
+    #-- END loop over models --#
+
+#-- END function fill_raw_value_hash() --#
+
+
+def remove_duplicate_raw_values( apps, schema_editor ):
+
+    '''
+    Before adding the unique constraint on ( object type, raw_value_hash ),
+        remove raw value synonyms that would violate it, keeping the oldest
+        (lowest id) row in each group.
+    '''
+
+    # declare variables
+    model_class = None
+    duplicate_qs = None
+    duplicate_dict = None
+    keep_id = None
+
+    model_class = apps.get_model( "context_text_proquest_hnp", "Proquest_HNP_Object_Type_Raw_Value" )
+    duplicate_qs = model_class.objects.values( "proquest_hnp_object_type_id", "raw_value_hash" ).annotate( keep_id = models.Min( "id" ), row_count = models.Count( "id" ) ).filter( row_count__gt = 1 ).order_by()
+    for duplicate_dict in duplicate_qs:
+
+        keep_id = duplicate_dict.pop( "keep_id" )
+        duplicate_dict.pop( "row_count" )
+        model_class.objects.filter( **duplicate_dict ).exclude( id = keep_id ).delete()
+
+    #-- END loop over duplicate groups --#
+
+#-- END function remove_duplicate_raw_values() --#
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text_proquest_hnp', '0008_unique_counts_and_raw_values'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proquest_hnp_object_type',
+            name='raw_value_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='proquest_hnp_object_type_raw_value',
+            name='raw_value_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.RunPython( fill_raw_value_hash, migrations.RunPython.noop ),
+        migrations.RunPython( remove_duplicate_raw_values, migrations.RunPython.noop ),
+        migrations.AddConstraint(
+            model_name='proquest_hnp_object_type_raw_value',
+            constraint=models.UniqueConstraint(fields=('proquest_hnp_object_type', 'raw_value_hash'), name='phnp_object_type_raw_value_unique'),
+        ),
+    ]
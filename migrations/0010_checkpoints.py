@@ -0,0 +1,44 @@
+# Generated by Django 2.2.4 on 2026-10-18 12:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text_proquest_hnp', '0009_raw_value_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Proquest_HNP_Checkpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_type', models.CharField(choices=[('object_types', 'Process object types'), ('uncompress', 'Uncompress zip files')], max_length=255)),
+                ('phase', models.CharField(choices=[('archives', 'Processing archives'), ('paper', 'Storing paper totals'), ('complete', 'Complete'), ('abandoned', 'Abandoned')], default='archives', max_length=255)),
+                ('use_zip_files', models.BooleanField(default=False)),
+                ('archive_count', models.IntegerField(blank=True, null=True)),
+                ('create_date', models.DateTimeField(auto_now_add=True)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('proquest_hnp_newspaper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='context_text_proquest_hnp.Proquest_HNP_Newspaper')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PHNP_Checkpoint_Archive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archive_identifier', models.CharField(max_length=255)),
+                ('create_date', models.DateTimeField(auto_now_add=True)),
+                ('proquest_hnp_checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='context_text_proquest_hnp.Proquest_HNP_Checkpoint')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='proquest_hnp_checkpoint',
+            index=models.Index(fields=['proquest_hnp_newspaper', 'run_type', 'phase'], name='phnp_checkpoint_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='phnp_checkpoint_archive',
+            constraint=models.UniqueConstraint(fields=('proquest_hnp_checkpoint', 'archive_identifier'), name='phnp_checkpoint_archive_unique'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.4 on 2026-10-18 13:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text_proquest_hnp', '0010_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PHNP_Archive_Work_Item',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.CharField(choices=[('uncompress', 'Uncompress zip file'), ('summarize', 'Summarize object types')], max_length=255)),
+                ('archive_identifier', models.CharField(max_length=255)),
+                ('archive_path', models.TextField()),
+                ('use_zip_files', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('leased', 'Leased'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=255)),
+                ('lease_owner', models.CharField(blank=True, max_length=255, null=True)),
+                ('lease_expires', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat', models.DateTimeField(blank=True, null=True)),
+                ('attempt_count', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('create_date', models.DateTimeField(auto_now_add=True)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('proquest_hnp_newspaper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='context_text_proquest_hnp.Proquest_HNP_Newspaper')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='phnp_archive_work_item',
+            index=models.Index(fields=['proquest_hnp_newspaper', 'phase', 'status', 'lease_expires'], name='phnp_work_item_claim_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='phnp_archive_work_item',
+            constraint=models.UniqueConstraint(fields=('proquest_hnp_newspaper', 'phase', 'archive_identifier'), name='phnp_work_item_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.4 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text_proquest_hnp', '0011_archive_work_items'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='phnp_archive_work_item',
+            name='phase',
+            field=models.CharField(choices=[('uncompress', 'Uncompress zip file'), ('summarize', 'Summarize object types'), ('rollup', 'Roll up paper totals')], max_length=255),
+        ),
+    ]
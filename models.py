@@ -18,7 +18,12 @@ You should have received a copy of the GNU Lesser General Public License along w
 # ! ==> Imports
 #===============================================================================
 
+# python base imports
+import hashlib
+
+from django.db import IntegrityError
 from django.db import models
+from django.db import transaction
 from django.template.defaultfilters import slugify
 from django.utils.encoding import python_2_unicode_compatible
 
@@ -153,6 +158,30 @@ def get_dict_value( dict_IN, name_IN, default_IN = None ):
 #-- END method get_dict_value() --#
 
 
+def make_raw_value_hash( raw_value_IN ):
+    
+    '''
+    Returns the fixed-width (64 character) SHA-256 hex digest of a raw
+        ObjectType value, stored in raw_value_hash on the models that hold raw
+        values so exact-match lookups use a small index.  Look up by hash and
+        raw value together - the raw value comparison confirms the match.
+        Returns None if None passed in.
+    '''
+    
+    # return reference
+    value_OUT = None
+    
+    if ( raw_value_IN is not None ):
+    
+        value_OUT = hashlib.sha256( raw_value_IN.encode( "utf-8" ) ).hexdigest()
+        
+    #-- END check to see if value passed in --#
+    
+    return value_OUT
+
+#-- END function make_raw_value_hash() --#
+
+
 #===============================================================================
 # ! ==> Models
 #===============================================================================
@@ -173,6 +202,7 @@ class Proquest_HNP_Object_Type( Abstract_Type ):
     #description = models.TextField( blank = True )
     parent_type = models.ForeignKey( "Proquest_HNP_Object_Type", on_delete = models.SET_NULL, blank = True, null = True )
     raw_value = models.TextField( unique = True )
+    raw_value_hash = models.CharField( max_length = 64, blank = True, null = True, db_index = True )
 
 
     #----------------------------------------------------------------------
@@ -237,6 +267,17 @@ class Proquest_HNP_Object_Type( Abstract_Type ):
     #-- END method __str__() --#
 
 
+    def save( self, *args, **kwargs ):
+        
+        # keep the lookup hash in sync with raw_value.
+        self.raw_value_hash = make_raw_value_hash( self.raw_value )
+        
+        # call parent save()
+        super( Proquest_HNP_Object_Type, self ).save( *args, **kwargs )
+        
+    #-- END method save() --#
+
+
     def set_raw_value( self, value_IN ):
         
         # return reference
@@ -289,15 +330,30 @@ class Proquest_HNP_Object_Type( Abstract_Type ):
                 #     set.  If not, add it using the model
                 #     Proquest_HNP_Object_Type_Raw_Value.
                 raw_value_qs = self.raw_value_set.all()
-                raw_value_qs = raw_value_qs.filter( raw_value = value_IN )
+                raw_value_qs = raw_value_qs.filter( raw_value_hash = make_raw_value_hash( value_IN ), raw_value = value_IN )
                 raw_value_count = raw_value_qs.count()
                 if ( raw_value_count == 0 ):
                 
-                    # not a known synonym.  Add it.
-                    raw_value_instance = Proquest_HNP_Object_Type_Raw_Value()
-                    raw_value_instance.proquest_hnp_object_type = self
-                    raw_value_instance.raw_value = value_IN
-                    raw_value_instance.save()
+                    # not a known synonym.  Add it (type and raw value hash
+                    #     are unique together, so if someone else just added it,
+                    #     we're done).
+                    try:
+                    
+                        with transaction.atomic():
+                        
+                            raw_value_instance = Proquest_HNP_Object_Type_Raw_Value()
+                            raw_value_instance.proquest_hnp_object_type = self
+                            raw_value_instance.raw_value = value_IN
+                            raw_value_instance.save()
+                            
+                        #-- END with transaction.atomic() --#
+                        
+                    except IntegrityError as ie:
+                    
+                        # already added.  Move on.
+                        pass
+                        
+                    #-- END try-except --#
                     
                 else:
                 
@@ -334,6 +390,26 @@ class Proquest_HNP_Object_Type_Raw_Value( models.Model ):
 
     proquest_hnp_object_type = models.ForeignKey( Proquest_HNP_Object_Type, on_delete = models.CASCADE, related_name = "raw_value_set" )
     raw_value = models.TextField()
+    raw_value_hash = models.CharField( max_length = 64, blank = True, null = True, db_index = True )
+
+
+    #----------------------------------------------------------------------
+    # Meta
+    #----------------------------------------------------------------------
+
+
+    # Meta-data for this class.
+    class Meta:
+
+        # each synonym once per type.  raw_value is an unbounded TextField
+        #     (too long for a btree row on PostgreSQL, not indexable at all
+        #     on MySQL), so the constraint is on its hash instead.
+        constraints = [
+            models.UniqueConstraint( fields = [ 'proquest_hnp_object_type', 'raw_value_hash' ], name = 'phnp_object_type_raw_value_unique' ),
+        ]
+        
+
+    #-- END class Meta --#
 
 
     #----------------------------------------------------------------------
@@ -376,6 +452,17 @@ class Proquest_HNP_Object_Type_Raw_Value( models.Model ):
     #-- END method __str__() --#
 
 
+    def save( self, *args, **kwargs ):
+        
+        # keep the lookup hash in sync with raw_value.
+        self.raw_value_hash = make_raw_value_hash( self.raw_value )
+        
+        # call parent save()
+        super( Proquest_HNP_Object_Type_Raw_Value, self ).save( *args, **kwargs )
+        
+    #-- END method save() --#
+
+
 #= End Proquest_HNP_Object_Type_Raw_Value Model ======================================================
 
 
@@ -447,6 +534,14 @@ class Proquest_HNP_Newspaper_Archive( models.Model ):
     end_date = models.DateField( blank = True, null = True )
     notes = models.TextField( blank = True, null = True )
 
+    # manifest of archive contents as of last summary, used to skip unchanged
+    #     archives on re-runs.
+    manifest_file_count = models.IntegerField( blank = True, null = True )
+    manifest_total_bytes = models.BigIntegerField( blank = True, null = True )
+    manifest_newest_mtime_ns = models.BigIntegerField( blank = True, null = True )
+    manifest_fingerprint = models.CharField( max_length = 255, blank = True, null = True )
+    manifest_updated = models.DateTimeField( blank = True, null = True )
+
     #----------------------------------------------------------------------
     # methods
     #----------------------------------------------------------------------
@@ -512,6 +607,23 @@ class PHNP_Newspaper_Object_Type( models.Model ):
     proquest_hnp_object_type = models.ForeignKey( Proquest_HNP_Object_Type, on_delete = models.CASCADE )
     item_count = models.IntegerField()
 
+
+    #----------------------------------------------------------------------
+    # Meta
+    #----------------------------------------------------------------------
+
+
+    # Meta-data for this class.
+    class Meta:
+
+        # one count per paper and type.
+        constraints = [
+            models.UniqueConstraint( fields = [ 'proquest_hnp_newspaper', 'proquest_hnp_object_type' ], name = 'phnp_paper_object_type_unique' ),
+        ]
+        
+
+    #-- END class Meta --#
+
     #----------------------------------------------------------------------
     # methods
     #----------------------------------------------------------------------
@@ -570,6 +682,23 @@ class PHNP_Newspaper_Archive_Object_Type( models.Model ):
     proquest_hnp_object_type = models.ForeignKey( Proquest_HNP_Object_Type, on_delete = models.CASCADE )
     item_count = models.IntegerField()
 
+
+    #----------------------------------------------------------------------
+    # Meta
+    #----------------------------------------------------------------------
+
+
+    # Meta-data for this class.
+    class Meta:
+
+        # one count per archive and type.
+        constraints = [
+            models.UniqueConstraint( fields = [ 'proquest_hnp_newspaper_archive', 'proquest_hnp_object_type' ], name = 'phnp_archive_object_type_unique' ),
+        ]
+        
+
+    #-- END class Meta --#
+
     #----------------------------------------------------------------------
     # methods
     #----------------------------------------------------------------------
@@ -619,3 +748,334 @@ class PHNP_Newspaper_Archive_Object_Type( models.Model ):
 
 #= End PHNP_Newspaper_Object_Type Model ======================================================
 
+
+
+# Proquest_HNP_Checkpoint model
+@python_2_unicode_compatible
+class Proquest_HNP_Checkpoint( models.Model ):
+
+    '''
+    One run of a long per-paper process (see ProquestHNPNewspaperHelper
+        process_paper_object_types() and uncompress_paper_zip_files()), with
+        the phase it has reached, and, in PHNP_Checkpoint_Archive, the
+        archives it has finished.  A run that is not complete or abandoned is
+        resumed by the next run of the same type for the paper.
+    '''
+
+    #----------------------------------------------------------------------
+    # constants-ish
+    #----------------------------------------------------------------------
+
+
+    # run types
+    RUN_TYPE_OBJECT_TYPES = "object_types"
+    RUN_TYPE_UNCOMPRESS = "uncompress"
+    RUN_TYPE_CHOICES = (
+        ( RUN_TYPE_OBJECT_TYPES, "Process object types" ),
+        ( RUN_TYPE_UNCOMPRESS, "Uncompress zip files" ),
+    )
+
+    # phases
+    PHASE_ARCHIVES = "archives"
+    PHASE_PAPER = "paper"
+    PHASE_COMPLETE = "complete"
+    PHASE_ABANDONED = "abandoned"
+    PHASE_CHOICES = (
+        ( PHASE_ARCHIVES, "Processing archives" ),
+        ( PHASE_PAPER, "Storing paper totals" ),
+        ( PHASE_COMPLETE, "Complete" ),
+        ( PHASE_ABANDONED, "Abandoned" ),
+    )
+    
+    # phases of runs that will not be resumed.
+    CLOSED_PHASE_LIST = [ PHASE_COMPLETE, PHASE_ABANDONED ]
+
+
+    #----------------------------------------------------------------------
+    # model fields and meta
+    #----------------------------------------------------------------------
+
+
+    proquest_hnp_newspaper = models.ForeignKey( Proquest_HNP_Newspaper, on_delete = models.CASCADE )
+    run_type = models.CharField( max_length = 255, choices = RUN_TYPE_CHOICES )
+    phase = models.CharField( max_length = 255, choices = PHASE_CHOICES, default = PHASE_ARCHIVES )
+    use_zip_files = models.BooleanField( default = False )
+    archive_count = models.IntegerField( blank = True, null = True )
+    create_date = models.DateTimeField( auto_now_add = True )
+    last_modified = models.DateTimeField( auto_now = True )
+
+
+    #----------------------------------------------------------------------
+    # Meta
+    #----------------------------------------------------------------------
+
+
+    # Meta-data for this class.
+    class Meta:
+
+        # find a paper's open run of a type.
+        indexes = [
+            models.Index( fields = [ 'proquest_hnp_newspaper', 'run_type', 'phase' ], name = 'phnp_checkpoint_lookup_idx' ),
+        ]
+
+    #-- END class Meta --#
+
+
+    #----------------------------------------------------------------------
+    # methods
+    #----------------------------------------------------------------------
+
+
+    def __str__( self ):
+        
+        # return reference
+        string_OUT = ""
+        
+        # declare variables
+        prefix_string = ""
+        
+        if ( self.id ):
+        
+            # yes. output.
+            string_OUT += str( self.id )
+            prefix_string = " - "
+
+        #-- END check to see if ID --#
+
+        if ( self.proquest_hnp_newspaper ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.proquest_hnp_newspaper.paper_identifier )
+            prefix_string = " - "
+            
+        #-- END check to see if newspaper. --#
+            
+        if ( self.run_type ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.run_type )
+            prefix_string = " - "
+            
+        #-- END check to see if run_type. --#
+            
+        if ( self.phase ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.phase )
+            prefix_string = " - "
+            
+        #-- END check to see if phase. --#
+            
+        return string_OUT
+        
+    #-- END method __str__() --#
+
+
+#= End Proquest_HNP_Checkpoint Model ======================================================
+
+
+# PHNP_Checkpoint_Archive model
+@python_2_unicode_compatible
+class PHNP_Checkpoint_Archive( models.Model ):
+
+    proquest_hnp_checkpoint = models.ForeignKey( Proquest_HNP_Checkpoint, on_delete = models.CASCADE )
+    archive_identifier = models.CharField( max_length = 255 )
+    create_date = models.DateTimeField( auto_now_add = True )
+
+
+    #----------------------------------------------------------------------
+    # Meta
+    #----------------------------------------------------------------------
+
+
+    # Meta-data for this class.
+    class Meta:
+
+        # each archive is finished once per run.
+        constraints = [
+            models.UniqueConstraint( fields = [ 'proquest_hnp_checkpoint', 'archive_identifier' ], name = 'phnp_checkpoint_archive_unique' ),
+        ]
+
+    #-- END class Meta --#
+
+
+    #----------------------------------------------------------------------
+    # methods
+    #----------------------------------------------------------------------
+
+
+    def __str__( self ):
+        
+        # return reference
+        string_OUT = ""
+        
+        # declare variables
+        prefix_string = ""
+        
+        if ( self.id ):
+        
+            # yes. output.
+            string_OUT += str( self.id )
+            prefix_string = " - "
+
+        #-- END check to see if ID --#
+
+        if ( self.proquest_hnp_checkpoint_id ):
+        
+            string_OUT += "{}checkpoint {}".format( prefix_string, self.proquest_hnp_checkpoint_id )
+            prefix_string = " - "
+            
+        #-- END check to see if checkpoint. --#
+            
+        if ( self.archive_identifier ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.archive_identifier )
+            prefix_string = " - "
+            
+        #-- END check to see if archive_identifier. --#
+            
+        return string_OUT
+        
+    #-- END method __str__() --#
+
+
+#= End PHNP_Checkpoint_Archive Model ======================================================
+
+
+# PHNP_Archive_Work_Item model
+@python_2_unicode_compatible
+class PHNP_Archive_Work_Item( models.Model ):
+
+    '''
+    One archive's work for one phase, in the queue that spreads a paper's
+        archives across worker processes and hosts that share the database
+        (see ProquestHNPWorkQueue).  A worker leases an item, renews the lease
+        while it works (heartbeat), and marks the item done.  Items whose lease
+        expires are queued again, up to the queue's maximum attempts.
+    '''
+
+    #----------------------------------------------------------------------
+    # constants-ish
+    #----------------------------------------------------------------------
+
+
+    # phases - the rollup item is one per paper, leased by the worker that
+    #     rebuilds the paper totals once the summarize items are done.
+    PHASE_UNCOMPRESS = "uncompress"
+    PHASE_SUMMARIZE = "summarize"
+    PHASE_ROLLUP = "rollup"
+    PHASE_CHOICES = (
+        ( PHASE_UNCOMPRESS, "Uncompress zip file" ),
+        ( PHASE_SUMMARIZE, "Summarize object types" ),
+        ( PHASE_ROLLUP, "Roll up paper totals" ),
+    )
+    
+    # phases workers claim archives in.
+    WORKER_PHASE_LIST = [ PHASE_UNCOMPRESS, PHASE_SUMMARIZE ]
+    
+    # phase whose item for the same archive has to be done first (if there is
+    #     one), when not reading zip files.
+    PHASE_PREREQUISITE_MAP = {
+        PHASE_SUMMARIZE : PHASE_UNCOMPRESS,
+    }
+
+    # statuses
+    STATUS_QUEUED = "queued"
+    STATUS_LEASED = "leased"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        ( STATUS_QUEUED, "Queued" ),
+        ( STATUS_LEASED, "Leased" ),
+        ( STATUS_DONE, "Done" ),
+        ( STATUS_FAILED, "Failed" ),
+    )
+    STATUS_LIST = [ STATUS_QUEUED, STATUS_LEASED, STATUS_DONE, STATUS_FAILED ]
+
+
+    #----------------------------------------------------------------------
+    # model fields and meta
+    #----------------------------------------------------------------------
+
+
+    proquest_hnp_newspaper = models.ForeignKey( Proquest_HNP_Newspaper, on_delete = models.CASCADE )
+    phase = models.CharField( max_length = 255, choices = PHASE_CHOICES )
+    archive_identifier = models.CharField( max_length = 255 )
+    archive_path = models.TextField()
+    use_zip_files = models.BooleanField( default = False )
+    status = models.CharField( max_length = 255, choices = STATUS_CHOICES, default = STATUS_QUEUED )
+    lease_owner = models.CharField( max_length = 255, blank = True, null = True )
+    lease_expires = models.DateTimeField( blank = True, null = True )
+    heartbeat = models.DateTimeField( blank = True, null = True )
+    attempt_count = models.IntegerField( default = 0 )
+    error_message = models.TextField( blank = True, null = True )
+    create_date = models.DateTimeField( auto_now_add = True )
+    last_modified = models.DateTimeField( auto_now = True )
+
+
+    #----------------------------------------------------------------------
+    # Meta
+    #----------------------------------------------------------------------
+
+
+    # Meta-data for this class.
+    class Meta:
+
+        # one item per archive and phase.
+        constraints = [
+            models.UniqueConstraint( fields = [ 'proquest_hnp_newspaper', 'phase', 'archive_identifier' ], name = 'phnp_work_item_unique' ),
+        ]
+        
+        # find a phase's queued items, and its expired leases.
+        indexes = [
+            models.Index( fields = [ 'proquest_hnp_newspaper', 'phase', 'status', 'lease_expires' ], name = 'phnp_work_item_claim_idx' ),
+        ]
+
+    #-- END class Meta --#
+
+
+    #----------------------------------------------------------------------
+    # methods
+    #----------------------------------------------------------------------
+
+
+    def __str__( self ):
+        
+        # return reference
+        string_OUT = ""
+        
+        # declare variables
+        prefix_string = ""
+        
+        if ( self.id ):
+        
+            # yes. output.
+            string_OUT += str( self.id )
+            prefix_string = " - "
+
+        #-- END check to see if ID --#
+
+        if ( self.archive_identifier ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.archive_identifier )
+            prefix_string = " - "
+            
+        #-- END check to see if archive_identifier. --#
+            
+        if ( self.phase ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.phase )
+            prefix_string = " - "
+            
+        #-- END check to see if phase. --#
+            
+        if ( self.status ):
+        
+            string_OUT += "{}{}".format( prefix_string, self.status )
+            prefix_string = " - "
+            
+        #-- END check to see if status. --#
+            
+        return string_OUT
+        
+    #-- END method __str__() --#
+
+
+#= End PHNP_Archive_Work_Item Model ======================================================
@@ -0,0 +1,495 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import array
+import collections
+
+# numpy is optional - without it, the same results are computed in Python.
+try:
+
+    import numpy
+
+except ImportError as ie:
+
+    numpy = None
+
+#-- END try-except to import numpy --#
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPAggregator( object ):
+
+    '''
+    Aggregates record metadata - ( ObjectType id, NumericPubDate int ) pairs -
+        added in batches (arrays), rather than record by record.  Type IDs are
+        positions in the aggregator's type_list; batches that use their own
+        type list (an archive's ProquestHNPArchiveIndex, say) are remapped as
+        they are added.  Type ID -1 means no type, pub date 0 means no date.
+
+    Per-type counts, the pub date range, year and month histograms, and a
+        type-by-year crosstab are each a handful of vectorized operations over
+        all the rows added when numpy is installed, and the equivalent
+        collections.Counter passes when it is not.  Results are the same
+        either way.  Only the aggregation is vectorized - building the
+        batches (get_type_id() and an append per row) is still done row by
+        row, in Python, by the caller.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # missing values
+    NO_TYPE_ID = -1
+    NO_PUB_DATE = 0
+
+    # array typecode
+    TYPECODE = "i"
+
+    # summary keys
+    SUMMARY_ROW_COUNT = "row_count"
+    SUMMARY_TYPE_TO_COUNT_MAP = "type_to_count_map"
+    SUMMARY_MIN_PUB_DATE = "min_pub_date"
+    SUMMARY_MAX_PUB_DATE = "max_pub_date"
+    SUMMARY_YEAR_TO_COUNT_MAP = "year_to_count_map"
+    SUMMARY_MONTH_TO_COUNT_MAP = "month_to_count_map"
+    SUMMARY_TYPE_TO_YEAR_TO_COUNT_MAP = "type_to_year_to_count_map"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, use_numpy_IN = True ):
+
+        # declare variables
+        self.type_list = []
+        self.type_to_id_map = {}
+        self.type_id_array = array.array( self.TYPECODE )
+        self.pub_date_array = array.array( self.TYPECODE )
+
+        # only use numpy if it is installed.
+        self.use_numpy = ( ( use_numpy_IN == True ) and ( numpy is not None ) )
+
+    #-- END method __init__() --#
+
+
+    def __len__( self ):
+
+        return len( self.type_id_array )
+
+    #-- END method __len__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_batch( self, type_id_array_IN, pub_date_array_IN, type_list_IN = None ):
+
+        '''
+        Adds a batch of rows: parallel sequences of type IDs and pub date ints.
+            If type_list_IN is passed in, the type IDs are positions in it, and
+            are remapped to this aggregator's IDs; otherwise they must already
+            be this aggregator's (see get_type_id()).
+        '''
+
+        # declare variables
+        id_map_list = None
+        object_type = None
+        type_id = None
+
+        if ( len( type_id_array_IN ) != len( pub_date_array_IN ) ):
+
+            raise ValueError( "type ID and pub date batches are different lengths ( {} and {} )".format( len( type_id_array_IN ), len( pub_date_array_IN ) ) )
+
+        #-- END check to see if lengths match --#
+
+        if ( type_list_IN is not None ):
+
+            # map batch's IDs to ours - last slot maps -1 to -1.
+            id_map_list = [ self.get_type_id( object_type ) for object_type in type_list_IN ]
+            id_map_list.append( self.NO_TYPE_ID )
+            if ( self.use_numpy == True ):
+
+                self.type_id_array.frombytes( numpy.asarray( id_map_list, dtype = numpy.int32 )[ numpy.asarray( type_id_array_IN, dtype = numpy.int64 ) ].astype( numpy.int32 ).tobytes() )
+
+            else:
+
+                self.type_id_array.extend( id_map_list[ type_id ] for type_id in type_id_array_IN )
+
+            #-- END check to see if numpy --#
+
+        else:
+
+            self.type_id_array.extend( type_id_array_IN )
+
+        #-- END check to see if type list passed in --#
+
+        self.pub_date_array.extend( pub_date_array_IN )
+
+    #-- END method add_batch() --#
+
+
+    def add_index( self, archive_index_IN ):
+
+        '''
+        Adds all the rows in a ProquestHNPArchiveIndex.
+        '''
+
+        self.add_batch( archive_index_IN.get_column( archive_index_IN.COLUMN_TYPE_ID ),
+                        archive_index_IN.get_column( archive_index_IN.COLUMN_PUB_DATE ),
+                        type_list_IN = archive_index_IN.type_list )
+
+    #-- END method add_index() --#
+
+
+    def count_keys( self, key_array_IN ):
+
+        '''
+        Returns a dictionary of int key to number of occurrences in the array
+            passed in (a numpy array if use_numpy, else any iterable).
+        '''
+
+        # return reference
+        key_to_count_map_OUT = None
+
+        # declare variables
+        key_array = None
+        count_array = None
+
+        if ( self.use_numpy == True ):
+
+            key_array, count_array = numpy.unique( key_array_IN, return_counts = True )
+            key_to_count_map_OUT = dict( zip( key_array.tolist(), count_array.tolist() ) )
+
+        else:
+
+            key_to_count_map_OUT = dict( collections.Counter( key_array_IN ) )
+
+        #-- END check to see if numpy --#
+
+        return key_to_count_map_OUT
+
+    #-- END method count_keys() --#
+
+
+    def get_dated_arrays( self ):
+
+        '''
+        Returns a tuple of ( type IDs, pub dates ) for the rows that have a pub
+            date - numpy arrays if use_numpy, else lists.
+        '''
+
+        # return reference
+        array_tuple_OUT = None
+
+        # declare variables
+        type_id_array = None
+        pub_date_array = None
+        is_dated_array = None
+        row_index_list = None
+        row_index = None
+
+        if ( self.use_numpy == True ):
+
+            type_id_array = numpy.frombuffer( self.type_id_array, dtype = numpy.int32 ) if ( len( self.type_id_array ) > 0 ) else numpy.zeros( 0, dtype = numpy.int32 )
+            pub_date_array = numpy.frombuffer( self.pub_date_array, dtype = numpy.int32 ) if ( len( self.pub_date_array ) > 0 ) else numpy.zeros( 0, dtype = numpy.int32 )
+            is_dated_array = ( pub_date_array != self.NO_PUB_DATE )
+            array_tuple_OUT = ( type_id_array[ is_dated_array ], pub_date_array[ is_dated_array ] )
+
+        else:
+
+            row_index_list = [ row_index for row_index, pub_date in enumerate( self.pub_date_array ) if pub_date != self.NO_PUB_DATE ]
+            array_tuple_OUT = ( [ self.type_id_array[ row_index ] for row_index in row_index_list ],
+                                [ self.pub_date_array[ row_index ] for row_index in row_index_list ] )
+
+        #-- END check to see if numpy --#
+
+        return array_tuple_OUT
+
+    #-- END method get_dated_arrays() --#
+
+
+    def get_month_histogram( self ):
+
+        '''
+        Returns a map of month (int, YYYYMM) to number of rows published that
+            month.  Rows with no pub date are not counted.
+        '''
+
+        # return reference
+        month_to_count_map_OUT = None
+
+        # declare variables
+        pub_date_array = None
+        pub_date = None
+
+        pub_date_array = self.get_dated_arrays()[ 1 ]
+        if ( self.use_numpy == True ):
+
+            month_to_count_map_OUT = self.count_keys( pub_date_array // 100 )
+
+        else:
+
+            month_to_count_map_OUT = self.count_keys( pub_date // 100 for pub_date in pub_date_array )
+
+        #-- END check to see if numpy --#
+
+        return month_to_count_map_OUT
+
+    #-- END method get_month_histogram() --#
+
+
+    def get_pub_date_range( self ):
+
+        '''
+        Returns a tuple of min and max pub date ints, or ( None, None ) if no
+            rows have a pub date.
+        '''
+
+        # return reference
+        range_OUT = None
+
+        # declare variables
+        pub_date_array = None
+
+        range_OUT = ( None, None )
+        pub_date_array = self.get_dated_arrays()[ 1 ]
+        if ( len( pub_date_array ) > 0 ):
+
+            if ( self.use_numpy == True ):
+
+                range_OUT = ( int( pub_date_array.min() ), int( pub_date_array.max() ) )
+
+            else:
+
+                range_OUT = ( min( pub_date_array ), max( pub_date_array ) )
+
+            #-- END check to see if numpy --#
+
+        #-- END check to see if any dates --#
+
+        return range_OUT
+
+    #-- END method get_pub_date_range() --#
+
+
+    def get_summary( self ):
+
+        '''
+        Returns a dictionary with the row count and every aggregate: type
+            counts, pub date range, year and month histograms, and the
+            type-by-year crosstab.
+        '''
+
+        # return reference
+        summary_dict_OUT = None
+
+        # declare variables
+        min_pub_date = None
+        max_pub_date = None
+
+        min_pub_date, max_pub_date = self.get_pub_date_range()
+
+        summary_dict_OUT = {}
+        summary_dict_OUT[ self.SUMMARY_ROW_COUNT ] = len( self )
+        summary_dict_OUT[ self.SUMMARY_TYPE_TO_COUNT_MAP ] = self.get_type_counts()
+        summary_dict_OUT[ self.SUMMARY_MIN_PUB_DATE ] = min_pub_date
+        summary_dict_OUT[ self.SUMMARY_MAX_PUB_DATE ] = max_pub_date
+        summary_dict_OUT[ self.SUMMARY_YEAR_TO_COUNT_MAP ] = self.get_year_histogram()
+        summary_dict_OUT[ self.SUMMARY_MONTH_TO_COUNT_MAP ] = self.get_month_histogram()
+        summary_dict_OUT[ self.SUMMARY_TYPE_TO_YEAR_TO_COUNT_MAP ] = self.get_type_by_year_crosstab()
+
+        return summary_dict_OUT
+
+    #-- END method get_summary() --#
+
+
+    def get_type_by_year_crosstab( self ):
+
+        '''
+        Returns a map of ObjectType value to a map of year to number of rows of
+            that type published that year.  Rows with no type or no pub date
+            are not counted.
+        '''
+
+        # return reference
+        type_to_year_to_count_map_OUT = None
+
+        # declare variables
+        type_id_array = None
+        pub_date_array = None
+        has_type_array = None
+        key_to_count_map = None
+        key = None
+        key_count = None
+        type_id = None
+        year = None
+        pub_date = None
+
+        # one key per ( type, year ): type ID * 10000 + year.
+        type_id_array, pub_date_array = self.get_dated_arrays()
+        if ( self.use_numpy == True ):
+
+            has_type_array = ( type_id_array != self.NO_TYPE_ID )
+            key_to_count_map = self.count_keys( ( type_id_array[ has_type_array ].astype( numpy.int64 ) * 10000 ) + ( pub_date_array[ has_type_array ] // 10000 ) )
+
+        else:
+
+            key_to_count_map = self.count_keys( ( type_id * 10000 ) + ( pub_date // 10000 ) for type_id, pub_date in zip( type_id_array, pub_date_array ) if type_id != self.NO_TYPE_ID )
+
+        #-- END check to see if numpy --#
+
+        type_to_year_to_count_map_OUT = {}
+        for key, key_count in key_to_count_map.items():
+
+            type_id, year = divmod( key, 10000 )
+            type_to_year_to_count_map_OUT.setdefault( self.type_list[ type_id ], {} )[ year ] = key_count
+
+        #-- END loop over keys --#
+
+        return type_to_year_to_count_map_OUT
+
+    #-- END method get_type_by_year_crosstab() --#
+
+
+    def get_type_counts( self ):
+
+        '''
+        Returns a map of ObjectType value to number of rows of that type.
+            Rows with no type are not counted.
+        '''
+
+        # return reference
+        type_to_count_map_OUT = None
+
+        # declare variables
+        type_id_array = None
+        count_array = None
+        type_id_to_count_map = None
+        type_id = None
+        type_count = None
+
+        type_to_count_map_OUT = {}
+        if ( self.use_numpy == True ):
+
+            if ( len( self.type_id_array ) > 0 ):
+
+                type_id_array = numpy.frombuffer( self.type_id_array, dtype = numpy.int32 )
+                count_array = numpy.bincount( type_id_array[ type_id_array != self.NO_TYPE_ID ], minlength = len( self.type_list ) )
+                for type_id in numpy.flatnonzero( count_array ).tolist():
+
+                    type_to_count_map_OUT[ self.type_list[ type_id ] ] = int( count_array[ type_id ] )
+
+                #-- END loop over types with counts --#
+
+            #-- END check to see if any rows --#
+
+        else:
+
+            type_id_to_count_map = collections.Counter( self.type_id_array )
+            for type_id, type_count in type_id_to_count_map.items():
+
+                if ( type_id != self.NO_TYPE_ID ):
+
+                    type_to_count_map_OUT[ self.type_list[ type_id ] ] = type_count
+
+                #-- END check to see if type --#
+
+            #-- END loop over type counts --#
+
+        #-- END check to see if numpy --#
+
+        return type_to_count_map_OUT
+
+    #-- END method get_type_counts() --#
+
+
+    def get_type_id( self, object_type_IN ):
+
+        '''
+        Returns this aggregator's type ID for an ObjectType value, adding it if
+            new.  Returns NO_TYPE_ID for None or "".
+        '''
+
+        # return reference
+        type_id_OUT = None
+
+        if ( ( object_type_IN is None ) or ( object_type_IN == "" ) ):
+
+            type_id_OUT = self.NO_TYPE_ID
+
+        else:
+
+            type_id_OUT = self.type_to_id_map.get( object_type_IN, None )
+            if ( type_id_OUT is None ):
+
+                type_id_OUT = len( self.type_list )
+                self.type_list.append( object_type_IN )
+                self.type_to_id_map[ object_type_IN ] = type_id_OUT
+
+            #-- END check to see if new type --#
+
+        #-- END check to see if type passed in --#
+
+        return type_id_OUT
+
+    #-- END method get_type_id() --#
+
+
+    def get_year_histogram( self ):
+
+        '''
+        Returns a map of year (int) to number of rows published that year.
+            Rows with no pub date are not counted.
+        '''
+
+        # return reference
+        year_to_count_map_OUT = None
+
+        # declare variables
+        pub_date_array = None
+        pub_date = None
+
+        pub_date_array = self.get_dated_arrays()[ 1 ]
+        if ( self.use_numpy == True ):
+
+            year_to_count_map_OUT = self.count_keys( pub_date_array // 10000 )
+
+        else:
+
+            year_to_count_map_OUT = self.count_keys( pub_date // 10000 for pub_date in pub_date_array )
+
+        #-- END check to see if numpy --#
+
+        return year_to_count_map_OUT
+
+    #-- END method get_year_histogram() --#
+
+
+#-- END class ProquestHNPAggregator --#
@@ -0,0 +1,604 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import array
+import json
+import os
+import sys
+import tempfile
+
+#===============================================================================
+# constants
+#===============================================================================
+
+
+# process umask, read once at import (os.umask() can only be read by setting
+#     it, which is not safe once other threads are creating files).
+CURRENT_UMASK = os.umask( 0 )
+os.umask( CURRENT_UMASK )
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPArchiveIndex( object ):
+
+    '''
+    Columnar index of the Record XML files in one archive, built while the
+        archive is summarized so later counts and filters do not need to
+        re-read the XML.  One row per Record file, in columns held in
+        array.array instances:
+        
+        - record_id - RecordID, as int (-1 if missing or not numeric).
+        - type_id - position of the file's ObjectType value (multiple values
+            joined with "|") in type_list (-1 if none).
+        - pub_date - NumericPubDate, as int YYYYMMDD (0 if missing).
+        - byte_size - size of the XML file, uncompressed.
+        - name - file path (folder) or member name (zip), kept as a list.
+        
+    Saved to a single file: a magic line, a JSON header line (version,
+        row count, type list, column typecodes and byte lengths, byte order,
+        and the archive manifest it was built from), then each array's bytes,
+        then the names, UTF-8, newline-separated.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # file format
+    FILE_MAGIC = b"PHNPIDX1\n"
+    FILE_VERSION = 1
+    FILE_NAME_FORMAT = ".{}.phnp-index"
+    FILE_NAME_SEPARATOR = "\n"
+    FILE_MODE = 0o666
+
+    # columns
+    COLUMN_RECORD_ID = "record_id"
+    COLUMN_TYPE_ID = "type_id"
+    COLUMN_PUB_DATE = "pub_date"
+    COLUMN_BYTE_SIZE = "byte_size"
+    COLUMN_NAME = "name"
+    COLUMN_TO_TYPECODE_MAP = {
+        COLUMN_RECORD_ID : "q",
+        COLUMN_TYPE_ID : "i",
+        COLUMN_PUB_DATE : "i",
+        COLUMN_BYTE_SIZE : "q",
+    }
+    ARRAY_COLUMN_LIST = [ COLUMN_RECORD_ID, COLUMN_TYPE_ID, COLUMN_PUB_DATE, COLUMN_BYTE_SIZE ]
+
+    # row dictionary keys, in addition to column names
+    ROW_OBJECT_TYPE = "object_type"
+
+    # missing values
+    NO_RECORD_ID = -1
+    NO_TYPE_ID = -1
+    NO_PUB_DATE = 0
+
+    # header keys
+    HEADER_VERSION = "version"
+    HEADER_ROW_COUNT = "row_count"
+    HEADER_TYPE_LIST = "type_list"
+    HEADER_COLUMNS = "columns"
+    HEADER_BYTE_ORDER = "byte_order"
+    HEADER_NAME_BYTES = "name_bytes"
+    HEADER_MANIFEST = "manifest"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def get_index_file_path( cls, archive_path_IN, index_folder_path_IN = None ):
+
+        '''
+        Returns the path of the index file for an archive folder or archive
+            .zip file: a hidden file named for the archive folder or zip file
+            (".<identifier>.phnp-index" or ".<identifier>.zip.phnp-index", so
+            the two can share a folder), in index_folder_path_IN if passed
+            in, else next to the archive.
+        '''
+
+        # return reference
+        path_OUT = None
+
+        # declare variables
+        parent_folder_path = None
+        archive_name = None
+
+        parent_folder_path, archive_name = os.path.split( archive_path_IN.rstrip( "/" ) )
+        if ( ( index_folder_path_IN is not None ) and ( index_folder_path_IN != "" ) ):
+
+            parent_folder_path = index_folder_path_IN
+
+        #-- END check to see if index folder passed in --#
+
+        path_OUT = os.path.join( parent_folder_path, cls.FILE_NAME_FORMAT.format( archive_name ) )
+
+        return path_OUT
+
+    #-- END class method get_index_file_path() --#
+
+
+    @classmethod
+    def load( cls, index_file_path_IN ):
+
+        '''
+        Loads and returns the index saved at index_file_path_IN.  Returns None
+            if there is no file there.  Raises ValueError if the file is not an
+            index this version can read.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        index_file = None
+        header_dict = None
+        column_name = None
+        column_array = None
+        typecode = None
+        byte_count = None
+        name_bytes = None
+
+        if ( os.path.exists( index_file_path_IN ) == True ):
+
+            with open( index_file_path_IN, "rb" ) as index_file:
+
+                # check format
+                if ( index_file.readline() != cls.FILE_MAGIC ):
+
+                    raise ValueError( "Not a ProQuest HNP archive index: {}".format( index_file_path_IN ) )
+
+                #-- END check magic --#
+
+                header_dict = json.loads( index_file.readline().decode( "utf-8" ) )
+                if ( header_dict.get( cls.HEADER_VERSION, None ) != cls.FILE_VERSION ):
+
+                    raise ValueError( "Unsupported ProQuest HNP archive index version {}: {}".format( header_dict.get( cls.HEADER_VERSION, None ), index_file_path_IN ) )
+
+                #-- END check version --#
+
+                instance_OUT = cls()
+                instance_OUT.type_list = header_dict[ cls.HEADER_TYPE_LIST ]
+                instance_OUT.type_to_id_map = { type_value : type_id for type_id, type_value in enumerate( instance_OUT.type_list ) }
+                instance_OUT.manifest_dict = header_dict.get( cls.HEADER_MANIFEST, None )
+
+                # arrays
+                for column_name in cls.ARRAY_COLUMN_LIST:
+
+                    typecode, byte_count = header_dict[ cls.HEADER_COLUMNS ][ column_name ]
+                    column_array = array.array( typecode )
+                    column_array.frombytes( index_file.read( byte_count ) )
+                    if ( header_dict[ cls.HEADER_BYTE_ORDER ] != sys.byteorder ):
+
+                        column_array.byteswap()
+
+                    #-- END check to see if byte order matches --#
+
+                    instance_OUT.column_to_array_map[ column_name ] = column_array
+
+                #-- END loop over array columns --#
+
+                # names
+                name_bytes = index_file.read( header_dict[ cls.HEADER_NAME_BYTES ] )
+                instance_OUT.name_list = []
+                if ( header_dict[ cls.HEADER_ROW_COUNT ] > 0 ):
+
+                    instance_OUT.name_list = name_bytes.decode( "utf-8" ).split( cls.FILE_NAME_SEPARATOR )
+
+                #-- END check to see if any rows --#
+
+            #-- END with open( index_file_path_IN ) --#
+
+        #-- END check to see if file exists --#
+
+        return instance_OUT
+
+    #-- END class method load() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # declare variables
+        self.column_to_array_map = {}
+        self.name_list = []
+        self.type_list = []
+        self.type_to_id_map = {}
+        self.manifest_dict = None
+
+        # init
+        for column_name in self.ARRAY_COLUMN_LIST:
+
+            self.column_to_array_map[ column_name ] = array.array( self.COLUMN_TO_TYPECODE_MAP[ column_name ] )
+
+        #-- END loop over array columns --#
+
+    #-- END method __init__() --#
+
+
+    def __len__( self ):
+
+        return len( self.name_list )
+
+    #-- END method __len__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_record( self, name_IN, byte_size_IN, record_id_IN = None, object_type_IN = None, pub_date_int_IN = None ):
+
+        '''
+        Appends a row for a Record file.  record_id_IN can be an int or a
+            string (non-numeric values are stored as NO_RECORD_ID).
+        '''
+
+        # declare variables
+        record_id = None
+
+        # record ID
+        record_id = self.NO_RECORD_ID
+        if ( record_id_IN is not None ):
+
+            try:
+
+                record_id = int( record_id_IN )
+
+            except ValueError as ve:
+
+                record_id = self.NO_RECORD_ID
+
+            #-- END try-except --#
+
+        #-- END check to see if record ID --#
+
+        self.column_to_array_map[ self.COLUMN_RECORD_ID ].append( record_id )
+        self.column_to_array_map[ self.COLUMN_TYPE_ID ].append( self.get_type_id( object_type_IN ) )
+        self.column_to_array_map[ self.COLUMN_PUB_DATE ].append( pub_date_int_IN if ( pub_date_int_IN is not None ) else self.NO_PUB_DATE )
+        self.column_to_array_map[ self.COLUMN_BYTE_SIZE ].append( byte_size_IN if ( byte_size_IN is not None ) else 0 )
+        self.name_list.append( name_IN )
+
+    #-- END method add_record() --#
+
+
+    def count_by_type( self, row_index_list_IN = None ):
+
+        '''
+        Returns a map of ObjectType value to number of rows, for all rows or
+            for the row indexes passed in (see select()).  Rows with no type
+            are not counted.
+        '''
+
+        # return reference
+        type_to_count_map_OUT = None
+
+        # declare variables
+        type_id_array = None
+        id_to_count_map = None
+        type_id = None
+        row_index = None
+        type_count = None
+
+        type_id_array = self.column_to_array_map[ self.COLUMN_TYPE_ID ]
+        id_to_count_map = {}
+        if ( row_index_list_IN is None ):
+
+            for type_id in type_id_array:
+
+                id_to_count_map[ type_id ] = id_to_count_map.get( type_id, 0 ) + 1
+
+            #-- END loop over type IDs --#
+
+        else:
+
+            for row_index in row_index_list_IN:
+
+                type_id = type_id_array[ row_index ]
+                id_to_count_map[ type_id ] = id_to_count_map.get( type_id, 0 ) + 1
+
+            #-- END loop over rows --#
+
+        #-- END check to see if row list passed in --#
+
+        type_to_count_map_OUT = {}
+        for type_id, type_count in id_to_count_map.items():
+
+            if ( type_id != self.NO_TYPE_ID ):
+
+                type_to_count_map_OUT[ self.type_list[ type_id ] ] = type_count
+
+            #-- END check to see if type --#
+
+        #-- END loop over counts --#
+
+        return type_to_count_map_OUT
+
+    #-- END method count_by_type() --#
+
+
+    def get_column( self, column_name_IN ):
+
+        '''
+        Returns the array (or, for "name", the list) for a column.
+        '''
+
+        # return reference
+        column_OUT = None
+
+        if ( column_name_IN == self.COLUMN_NAME ):
+
+            column_OUT = self.name_list
+
+        else:
+
+            column_OUT = self.column_to_array_map[ column_name_IN ]
+
+        #-- END check to see which column --#
+
+        return column_OUT
+
+    #-- END method get_column() --#
+
+
+    def get_pub_date_range( self ):
+
+        '''
+        Returns a tuple of min and max NumericPubDate (ints), ignoring rows
+            with no date, or ( None, None ) if no rows have dates.
+        '''
+
+        # return reference
+        range_OUT = None
+
+        # declare variables
+        pub_date_list = None
+
+        pub_date_list = [ pub_date for pub_date in self.column_to_array_map[ self.COLUMN_PUB_DATE ] if pub_date != self.NO_PUB_DATE ]
+        if ( len( pub_date_list ) > 0 ):
+
+            range_OUT = ( min( pub_date_list ), max( pub_date_list ) )
+
+        else:
+
+            range_OUT = ( None, None )
+
+        #-- END check to see if any dates --#
+
+        return range_OUT
+
+    #-- END method get_pub_date_range() --#
+
+
+    def get_row( self, row_index_IN ):
+
+        '''
+        Returns a dictionary of column name to value for a row, plus the
+            row's ObjectType value in "object_type" (None if no type).
+        '''
+
+        # return reference
+        row_dict_OUT = None
+
+        # declare variables
+        type_id = None
+
+        type_id = self.column_to_array_map[ self.COLUMN_TYPE_ID ][ row_index_IN ]
+
+        row_dict_OUT = {}
+        row_dict_OUT[ self.COLUMN_RECORD_ID ] = self.column_to_array_map[ self.COLUMN_RECORD_ID ][ row_index_IN ]
+        row_dict_OUT[ self.COLUMN_TYPE_ID ] = type_id
+        row_dict_OUT[ self.ROW_OBJECT_TYPE ] = self.type_list[ type_id ] if ( type_id != self.NO_TYPE_ID ) else None
+        row_dict_OUT[ self.COLUMN_PUB_DATE ] = self.column_to_array_map[ self.COLUMN_PUB_DATE ][ row_index_IN ]
+        row_dict_OUT[ self.COLUMN_BYTE_SIZE ] = self.column_to_array_map[ self.COLUMN_BYTE_SIZE ][ row_index_IN ]
+        row_dict_OUT[ self.COLUMN_NAME ] = self.name_list[ row_index_IN ]
+
+        return row_dict_OUT
+
+    #-- END method get_row() --#
+
+
+    def get_type_id( self, object_type_IN ):
+
+        '''
+        Returns the index's type ID for an ObjectType value, adding it to
+            type_list if new.  Returns NO_TYPE_ID for None or "".
+        '''
+
+        # return reference
+        type_id_OUT = None
+
+        if ( ( object_type_IN is None ) or ( object_type_IN == "" ) ):
+
+            type_id_OUT = self.NO_TYPE_ID
+
+        else:
+
+            type_id_OUT = self.type_to_id_map.get( object_type_IN, None )
+            if ( type_id_OUT is None ):
+
+                type_id_OUT = len( self.type_list )
+                self.type_list.append( object_type_IN )
+                self.type_to_id_map[ object_type_IN ] = type_id_OUT
+
+            #-- END check to see if new type --#
+
+        #-- END check to see if type passed in --#
+
+        return type_id_OUT
+
+    #-- END method get_type_id() --#
+
+
+    def save( self, index_file_path_IN ):
+
+        '''
+        Writes the index to index_file_path_IN, atomically (written to a
+            temporary file in the same folder, then renamed into place).  The
+            file gets the usual mode for a new file under the process umask
+            (mkstemp() makes it 0600, which other users' workers can't read).
+        '''
+
+        # declare variables
+        name_bytes = None
+        header_dict = None
+        column_name = None
+        column_array = None
+        file_descriptor = None
+        temp_file_path = None
+        index_file = None
+
+        name_bytes = self.FILE_NAME_SEPARATOR.join( self.name_list ).encode( "utf-8" )
+
+        # header
+        header_dict = {}
+        header_dict[ self.HEADER_VERSION ] = self.FILE_VERSION
+        header_dict[ self.HEADER_ROW_COUNT ] = len( self.name_list )
+        header_dict[ self.HEADER_TYPE_LIST ] = self.type_list
+        header_dict[ self.HEADER_BYTE_ORDER ] = sys.byteorder
+        header_dict[ self.HEADER_NAME_BYTES ] = len( name_bytes )
+        header_dict[ self.HEADER_MANIFEST ] = self.manifest_dict
+        header_dict[ self.HEADER_COLUMNS ] = {}
+        for column_name in self.ARRAY_COLUMN_LIST:
+
+            column_array = self.column_to_array_map[ column_name ]
+            header_dict[ self.HEADER_COLUMNS ][ column_name ] = [ column_array.typecode, len( column_array ) * column_array.itemsize ]
+
+        #-- END loop over array columns --#
+
+        # write to temp file, then rename.
+        file_descriptor, temp_file_path = tempfile.mkstemp( prefix = ".phnp-index-", dir = os.path.dirname( os.path.abspath( index_file_path_IN ) ) )
+        try:
+
+            with os.fdopen( file_descriptor, "wb" ) as index_file:
+
+                index_file.write( self.FILE_MAGIC )
+                index_file.write( ( json.dumps( header_dict ) + "\n" ).encode( "utf-8" ) )
+                for column_name in self.ARRAY_COLUMN_LIST:
+
+                    self.column_to_array_map[ column_name ].tofile( index_file )
+
+                #-- END loop over array columns --#
+
+                index_file.write( name_bytes )
+
+            #-- END with os.fdopen() --#
+
+            os.chmod( temp_file_path, self.FILE_MODE & ~CURRENT_UMASK )
+            os.replace( temp_file_path, index_file_path_IN )
+
+        except Exception as e:
+
+            # clean up, then pass it on.
+            if ( os.path.exists( temp_file_path ) == True ):
+
+                os.remove( temp_file_path )
+
+            #-- END check to see if temp file exists --#
+
+            raise
+
+        #-- END try-except --#
+
+    #-- END method save() --#
+
+
+    def select( self, object_type_list_IN = None, start_pub_date_int_IN = None, end_pub_date_int_IN = None ):
+
+        '''
+        Returns the list of row indexes that match all the filters passed in:
+            ObjectType value in object_type_list_IN, and NumericPubDate between
+            start_pub_date_int_IN and end_pub_date_int_IN (ints, YYYYMMDD,
+            inclusive).  Filters left as None are not applied.
+        '''
+
+        # return reference
+        row_index_list_OUT = None
+
+        # declare variables
+        type_id_set = None
+        object_type = None
+        type_id_array = None
+        pub_date_array = None
+        row_index = None
+        pub_date = None
+
+        # turn types into IDs.
+        if ( object_type_list_IN is not None ):
+
+            type_id_set = set()
+            for object_type in object_type_list_IN:
+
+                if ( object_type in self.type_to_id_map ):
+
+                    type_id_set.add( self.type_to_id_map[ object_type ] )
+
+                #-- END check to see if type in index --#
+
+            #-- END loop over types --#
+
+        #-- END check to see if types passed in --#
+
+        type_id_array = self.column_to_array_map[ self.COLUMN_TYPE_ID ]
+        pub_date_array = self.column_to_array_map[ self.COLUMN_PUB_DATE ]
+        row_index_list_OUT = []
+        for row_index in range( len( type_id_array ) ):
+
+            if ( ( type_id_set is not None ) and ( type_id_array[ row_index ] not in type_id_set ) ):
+
+                continue
+
+            #-- END check type --#
+
+            pub_date = pub_date_array[ row_index ]
+            if ( ( start_pub_date_int_IN is not None ) and ( ( pub_date == self.NO_PUB_DATE ) or ( pub_date < start_pub_date_int_IN ) ) ):
+
+                continue
+
+            #-- END check start date --#
+
+            if ( ( end_pub_date_int_IN is not None ) and ( ( pub_date == self.NO_PUB_DATE ) or ( pub_date > end_pub_date_int_IN ) ) ):
+
+                continue
+
+            #-- END check end date --#
+
+            row_index_list_OUT.append( row_index )
+
+        #-- END loop over rows --#
+
+        return row_index_list_OUT
+
+    #-- END method select() --#
+
+
+#-- END class ProquestHNPArchiveIndex --#
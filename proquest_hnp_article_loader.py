@@ -0,0 +1,733 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import datetime
+import os
+import time
+import zipfile
+
+# django imports
+from django.db import transaction
+
+# context_text imports
+from context_text.models import Article
+from context_text.models import Article_Text
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.proquest_hnp_metrics import MeteredReader
+from context_text_proquest_hnp.proquest_hnp_metrics import ProquestHNPMetrics
+from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+from context_text_proquest_hnp.proquest_hnp_record_id_set import ProquestHNPRecordIdSet
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPArticleLoader( object ):
+
+    '''
+    Streams the Record XML files for a paper (archive folders, or straight
+        from the archive .zip files) into context_text Article and
+        Article_Text rows for the paper's context_text Newspaper.
+
+        - Records can be limited to a list of ObjectType values and a range of
+            NumericPubDates.  If an archive has a current
+            ProquestHNPArchiveIndex (written when it was summarized), only the
+            matching files are opened.  Otherwise every file is parsed and
+            filtered.
+        - Articles are queued and written batch_size at a time with
+            bulk_create(), each batch in its own transaction, so memory is
+            bounded by the batch size, not the paper.
+        - Articles are identified by newspaper, archive_source, and archive_id
+            (the RecordID).  Records already loaded are skipped, so a load can
+            be re-run after it fails part way through.
+        - The RecordIDs already loaded and those seen so far are kept in
+            ProquestHNPRecordIdSets, so a Record that was loaded before, or
+            that is in more than one archive (re-issued deliveries), is
+            skipped before it is parsed when the archive has an index, and
+            before it is queued when it does not.
+
+        Article_Text rows are created directly with bulk_create(), so
+        Article_Text.set_text()'s cleanup is not applied to the content.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # Article.archive_source for articles loaded from HNP.
+    ARCHIVE_SOURCE = "ProQuest HNP"
+
+    # default number of articles per bulk_create() batch.
+    DEFAULT_BATCH_SIZE = 500
+
+    # Record fields (element paths relative to <Record>)
+    RECORD_FIELD_RECORD_TITLE = "RecordTitle"
+    RECORD_FIELD_AUTHOR = "Contributor/OriginalForm"
+    RECORD_FIELD_START_PAGE = "StartPage"
+    RECORD_FIELD_URL_DOC_VIEW = "URLDocView"
+    RECORD_FIELD_COPYRIGHT = "Copyright"
+    RECORD_FIELD_FULL_TEXT = "FullText"
+    RECORD_ARTICLE_FIELD_LIST = ProquestHNPNewspaperHelper.RECORD_SUMMARY_FIELD_LIST + [
+        RECORD_FIELD_RECORD_TITLE,
+        RECORD_FIELD_AUTHOR,
+        RECORD_FIELD_START_PAGE,
+        RECORD_FIELD_URL_DOC_VIEW,
+        RECORD_FIELD_COPYRIGHT,
+        RECORD_FIELD_FULL_TEXT
+    ]
+
+    # separator between multiple authors in Article.author_string
+    AUTHOR_STRING_SEPARATOR = "; "
+
+    # status counts (see get_status_map())
+    STATUS_RECORDS = "records"
+    STATUS_CREATED = "created"
+    STATUS_SKIPPED_FILTERED = "skipped_filtered"
+    STATUS_SKIPPED_EXISTING = "skipped_existing"
+    STATUS_SKIPPED_DUPLICATE = "skipped_duplicate"
+    STATUS_SKIPPED_INVALID = "skipped_invalid"
+    STATUS_LIST = [ STATUS_RECORDS, STATUS_CREATED, STATUS_SKIPPED_FILTERED, STATUS_SKIPPED_EXISTING, STATUS_SKIPPED_DUPLICATE, STATUS_SKIPPED_INVALID ]
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self,
+                  newspaper_helper_IN,
+                  object_type_list_IN = None,
+                  start_pub_date_int_IN = None,
+                  end_pub_date_int_IN = None,
+                  batch_size_IN = DEFAULT_BATCH_SIZE ):
+
+        # declare variables
+        self.newspaper_helper = newspaper_helper_IN
+        self.metrics = newspaper_helper_IN.metrics
+
+        # filters - ObjectType values ("|"-joined, as in summaries), and
+        #     NumericPubDate range (ints, YYYYMMDD, inclusive).  None = all.
+        self.object_type_set = None
+        if ( object_type_list_IN is not None ):
+
+            self.object_type_set = set( object_type_list_IN )
+
+        #-- END check to see if type filter --#
+
+        self.start_pub_date_int = start_pub_date_int_IN
+        self.end_pub_date_int = end_pub_date_int_IN
+
+        # writing
+        self.batch_size = max( batch_size_IN, 1 )
+        self.pending_article_list = []
+        self.newspaper = None
+
+        # RecordIDs already loaded for the newspaper (see load_paper()), and
+        #     RecordIDs seen so far in this load.
+        self.existing_record_id_set = ProquestHNPRecordIdSet()
+        self.seen_record_id_set = ProquestHNPRecordIdSet()
+
+        # status counts
+        self.status_to_count_map = None
+        self.reset_status()
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def build_article( self, record_field_map_IN ):
+
+        '''
+        Accepts a map of Record field to value list (see
+            ProquestHNPNewspaperHelper.extract_record_fields() and
+            RECORD_ARTICLE_FIELD_LIST) and returns a tuple of an unsaved
+            Article and the Record's full text (None if no <FullText>).
+            Returns None if the Record has no RecordID or no valid
+            NumericPubDate.
+        '''
+
+        # return reference
+        article_tuple_OUT = None
+
+        # declare variables
+        record_id = None
+        pub_date = None
+        headline = None
+        headline_max_length = None
+        author_list = None
+        article_instance = None
+        full_text_list = None
+        full_text = None
+
+        record_id = self.get_field_value( record_field_map_IN, ProquestHNPNewspaperHelper.RECORD_FIELD_RECORD_ID )
+
+        # pub date
+        try:
+
+            pub_date = datetime.datetime.strptime( self.get_field_value( record_field_map_IN, ProquestHNPNewspaperHelper.RECORD_FIELD_NUMERIC_PUB_DATE ),
+                                                   ProquestHNPNewspaperHelper.DATETIME_FORMAT_NUMERAL_PUB_DATE ).date()
+
+        except ValueError:
+
+            pub_date = None
+
+        #-- END try to parse NumericPubDate --#
+
+        if ( ( record_id != "" ) and ( pub_date is not None ) ):
+
+            # headline - truncate to fit.
+            headline = self.get_field_value( record_field_map_IN, self.RECORD_FIELD_RECORD_TITLE )
+            headline_max_length = Article._meta.get_field( "headline" ).max_length
+            if ( ( headline_max_length is not None ) and ( len( headline ) > headline_max_length ) ):
+
+                headline = headline[ : headline_max_length ]
+
+            #-- END check to see if headline is too long --#
+
+            # authors
+            author_list = [ author.strip() for author in record_field_map_IN.get( self.RECORD_FIELD_AUTHOR, [] ) if ( author.strip() != "" ) ]
+
+            article_instance = Article()
+            article_instance.newspaper = self.newspaper
+            article_instance.unique_identifier = record_id
+            article_instance.archive_source = self.ARCHIVE_SOURCE
+            article_instance.archive_id = record_id
+            article_instance.pub_date = pub_date
+            article_instance.headline = headline
+            article_instance.page = self.get_field_value( record_field_map_IN, self.RECORD_FIELD_START_PAGE ) or None
+            article_instance.author_string = self.AUTHOR_STRING_SEPARATOR.join( author_list ) or None
+            article_instance.permalink = self.get_field_value( record_field_map_IN, self.RECORD_FIELD_URL_DOC_VIEW ) or None
+            article_instance.copyright = self.get_field_value( record_field_map_IN, self.RECORD_FIELD_COPYRIGHT ) or None
+
+            # full text - not stripped.
+            full_text_list = record_field_map_IN.get( self.RECORD_FIELD_FULL_TEXT, [] )
+            if ( len( full_text_list ) > 0 ):
+
+                full_text = "".join( full_text_list )
+
+            #-- END check to see if full text --#
+
+            article_tuple_OUT = ( article_instance, full_text )
+
+        #-- END check to see if valid Record --#
+
+        return article_tuple_OUT
+
+    #-- END method build_article() --#
+
+
+    def flush_articles( self ):
+
+        '''
+        Writes the queued articles in one transaction: skips any that already
+            exist, then bulk_create()s the Articles and their Article_Texts.
+            Returns the number of Articles created.
+        '''
+
+        # return reference
+        created_count_OUT = None
+
+        # declare variables
+        pending_article_list = None
+        existing_record_id_set = None
+        article_list = None
+        record_id_to_id_map = None
+        article_instance = None
+        full_text = None
+        article_text_list = None
+        article_text_instance = None
+
+        created_count_OUT = 0
+        pending_article_list = self.pending_article_list
+        self.pending_article_list = []
+        if ( len( pending_article_list ) > 0 ):
+
+            with self.metrics.time_phase( ProquestHNPMetrics.PHASE_DB_WRITE ):
+
+                with transaction.atomic():
+
+                    # skip articles already in the database.
+                    existing_record_id_set = set( Article.objects.filter( newspaper = self.newspaper,
+                                                                          archive_source = self.ARCHIVE_SOURCE,
+                                                                          archive_id__in = [ article_instance.archive_id for article_instance, full_text in pending_article_list ] ).values_list( "archive_id", flat = True ) )
+                    if ( len( existing_record_id_set ) > 0 ):
+
+                        self.status_to_count_map[ self.STATUS_SKIPPED_EXISTING ] += len( existing_record_id_set )
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARTICLES_SKIPPED, len( existing_record_id_set ) )
+                        pending_article_list = [ ( article_instance, full_text ) for article_instance, full_text in pending_article_list if ( article_instance.archive_id not in existing_record_id_set ) ]
+
+                    #-- END check to see if any already loaded --#
+
+                    if ( len( pending_article_list ) > 0 ):
+
+                        article_list = [ article_instance for article_instance, full_text in pending_article_list ]
+                        Article.objects.bulk_create( article_list, batch_size = self.batch_size )
+
+                        # IDs are only set by bulk_create() on some databases -
+                        #     look up any that are missing.
+                        if ( any( article_instance.pk is None for article_instance in article_list ) == True ):
+
+                            record_id_to_id_map = dict( Article.objects.filter( newspaper = self.newspaper,
+                                                                                archive_source = self.ARCHIVE_SOURCE,
+                                                                                archive_id__in = [ article_instance.archive_id for article_instance in article_list ] ).values_list( "archive_id", "id" ) )
+                            for article_instance in article_list:
+
+                                article_instance.pk = record_id_to_id_map[ article_instance.archive_id ]
+
+                            #-- END loop over articles --#
+
+                        #-- END check to see if IDs need to be retrieved --#
+
+                        # texts
+                        article_text_list = []
+                        for article_instance, full_text in pending_article_list:
+
+                            if ( full_text is not None ):
+
+                                article_text_instance = Article_Text()
+                                article_text_instance.article = article_instance
+                                article_text_instance.content = full_text
+                                article_text_list.append( article_text_instance )
+
+                            #-- END check to see if full text --#
+
+                        #-- END loop over articles --#
+
+                        Article_Text.objects.bulk_create( article_text_list, batch_size = self.batch_size )
+
+                        created_count_OUT = len( article_list )
+
+                    #-- END check to see if anything left to create --#
+
+                #-- END with transaction.atomic() --#
+
+            #-- END with time_phase( "db_write" ) --#
+
+            self.status_to_count_map[ self.STATUS_CREATED ] += created_count_OUT
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_ARTICLES_CREATED, created_count_OUT )
+
+        #-- END check to see if anything queued --#
+
+        return created_count_OUT
+
+    #-- END method flush_articles() --#
+
+
+    def get_field_value( self, record_field_map_IN, field_name_IN ):
+
+        '''
+        Returns the values for a Record field joined and stripped, or "" if
+            not present.
+        '''
+
+        return "".join( record_field_map_IN.get( field_name_IN, [] ) ).strip()
+
+    #-- END method get_field_value() --#
+
+
+    def get_record_id_skip_status( self, record_id_IN, add_IN = True ):
+
+        '''
+        Returns the status to skip a Record with if its RecordID was already
+            loaded (STATUS_SKIPPED_EXISTING) or already seen in this load
+            (STATUS_SKIPPED_DUPLICATE), and updates the status counts.  Returns
+            None if the Record should be loaded.  If add_IN is True, the
+            RecordID is marked as seen.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        if ( record_id_IN in self.existing_record_id_set ):
+
+            status_OUT = self.STATUS_SKIPPED_EXISTING
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_ARTICLES_SKIPPED )
+
+        elif ( record_id_IN in self.seen_record_id_set ):
+
+            status_OUT = self.STATUS_SKIPPED_DUPLICATE
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_DUPLICATE_RECORDS )
+
+        elif ( add_IN == True ):
+
+            self.seen_record_id_set.add( record_id_IN )
+
+        #-- END check to see if already loaded or seen --#
+
+        if ( status_OUT is not None ):
+
+            self.status_to_count_map[ status_OUT ] += 1
+
+        #-- END check to see if skipping --#
+
+        return status_OUT
+
+    #-- END method get_record_id_skip_status() --#
+
+
+    def get_status_map( self ):
+
+        '''
+        Returns a map of status (see STATUS_LIST) to count for the Records
+            processed since the last reset_status().
+        '''
+
+        return dict( self.status_to_count_map )
+
+    #-- END method get_status_map() --#
+
+
+    def is_record_selected( self, object_type_IN, pub_date_int_IN ):
+
+        '''
+        Returns True if a Record's ObjectType value and NumericPubDate (int,
+            YYYYMMDD, or None) pass the loader's filters.
+        '''
+
+        # return reference
+        is_selected_OUT = None
+
+        is_selected_OUT = True
+        if ( ( self.object_type_set is not None ) and ( object_type_IN not in self.object_type_set ) ):
+
+            is_selected_OUT = False
+
+        elif ( ( self.start_pub_date_int is not None ) and ( ( pub_date_int_IN is None ) or ( pub_date_int_IN < self.start_pub_date_int ) ) ):
+
+            is_selected_OUT = False
+
+        elif ( ( self.end_pub_date_int is not None ) and ( ( pub_date_int_IN is None ) or ( pub_date_int_IN > self.end_pub_date_int ) ) ):
+
+            is_selected_OUT = False
+
+        #-- END check filters --#
+
+        return is_selected_OUT
+
+    #-- END method is_record_selected() --#
+
+
+    def iterate_archive_record_files( self, archive_path_IN, is_zip_file_IN = False ):
+
+        '''
+        Generator - yields ( name, binary file object, size ) for the Record
+            XML files in an archive folder or archive .zip file (see
+            ProquestHNPNewspaperHelper.iterate_archive_folder_files() and
+            iterate_archive_zip_members()).  If the archive has a current
+            index, only the files that match the loader's filters, and whose
+            RecordIDs have not been loaded or seen (see
+            get_record_id_skip_status()), are yielded.
+        '''
+
+        # declare variables
+        archive_index = None
+        row_index_list = None
+        name_list = None
+        name = None
+        zip_file = None
+        xml_file = None
+
+        archive_index = self.newspaper_helper.load_archive_index( archive_path_IN,
+                                                                  is_zip_file_IN = is_zip_file_IN,
+                                                                  index_folder_path_IN = self.newspaper_helper.get_archive_index_folder_path( is_zip_file_IN ) )
+        if ( archive_index is None ):
+
+            # no index - read everything.
+            if ( is_zip_file_IN == True ):
+
+                yield from self.newspaper_helper.iterate_archive_zip_members( archive_path_IN, metrics_IN = self.metrics )
+
+            else:
+
+                yield from self.newspaper_helper.iterate_archive_folder_files( archive_path_IN, metrics_IN = self.metrics )
+
+            #-- END check to see if zip file --#
+
+        else:
+
+            # index - just the files that match.
+            row_index_list = archive_index.select( None if ( self.object_type_set is None ) else list( self.object_type_set ),
+                                                   self.start_pub_date_int,
+                                                   self.end_pub_date_int )
+            self.status_to_count_map[ self.STATUS_RECORDS ] += len( archive_index ) - len( row_index_list )
+            self.status_to_count_map[ self.STATUS_SKIPPED_FILTERED ] += len( archive_index ) - len( row_index_list )
+            name_list = self.iterate_index_names( archive_index, row_index_list )
+            if ( is_zip_file_IN == True ):
+
+                with zipfile.ZipFile( archive_path_IN, "r" ) as zip_file:
+
+                    for name in name_list:
+
+                        with zip_file.open( name, "r" ) as xml_file:
+
+                            yield ( name, xml_file, zip_file.getinfo( name ).file_size )
+
+                        #-- END with zip_file.open() --#
+
+                    #-- END loop over selected members --#
+
+                #-- END with ZipFile --#
+
+            else:
+
+                # index holds the path as summarized - the archive folder may
+                #     have been moved since, so look in archive_path_IN.
+                for name in name_list:
+
+                    name = os.path.join( archive_path_IN, os.path.basename( name ) )
+                    with open( name, "rb" ) as xml_file:
+
+                        yield ( name, xml_file, os.fstat( xml_file.fileno() ).st_size )
+
+                    #-- END with open( name )...: --#
+
+                #-- END loop over selected files --#
+
+            #-- END check to see if zip file --#
+
+        #-- END check to see if index --#
+
+    #-- END method iterate_archive_record_files() --#
+
+
+    def iterate_index_names( self, archive_index_IN, row_index_list_IN ):
+
+        '''
+        Generator - yields the file name for each row of an archive's index,
+            skipping (and counting) rows whose RecordID was already loaded or
+            seen.  The RecordID is not marked as seen here - that happens once
+            the file is parsed.
+        '''
+
+        # declare variables
+        record_id_array = None
+        row_index = None
+        record_id = None
+
+        record_id_array = archive_index_IN.get_column( archive_index_IN.COLUMN_RECORD_ID )
+        for row_index in row_index_list_IN:
+
+            record_id = record_id_array[ row_index ]
+            if ( ( record_id != archive_index_IN.NO_RECORD_ID ) and ( self.get_record_id_skip_status( record_id, add_IN = False ) is not None ) ):
+
+                # skipped without reading the file.
+                self.status_to_count_map[ self.STATUS_RECORDS ] += 1
+
+            else:
+
+                yield archive_index_IN.name_list[ row_index ]
+
+            #-- END check to see if RecordID already loaded or seen --#
+
+        #-- END loop over rows --#
+
+    #-- END method iterate_index_names() --#
+
+
+    def load_archive( self, archive_path_IN, is_zip_file_IN = False ):
+
+        '''
+        Loads the selected Records in an archive folder or archive .zip file
+            as Articles.  Articles are queued and written a batch at a time,
+            so some of this archive's may still be queued when this returns -
+            call flush_articles() when done loading.  Returns the number of
+            Records queued.
+        '''
+
+        # return reference
+        queued_count_OUT = None
+
+        # declare variables
+        xml_file_path = None
+        xml_file = None
+        xml_file_size = None
+        metered_file = None
+        start_time = None
+        record_field_map = None
+        object_type = None
+        pub_date_string = None
+        pub_date_int = None
+        record_id = None
+        article_tuple = None
+
+        queued_count_OUT = 0
+        for xml_file_path, xml_file, xml_file_size in self.iterate_archive_record_files( archive_path_IN, is_zip_file_IN = is_zip_file_IN ):
+
+            # parse (time spent waiting on read() is "read", the rest is
+            #     "parse").
+            metered_file = MeteredReader( xml_file )
+            start_time = time.perf_counter()
+            record_field_map = self.newspaper_helper.extract_record_fields( metered_file, self.RECORD_ARTICLE_FIELD_LIST )
+            self.metrics.add_time( ProquestHNPMetrics.PHASE_READ, metered_file.read_seconds, count_IN = 0 )
+            self.metrics.add_time( ProquestHNPMetrics.PHASE_PARSE, ( time.perf_counter() - start_time ) - metered_file.read_seconds )
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_FILES )
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_BYTES_READ, metered_file.byte_count )
+
+            if ( record_field_map is None ):
+
+                # not a Record.
+                self.metrics.increment( ProquestHNPMetrics.COUNTER_NO_RECORD )
+                continue
+
+            #-- END check to see if Record --#
+
+            self.status_to_count_map[ self.STATUS_RECORDS ] += 1
+
+            # filter (already done if the archive has an index, but cheap).
+            object_type = ProquestHNPNewspaperHelper.OBJECT_TYPE_VALUE_SEPARATOR.join( record_field_map.get( ProquestHNPNewspaperHelper.RECORD_FIELD_OBJECT_TYPE, [] ) )
+            pub_date_string = self.get_field_value( record_field_map, ProquestHNPNewspaperHelper.RECORD_FIELD_NUMERIC_PUB_DATE )
+            pub_date_int = int( pub_date_string ) if ( pub_date_string.isdigit() == True ) else None
+            if ( self.is_record_selected( object_type, pub_date_int ) == False ):
+
+                self.status_to_count_map[ self.STATUS_SKIPPED_FILTERED ] += 1
+                continue
+
+            #-- END check to see if Record selected --#
+
+            # already loaded, or already in an earlier archive?
+            record_id = self.get_field_value( record_field_map, ProquestHNPNewspaperHelper.RECORD_FIELD_RECORD_ID )
+            if ( ( record_id != "" ) and ( self.get_record_id_skip_status( record_id ) is not None ) ):
+
+                continue
+
+            #-- END check to see if RecordID already loaded or seen --#
+
+            article_tuple = self.build_article( record_field_map )
+            if ( article_tuple is None ):
+
+                self.status_to_count_map[ self.STATUS_SKIPPED_INVALID ] += 1
+
+            else:
+
+                self.queue_article( article_tuple[ 0 ], article_tuple[ 1 ] )
+                queued_count_OUT += 1
+
+            #-- END check to see if valid Record --#
+
+        #-- END loop over Record files --#
+
+        return queued_count_OUT
+
+    #-- END method load_archive() --#
+
+
+    def load_paper( self, use_zip_files_IN = False, print_logging_IN = True ):
+
+        '''
+        Loads the selected Records from all of the paper's archives - the
+            archive folders in destination_paper_path, or, if
+            use_zip_files_IN is True, the archive .zip files in
+            source_paper_path - as Articles for the paper's context_text
+            Newspaper.  Returns the status map (see get_status_map()), or None
+            if the paper has no Newspaper.
+        '''
+
+        # return reference
+        status_map_OUT = None
+
+        # declare variables
+        me = "load_paper"
+        log_message = None
+        archive_path_list = None
+        archive_counter = None
+        archive_path = None
+        queued_count = None
+
+        # need a newspaper.
+        self.newspaper = self.newspaper_helper.get_PHNP_newspaper().newspaper
+        if ( self.newspaper is not None ):
+
+            self.reset_status()
+
+            # RecordIDs already loaded.
+            self.existing_record_id_set = ProquestHNPRecordIdSet()
+            self.seen_record_id_set = ProquestHNPRecordIdSet()
+            with self.metrics.time_phase( ProquestHNPMetrics.PHASE_DB_READ ):
+
+                self.existing_record_id_set.update( Article.objects.filter( newspaper = self.newspaper, archive_source = self.ARCHIVE_SOURCE ).values_list( "archive_id", flat = True ).iterator() )
+
+            #-- END with metrics.time_phase() --#
+
+            archive_path_list = sorted( dir_entry.path for dir_entry in self.newspaper_helper.iterate_paper_archives( use_zip_files_IN ) )
+            archive_counter = 0
+            for archive_path in archive_path_list:
+
+                archive_counter += 1
+                queued_count = self.load_archive( archive_path, is_zip_file_IN = use_zip_files_IN )
+                self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES )
+
+                if ( self.newspaper_helper.is_output_enabled( print_logging_IN ) == True ):
+
+                    log_message = "In {}: archive {} of {} ( {} ): queued {} articles; status so far: {}".format( me, archive_counter, len( archive_path_list ), archive_path, queued_count, self.status_to_count_map )
+                    self.newspaper_helper.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+
+                #-- END check to see if output --#
+
+            #-- END loop over archives --#
+
+            # write what is left.
+            self.flush_articles()
+            status_map_OUT = self.get_status_map()
+
+        else:
+
+            log_message = "In {}: ERROR - Proquest_HNP_Newspaper for paper \"{}\" has no related Newspaper, so no articles loaded.".format( me, self.newspaper_helper.paper_identifier )
+            self.newspaper_helper.output_debug_message( log_message, do_print_IN = True )
+
+        #-- END check to see if newspaper --#
+
+        return status_map_OUT
+
+    #-- END method load_paper() --#
+
+
+    def queue_article( self, article_IN, full_text_IN = None ):
+
+        '''
+        Adds an unsaved Article (and its full text) to the batch to be
+            written, then writes the batch once it has batch_size articles.
+        '''
+
+        self.pending_article_list.append( ( article_IN, full_text_IN ) )
+        if ( len( self.pending_article_list ) >= self.batch_size ):
+
+            self.flush_articles()
+
+        #-- END check to see if batch is full --#
+
+    #-- END method queue_article() --#
+
+
+    def reset_status( self ):
+
+        self.status_to_count_map = { status : 0 for status in self.STATUS_LIST }
+
+    #-- END method reset_status() --#
+
+
+#-- END class ProquestHNPArticleLoader --#
@@ -0,0 +1,387 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import array
+import os
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPFileTypeMap( object ):
+
+    '''
+    Map of ObjectType value to the Record files that have it, for one archive
+        or for a whole paper.  Nothing is stored per file but ints and the file
+        name's bytes:
+
+        - ObjectType values and folder paths are interned - each is stored
+            once, in type_list and folder_list, and rows refer to them by
+            position.
+        - rows are kept in array.array columns: type id, folder id, and the
+            end offset of the file name in name_buffer (a bytearray of UTF-8
+            file names).
+        - per-type counts are kept as files are added, as are the first
+            example_count paths for each type.
+
+    Adding a file is constant time - no list is scanned.  If keep_file_paths
+        is False, only the counts and examples are kept, so memory does not
+        grow with the number of files.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # default number of example file paths to keep per type.
+    DEFAULT_EXAMPLE_COUNT = 10
+
+    # array typecodes
+    TYPECODE_ID = "i"
+    TYPECODE_OFFSET = "q"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, keep_file_paths_IN = True, example_count_IN = DEFAULT_EXAMPLE_COUNT ):
+
+        # declare variables
+        self.keep_file_paths = keep_file_paths_IN
+        self.example_count = example_count_IN
+
+        # interned values
+        self.type_list = []
+        self.type_to_id_map = {}
+        self.folder_list = []
+        self.folder_to_id_map = {}
+
+        # per-type counts and examples, by type id
+        self.type_count_list = []
+        self.type_example_list = []
+
+        # rows
+        self.type_id_array = array.array( self.TYPECODE_ID )
+        self.folder_id_array = array.array( self.TYPECODE_ID )
+        self.name_end_array = array.array( self.TYPECODE_OFFSET )
+        self.name_buffer = bytearray()
+
+    #-- END method __init__() --#
+
+
+    def __len__( self ):
+
+        # number of files added, whether or not their paths were kept.
+        return sum( self.type_count_list )
+
+    #-- END method __len__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add( self, object_type_IN, file_path_IN ):
+
+        '''
+        Adds a file path under an ObjectType value.  Each path should only be
+            added once - there is no check for duplicates.
+        '''
+
+        # declare variables
+        type_id = None
+        example_list = None
+        folder_path = None
+        file_name = None
+        folder_id = None
+
+        type_id = self.get_type_id( object_type_IN )
+        self.type_count_list[ type_id ] += 1
+
+        # example?
+        example_list = self.type_example_list[ type_id ]
+        if ( len( example_list ) < self.example_count ):
+
+            example_list.append( file_path_IN )
+
+        #-- END check to see if room for another example --#
+
+        # keep the path?
+        if ( self.keep_file_paths == True ):
+
+            folder_path, file_name = os.path.split( file_path_IN )
+            folder_id = self.folder_to_id_map.get( folder_path, None )
+            if ( folder_id is None ):
+
+                folder_id = len( self.folder_list )
+                self.folder_list.append( folder_path )
+                self.folder_to_id_map[ folder_path ] = folder_id
+
+            #-- END check to see if folder is new --#
+
+            self.name_buffer.extend( file_name.encode( "utf-8" ) )
+            self.type_id_array.append( type_id )
+            self.folder_id_array.append( folder_id )
+            self.name_end_array.append( len( self.name_buffer ) )
+
+        #-- END check to see if keeping file paths --#
+
+    #-- END method add() --#
+
+
+    def get_count_map( self ):
+
+        '''
+        Returns a map of ObjectType value to number of files.
+        '''
+
+        # return reference
+        type_to_count_map_OUT = None
+
+        type_to_count_map_OUT = dict( zip( self.type_list, self.type_count_list ) )
+
+        return type_to_count_map_OUT
+
+    #-- END method get_count_map() --#
+
+
+    def get_example_map( self ):
+
+        '''
+        Returns a map of ObjectType value to a list of up to example_count
+            file paths, in the order they were added.
+        '''
+
+        # return reference
+        type_to_example_list_map_OUT = None
+
+        type_to_example_list_map_OUT = dict( zip( self.type_list, [ list( example_list ) for example_list in self.type_example_list ] ) )
+
+        return type_to_example_list_map_OUT
+
+    #-- END method get_example_map() --#
+
+
+    def get_file_path( self, row_index_IN ):
+
+        '''
+        Returns the file path for a row.  Only available when keeping file
+            paths.
+        '''
+
+        # return reference
+        file_path_OUT = None
+
+        # declare variables
+        name_start = None
+
+        name_start = 0
+        if ( row_index_IN > 0 ):
+
+            name_start = self.name_end_array[ row_index_IN - 1 ]
+
+        #-- END check to see if first row --#
+
+        file_path_OUT = os.path.join( self.folder_list[ self.folder_id_array[ row_index_IN ] ],
+                                      self.name_buffer[ name_start : self.name_end_array[ row_index_IN ] ].decode( "utf-8" ) )
+
+        return file_path_OUT
+
+    #-- END method get_file_path() --#
+
+
+    def get_file_path_list( self, object_type_IN ):
+
+        '''
+        Returns a list of the file paths for an ObjectType value, in the
+            order they were added (empty if the type is unknown or paths are
+            not kept).
+        '''
+
+        # return reference
+        file_path_list_OUT = None
+
+        file_path_list_OUT = list( self.iterate_file_paths( object_type_IN ) )
+
+        return file_path_list_OUT
+
+    #-- END method get_file_path_list() --#
+
+
+    def get_type_id( self, object_type_IN ):
+
+        '''
+        Returns the map's type ID for an ObjectType value, adding it to
+            type_list if it is new.
+        '''
+
+        # return reference
+        type_id_OUT = None
+
+        type_id_OUT = self.type_to_id_map.get( object_type_IN, None )
+        if ( type_id_OUT is None ):
+
+            type_id_OUT = len( self.type_list )
+            self.type_list.append( object_type_IN )
+            self.type_to_id_map[ object_type_IN ] = type_id_OUT
+            self.type_count_list.append( 0 )
+            self.type_example_list.append( [] )
+
+        #-- END check to see if new type --#
+
+        return type_id_OUT
+
+    #-- END method get_type_id() --#
+
+
+    def iterate_file_paths( self, object_type_IN = None ):
+
+        '''
+        Generator - yields the file paths for an ObjectType value, or for all
+            types if None, in the order they were added.  Paths are built as
+            they are requested.  Yields nothing if paths are not kept.
+        '''
+
+        # declare variables
+        type_id = None
+        row_index = None
+        row_type_id = None
+
+        # which type?
+        type_id = None
+        if ( object_type_IN is not None ):
+
+            type_id = self.type_to_id_map.get( object_type_IN, None )
+
+        #-- END check to see if type passed in --#
+
+        if ( ( object_type_IN is None ) or ( type_id is not None ) ):
+
+            for row_index, row_type_id in enumerate( self.type_id_array ):
+
+                if ( ( type_id is None ) or ( row_type_id == type_id ) ):
+
+                    yield self.get_file_path( row_index )
+
+                #-- END check to see if row matches --#
+
+            #-- END loop over rows --#
+
+        #-- END check to see if known type --#
+
+    #-- END method iterate_file_paths() --#
+
+
+    def merge( self, file_type_map_IN ):
+
+        '''
+        Adds the counts, examples, and rows from another map (an archive's, to
+            build a paper-wide map) into this one, remapping its type and
+            folder ids to this map's.
+        '''
+
+        # declare variables
+        type_id_remap_list = None
+        folder_id_remap_list = None
+        other_type_id = None
+        object_type = None
+        type_id = None
+        example_list = None
+        folder_path = None
+        folder_id = None
+        name_offset = None
+        name_end = None
+
+        # types - counts and examples
+        type_id_remap_list = []
+        for other_type_id, object_type in enumerate( file_type_map_IN.type_list ):
+
+            type_id = self.get_type_id( object_type )
+            type_id_remap_list.append( type_id )
+            self.type_count_list[ type_id ] += file_type_map_IN.type_count_list[ other_type_id ]
+            example_list = self.type_example_list[ type_id ]
+            example_list.extend( file_type_map_IN.type_example_list[ other_type_id ][ : max( self.example_count - len( example_list ), 0 ) ] )
+
+        #-- END loop over types --#
+
+        # rows
+        if ( self.keep_file_paths == True ):
+
+            folder_id_remap_list = []
+            for folder_path in file_type_map_IN.folder_list:
+
+                folder_id = self.folder_to_id_map.get( folder_path, None )
+                if ( folder_id is None ):
+
+                    folder_id = len( self.folder_list )
+                    self.folder_list.append( folder_path )
+                    self.folder_to_id_map[ folder_path ] = folder_id
+
+                #-- END check to see if folder is new --#
+
+                folder_id_remap_list.append( folder_id )
+
+            #-- END loop over folders --#
+
+            name_offset = len( self.name_buffer )
+            self.type_id_array.extend( type_id_remap_list[ type_id ] for type_id in file_type_map_IN.type_id_array )
+            self.folder_id_array.extend( folder_id_remap_list[ folder_id ] for folder_id in file_type_map_IN.folder_id_array )
+            self.name_end_array.extend( name_end + name_offset for name_end in file_type_map_IN.name_end_array )
+            self.name_buffer.extend( file_type_map_IN.name_buffer )
+
+        #-- END check to see if keeping file paths --#
+
+    #-- END method merge() --#
+
+
+    def to_dict( self ):
+
+        '''
+        Returns a map of ObjectType value to list of file paths - what
+            map_archive_folder_files_to_types() returns.  This builds
+            every path string, so only use it on maps of a manageable size.
+        '''
+
+        # return reference
+        type_to_file_path_list_map_OUT = None
+
+        # declare variables
+        row_index = None
+        type_id = None
+
+        type_to_file_path_list_map_OUT = { object_type : [] for object_type in self.type_list }
+        for row_index, type_id in enumerate( self.type_id_array ):
+
+            type_to_file_path_list_map_OUT[ self.type_list[ type_id ] ].append( self.get_file_path( row_index ) )
+
+        #-- END loop over rows --#
+
+        return type_to_file_path_list_map_OUT
+
+    #-- END method to_dict() --#
+
+
+#-- END class ProquestHNPFileTypeMap --#
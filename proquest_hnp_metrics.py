@@ -0,0 +1,411 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import contextlib
+import json
+import time
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class MeteredReader( object ):
+
+    '''
+    Wraps a binary file object and times its read() calls, so time spent
+        waiting on the disk (or on zip decompression) can be told apart from
+        time spent parsing what was read.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, file_IN ):
+
+        # declare variables
+        self.file = file_IN
+        self.read_seconds = 0.0
+        self.byte_count = 0
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def read( self, size_IN = -1 ):
+
+        # return reference
+        data_OUT = None
+
+        # declare variables
+        start_time = None
+
+        start_time = time.perf_counter()
+        data_OUT = self.file.read( size_IN )
+        self.read_seconds += time.perf_counter() - start_time
+        self.byte_count += len( data_OUT )
+
+        return data_OUT
+
+    #-- END method read() --#
+
+
+#-- END class MeteredReader --#
+
+
+class ProquestHNPMetrics( object ):
+
+    '''
+    Counters and per-phase timers for a run of ProquestHNPNewspaperHelper.
+        Anything recorded for an archive is also added to the paper-level
+        totals; anything recorded without an archive identifier only goes to
+        the totals.  Timers accumulate seconds and the number of timings for
+        each phase.  A metrics dictionary from another instance (a worker
+        process, say - see get_totals_dict()) can be merged in with
+        merge_totals_dict().
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # phases
+    PHASE_EXTRACT = "extract"
+    PHASE_LIST = "list"
+    PHASE_READ = "read"
+    PHASE_PARSE = "parse"
+    PHASE_AGGREGATE = "aggregate"
+    PHASE_DB_READ = "db_read"
+    PHASE_DB_WRITE = "db_write"
+    PHASE_INDEX_WRITE = "index_write"
+    PHASE_LIST_ALL = [ PHASE_EXTRACT, PHASE_LIST, PHASE_READ, PHASE_PARSE, PHASE_AGGREGATE, PHASE_INDEX_WRITE, PHASE_DB_READ, PHASE_DB_WRITE ]
+
+    # counters
+    COUNTER_ARCHIVES = "archives"
+    COUNTER_ARCHIVES_UNCHANGED = "archives_unchanged"
+    COUNTER_ARCHIVES_RESUMED = "archives_resumed"
+    COUNTER_ARCHIVES_CHANGED_SINCE_CHECKPOINT = "archives_changed_since_checkpoint"
+    COUNTER_FILES = "files"
+    COUNTER_BYTES_READ = "bytes_read"
+    COUNTER_NO_RECORD = "no_record"
+    COUNTER_BAD_PUB_DATE = "bad_pub_date"
+    COUNTER_FILES_EXTRACTED = "files_extracted"
+    COUNTER_BYTES_EXTRACTED = "bytes_extracted"
+    COUNTER_COMPRESSED_BYTES = "compressed_bytes"
+    COUNTER_ROWS_CREATED = "rows_created"
+    COUNTER_ROWS_UPDATED = "rows_updated"
+    COUNTER_ROWS_DELETED = "rows_deleted"
+    COUNTER_ARTICLES_CREATED = "articles_created"
+    COUNTER_ARTICLES_SKIPPED = "articles_skipped"
+    COUNTER_DUPLICATE_RECORDS = "duplicate_records"
+
+    # dictionary keys
+    METRICS_TIMERS = "timers"
+    METRICS_COUNTERS = "counters"
+    METRICS_SECONDS = "seconds"
+    METRICS_COUNT = "count"
+    METRICS_TOTALS = "totals"
+    METRICS_ARCHIVES = "archives"
+
+    # JSON lines keys
+    JSON_LINE_RUN = "run"
+    JSON_LINE_PAPER_IDENTIFIER = "paper_identifier"
+    JSON_LINE_SCOPE = "scope"
+    JSON_LINE_ARCHIVE_IDENTIFIER = "archive_identifier"
+    SCOPE_ARCHIVE = "archive"
+    SCOPE_PAPER = "paper"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # declare variables
+        self.totals_dict = None
+        self.archive_identifier_to_dict_map = None
+
+        # init
+        self.reset()
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_time( self, phase_IN, seconds_IN, archive_identifier_IN = None, count_IN = 1 ):
+
+        '''
+        Adds seconds_IN to the timer for phase_IN (and count_IN to its count),
+            for the paper and, if one is passed in, for the archive.
+        '''
+
+        # declare variables
+        metrics_dict = None
+
+        for metrics_dict in self.get_target_dict_list( archive_identifier_IN ):
+
+            self.add_time_to_dict( metrics_dict, phase_IN, seconds_IN, count_IN )
+
+        #-- END loop over metrics dictionaries to update --#
+
+    #-- END method add_time() --#
+
+
+    def add_time_to_dict( self, metrics_dict_IN, phase_IN, seconds_IN, count_IN = 1 ):
+
+        # declare variables
+        timer_dict = None
+
+        timer_dict = metrics_dict_IN[ self.METRICS_TIMERS ].get( phase_IN, None )
+        if ( timer_dict is None ):
+
+            timer_dict = { self.METRICS_SECONDS : 0.0, self.METRICS_COUNT : 0 }
+            metrics_dict_IN[ self.METRICS_TIMERS ][ phase_IN ] = timer_dict
+
+        #-- END check to see if timer exists --#
+
+        timer_dict[ self.METRICS_SECONDS ] += seconds_IN
+        timer_dict[ self.METRICS_COUNT ] += count_IN
+
+    #-- END method add_time_to_dict() --#
+
+
+    def get_archive_dict( self, archive_identifier_IN ):
+
+        '''
+        Returns the metrics dictionary for the archive passed in, creating it
+            if needed.
+        '''
+
+        # return reference
+        metrics_dict_OUT = None
+
+        metrics_dict_OUT = self.archive_identifier_to_dict_map.get( archive_identifier_IN, None )
+        if ( metrics_dict_OUT is None ):
+
+            metrics_dict_OUT = self.make_metrics_dict()
+            self.archive_identifier_to_dict_map[ archive_identifier_IN ] = metrics_dict_OUT
+
+        #-- END check to see if archive has metrics yet --#
+
+        return metrics_dict_OUT
+
+    #-- END method get_archive_dict() --#
+
+
+    def get_target_dict_list( self, archive_identifier_IN = None ):
+
+        # return reference
+        dict_list_OUT = None
+
+        dict_list_OUT = [ self.totals_dict ]
+        if ( archive_identifier_IN is not None ):
+
+            dict_list_OUT.append( self.get_archive_dict( archive_identifier_IN ) )
+
+        #-- END check to see if archive passed in --#
+
+        return dict_list_OUT
+
+    #-- END method get_target_dict_list() --#
+
+
+    def get_totals_dict( self ):
+
+        '''
+        Returns the paper-level totals: { "timers" : { phase : { "seconds",
+            "count" } }, "counters" : { name : value } }.
+        '''
+
+        return self.totals_dict
+
+    #-- END method get_totals_dict() --#
+
+
+    def increment( self, counter_name_IN, amount_IN = 1, archive_identifier_IN = None ):
+
+        '''
+        Adds amount_IN to the counter passed in, for the paper and, if one is
+            passed in, for the archive.
+        '''
+
+        # declare variables
+        metrics_dict = None
+        counter_dict = None
+
+        for metrics_dict in self.get_target_dict_list( archive_identifier_IN ):
+
+            counter_dict = metrics_dict[ self.METRICS_COUNTERS ]
+            counter_dict[ counter_name_IN ] = counter_dict.get( counter_name_IN, 0 ) + amount_IN
+
+        #-- END loop over metrics dictionaries to update --#
+
+    #-- END method increment() --#
+
+
+    def make_metrics_dict( self ):
+
+        return { self.METRICS_TIMERS : {}, self.METRICS_COUNTERS : {} }
+
+    #-- END method make_metrics_dict() --#
+
+
+    def merge_totals_dict( self, metrics_dict_IN, archive_identifier_IN = None ):
+
+        '''
+        Adds the timers and counters in a metrics dictionary (see
+            get_totals_dict()) into this instance, for the paper and, if one is
+            passed in, for the archive.
+        '''
+
+        # declare variables
+        phase = None
+        timer_dict = None
+        counter_name = None
+        counter_value = None
+
+        if ( metrics_dict_IN is not None ):
+
+            for phase, timer_dict in metrics_dict_IN.get( self.METRICS_TIMERS, {} ).items():
+
+                self.add_time( phase, timer_dict[ self.METRICS_SECONDS ], archive_identifier_IN, count_IN = timer_dict[ self.METRICS_COUNT ] )
+
+            #-- END loop over timers --#
+
+            for counter_name, counter_value in metrics_dict_IN.get( self.METRICS_COUNTERS, {} ).items():
+
+                self.increment( counter_name, counter_value, archive_identifier_IN )
+
+            #-- END loop over counters --#
+
+        #-- END check to see if metrics passed in --#
+
+    #-- END method merge_totals_dict() --#
+
+
+    def reset( self ):
+
+        self.totals_dict = self.make_metrics_dict()
+        self.archive_identifier_to_dict_map = {}
+
+    #-- END method reset() --#
+
+
+    @contextlib.contextmanager
+    def time_phase( self, phase_IN, archive_identifier_IN = None ):
+
+        '''
+        Context manager - times the code inside the with block as phase_IN.
+        '''
+
+        # declare variables
+        start_time = None
+
+        start_time = time.perf_counter()
+        try:
+
+            yield self
+
+        finally:
+
+            self.add_time( phase_IN, time.perf_counter() - start_time, archive_identifier_IN )
+
+        #-- END try-finally --#
+
+    #-- END method time_phase() --#
+
+
+    def to_dict( self ):
+
+        '''
+        Returns { "totals" : <paper-level metrics>, "archives" : { archive
+            identifier : <archive metrics> } }.
+        '''
+
+        # return reference
+        metrics_dict_OUT = None
+
+        metrics_dict_OUT = {}
+        metrics_dict_OUT[ self.METRICS_TOTALS ] = self.totals_dict
+        metrics_dict_OUT[ self.METRICS_ARCHIVES ] = self.archive_identifier_to_dict_map
+
+        return metrics_dict_OUT
+
+    #-- END method to_dict() --#
+
+
+    def to_json_lines( self, run_name_IN = None, paper_identifier_IN = None ):
+
+        '''
+        Returns a list of JSON strings, one per archive (in identifier order),
+            then one for the paper totals.  Each is labeled with the run name,
+            paper identifier, scope ("archive" or "paper"), and archive
+            identifier.
+        '''
+
+        # return reference
+        line_list_OUT = None
+
+        # declare variables
+        archive_identifier = None
+        line_dict = None
+
+        line_list_OUT = []
+        for archive_identifier in sorted( self.archive_identifier_to_dict_map.keys() ):
+
+            line_dict = {}
+            line_dict[ self.JSON_LINE_RUN ] = run_name_IN
+            line_dict[ self.JSON_LINE_PAPER_IDENTIFIER ] = paper_identifier_IN
+            line_dict[ self.JSON_LINE_SCOPE ] = self.SCOPE_ARCHIVE
+            line_dict[ self.JSON_LINE_ARCHIVE_IDENTIFIER ] = archive_identifier
+            line_dict.update( self.archive_identifier_to_dict_map[ archive_identifier ] )
+            line_list_OUT.append( json.dumps( line_dict, sort_keys = True ) )
+
+        #-- END loop over archives --#
+
+        line_dict = {}
+        line_dict[ self.JSON_LINE_RUN ] = run_name_IN
+        line_dict[ self.JSON_LINE_PAPER_IDENTIFIER ] = paper_identifier_IN
+        line_dict[ self.JSON_LINE_SCOPE ] = self.SCOPE_PAPER
+        line_dict[ self.JSON_LINE_ARCHIVE_IDENTIFIER ] = None
+        line_dict.update( self.totals_dict )
+        line_list_OUT.append( json.dumps( line_dict, sort_keys = True ) )
+
+        return line_list_OUT
+
+    #-- END method to_json_lines() --#
+
+
+#-- END class ProquestHNPMetrics --#
@@ -18,17 +18,33 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 
 # python base imports
+import array
 import calendar
+import concurrent.futures
 import datetime
-import glob
+import functools
+import json
+import logging
 import os
+import shutil
 import six
-import xmltodict
+import tempfile
+import time
+import zlib
+from xml.etree import ElementTree
 import zipfile
 
 # django classes
+import django
 from django.contrib.auth.models import User
+from django.db import connections
+from django.db import IntegrityError
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Max
+from django.db.models import Min
 from django.db.models import Q
+from django.db.models import Sum
 from django.template.defaultfilters import slugify
 
 # python_utilities
@@ -40,12 +56,22 @@ from python_utilities.rate_limited.basic_rate_limited import BasicRateLimited
 from context_text.shared.context_text_base import ContextTextBase
 
 # context_text_proquest_hnp
+from context_text_proquest_hnp.models import PHNP_Checkpoint_Archive
 from context_text_proquest_hnp.models import PHNP_Newspaper_Archive_Object_Type
 from context_text_proquest_hnp.models import PHNP_Newspaper_Object_Type
+from context_text_proquest_hnp.models import Proquest_HNP_Checkpoint
 from context_text_proquest_hnp.models import Proquest_HNP_Newspaper
 from context_text_proquest_hnp.models import Proquest_HNP_Newspaper_Archive
 from context_text_proquest_hnp.models import Proquest_HNP_Object_Type
 from context_text_proquest_hnp.models import Proquest_HNP_Object_Type_Raw_Value
+from context_text_proquest_hnp.proquest_hnp_aggregator import ProquestHNPAggregator
+from context_text_proquest_hnp.proquest_hnp_archive_index import ProquestHNPArchiveIndex
+from context_text_proquest_hnp.proquest_hnp_file_type_map import ProquestHNPFileTypeMap
+from context_text_proquest_hnp.proquest_hnp_metrics import MeteredReader
+from context_text_proquest_hnp.proquest_hnp_metrics import ProquestHNPMetrics
+from context_text_proquest_hnp.proquest_hnp_object_type_cache import ProquestHNPObjectTypeCache
+from context_text_proquest_hnp.proquest_hnp_read_ahead import ProquestHNPReadAhead
+from context_text_proquest_hnp.proquest_hnp_record_id_set import ProquestHNPRecordIdSet
 
 #===============================================================================
 # classes (in alphabetical order by name)
@@ -68,12 +94,65 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
     ARCHIVE_SUMMARY_MIN_PUB_DATE = "min_pub_date"
     ARCHIVE_SUMMARY_MAX_PUB_DATE = "max_pub_date"
     ARCHIVE_SUMMARY_INSTANCE = "archive_instance"
+    ARCHIVE_SUMMARY_FILE_COUNT = "file_count"
+    ARCHIVE_SUMMARY_NO_RECORD_COUNT = "no_record_count"
+    ARCHIVE_SUMMARY_NO_OBJECT_TYPE_COUNT = "no_object_type_count"
+    ARCHIVE_SUMMARY_NO_OBJECT_TYPE_VALUE_COUNT = "no_object_type_value_count"
+    ARCHIVE_SUMMARY_MANIFEST = "manifest"
+    ARCHIVE_SUMMARY_IS_UNCHANGED = "is_unchanged"
+    ARCHIVE_SUMMARY_METRICS = "metrics"
+    ARCHIVE_SUMMARY_INDEX_FILE_PATH = "index_file_path"
+    
+    # file extensions
+    XML_FILE_EXTENSION = ".xml"
+    ZIP_FILE_EXTENSION = ".zip"
+    
+    # archive extraction
+    EXTRACT_PARTIAL_FOLDER_SUFFIX = ".partial-"
+    EXTRACT_RESULT_ZIP_FILE_PATH = "zip_file_path"
+    EXTRACT_RESULT_FOLDER_PATH = "folder_path"
+    EXTRACT_RESULT_FILE_COUNT = "file_count"
+    EXTRACT_RESULT_COMPRESSED_BYTES = "compressed_bytes"
+    EXTRACT_RESULT_UNCOMPRESSED_BYTES = "uncompressed_bytes"
+    EXTRACT_RESULT_SECONDS = "seconds"
+    EXTRACT_RESULT_MB_PER_SECOND = "mb_per_second"
+    
+    # archive manifest
+    ARCHIVE_MANIFEST_FILE_COUNT = "file_count"
+    ARCHIVE_MANIFEST_TOTAL_BYTES = "total_bytes"
+    ARCHIVE_MANIFEST_NEWEST_MTIME_NS = "newest_mtime_ns"
+    ARCHIVE_MANIFEST_FINGERPRINT = "fingerprint"
     
     # datetime string formats
     DATETIME_FORMAT_NUMERAL_PUB_DATE = "%Y%m%d"
 
+    # Record XML elements
+    RECORD_ROOT_ELEMENT = "Record"
+    RECORD_FIELD_RECORD_ID = "RecordID"
+    RECORD_FIELD_OBJECT_TYPE = "ObjectType"
+    RECORD_FIELD_NUMERIC_PUB_DATE = "NumericPubDate"
+    RECORD_FIELD_PATH_SEPARATOR = "/"
+    OBJECT_TYPE_VALUE_SEPARATOR = "|"
+    
+    # fields needed to summarize an archive
+    RECORD_SUMMARY_FIELD_LIST = [ RECORD_FIELD_RECORD_ID, RECORD_FIELD_OBJECT_TYPE, RECORD_FIELD_NUMERIC_PUB_DATE ]
+
     # logger name
     MY_LOGGER_NAME = "context_text_proquest_hnp.proquest_hnp_newspaper_helper"
+    
+    # number of archives whose database writes are committed together.
+    DEFAULT_ARCHIVE_WRITE_BATCH_SIZE = 1
+    
+    # number of Record files to read ahead of parsing (0 = read each file as
+    #     it is parsed - see ProquestHNPReadAhead).
+    DEFAULT_READ_AHEAD_COUNT = 0
+    
+    # an interrupted run that has recorded no progress for longer than this is
+    #     not resumed - a new run is started instead (see get_checkpoint()).
+    DEFAULT_CHECKPOINT_MAX_AGE = datetime.timedelta( days = 7 )
+    
+    # number of example file paths per ObjectType to log.
+    LOG_EXAMPLE_FILE_PATH_COUNT = 10
 
 
     #---------------------------------------------------------------------------
@@ -82,7 +161,7 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
 
 
     # object type instances, to minimize trips to database.
-    raw_object_type_to_instance_map = {}
+    object_type_cache = ProquestHNPObjectTypeCache()
 
     
     #---------------------------------------------------------------------------
@@ -115,89 +194,48 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
     @classmethod
     def fetch_object_type_instance( cls, raw_value_IN ):
         
+        '''
+        Returns the Proquest_HNP_Object_Type for the raw ObjectType value
+            passed in, creating it if needed.  Looks values up in the shared
+            object_type_cache, which is preloaded with all object types and
+            their raw value synonyms the first time it is used.
+        '''
+        
         # return reference
         instance_OUT = None
 
         # declare variables
         me = "fetch_object_type_instance"
-        slug_value = None
         log_message = None
         type_instance = None
-        db_raw_value = None
-        raw_value_qs = None
-        raw_value_count = None
-        raw_value_instance = None
         
         # make sure value is passed in.
         if ( ( raw_value_IN is not None ) and ( raw_value_IN != "" ) ):
         
-            # slugify the value
-            slug_value = slugify( raw_value_IN )
-        
-            # is value already in our map?
-            if ( raw_value_IN in cls.raw_object_type_to_instance_map ):
-            
-                # it is.  Return what we have.
-                type_instance = cls.raw_object_type_to_instance_map.get( raw_value_IN, None )
-                
-            else:
+            try:
             
-                # not in cache.  In database?
-                try:
+                # warm the cache first time through.
+                if ( cls.object_type_cache.is_preloaded == False ):
                 
-                    # look to see if type with this slug exists.
-                    type_instance = Proquest_HNP_Object_Type.objects.get( raw_value = raw_value_IN )
-                    
-                    # call method set_raw_value() with the value passed in to
-                    #     set the current raw value - if matches main value in
-                    #     the object type record, does nothing except to make
-                    #     sure the value is also in the overflow area.  If the
-                    #     value passed in is different from main record, adds it
-                    #     to the overflow table.
-                    type_instance.set_raw_value( raw_value_IN )
-                    type_instance.save()
+                    cls.object_type_cache.preload()
                     
-                except Proquest_HNP_Object_Type.DoesNotExist as dnee:
-                
-                    # does not exist.  make one and return it.
-                    type_instance = Proquest_HNP_Object_Type()
-                    type_instance.set_raw_value( raw_value_IN )
-                    type_instance.save()
-                
-                except Proquest_HNP_Object_Type.MultipleObjectsReturned as more:
-                
-                    # ERROR - more than one.  Should be impossible.  Check
-                    #     case-sensitivity things.
-                    log_message = "ERROR - multiple matches for raw value \"{}\" ( slug \"{}\" ).".format( slug_value, raw_value_IN )
-                    cls.log_message( log_message,
-                                     method_IN = me,
-                                     logger_name_IN = cls.MY_LOGGER_NAME,
-                                     do_print_IN = True )
-                    type_instance = None
-                
-                except Exception as e:
-                
-                    # Unexpected ERROR.
-                    log_message = "ERROR - Unexpected exception caught trying to retrieve object type instance for raw value \"{}\" ( slug \"\" ).".format( slug_value, raw_value_IN )
-                    cls.log_exception( e,
-                                       message_IN = log_message,
-                                       method_IN = me,
-                                       logger_name_IN = cls.MY_LOGGER_NAME,
-                                       do_print_IN = True )
-                    type_instance = None
-                
-                #-- END try-except --#
-                
-                # got anything?
-                if ( type_instance is not None ):
+                #-- END check to see if cache preloaded --#
                 
-                    # yes.  Add to map.
-                    cls.raw_object_type_to_instance_map[ raw_value_IN ] = type_instance
-                    type_instance = cls.fetch_object_type_instance( raw_value_IN )
+                # look up (or create) the type.
+                type_instance = cls.object_type_cache.get( raw_value_IN )
                 
-                #-- END check to see if we have an instance --#
-                 
-            #-- END check to see if instance already loaded --#
+            except Exception as e:
+            
+                # Unexpected ERROR.
+                log_message = "ERROR - Unexpected exception caught trying to retrieve object type instance for raw value \"{}\".".format( raw_value_IN )
+                cls.log_exception( e,
+                                   message_IN = log_message,
+                                   method_IN = me,
+                                   logger_name_IN = cls.MY_LOGGER_NAME,
+                                   do_print_IN = True )
+                type_instance = None
+            
+            #-- END try-except --#
             
         #-- END check to make sure value passed in. --#
         
@@ -207,6 +245,18 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
     #-- END class method fetch_object_type_instance() --#
     
 
+    @classmethod
+    def get_object_type_cache_stats( cls ):
+        
+        '''
+        Returns the hit/miss/eviction stats dictionary from object_type_cache.
+        '''
+        
+        return cls.object_type_cache.get_stats()
+        
+    #-- END class method get_object_type_cache_stats() --#
+    
+
     @classmethod
     def fetch_archive_instance( cls,
                                 proquest_hnp_newspaper_instance_IN,
@@ -289,682 +339,3682 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
     #-- END class method fetch_archive_instance() --#
 
 
-    #---------------------------------------------------------------------------
-    # ! ==> __init__() method
-    #---------------------------------------------------------------------------
-
+    @classmethod
+    def build_archive_index( cls, archive_path_IN, is_zip_file_IN = False, manifest_dict_IN = None, metrics_IN = None ):
 
-    def __init__( self ):
+        '''
+        Reads the Record XML files in the archive folder (or, if
+            is_zip_file_IN is True, archive .zip file) at archive_path_IN and
+            returns a ProquestHNPArchiveIndex of them, in memory - it is not
+            saved.  For when an archive's saved index is missing or can't be
+            read, but its RecordIDs are needed (see find_duplicate_records()).
+        '''
 
-        # call parent's __init__()
-        super( ProquestHNPNewspaperHelper, self ).__init__()
+        # return reference
+        index_OUT = None
 
         # declare variables
-        self.request = None
-        self.parameters = ParamContainer()
-        
-        # rate limiting
-        self.is_rate_limited = False
-        
-        # information on proquest data files
-        self.paper_identifier = None
-        self.paper_start_year = None
-        self.paper_end_year = None
-        self.archive_identifier = None
-        self.source_all_papers_folder = None
-        self.source_paper_path = None
-        self.destination_all_papers_folder = None
-        self.destination_paper_path = None
-        self.did_destination_paper_path_exist = None
-        
-        # references to django model instances
-        self.phnp_newspaper = None
-        self.newspaper = None
-        
-        # metadata about article files
-        self.object_type_to_count_map = None
+        record_file_iterator = None
 
-        # define parameters - should do this in "child.__init__()".
-        self.define_parameters( self.PARAM_NAME_TO_TYPE_MAP )        
-        
-        # set logger name (for LoggingHelper parent class: (LoggingHelper --> ExceptionHelper --> BasicRateLimited --> ContextBase --> ContextTextBase).
-        self.set_logger_name( self.MY_LOGGER_NAME )
-        
-    #-- END method __init__() --#
+        index_OUT = ProquestHNPArchiveIndex()
+        index_OUT.manifest_dict = manifest_dict_IN
+        if ( is_zip_file_IN == True ):
 
+            record_file_iterator = cls.iterate_archive_zip_members( archive_path_IN, metrics_IN = metrics_IN )
 
-    def __str__( self ):
+        else:
 
-        # return reference
-        value_OUT = ""
-        
-        # declare variables
-        separator = ""
-        
-        if ( self.paper_identifier is not None ):
-        
-            value_OUT = "{}{}{}".format( value_OUT, separator, self.paper_identifier )
-            separator = " - "
-            
-        #-- END check if ID present --#
-        
-        if ( self.paper_start_year is not None ):
-        
-            value_OUT = "{} from {}".format( value_OUT, self.paper_start_year )
-            separator = " - "
-            
-        #-- END check if start year present --#
+            record_file_iterator = cls.iterate_archive_folder_files( archive_path_IN, metrics_IN = metrics_IN )
 
-        if ( self.paper_end_year is not None ):
-        
-            value_OUT = "{} to {}".format( value_OUT, self.paper_end_year )
-            separator = " - "
-            
-        #-- END check if end year present --#
-            
-        if ( self.source_paper_path is not None ):
-        
-            value_OUT = "{}{}source path: {}".format( value_OUT, separator, self.source_paper_path )
-            separator = " - "
-            
-        #-- END check if source path present --#
-            
-        if ( self.destination_paper_path is not None ):
-        
-            value_OUT = "{}{}dest path: {}".format( value_OUT, separator, self.destination_paper_path )
-            separator = " - "
-            
-        #-- END check if dest path present --#
-        
-        return value_OUT
-            
-    #-- END method __str__() --#
+        #-- END check to see if zip file --#
 
+        cls.summarize_record_files( record_file_iterator, metrics_IN = metrics_IN, index_IN = index_OUT )
 
-    #---------------------------------------------------------------------------
-    # ! ==> instance methods, in alphabetical order
-    #---------------------------------------------------------------------------
+        return index_OUT
 
+    #-- END class method build_archive_index() --#
+
+
+    @classmethod
+    def build_archive_manifest( cls, archive_path_IN, is_zip_file_IN = False ):
 
-    def create_PHNP_newspaper( self ):
-        
         '''
-        Instance must have paper_identifier set.  If set, start and end year and
-            source and destination paths will also be stored.
+        Builds a manifest of an archive's contents from file metadata only (no
+            file contents are read): XML file count, total bytes, newest
+            modification time (nanoseconds), and a fingerprint of the file
+            names, sizes and either modification times (folder) or CRCs (zip).
+            If the manifest stored on an archive's database record still
+            matches, the archive has not changed since it was summarized.
         '''
-        
+
         # return reference
-        instance_OUT = None
-        
+        manifest_dict_OUT = None
+
         # declare variables
-        me = "create_PHNP_newspaper"
-        log_message = None
-        paper_qs = None
-        paper_count = -1
-        phnp_newspaper_instance = None
-        paper_identifier = None
-        start_year = None
-        end_year = None
-        compressed_folder_path = None
-        uncompressed_folder_path = None
-        newspaper = None
-        notes = None
-        
-        # get data from instance
-        paper_identifier = self.paper_identifier
-        start_year = self.paper_start_year
-        end_year = self.paper_end_year
-        compressed_folder_path = self.source_paper_path
-        uncompressed_folder_path = self.destination_paper_path
-        newspaper = self.newspaper
-        
-        # try to retrieve from database
-        paper_qs = Proquest_HNP_Newspaper.objects.filter( paper_identifier = paper_identifier )
-        paper_count = paper_qs.count()
-        
-        # anything returned?
-        if ( paper_count == 0 ):
-        
-            # make a new instance
-            phnp_newspaper_instance = Proquest_HNP_Newspaper()
+        file_count = None
+        total_bytes = None
+        newest_mtime_ns = None
+        fingerprint_xor = None
+        fingerprint_sum = None
+        fingerprint_prefix = None
+        entry_crc = None
+        zip_file = None
+        zip_info = None
+        dir_entry = None
+        entry_stat = None
+
+        # init
+        file_count = 0
+        total_bytes = 0
+        newest_mtime_ns = 0
+        fingerprint_xor = 0
+        fingerprint_sum = 0
+
+        if ( is_zip_file_IN == True ):
+
+            # zip file - newest mtime is the zip's, CRCs come from the zip's
+            #     central directory.
+            fingerprint_prefix = "zip"
+            newest_mtime_ns = os.stat( archive_path_IN ).st_mtime_ns
+            with zipfile.ZipFile( archive_path_IN, "r" ) as zip_file:
+
+                for zip_info in zip_file.infolist():
+
+                    if ( ( zip_info.is_dir() == False ) and ( zip_info.filename.lower().endswith( cls.XML_FILE_EXTENSION ) == True ) ):
+
+                        file_count += 1
+                        total_bytes += zip_info.file_size
+                        entry_crc = zlib.crc32( "{}|{}|{}".format( zip_info.filename, zip_info.file_size, zip_info.CRC ).encode( "utf-8" ) )
+                        fingerprint_xor ^= entry_crc
+                        fingerprint_sum = ( fingerprint_sum + entry_crc ) & 0xFFFFFFFFFFFFFFFF
+
+                    #-- END check to see if XML file --#
+
+                #-- END loop over zip members --#
+
+            #-- END with ZipFile --#
 
-            # store information
-            phnp_newspaper_instance.paper_identifier = paper_identifier
-            phnp_newspaper_instance.start_year = start_year
-            phnp_newspaper_instance.end_year = end_year
-            phnp_newspaper_instance.compressed_folder_path = compressed_folder_path
-            phnp_newspaper_instance.uncompressed_folder_path = uncompressed_folder_path
-            phnp_newspaper_instance.newspaper = newspaper
-            
-            # save
-            phnp_newspaper_instance.save()
-                    
         else:
-            
-            log_message = "In {}: Proquest_HNP_Newspaper already exists for paper_identifier \"{}\".  Returning existing instance.".format( me, paper_identifier )
-            self.output_debug_message( log_message, do_print_IN = True )
-            phnp_newspaper_instance = paper_qs.get()
-            
-        #-- END check if exists --#
-            
-        # store in instance
-        self.phnp_newspaper = phnp_newspaper_instance
-        
-        # return
-        instance_OUT = self.phnp_newspaper
-        return instance_OUT
-        
-    #-- END method create_PHNP_newspaper() --#
-    
 
-    def get_archive_instance( self,
-                              archive_identifier_IN,
-                              compressed_file_path_IN = None,
-                              uncompressed_folder_path_IN = None,
-                              start_date_IN = None,
-                              end_date_IN = None,
-                              notes_IN = None ):
-        
-        # return reference
-        instance_OUT = None
+            # folder - stat each XML file.
+            fingerprint_prefix = "folder"
+            for dir_entry in cls.iterate_folder_entries( archive_path_IN, extension_IN = cls.XML_FILE_EXTENSION ):
 
-        # declare variables
-        me = "get_archive_instance"
-        newspaper_instance = None
-        archive_instance = None
+                entry_stat = dir_entry.stat()
+                file_count += 1
+                total_bytes += entry_stat.st_size
+                newest_mtime_ns = max( newest_mtime_ns, entry_stat.st_mtime_ns )
+                entry_crc = zlib.crc32( "{}|{}|{}".format( dir_entry.name, entry_stat.st_size, entry_stat.st_mtime_ns ).encode( "utf-8" ) )
+                fingerprint_xor ^= entry_crc
+                fingerprint_sum = ( fingerprint_sum + entry_crc ) & 0xFFFFFFFFFFFFFFFF
 
-        # get nested newspaper instance
-        newspaper_instance = self.phnp_newspaper
-        
-        # call static method
-        archive_instance = self.fetch_archive_instance( newspaper_instance,
-                                                        archive_identifier_IN,
-                                                        compressed_file_path_IN,
-                                                        uncompressed_folder_path_IN,
-                                                        start_date_IN,
-                                                        end_date_IN,
-                                                        notes_IN )
-        
-        instance_OUT = archive_instance
-        return instance_OUT
-        
-    #-- END class method get_archive_instance() --#
+            #-- END loop over XML files --#
 
+        #-- END check to see if zip file or folder --#
+
+        manifest_dict_OUT = {}
+        manifest_dict_OUT[ cls.ARCHIVE_MANIFEST_FILE_COUNT ] = file_count
+        manifest_dict_OUT[ cls.ARCHIVE_MANIFEST_TOTAL_BYTES ] = total_bytes
+        manifest_dict_OUT[ cls.ARCHIVE_MANIFEST_NEWEST_MTIME_NS ] = newest_mtime_ns
+        manifest_dict_OUT[ cls.ARCHIVE_MANIFEST_FINGERPRINT ] = "{}:{:08x}{:016x}".format( fingerprint_prefix, fingerprint_xor, fingerprint_sum )
+
+        return manifest_dict_OUT
+
+    #-- END class method build_archive_manifest() --#
+
+
+    @classmethod
+    def extract_archive_zip_file( cls, zip_file_path_IN, archive_folder_path_IN ):
 
-    def get_PHNP_newspaper( self ):
-        
         '''
-        Instance must have paper_identifier set.  If set, start and end year and
+        Extracts the archive .zip file at zip_file_path_IN to the folder
+            archive_folder_path_IN, atomically: files are extracted into a
+            temporary folder next to the destination, which is renamed to the
+            destination only after extraction succeeds.  On failure the
+            temporary folder is removed and the exception is re-raised.  Safe
+            to call from multiple threads at once for different archives.
+
+        Returns a dictionary of zip path, folder path, file count, compressed
+            and uncompressed bytes, seconds elapsed, and uncompressed MB/sec.
+        '''
+
+        # return reference
+        result_dict_OUT = None
+
+        # declare variables
+        parent_folder_path = None
+        archive_folder_name = None
+        partial_folder_path = None
+        zip_file = None
+        zip_info_list = None
+        zip_info = None
+        file_count = None
+        uncompressed_bytes = None
+        start_time = None
+        elapsed_seconds = None
+        mb_per_second = None
+
+        # make temporary folder in the same parent, so rename is atomic.
+        parent_folder_path, archive_folder_name = os.path.split( archive_folder_path_IN )
+        os.makedirs( parent_folder_path, exist_ok = True )
+        partial_folder_path = tempfile.mkdtemp( prefix = ".{}{}".format( archive_folder_name, cls.EXTRACT_PARTIAL_FOLDER_SUFFIX ), dir = parent_folder_path )
+
+        start_time = time.time()
+        try:
+
+            with zipfile.ZipFile( zip_file_path_IN, "r" ) as zip_file:
+
+                # unzip to temporary folder.
+                zip_info_list = zip_file.infolist()
+                zip_file.extractall( partial_folder_path )
+
+            #-- END with ZipFile --#
+
+            # mkdtemp() creates the folder 0700 - make it like any other.
+            os.chmod( partial_folder_path, 0o755 )
+
+            # move into place.
+            os.rename( partial_folder_path, archive_folder_path_IN )
+
+        except Exception as e:
+
+            # clean up, then pass the error along.
+            shutil.rmtree( partial_folder_path, ignore_errors = True )
+            raise
+
+        #-- END try-except --#
+
+        elapsed_seconds = time.time() - start_time
+
+        # throughput
+        file_count = 0
+        uncompressed_bytes = 0
+        for zip_info in zip_info_list:
+
+            if ( zip_info.is_dir() == False ):
+
+                file_count += 1
+                uncompressed_bytes += zip_info.file_size
+
+            #-- END check to see if file --#
+
+        #-- END loop over zip members --#
+
+        mb_per_second = None
+        if ( elapsed_seconds > 0 ):
+
+            mb_per_second = ( uncompressed_bytes / ( 1024 * 1024 ) ) / elapsed_seconds
+
+        #-- END check to see if any time elapsed --#
+
+        result_dict_OUT = {}
+        result_dict_OUT[ cls.EXTRACT_RESULT_ZIP_FILE_PATH ] = zip_file_path_IN
+        result_dict_OUT[ cls.EXTRACT_RESULT_FOLDER_PATH ] = archive_folder_path_IN
+        result_dict_OUT[ cls.EXTRACT_RESULT_FILE_COUNT ] = file_count
+        result_dict_OUT[ cls.EXTRACT_RESULT_COMPRESSED_BYTES ] = os.path.getsize( zip_file_path_IN )
+        result_dict_OUT[ cls.EXTRACT_RESULT_UNCOMPRESSED_BYTES ] = uncompressed_bytes
+        result_dict_OUT[ cls.EXTRACT_RESULT_SECONDS ] = elapsed_seconds
+        result_dict_OUT[ cls.EXTRACT_RESULT_MB_PER_SECOND ] = mb_per_second
+
+        return result_dict_OUT
+
+    #-- END class method extract_archive_zip_file() --#
+
+
+    @classmethod
+    def extract_record_fields( cls, xml_source_IN, field_name_list_IN ):
+
+        '''
+        Accepts a Record XML file (path or file-like object opened in binary
+            mode) and a list of fields to pull from it.  Field names are
+            element paths relative to the <Record> root ("ObjectType",
+            "Contributor/OriginalForm").  Streams the file with iterparse
+            rather than building a dict of the whole record, and stops reading
+            once every requested field has been seen and the parser has moved
+            past it (elements that repeat, like ObjectType, are contiguous in
+            HNP records), so a trailing <FullText> is never read when it is not
+            asked for.
+
+        Returns None if the root element is not <Record>, else a dictionary of
+            field name to the list of text values found for it, in document
+            order (empty list if the field is not present).
+        '''
+
+        # return reference
+        field_to_value_list_map_OUT = None
+
+        # declare variables
+        field_to_value_list_map = None
+        open_field_set = None
+        field_name = None
+        field_top_element_map = None
+        element_stack = None
+        event = None
+        element = None
+        element_name = None
+        element_path = None
+        root_element = None
+        is_record = None
+
+        # init
+        field_to_value_list_map = {}
+        open_field_set = set( field_name_list_IN )
+        field_top_element_map = {}
+        for field_name in field_name_list_IN:
+
+            # start with empty value list, remember top-level element.
+            field_to_value_list_map[ field_name ] = []
+            field_top_element_map[ field_name ] = field_name.split( cls.RECORD_FIELD_PATH_SEPARATOR )[ 0 ]
+
+        #-- END loop over field names --#
+
+        element_stack = []
+        is_record = False
+        for event, element in ElementTree.iterparse( xml_source_IN, events = ( "start", "end" ) ):
+
+            # strip namespace, if present.
+            element_name = element.tag
+            if ( "}" in element_name ):
+
+                element_name = element_name.split( "}", 1 )[ 1 ]
+
+            #-- END check for namespace --#
+
+            if ( event == "start" ):
+
+                # root?
+                if ( len( element_stack ) == 0 ):
+
+                    # Record?
+                    root_element = element
+                    if ( element_name != cls.RECORD_ROOT_ELEMENT ):
+
+                        # not a Record - nothing to extract.
+                        break
+
+                    #-- END check to see if Record --#
+
+                    is_record = True
+
+                elif ( len( element_stack ) == 1 ):
+
+                    # new child of Record - any found field with a different
+                    #     top-level element is now complete.
+                    for field_name in list( open_field_set ):
+
+                        if ( ( len( field_to_value_list_map[ field_name ] ) > 0 )
+                            and ( field_top_element_map[ field_name ] != element_name ) ):
+
+                            open_field_set.discard( field_name )
+
+                        #-- END check to see if field is complete --#
+
+                    #-- END loop over open fields --#
+
+                    # got everything?
+                    if ( len( open_field_set ) == 0 ):
+
+                        # yes - stop reading.
+                        break
+
+                    #-- END check to see if all fields found --#
+
+                #-- END check to see how deep we are --#
+
+                element_stack.append( element_name )
+
+            else:
+
+                # end of an element - one we want?
+                element_path = cls.RECORD_FIELD_PATH_SEPARATOR.join( element_stack[ 1 : ] )
+                if ( element_path in field_to_value_list_map ):
+
+                    field_to_value_list_map[ element_path ].append( "".join( element.itertext() ) )
+
+                #-- END check to see if wanted field --#
+
+                element_stack.pop()
+
+                # done with a child of Record?  Free it.
+                if ( len( element_stack ) == 1 ):
+
+                    root_element.clear()
+
+                #-- END check to see if child of Record --#
+
+            #-- END check to see which event --#
+
+        #-- END loop over parse events --#
+
+        if ( is_record == True ):
+
+            field_to_value_list_map_OUT = field_to_value_list_map
+
+        #-- END check to see if Record --#
+
+        return field_to_value_list_map_OUT
+
+    #-- END class method extract_record_fields() --#
+
+
+    @classmethod
+    def iterate_archive_folder_files( cls, archive_path_IN, metrics_IN = None ):
+
+        '''
+        Generator - for each XML file in the archive folder at archive_path_IN,
+            opens the file in binary mode and yields a tuple of file path, file
+            object, and file size in bytes.  The file is closed when the next
+            file is requested.  Files are listed as they are read (see
+            iterate_folder_entries()), so the first file is yielded right away.
+            If a ProquestHNPMetrics is passed in, listing the folder is timed
+            as "list" and opening each file as "read".
+        '''
+
+        # declare variables
+        dir_entry = None
+        xml_file = None
+        start_time = None
+
+        for dir_entry in cls.iterate_folder_entries( archive_path_IN, extension_IN = cls.XML_FILE_EXTENSION, metrics_IN = metrics_IN ):
+
+            start_time = time.perf_counter()
+            with open( dir_entry.path, "rb" ) as xml_file:
+
+                if ( metrics_IN is not None ):
+
+                    metrics_IN.add_time( ProquestHNPMetrics.PHASE_READ, time.perf_counter() - start_time )
+
+                #-- END check to see if metrics --#
+
+                yield ( dir_entry.path, xml_file, dir_entry.stat().st_size )
+
+            #-- END with open( dir_entry.path )...: --#
+
+        #-- END loop over XML files --#
+
+    #-- END class method iterate_archive_folder_files() --#
+
+
+    @classmethod
+    def iterate_archive_read_ahead( cls, archive_path_IN, is_zip_file_IN = False, read_ahead_count_IN = ProquestHNPReadAhead.DEFAULT_READ_AHEAD_COUNT, metrics_IN = None ):
+
+        '''
+        Generator - like iterate_archive_folder_files() (or, if is_zip_file_IN
+            is True, iterate_archive_zip_members()), but the files are read in
+            a ProquestHNPReadAhead pipeline, up to read_ahead_count_IN files
+            ahead of the consumer, so reads overlap with parsing.  Each file
+            is yielded as an in-memory binary file object.  If a
+            ProquestHNPMetrics is passed in, listing is timed as "list", and
+            time spent waiting on reads that were not done yet as "read".
+        '''
+
+        # declare variables
+        read_ahead = None
+        zip_file = None
+        zip_info_list = None
+        start_time = None
+
+        read_ahead = ProquestHNPReadAhead( read_ahead_count_IN = read_ahead_count_IN, metrics_IN = metrics_IN )
+        if ( is_zip_file_IN == True ):
+
+            # zip stays open until every read is done.
+            start_time = time.perf_counter()
+            with zipfile.ZipFile( archive_path_IN, "r" ) as zip_file:
+
+                zip_info_list = [ zip_info for zip_info in zip_file.infolist() if ( ( zip_info.is_dir() == False ) and ( zip_info.filename.lower().endswith( cls.XML_FILE_EXTENSION ) == True ) ) ]
+                if ( metrics_IN is not None ):
+
+                    metrics_IN.add_time( ProquestHNPMetrics.PHASE_LIST, time.perf_counter() - start_time )
+
+                #-- END check to see if metrics --#
+
+                yield from read_ahead.iterate( ( zip_info.filename, zip_info.file_size, functools.partial( zip_file.read, zip_info ) ) for zip_info in zip_info_list )
+
+            #-- END with ZipFile --#
+
+        else:
+
+            # no stat() here - size comes from the bytes, once read, so the
+            #     only disk access in this thread is the listing.
+            yield from read_ahead.iterate( ( dir_entry.path, None, functools.partial( ProquestHNPReadAhead.read_file, dir_entry.path ) )
+                                           for dir_entry in cls.iterate_folder_entries( archive_path_IN, extension_IN = cls.XML_FILE_EXTENSION, metrics_IN = metrics_IN ) )
+
+        #-- END check to see if zip file --#
+
+    #-- END class method iterate_archive_read_ahead() --#
+
+
+    @classmethod
+    def iterate_archive_zip_members( cls, zip_file_path_IN, metrics_IN = None ):
+
+        '''
+        Generator - for each XML file inside the archive .zip file at
+            zip_file_path_IN, opens the member for streaming (nothing is
+            written to disk) and yields a tuple of member name, file object,
+            and uncompressed size in bytes.  The member is closed when the next
+            one is requested.  If a
+            ProquestHNPMetrics is passed in, opening the zip and reading its
+            member list is timed as "list" and opening each member as "read".
+        '''
+
+        # declare variables
+        zip_file = None
+        zip_info_list = None
+        zip_info = None
+        xml_file = None
+        start_time = None
+
+        start_time = time.perf_counter()
+        with zipfile.ZipFile( zip_file_path_IN, "r" ) as zip_file:
+
+            zip_info_list = zip_file.infolist()
+            if ( metrics_IN is not None ):
+
+                metrics_IN.add_time( ProquestHNPMetrics.PHASE_LIST, time.perf_counter() - start_time )
+
+            #-- END check to see if metrics --#
+
+            for zip_info in zip_info_list:
+
+                # only XML files.
+                if ( ( zip_info.is_dir() == False ) and ( zip_info.filename.lower().endswith( cls.XML_FILE_EXTENSION ) == True ) ):
+
+                    start_time = time.perf_counter()
+                    with zip_file.open( zip_info, "r" ) as xml_file:
+
+                        if ( metrics_IN is not None ):
+
+                            metrics_IN.add_time( ProquestHNPMetrics.PHASE_READ, time.perf_counter() - start_time )
+
+                        #-- END check to see if metrics --#
+
+                        yield ( zip_info.filename, xml_file, zip_info.file_size )
+
+                    #-- END with zip_file.open() --#
+
+                #-- END check to see if XML file --#
+
+            #-- END loop over zip members --#
+
+        #-- END with ZipFile --#
+
+    #-- END class method iterate_archive_zip_members() --#
+
+
+    @classmethod
+    def iterate_folder_entries( cls,
+                                folder_path_IN,
+                                extension_IN = None,
+                                name_prefix_IN = None,
+                                folders_only_IN = False,
+                                include_hidden_IN = False,
+                                metrics_IN = None,
+                                archive_identifier_IN = None ):
+
+        '''
+        Generator - streams the entries in a folder with os.scandir(), and
+            yields the os.DirEntry for each one that matches, in the order the
+            file system returns them (not sorted).  Nothing is listed ahead of
+            time, and each entry's stat() (size, mtime) is cached, and free on
+            some platforms.  Filters:
+            - extension_IN - only files whose names end with it (ignoring case,
+                ".xml" or ".zip", say).
+            - name_prefix_IN - only entries whose names start with it (a
+                paper's archive_file_name_prefix, say).
+            - folders_only_IN - only folders.
+            - include_hidden_IN - if False, skips names that start with ".".
+            Like glob, yields nothing if the folder does not exist.
+            If a ProquestHNPMetrics is passed in, time spent listing (not time
+            spent by the caller between entries) is added to "list" once the
+            generator finishes or is closed, under archive_identifier_IN if one
+            is passed in.
+        '''
+
+        # declare variables
+        extension = None
+        dir_entry_iterator = None
+        dir_entry = None
+        entry_name = None
+        is_match = None
+        start_time = None
+        list_seconds = None
+
+        # init
+        if ( extension_IN is not None ):
+
+            extension = extension_IN.lower()
+
+        #-- END check to see if extension --#
+
+        list_seconds = 0.0
+        start_time = time.perf_counter()
+        try:
+
+            if ( os.path.isdir( folder_path_IN ) == True ):
+
+                with os.scandir( folder_path_IN ) as dir_entry_iterator:
+
+                    for dir_entry in dir_entry_iterator:
+
+                        entry_name = dir_entry.name
+                        is_match = True
+                        if ( ( include_hidden_IN == False ) and ( entry_name.startswith( "." ) == True ) ):
+
+                            is_match = False
+
+                        elif ( ( name_prefix_IN is not None ) and ( name_prefix_IN != "" ) and ( entry_name.startswith( name_prefix_IN ) == False ) ):
+
+                            is_match = False
+
+                        elif ( ( extension is not None ) and ( ( entry_name.lower().endswith( extension ) == False ) or ( dir_entry.is_file() == False ) ) ):
+
+                            is_match = False
+
+                        elif ( ( folders_only_IN == True ) and ( dir_entry.is_dir() == False ) ):
+
+                            is_match = False
+
+                        #-- END checks to see if entry matches --#
+
+                        if ( is_match == True ):
+
+                            list_seconds += time.perf_counter() - start_time
+                            yield dir_entry
+                            start_time = time.perf_counter()
+
+                        #-- END check to see if entry matches --#
+
+                    #-- END loop over entries --#
+
+                #-- END with os.scandir() --#
+
+            #-- END check to see if folder exists --#
+
+            list_seconds += time.perf_counter() - start_time
+
+        finally:
+
+            if ( metrics_IN is not None ):
+
+                metrics_IN.add_time( ProquestHNPMetrics.PHASE_LIST, list_seconds, archive_identifier_IN )
+
+            #-- END check to see if metrics --#
+
+        #-- END try-finally --#
+
+    #-- END class method iterate_folder_entries() --#
+
+
+    @classmethod
+    def load_archive_index( cls, archive_path_IN, is_zip_file_IN = False, check_manifest_IN = True, manifest_dict_IN = None, index_folder_path_IN = None ):
+
+        '''
+        Loads the ProquestHNPArchiveIndex written when the archive folder or
+            archive .zip file at archive_path_IN was last summarized (to
+            index_folder_path_IN, if passed in - see save_archive_index()).  If
+            check_manifest_IN is True, the index is only returned if the
+            archive has not changed since (see build_archive_manifest()) -
+            pass the archive's current manifest in manifest_dict_IN if you
+            already have it, so it is not built again.  Returns None if there
+            is no index, or it is out of date.
+        '''
+
+        # return reference
+        index_OUT = None
+
+        # declare variables
+        archive_index = None
+        manifest_dict = None
+
+        archive_index = ProquestHNPArchiveIndex.load( ProquestHNPArchiveIndex.get_index_file_path( archive_path_IN, index_folder_path_IN = index_folder_path_IN ) )
+        if ( archive_index is not None ):
+
+            if ( check_manifest_IN == True ):
+
+                manifest_dict = manifest_dict_IN
+                if ( manifest_dict is None ):
+
+                    manifest_dict = cls.build_archive_manifest( archive_path_IN, is_zip_file_IN = is_zip_file_IN )
+
+                #-- END check to see if manifest passed in --#
+
+                if ( archive_index.manifest_dict == manifest_dict ):
+
+                    index_OUT = archive_index
+
+                #-- END check to see if index is current --#
+
+            else:
+
+                index_OUT = archive_index
+
+            #-- END check to see if checking manifest --#
+
+        #-- END check to see if index found --#
+
+        return index_OUT
+
+    #-- END class method load_archive_index() --#
+
+
+    @classmethod
+    def save_archive_index( cls, archive_index_IN, archive_path_IN, metrics_IN = None, index_folder_path_IN = None ):
+
+        '''
+        Saves an archive's ProquestHNPArchiveIndex for the archive folder or
+            .zip file at archive_path_IN in index_folder_path_IN (created if
+            needed), or, if no folder passed in, next to the archive (see
+            ProquestHNPArchiveIndex.get_index_file_path()), timed as
+            "index_write" if a ProquestHNPMetrics is passed in.  The index is
+            optional, so if it can't be written (read-only or full file
+            system, etc.), the error is logged and the archive is treated as
+            having no index.  Returns the path of the index file, or None if
+            no index passed in or it could not be written.
+        '''
+
+        # return reference
+        path_OUT = None
+
+        # declare variables
+        me = "save_archive_index"
+        log_message = None
+        index_file_path = None
+        start_time = None
+
+        if ( archive_index_IN is not None ):
+
+            start_time = time.perf_counter()
+            index_file_path = ProquestHNPArchiveIndex.get_index_file_path( archive_path_IN, index_folder_path_IN = index_folder_path_IN )
+            try:
+
+                os.makedirs( os.path.dirname( os.path.abspath( index_file_path ) ), exist_ok = True )
+                archive_index_IN.save( index_file_path )
+                path_OUT = index_file_path
+
+            except OSError as ose:
+
+                # no index for this archive - not fatal.
+                log_message = "ERROR - could not write archive index {}, so archive {} has no index.".format( index_file_path, archive_path_IN )
+                cls.log_exception( ose,
+                                   message_IN = log_message,
+                                   method_IN = me,
+                                   logger_name_IN = cls.MY_LOGGER_NAME,
+                                   do_print_IN = True )
+
+            #-- END try-except --#
+
+            if ( metrics_IN is not None ):
+
+                metrics_IN.add_time( ProquestHNPMetrics.PHASE_INDEX_WRITE, time.perf_counter() - start_time )
+
+            #-- END check to see if metrics --#
+
+        #-- END check to see if index passed in --#
+
+        return path_OUT
+
+    #-- END class method save_archive_index() --#
+
+
+    @classmethod
+    def summarize_archive_folder( cls, archive_path_IN, write_index_IN = True, read_ahead_count_IN = DEFAULT_READ_AHEAD_COUNT, manifest_dict_IN = None, index_folder_path_IN = None ):
+
+        '''
+        Summarizes the XML files in the archive folder at archive_path_IN.  See
+            summarize_record_files().  If write_index_IN is True, also writes
+            the archive's ProquestHNPArchiveIndex, to index_folder_path_IN if
+            passed in (see save_archive_index()).
+            If read_ahead_count_IN is greater than 0, files are read that far
+            ahead of parsing (see iterate_archive_read_ahead()).  If the
+            caller already built the archive's manifest (see
+            build_archive_manifest()) before reading, pass it in
+            manifest_dict_IN, else it is built here.
+        '''
+
+        # return reference
+        summary_dict_OUT = None
+
+        # declare variables
+        manifest_dict = None
+        metrics = None
+        archive_index = None
+        record_file_iterator = None
+
+        # take manifest before reading, so changes made while we read get
+        #     picked up next time.
+        metrics = ProquestHNPMetrics()
+        manifest_dict = manifest_dict_IN
+        if ( manifest_dict is None ):
+
+            with metrics.time_phase( ProquestHNPMetrics.PHASE_LIST ):
+
+                manifest_dict = cls.build_archive_manifest( archive_path_IN )
+
+            #-- END with metrics.time_phase() --#
+
+        #-- END check to see if manifest passed in --#
+
+        # build the archive's index as we go?
+        if ( write_index_IN == True ):
+
+            archive_index = ProquestHNPArchiveIndex()
+            archive_index.manifest_dict = manifest_dict
+
+        #-- END check to see if writing index --#
+
+        if ( ( read_ahead_count_IN is not None ) and ( read_ahead_count_IN > 0 ) ):
+
+            record_file_iterator = cls.iterate_archive_read_ahead( archive_path_IN, read_ahead_count_IN = read_ahead_count_IN, metrics_IN = metrics )
+
+        else:
+
+            record_file_iterator = cls.iterate_archive_folder_files( archive_path_IN, metrics_IN = metrics )
+
+        #-- END check to see if reading ahead --#
+
+        summary_dict_OUT = cls.summarize_record_files( record_file_iterator, metrics_IN = metrics, index_IN = archive_index )
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_MANIFEST ] = manifest_dict
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_INDEX_FILE_PATH ] = cls.save_archive_index( archive_index, archive_path_IN, metrics_IN = metrics, index_folder_path_IN = index_folder_path_IN )
+
+        return summary_dict_OUT
+
+    #-- END class method summarize_archive_folder() --#
+
+
+    @classmethod
+    def summarize_archive_zip( cls, zip_file_path_IN, write_index_IN = True, read_ahead_count_IN = DEFAULT_READ_AHEAD_COUNT, manifest_dict_IN = None, index_folder_path_IN = None ):
+
+        '''
+        Summarizes the XML files inside the archive .zip file at
+            zip_file_path_IN, reading them straight from the zip.  See
+            summarize_record_files() and summarize_archive_folder().
+        '''
+
+        # return reference
+        summary_dict_OUT = None
+
+        # declare variables
+        manifest_dict = None
+        metrics = None
+        archive_index = None
+        record_file_iterator = None
+
+        # take manifest before reading, so changes made while we read get
+        #     picked up next time.
+        metrics = ProquestHNPMetrics()
+        manifest_dict = manifest_dict_IN
+        if ( manifest_dict is None ):
+
+            with metrics.time_phase( ProquestHNPMetrics.PHASE_LIST ):
+
+                manifest_dict = cls.build_archive_manifest( zip_file_path_IN, is_zip_file_IN = True )
+
+            #-- END with metrics.time_phase() --#
+
+        #-- END check to see if manifest passed in --#
+
+        # build the archive's index as we go?
+        if ( write_index_IN == True ):
+
+            archive_index = ProquestHNPArchiveIndex()
+            archive_index.manifest_dict = manifest_dict
+
+        #-- END check to see if writing index --#
+
+        if ( ( read_ahead_count_IN is not None ) and ( read_ahead_count_IN > 0 ) ):
+
+            record_file_iterator = cls.iterate_archive_read_ahead( zip_file_path_IN, is_zip_file_IN = True, read_ahead_count_IN = read_ahead_count_IN, metrics_IN = metrics )
+
+        else:
+
+            record_file_iterator = cls.iterate_archive_zip_members( zip_file_path_IN, metrics_IN = metrics )
+
+        #-- END check to see if reading ahead --#
+
+        summary_dict_OUT = cls.summarize_record_files( record_file_iterator, metrics_IN = metrics, index_IN = archive_index )
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_MANIFEST ] = manifest_dict
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_INDEX_FILE_PATH ] = cls.save_archive_index( archive_index, zip_file_path_IN, metrics_IN = metrics, index_folder_path_IN = index_folder_path_IN )
+
+        return summary_dict_OUT
+
+    #-- END class method summarize_archive_zip() --#
+
+
+    @classmethod
+    def summarize_record_files( cls, record_file_iterator_IN, metrics_IN = None, index_IN = None ):
+
+        '''
+        Accepts an iterator over ( name, binary file object, size ) tuples for the
+            Record XML files in an archive (see iterate_archive_folder_files()
+            and iterate_archive_zip_members()) and returns a summary
+            dictionary: ObjectType value to count map, min and max
+            NumericPubDate (as ints, YYYYMMDD), audit counters, and metrics
+            (time spent reading, parsing, and aggregating, recorded in
+            metrics_IN if passed in, else in a new ProquestHNPMetrics).  If a
+            ProquestHNPArchiveIndex is passed in, adds a row to it for each
+            Record.  Does not touch the database, so it is safe to run in a
+            worker process - see store_archive_summary() to save the results.
+            
+        Each Record's type and date are collected into arrays, and the counts
+            and date range are computed from them in one batch at the end (see
+            ProquestHNPAggregator).  Only that final count is vectorized (with
+            numpy, if installed) - each Record still costs a Python type ID
+            lookup and two array appends, which is small next to parsing it.
+        '''
+
+        # return reference
+        summary_dict_OUT = None
+
+        # declare variables
+        xml_file_path = None
+        xml_file = None
+        xml_file_size = None
+        xml_file_counter = None
+
+        # declare variables - within XML file
+        record_field_map = None
+        object_type_list = None
+        object_type = None
+        numeric_pub_date_list = None
+        numeric_pub_date = None
+        numeric_pub_date_int = None
+        record_id = None
+
+        # declare variables - summary information
+        object_type_to_count_map = None
+        aggregator = None
+        type_id_array = None
+        pub_date_array = None
+        min_pub_date_int = None
+        max_pub_date_int = None
+
+        # declare variables - auditing
+        no_record_counter = None
+        no_object_type_counter = None
+        no_object_type_text_counter = None
+        bad_pub_date_counter = None
+
+        # declare variables - metrics
+        metrics = None
+        metered_file = None
+        start_time = None
+        parsed_time = None
+        bytes_read = None
+
+        # init
+        aggregator = ProquestHNPAggregator()
+        type_id_array = array.array( ProquestHNPAggregator.TYPECODE )
+        pub_date_array = array.array( ProquestHNPAggregator.TYPECODE )
+        metrics = metrics_IN
+        if ( metrics is None ):
+
+            metrics = ProquestHNPMetrics()
+
+        #-- END check to see if metrics passed in --#
+
+        # loop
+        xml_file_counter = 0
+        no_record_counter = 0
+        no_object_type_counter = 0
+        no_object_type_text_counter = 0
+        bad_pub_date_counter = 0
+        bytes_read = 0
+        for xml_file_path, xml_file, xml_file_size in record_file_iterator_IN:
+
+            xml_file_counter += 1
+
+            # stream just the fields we need out of the XML (time spent
+            #     waiting on read() is "read", the rest is "parse").
+            metered_file = MeteredReader( xml_file )
+            start_time = time.perf_counter()
+            record_field_map = cls.extract_record_fields( metered_file, cls.RECORD_SUMMARY_FIELD_LIST )
+            parsed_time = time.perf_counter()
+            metrics.add_time( ProquestHNPMetrics.PHASE_READ, metered_file.read_seconds, count_IN = 0 )
+            metrics.add_time( ProquestHNPMetrics.PHASE_PARSE, ( parsed_time - start_time ) - metered_file.read_seconds )
+            bytes_read += metered_file.byte_count
+
+            if ( record_field_map is not None ):
+
+                # get object type - multiple <ObjectType> elements are
+                #     joined with "|".
+                object_type_list = record_field_map.get( cls.RECORD_FIELD_OBJECT_TYPE, [] )
+                object_type = cls.OBJECT_TYPE_VALUE_SEPARATOR.join( object_type_list )
+
+                # got a type?
+                if ( len( object_type_list ) == 0 ):
+
+                    # no ObjectType element
+                    no_object_type_counter += 1
+
+                elif ( object_type == "" ):
+
+                    # ObjectType element(s), but no value
+                    no_object_type_text_counter += 1
+
+                #-- END check for type value (counted from type_id_array below) --#
+
+                # get NumericPubDate
+                numeric_pub_date_int = None
+                numeric_pub_date_list = record_field_map.get( cls.RECORD_FIELD_NUMERIC_PUB_DATE, [] )
+                numeric_pub_date = "".join( numeric_pub_date_list ).strip()
+                if ( numeric_pub_date != "" ):
+
+                    # malformed date = no date (same as
+                    #     ProquestHNPArticleLoader.build_article()) - one bad
+                    #     Record should not abort the archive.
+                    try:
+
+                        numeric_pub_date_int = int( numeric_pub_date )
+                        datetime.date( numeric_pub_date_int // 10000, ( numeric_pub_date_int // 100 ) % 100, numeric_pub_date_int % 100 )
+
+                    except ValueError:
+
+                        numeric_pub_date_int = None
+                        bad_pub_date_counter += 1
+
+                    #-- END try to parse NumericPubDate --#
+
+                #-- END check to see if NumericPubDate --#
+
+                # add to batch.
+                type_id_array.append( aggregator.get_type_id( object_type ) )
+                pub_date_array.append( numeric_pub_date_int if ( numeric_pub_date_int is not None ) else ProquestHNPAggregator.NO_PUB_DATE )
+
+                # index it?
+                if ( index_IN is not None ):
+
+                    record_id = "".join( record_field_map.get( cls.RECORD_FIELD_RECORD_ID, [] ) ).strip()
+                    index_IN.add_record( xml_file_path,
+                                         xml_file_size,
+                                         record_id_IN = record_id if ( record_id != "" ) else None,
+                                         object_type_IN = object_type,
+                                         pub_date_int_IN = numeric_pub_date_int )
+
+                #-- END check to see if indexing --#
+
+            else:
+
+                # increment counter
+                no_record_counter += 1
+
+            #-- END check if we found a "Record" node in root --#
+
+            metrics.add_time( ProquestHNPMetrics.PHASE_AGGREGATE, time.perf_counter() - parsed_time )
+
+        #-- END loop over XML files --#
+
+        # counts and date range, in one batch.
+        with metrics.time_phase( ProquestHNPMetrics.PHASE_AGGREGATE ):
+
+            aggregator.add_batch( type_id_array, pub_date_array )
+            object_type_to_count_map = aggregator.get_type_counts()
+            min_pub_date_int, max_pub_date_int = aggregator.get_pub_date_range()
+
+        #-- END with metrics.time_phase() --#
+
+        metrics.increment( ProquestHNPMetrics.COUNTER_FILES, xml_file_counter )
+        metrics.increment( ProquestHNPMetrics.COUNTER_BYTES_READ, bytes_read )
+        metrics.increment( ProquestHNPMetrics.COUNTER_NO_RECORD, no_record_counter )
+        metrics.increment( ProquestHNPMetrics.COUNTER_BAD_PUB_DATE, bad_pub_date_counter )
+
+        # store information in summary
+        summary_dict_OUT = {}
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP ] = object_type_to_count_map
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_MIN_PUB_DATE ] = min_pub_date_int
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_MAX_PUB_DATE ] = max_pub_date_int
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_FILE_COUNT ] = xml_file_counter
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_NO_RECORD_COUNT ] = no_record_counter
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_NO_OBJECT_TYPE_COUNT ] = no_object_type_counter
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_NO_OBJECT_TYPE_VALUE_COUNT ] = no_object_type_text_counter
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_MANIFEST ] = None
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_IS_UNCHANGED ] = False
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_INSTANCE ] = None
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_METRICS ] = metrics.get_totals_dict()
+        summary_dict_OUT[ cls.ARCHIVE_SUMMARY_INDEX_FILE_PATH ] = None
+
+        return summary_dict_OUT
+
+    #-- END class method summarize_record_files() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # call parent's __init__()
+        super( ProquestHNPNewspaperHelper, self ).__init__()
+
+        # declare variables
+        self.request = None
+        self.parameters = ParamContainer()
+        
+        # rate limiting
+        self.is_rate_limited = False
+        
+        # logging - if quiet, progress messages are not printed (errors still
+        #     are), and are only built if the logger has DEBUG enabled.
+        self.is_quiet = False
+        
+        # metrics for the last run (see get_metrics_dict()) - if a path is
+        #     set, they are also appended to it as JSON lines.
+        self.metrics = ProquestHNPMetrics()
+        self.metrics_json_lines_file_path = None
+        
+        # write a ProquestHNPArchiveIndex for each archive as it is summarized?
+        #     Indexes go in archive_index_folder_path if set, else next to the
+        #     archive folders in destination_paper_path (see
+        #     get_archive_index_folder_path()) - never in the delivery folder.
+        self.write_archive_index = True
+        self.archive_index_folder_path = None
+        
+        # archive database writes are queued and committed in one transaction
+        #     per this many archives (see queue_archive_summary()).
+        self.archive_write_batch_size = self.DEFAULT_ARCHIVE_WRITE_BATCH_SIZE
+        self.pending_archive_write_list = []
+        
+        # read Record files this many ahead of parsing (0 = off - see
+        #     iterate_archive_read_ahead()).
+        self.read_ahead_count = self.DEFAULT_READ_AHEAD_COUNT
+        
+        # record finished archives in a Proquest_HNP_Checkpoint, so an
+        #     interrupted run picks up where it left off (see get_checkpoint())?
+        #     Runs idle longer than checkpoint_max_age (None = no limit) are not
+        #     resumed.
+        self.use_checkpoints = True
+        self.checkpoint_max_age = self.DEFAULT_CHECKPOINT_MAX_AGE
+        self.checkpoint = None
+        self.checkpoint_archive_identifier_set = set()
+        
+        # leave Records whose RecordID is in an earlier archive out of the
+        #     paper-level counts (see find_duplicate_records())?  Off by
+        #     default, so paper counts are the sum of the archive counts.
+        self.skip_duplicate_records = False
+        
+        # information on proquest data files
+        self.paper_identifier = None
+        self.paper_start_year = None
+        self.paper_end_year = None
+        self.archive_identifier = None
+        self.source_all_papers_folder = None
+        self.source_paper_path = None
+        self.destination_all_papers_folder = None
+        self.destination_paper_path = None
+        self.did_destination_paper_path_exist = None
+        self.archive_file_name_prefix = None
+        
+        # references to django model instances
+        self.phnp_newspaper = None
+        self.newspaper = None
+        
+        # metadata about article files
+        self.object_type_to_count_map = None
+        self.min_pub_date_int = None
+        self.max_pub_date_int = None
+
+        # define parameters - should do this in "child.__init__()".
+        self.define_parameters( self.PARAM_NAME_TO_TYPE_MAP )        
+        
+        # set logger name (for LoggingHelper parent class: (LoggingHelper --> ExceptionHelper --> BasicRateLimited --> ContextBase --> ContextTextBase).
+        self.set_logger_name( self.MY_LOGGER_NAME )
+        
+    #-- END method __init__() --#
+
+
+    def __str__( self ):
+
+        # return reference
+        value_OUT = ""
+        
+        # declare variables
+        separator = ""
+        
+        if ( self.paper_identifier is not None ):
+        
+            value_OUT = "{}{}{}".format( value_OUT, separator, self.paper_identifier )
+            separator = " - "
+            
+        #-- END check if ID present --#
+        
+        if ( self.paper_start_year is not None ):
+        
+            value_OUT = "{} from {}".format( value_OUT, self.paper_start_year )
+            separator = " - "
+            
+        #-- END check if start year present --#
+
+        if ( self.paper_end_year is not None ):
+        
+            value_OUT = "{} to {}".format( value_OUT, self.paper_end_year )
+            separator = " - "
+            
+        #-- END check if end year present --#
+            
+        if ( self.source_paper_path is not None ):
+        
+            value_OUT = "{}{}source path: {}".format( value_OUT, separator, self.source_paper_path )
+            separator = " - "
+            
+        #-- END check if source path present --#
+            
+        if ( self.destination_paper_path is not None ):
+        
+            value_OUT = "{}{}dest path: {}".format( value_OUT, separator, self.destination_paper_path )
+            separator = " - "
+            
+        #-- END check if dest path present --#
+        
+        return value_OUT
+            
+    #-- END method __str__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def aggregate_paper_indexes( self, use_zip_files_IN = False ):
+        
+        '''
+        Rolls up the paper from its archive indexes (see load_archive_index()),
+            without reading any XML: per-type counts, pub date range, year and
+            month histograms, and a type-by-year crosstab (see
+            ProquestHNPAggregator.get_summary()).  Looks at the archive folders
+            in destination_paper_path, or, if use_zip_files_IN is True, the
+            archive .zip files in source_paper_path.  Archives with no current
+            index are left out and logged.
+        '''
+        
+        # return reference
+        summary_dict_OUT = None
+        
+        # declare variables
+        me = "aggregate_paper_indexes"
+        log_message = None
+        paper_path = None
+        aggregator = None
+        archive_path = None
+        archive_index = None
+        
+        # init
+        aggregator = ProquestHNPAggregator()
+        if ( use_zip_files_IN == True ):
+        
+            paper_path = self.source_paper_path
+            
+        else:
+        
+            paper_path = self.destination_paper_path
+            
+        #-- END check to see if reading zip files. --#
+        
+        if ( ( paper_path is not None ) and ( paper_path != "" ) ):
+        
+            for archive_path in sorted( dir_entry.path for dir_entry in self.iterate_paper_archives( use_zip_files_IN ) ):
+            
+                archive_index = self.load_archive_index( archive_path,
+                                                         is_zip_file_IN = use_zip_files_IN,
+                                                         index_folder_path_IN = self.get_archive_index_folder_path( use_zip_files_IN ) )
+                if ( archive_index is not None ):
+                
+                    aggregator.add_index( archive_index )
+                    
+                else:
+                
+                    log_message = "In {}: no current index for archive {}, so left it out.".format( me, archive_path )
+                    self.output_debug_message( log_message, do_print_IN = True )
+                    
+                #-- END check to see if index --#
+                
+            #-- END loop over archives --#
+            
+        else:
+        
+            log_message = "In {}: ERROR - no folder path found, can't aggregate.".format( me )
+            self.output_debug_message( log_message, do_print_IN = True )
+            
+        #-- END check to see if paper path --#
+        
+        summary_dict_OUT = aggregator.get_summary()
+        return summary_dict_OUT
+        
+    #-- END method aggregate_paper_indexes() --#
+
+
+    def build_archive_file_type_map( self, archive_path_IN = None, print_logging_IN = True, keep_file_paths_IN = True, file_type_map_IN = None ):
+ 
+        '''
+        Maps the Record XML files in an archive folder to their ObjectType
+            values, and returns a ProquestHNPFileTypeMap (see
+            map_archive_folder_files_to_types() for the same as a dictionary
+            of type to file path list).  If keep_file_paths_IN is
+            False, only per-type counts and up to LOG_EXAMPLE_FILE_PATH_COUNT
+            example paths per type are kept.  To build one map across
+            archives, pass it in as file_type_map_IN - files are added to it,
+            and it is returned (see map_paper_files_to_types()).
+        '''
+ 
+        # return reference
+        file_type_map_OUT = None
+        
+        # declare variables
+        me = "build_archive_file_type_map"
+        uncompressed_archive_path = None
+        dir_entry = None
+        xml_file_path = None
+        xml_file = None
+        xml_file_counter = None
+        record_field_map = None
+        object_type_list = None
+        object_type = None
+        
+        # declare variables - auditing
+        xml_file_counter = None
+        no_record_counter = None
+        no_object_type_counter = None
+        no_object_type_text_counter = None
+        
+        # output
+        file_type_map = None
+        object_type_to_count_map = None
+        object_type_to_example_list_map = None
+        file_path_example_list = None
+        
+        # declare variables - metrics
+        archive_identifier = None
+        metered_file = None
+        start_time = None
+        parsed_time = None
+        
+        # init
+        file_type_map = file_type_map_IN
+        if ( file_type_map is None ):
+        
+            file_type_map = ProquestHNPFileTypeMap( keep_file_paths_IN = keep_file_paths_IN,
+                                                    example_count_IN = self.LOG_EXAMPLE_FILE_PATH_COUNT )
+            
+        #-- END check to see if map passed in --#
+        
+        # get uncompressed archive path
+        uncompressed_archive_path = archive_path_IN
+        if ( ( uncompressed_archive_path is not None ) and ( uncompressed_archive_path != "" ) ):
+        
+            # loop over files in the current archive folder path.
+            archive_identifier = self.get_archive_identifier( uncompressed_archive_path )
+            
+            log_message = "Processing XML files in {}".format( uncompressed_archive_path )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            
+            # loop - files are listed as they are processed (timed as "list").
+            xml_file_counter = 0
+            no_record_counter = 0
+            no_object_type_counter = 0
+            no_object_type_text_counter = 0
+            for dir_entry in self.iterate_folder_entries( uncompressed_archive_path,
+                                                          extension_IN = self.XML_FILE_EXTENSION,
+                                                          metrics_IN = self.metrics,
+                                                          archive_identifier_IN = archive_identifier ):
+                
+                xml_file_counter += 1
+                xml_file_path = dir_entry.path
+                
+                # try to parse the file
+                start_time = time.perf_counter()
+                with open( xml_file_path, "rb" ) as xml_file:
+                
+                    # stream just the fields we need out of the XML.
+                    metered_file = MeteredReader( xml_file )
+                    record_field_map = self.extract_record_fields( metered_file, self.RECORD_SUMMARY_FIELD_LIST )
+                    parsed_time = time.perf_counter()
+                    self.metrics.add_time( ProquestHNPMetrics.PHASE_READ, metered_file.read_seconds, archive_identifier )
+                    self.metrics.add_time( ProquestHNPMetrics.PHASE_PARSE, ( parsed_time - start_time ) - metered_file.read_seconds, archive_identifier )
+                    self.metrics.increment( ProquestHNPMetrics.COUNTER_BYTES_READ, metered_file.byte_count, archive_identifier )
+                    
+                    if ( record_field_map is not None ):
+                        
+                        # get object type - multiple <ObjectType> elements
+                        #     are joined with "|".
+                        object_type_list = record_field_map.get( self.RECORD_FIELD_OBJECT_TYPE, [] )
+                        object_type = self.OBJECT_TYPE_VALUE_SEPARATOR.join( object_type_list )
+            
+                        # got a type?
+                        if ( len( object_type_list ) == 0 ):
+            
+                            # no ObjectType element
+                            no_object_type_counter += 1
+            
+                        elif ( ( object_type is not None ) and ( object_type != "" ) ):
+            
+                            # we do.  Add path under its type.
+                            file_type_map.add( object_type, xml_file_path )
+            
+                        else:
+            
+                            # object type is None
+                            no_object_type_text_counter += 1
+            
+                        #-- END check for type value --#
+                        
+                    else:
+                        
+                        # increment counter
+                        no_record_counter += 1
+                        
+                    #-- END check if we found a "Record" node in root --#
+                    
+                    self.metrics.add_time( ProquestHNPMetrics.PHASE_AGGREGATE, time.perf_counter() - parsed_time, archive_identifier )
+            
+                #-- END with open( xml_file_path )...: --#
+                
+            #-- END loop over XML files --#
+            
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_FILES, xml_file_counter, archive_identifier )
+            self.metrics.increment( ProquestHNPMetrics.COUNTER_NO_RECORD, no_record_counter, archive_identifier )
+            
+            # summary - only build it if it will be output.
+            if ( self.is_output_enabled( print_logging_IN ) == True ):
+            
+                log_message = "\nIn {}:".format( me )
+                log_message += "\nXML file count: {}".format( xml_file_counter )
+                log_message += "\nCounters:"
+                log_message += "\n- Processed {} files".format( xml_file_counter )
+                log_message += "\n- No Record: {}".format( no_record_counter )
+                log_message += "\n- No ObjectType: {}".format( no_object_type_counter )
+                log_message += "\n- No ObjectType value: {}".format( no_object_type_text_counter )
+                log_message += "\n\nObjectType values and occurrence counts:"
+                if ( file_type_map_IN is not None ):
+                
+                    log_message += " (all archives so far)"
+                    
+                #-- END check to see if shared map --#
+                
+                object_type_to_count_map = file_type_map.get_count_map()
+                object_type_to_example_list_map = file_type_map.get_example_map()
+                object_type_list = list( six.iterkeys( object_type_to_count_map ) )
+                object_type_list.sort()
+                for object_type in object_type_list:
+                
+                    # print type, count, and examples
+                    file_path_example_list = object_type_to_example_list_map.get( object_type, [] )
+                    log_message += "\n- {} - {} files:".format( object_type, object_type_to_count_map.get( object_type, 0 ) )
+                    for file_path in file_path_example_list:
+                    
+                        log_message += "\n    - {}".format( file_path )
+                    
+                    #-- END loop over example file paths. --#
+                
+                #-- END loop over object types. --#
+            
+                self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+                
+            #-- END check to see if output enabled --#
+        
+        else:
+        
+            log_message = "In {}: ERROR - no path passed in, can't process.".format( me )
+            self.output_debug_message( log_message, do_print_IN = True )
+        
+        #-- END check to see if path passed in. --#
+
+        # return the map.        
+        file_type_map_OUT = file_type_map
+        
+        return file_type_map_OUT
+
+    #-- END method build_archive_file_type_map() --#
+
+
+    def create_PHNP_newspaper( self ):
+        
+        '''
+        Instance must have paper_identifier set.  If set, start and end year and
+            source and destination paths will also be stored.
+        '''
+        
+        # return reference
+        instance_OUT = None
+        
+        # declare variables
+        me = "create_PHNP_newspaper"
+        log_message = None
+        paper_qs = None
+        paper_count = -1
+        phnp_newspaper_instance = None
+        paper_identifier = None
+        start_year = None
+        end_year = None
+        compressed_folder_path = None
+        uncompressed_folder_path = None
+        archive_file_name_prefix = None
+        newspaper = None
+        notes = None
+        
+        # get data from instance
+        paper_identifier = self.paper_identifier
+        start_year = self.paper_start_year
+        end_year = self.paper_end_year
+        compressed_folder_path = self.source_paper_path
+        uncompressed_folder_path = self.destination_paper_path
+        archive_file_name_prefix = self.archive_file_name_prefix
+        newspaper = self.newspaper
+        
+        # try to retrieve from database
+        paper_qs = Proquest_HNP_Newspaper.objects.filter( paper_identifier = paper_identifier )
+        paper_count = paper_qs.count()
+        
+        # anything returned?
+        if ( paper_count == 0 ):
+        
+            # make a new instance
+            phnp_newspaper_instance = Proquest_HNP_Newspaper()
+
+            # store information
+            phnp_newspaper_instance.paper_identifier = paper_identifier
+            phnp_newspaper_instance.start_year = start_year
+            phnp_newspaper_instance.end_year = end_year
+            phnp_newspaper_instance.compressed_folder_path = compressed_folder_path
+            phnp_newspaper_instance.uncompressed_folder_path = uncompressed_folder_path
+            phnp_newspaper_instance.archive_file_name_prefix = archive_file_name_prefix
+            phnp_newspaper_instance.newspaper = newspaper
+            
+            # save
+            phnp_newspaper_instance.save()
+                    
+        else:
+            
+            log_message = "In {}: Proquest_HNP_Newspaper already exists for paper_identifier \"{}\".  Returning existing instance.".format( me, paper_identifier )
+            self.output_progress_message( log_message )
+            phnp_newspaper_instance = paper_qs.get()
+            
+        #-- END check if exists --#
+            
+        # store in instance
+        self.phnp_newspaper = phnp_newspaper_instance
+        
+        # return
+        instance_OUT = self.phnp_newspaper
+        return instance_OUT
+        
+    #-- END method create_PHNP_newspaper() --#
+    
+
+    def find_duplicate_records( self, archive_path_list_IN, use_zip_files_IN = False, archive_manifest_map_IN = None ):
+        
+        '''
+        Finds Records whose RecordID was already seen in the paper - ProQuest
+            re-issues and corrects deliveries, so the same Record can be in
+            more than one archive.  Uses each archive's index (see
+            load_archive_index()), so no XML is read.  Archives are checked in
+            sorted order, the first occurrence of each RecordID is kept, and
+            every later one is a duplicate.  RecordIDs seen are kept in a
+            ProquestHNPRecordIdSet.  If an archive has no current index (not
+            written, out of date, or can't be read), its RecordIDs are read
+            from its XML instead (see build_archive_index()), and that is
+            logged - every archive is always checked.  If the caller already
+            has archives' current manifests, pass them in
+            archive_manifest_map_IN (archive path to manifest), so they are
+            not built again.
+            
+        Returns a map of ObjectType value to number of duplicate Records (the
+            amount to take off the paper-level counts).
+        '''
+        
+        # return reference
+        object_type_to_count_map_OUT = None
+        
+        # declare variables
+        me = "find_duplicate_records"
+        log_message = None
+        record_id_set = None
+        archive_path = None
+        archive_identifier = None
+        archive_index = None
+        type_id_array = None
+        row_index = None
+        record_id = None
+        type_id = None
+        object_type = None
+        duplicate_counter = None
+        archive_duplicate_counter = None
+        example_list = None
+        archive_manifest_map = None
+        
+        # init
+        object_type_to_count_map_OUT = {}
+        record_id_set = ProquestHNPRecordIdSet()
+        archive_manifest_map = archive_manifest_map_IN
+        if ( archive_manifest_map is None ):
+        
+            archive_manifest_map = {}
+            
+        #-- END check to see if manifests passed in --#
+        duplicate_counter = 0
+        example_list = []
+        
+        for archive_path in sorted( archive_path_list_IN ):
+        
+            archive_identifier = self.get_archive_identifier( archive_path )
+            with self.metrics.time_phase( ProquestHNPMetrics.PHASE_READ, archive_identifier ):
+            
+                try:
+                
+                    archive_index = self.load_archive_index( archive_path,
+                                                             is_zip_file_IN = use_zip_files_IN,
+                                                             manifest_dict_IN = archive_manifest_map.get( archive_path, None ),
+                                                             index_folder_path_IN = self.get_archive_index_folder_path( use_zip_files_IN ) )
+                    
+                except ( OSError, ValueError ) as e:
+                
+                    # unreadable index - same as none.
+                    log_message = "In {}: could not load index for archive {} ( {} ).".format( me, archive_path, e )
+                    self.output_debug_message( log_message, do_print_IN = True )
+                    archive_index = None
+                    
+                #-- END try-except --#
+                
+            #-- END with metrics.time_phase() --#
+            
+            if ( archive_index is None ):
+            
+                # no index, so read the RecordIDs from the XML (its files
+                #     were already counted when it was summarized).
+                log_message = "In {}: no current index for archive {}, so reading its XML to check for duplicate Records.".format( me, archive_path )
+                self.output_debug_message( log_message, do_print_IN = True )
+                with self.metrics.time_phase( ProquestHNPMetrics.PHASE_READ, archive_identifier ):
+                
+                    archive_index = self.build_archive_index( archive_path, is_zip_file_IN = use_zip_files_IN )
+                    
+                #-- END with metrics.time_phase() --#
+                
+            #-- END check to see if index --#
+            
+            with self.metrics.time_phase( ProquestHNPMetrics.PHASE_AGGREGATE, archive_identifier ):
+            
+                archive_duplicate_counter = 0
+                type_id_array = archive_index.get_column( ProquestHNPArchiveIndex.COLUMN_TYPE_ID )
+                for row_index, record_id in enumerate( archive_index.get_column( ProquestHNPArchiveIndex.COLUMN_RECORD_ID ) ):
+                
+                    if ( ( record_id != ProquestHNPArchiveIndex.NO_RECORD_ID ) and ( record_id_set.add( record_id ) == False ) ):
+                    
+                        # duplicate - counts against its type, if it has one.
+                        archive_duplicate_counter += 1
+                        type_id = type_id_array[ row_index ]
+                        if ( type_id != ProquestHNPArchiveIndex.NO_TYPE_ID ):
+                        
+                            object_type = archive_index.type_list[ type_id ]
+                            object_type_to_count_map_OUT[ object_type ] = object_type_to_count_map_OUT.get( object_type, 0 ) + 1
+                            
+                        #-- END check to see if type --#
+                        
+                        if ( len( example_list ) < self.LOG_EXAMPLE_FILE_PATH_COUNT ):
+                        
+                            example_list.append( "{} ( {} )".format( record_id, archive_index.name_list[ row_index ] ) )
+                            
+                        #-- END check to see if room for another example --#
+                        
+                    #-- END check to see if duplicate --#
+                    
+                #-- END loop over rows --#
+                
+            #-- END with metrics.time_phase() --#
+            
+            if ( archive_duplicate_counter > 0 ):
+            
+                duplicate_counter += archive_duplicate_counter
+                self.metrics.increment( ProquestHNPMetrics.COUNTER_DUPLICATE_RECORDS, archive_duplicate_counter, archive_identifier )
+                
+            #-- END check to see if duplicates --#
+            
+        #-- END loop over archives --#
+        
+        if ( duplicate_counter > 0 ):
+        
+            log_message = "In {}: {} duplicate Records ( RecordID already in an earlier archive ) by type: {}; examples: {}".format( me, duplicate_counter, object_type_to_count_map_OUT, example_list )
+            self.output_progress_message( log_message )
+            
+        #-- END check to see if duplicates --#
+        
+        return object_type_to_count_map_OUT
+        
+    #-- END method find_duplicate_records() --#
+    
+
+    def flush_archive_summaries( self ):
+        
+        '''
+        Writes all queued archive summaries (see queue_archive_summary()) to
+            the database in a single transaction, so either every archive in
+            the batch is recorded, or none is.  The archives are recorded in
+            the current checkpoint (if any) in the same transaction.  If the
+            batch fails, object_type_cache is cleared (types created in the
+            batch were rolled back with it) and the exception is re-raised.  Returns the number written.
+        '''
+        
+        # return reference
+        write_count_OUT = None
+        
+        # declare variables
+        pending_write_list = None
+        archive_identifier = None
+        summary_dict = None
+        compressed_file_path = None
+        uncompressed_folder_path = None
+        
+        # take the queue, so it is empty even if the write fails.
+        pending_write_list = self.pending_archive_write_list
+        self.pending_archive_write_list = []
+        
+        write_count_OUT = 0
+        if ( len( pending_write_list ) > 0 ):
+        
+            try:
+            
+                with transaction.atomic():
+                
+                    for archive_identifier, summary_dict, compressed_file_path, uncompressed_folder_path in pending_write_list:
+                    
+                        self.store_archive_summary( archive_identifier,
+                                                    summary_dict,
+                                                    compressed_file_path_IN = compressed_file_path,
+                                                    uncompressed_folder_path_IN = uncompressed_folder_path )
+                        write_count_OUT += 1
+                        
+                    #-- END loop over queued archives --#
+                    
+                    # finished, as far as a restarted run is concerned.
+                    self.record_checkpoint_archives( [ pending_write[ 0 ] for pending_write in pending_write_list ] )
+                    
+                #-- END with transaction.atomic() --#
+                
+            except Exception as e:
+            
+                # batch rolled back - don't trust anything cached from it.
+                self.object_type_cache.clear()
+                raise
+                
+            #-- END try-except --#
+            
+        #-- END check to see if anything queued --#
+        
+        return write_count_OUT
+        
+    #-- END method flush_archive_summaries() --#
+
+
+    def get_archive_identifier( self, archive_path_IN ):
+        
+        '''
+        Returns the archive identifier for an archive folder or archive .zip
+            file path - the last item in the path, with any ".zip" removed.
+        '''
+        
+        # return reference
+        value_OUT = None
+        
+        # file or folder name is the last thing in the path.
+        value_OUT = archive_path_IN.split( "/" )[ -1 ]
+        
+        # remove ".zip" from end.
+        value_OUT = value_OUT.split( ".zip" )[ 0 ]
+        
+        return value_OUT
+        
+    #-- END method get_archive_identifier() --#
+
+
+    def get_archive_index_folder_path( self, use_zip_files_IN = False ):
+        
+        '''
+        Returns the folder archive indexes are written to and read from (see
+            save_archive_index()): archive_index_folder_path if set.  If not,
+            for archive .zip files, destination_paper_path, so indexes are
+            never written into source_paper_path (the delivery share, which
+            may be read-only), and for archive folders, None (next to the
+            folder, which is in destination_paper_path).
+        '''
+        
+        # return reference
+        path_OUT = None
+        
+        if ( ( self.archive_index_folder_path is not None ) and ( self.archive_index_folder_path != "" ) ):
+        
+            path_OUT = self.archive_index_folder_path
+            
+        elif ( ( use_zip_files_IN == True ) and ( self.destination_paper_path is not None ) and ( self.destination_paper_path != "" ) ):
+        
+            path_OUT = self.destination_paper_path
+            
+        #-- END check to see where indexes go --#
+        
+        return path_OUT
+        
+    #-- END method get_archive_index_folder_path() --#
+
+
+    def get_archive_instance( self,
+                              archive_identifier_IN,
+                              compressed_file_path_IN = None,
+                              uncompressed_folder_path_IN = None,
+                              start_date_IN = None,
+                              end_date_IN = None,
+                              notes_IN = None ):
+        
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        me = "get_archive_instance"
+        newspaper_instance = None
+        archive_instance = None
+
+        # get nested newspaper instance (loading or creating it if needed)
+        newspaper_instance = self.get_PHNP_newspaper()
+        
+        # call static method
+        archive_instance = self.fetch_archive_instance( newspaper_instance,
+                                                        archive_identifier_IN,
+                                                        compressed_file_path_IN,
+                                                        uncompressed_folder_path_IN,
+                                                        start_date_IN,
+                                                        end_date_IN,
+                                                        notes_IN )
+        
+        instance_OUT = archive_instance
+        return instance_OUT
+        
+    #-- END class method get_archive_instance() --#
+
+
+    def get_archive_zip_file_path( self, archive_identifier_IN ):
+        
+        '''
+        Returns the path to the .zip file for the archive identifier passed in,
+            or None if no source_paper_path is set.
+        '''
+        
+        # return reference
+        path_OUT = None
+        
+        # declare variables
+        compressed_paper_path = None
+        
+        # build path to zip file, if we know the paper's compressed folder.
+        compressed_paper_path = self.source_paper_path
+        if ( ( compressed_paper_path is not None ) and ( compressed_paper_path != "" ) ):
+        
+            path_OUT = "{}/{}.zip".format( compressed_paper_path, archive_identifier_IN )
+            
+        #-- END check to see if we have compressed paper path --#
+        
+        return path_OUT
+        
+    #-- END method get_archive_zip_file_path() --#
+
+
+    def get_checkpoint( self, run_type_IN, use_zip_files_IN = False, archive_count_IN = None, restart_IN = False ):
+        
+        '''
+        Starts or resumes the checkpoint for a run of type run_type_IN (one of
+            the Proquest_HNP_Checkpoint.RUN_TYPE_* values) for this paper,
+            stores it in self.checkpoint, and returns it.  If the paper has an
+            open run of that type (not complete or abandoned, and reading zip
+            files or not, as use_zip_files_IN says), it is resumed - the
+            identifiers of the archives it has finished are loaded into
+            checkpoint_archive_identifier_set, for the run to skip.  If the
+            open run has recorded no progress for longer than
+            checkpoint_max_age, a warning is logged and it is not resumed.  In
+            that case, or if there is no open run, or if restart_IN is True, a
+            new checkpoint is started, and any open ones are marked abandoned.
+            If use_checkpoints is False or there is no paper_identifier,
+            returns None, and nothing is recorded.
+        '''
+        
+        # return reference
+        checkpoint_OUT = None
+        
+        # declare variables
+        me = "get_checkpoint"
+        log_message = None
+        paper_instance = None
+        open_checkpoint_qs = None
+        last_progress_dt = None
+        
+        # init
+        self.checkpoint = None
+        self.checkpoint_archive_identifier_set = set()
+        
+        if ( ( self.use_checkpoints == True ) and ( self.paper_identifier is not None ) ):
+        
+            paper_instance = self.get_PHNP_newspaper()
+            open_checkpoint_qs = Proquest_HNP_Checkpoint.objects.filter( proquest_hnp_newspaper = paper_instance,
+                                                                         run_type = run_type_IN,
+                                                                         use_zip_files = use_zip_files_IN )
+            open_checkpoint_qs = open_checkpoint_qs.exclude( phase__in = Proquest_HNP_Checkpoint.CLOSED_PHASE_LIST )
+            if ( restart_IN == True ):
+            
+                # start over - open runs will not be resumed.
+                open_checkpoint_qs.update( phase = Proquest_HNP_Checkpoint.PHASE_ABANDONED, last_modified = timezone.now() )
+                
+            else:
+            
+                # resume the latest open run, if there is one.
+                checkpoint_OUT = open_checkpoint_qs.order_by( "-id" ).first()
+                
+                # unless it has been idle too long to trust.
+                if ( ( checkpoint_OUT is not None ) and ( self.checkpoint_max_age is not None ) ):
+                
+                    # last progress - latest of last save and last archive.
+                    last_progress_dt = checkpoint_OUT.phnp_checkpoint_archive_set.aggregate( last_progress_dt = Max( "create_date" ) )[ "last_progress_dt" ]
+                    if ( ( last_progress_dt is None ) or ( last_progress_dt < checkpoint_OUT.last_modified ) ):
+                    
+                        last_progress_dt = checkpoint_OUT.last_modified
+                        
+                    #-- END check to see which is later --#
+                    
+                    if ( last_progress_dt < ( timezone.now() - self.checkpoint_max_age ) ):
+                    
+                        log_message = "In {}(): WARNING - checkpoint {} last recorded progress at {}, more than {} ago - not resuming it, starting a new run.".format( me, checkpoint_OUT.id, last_progress_dt, self.checkpoint_max_age )
+                        self.output_debug_message( log_message, do_print_IN = True )
+                        open_checkpoint_qs.update( phase = Proquest_HNP_Checkpoint.PHASE_ABANDONED, last_modified = timezone.now() )
+                        checkpoint_OUT = None
+                        
+                    #-- END check to see if too old --#
+                    
+                #-- END check to see if checkpoint age limit --#
+                
+            #-- END check to see if restarting --#
+            
+            if ( checkpoint_OUT is not None ):
+            
+                # resume
+                self.checkpoint_archive_identifier_set = set( checkpoint_OUT.phnp_checkpoint_archive_set.values_list( "archive_identifier", flat = True ) )
+                checkpoint_OUT.phase = Proquest_HNP_Checkpoint.PHASE_ARCHIVES
+                checkpoint_OUT.archive_count = archive_count_IN
+                checkpoint_OUT.save()
+                log_message = "==> RESUMING checkpoint {} - {} archives already done".format( checkpoint_OUT.id, len( self.checkpoint_archive_identifier_set ) )
+                
+            else:
+            
+                # new run
+                checkpoint_OUT = Proquest_HNP_Checkpoint.objects.create( proquest_hnp_newspaper = paper_instance,
+                                                                         run_type = run_type_IN,
+                                                                         use_zip_files = use_zip_files_IN,
+                                                                         archive_count = archive_count_IN )
+                log_message = "==> STARTING checkpoint {}".format( checkpoint_OUT.id )
+                
+            #-- END check to see if resuming --#
+            
+            self.output_progress_message( log_message )
+            self.checkpoint = checkpoint_OUT
+            
+        #-- END check to see if using checkpoints --#
+        
+        return checkpoint_OUT
+        
+    #-- END method get_checkpoint() --#
+
+
+    def get_do_print( self, print_logging_IN = True ):
+        
+        '''
+        Returns True if progress messages should be printed: print_logging_IN
+            is True and the instance is not in quiet mode.
+        '''
+        
+        # return reference
+        value_OUT = None
+        
+        value_OUT = ( ( print_logging_IN == True ) and ( self.is_quiet != True ) )
+        
+        return value_OUT
+        
+    #-- END method get_do_print() --#
+
+
+    def get_metrics_dict( self ):
+        
+        '''
+        Returns the metrics for the last run of process_paper_object_types() or
+            uncompress_paper_zip_files() (plus anything run since): per-phase
+            timers and counters for the paper and for each archive.  See
+            ProquestHNPMetrics.to_dict().
+        '''
+        
+        return self.metrics.to_dict()
+        
+    #-- END method get_metrics_dict() --#
+
+
+    def get_PHNP_newspaper( self ):
+        
+        '''
+        Instance must have paper_identifier set.  If set, start and end year and
+            source and destination paths will also be stored.
+        '''
+        
+        # return reference
+        instance_OUT = None
+        
+        # declare variables
+        me = "get_PHNP_newspaper"
+        
+        # if instance set, just return it.
+        if ( self.phnp_newspaper is not None ):
+        
+            # already set.  Use it.
+            instance_OUT = self.phnp_newspaper
+            
+        else:
+        
+            # not already set.  Create, then return.        
+            instance_OUT = self.create_PHNP_newspaper()
+            
+        #-- END check if instance already nested. --#
+
+        return instance_OUT
+        
+    #-- END method get_PHNP_newspaper() --#
+    
+
+    def get_unchanged_archive_summary( self, archive_path_IN, use_zip_files_IN = False, manifest_dict_IN = None ):
+        
+        '''
+        Builds the current manifest for the archive folder (or, if
+            use_zip_files_IN is True, the archive .zip file) at archive_path_IN
+            (unless it is passed in in manifest_dict_IN), and returns the
+            archive's stored summary if it is unchanged since it was last
+            summarized (see load_unchanged_archive_summary()).
+            Returns None if it has changed, is new, or, when
+            write_archive_index is True, has no index yet - it needs to be
+            summarized.
+        '''
+        
+        # return reference
+        summary_dict_OUT = None
+        
+        # declare variables
+        archive_identifier = None
+        manifest_dict = None
+        
+        archive_identifier = self.get_archive_identifier( archive_path_IN )
+        manifest_dict = manifest_dict_IN
+        if ( manifest_dict is None ):
+        
+            with self.metrics.time_phase( ProquestHNPMetrics.PHASE_LIST, archive_identifier ):
+            
+                manifest_dict = self.build_archive_manifest( archive_path_IN, is_zip_file_IN = use_zip_files_IN )
+                
+            #-- END with metrics.time_phase() --#
+            
+        #-- END check to see if manifest passed in --#
+        
+        with self.metrics.time_phase( ProquestHNPMetrics.PHASE_DB_READ, archive_identifier ):
+        
+            summary_dict_OUT = self.load_unchanged_archive_summary( archive_identifier, manifest_dict )
+            
+        #-- END with metrics.time_phase() --#
+        
+        # unchanged, but no index yet?  Summarize it again to build one.
+        if ( ( summary_dict_OUT is not None )
+            and ( self.write_archive_index == True )
+            and ( os.path.exists( ProquestHNPArchiveIndex.get_index_file_path( archive_path_IN, index_folder_path_IN = self.get_archive_index_folder_path( use_zip_files_IN ) ) ) == False ) ):
+        
+            summary_dict_OUT = None
+            
+        #-- END check to see if index missing --#
+        
+        return summary_dict_OUT
+        
+    #-- END method get_unchanged_archive_summary() --#
+
+
+    def initialize_from_database( self, paper_identifier_IN ):
+        
+        '''
+        Instance must have paper_identifier set.  If set, start and end year and
             source and destination paths will also be stored.
         '''
         
-        # return reference
-        instance_OUT = None
+        # return reference
+        instance_OUT = None
+        
+        # declare variables
+        me = "initialize_from_database"
+        log_message = None
+        paper_qs = None
+        paper_count = -1
+        phnp_newspaper_instance = None
+        paper_identifier = None
+        start_year = None
+        end_year = None
+        compressed_folder_path = None
+        uncompressed_folder_path = None
+        archive_file_name_prefix = None
+        newspaper = None
+        notes = None
+                
+        # try to retrieve from database
+        paper_qs = Proquest_HNP_Newspaper.objects.filter( paper_identifier = paper_identifier_IN )
+        paper_count = paper_qs.count()
+        
+        # anything returned?
+        if ( paper_count == 1 ):
+        
+            # get instance
+            phnp_newspaper_instance = paper_qs.get()
+
+            # get needed information
+            paper_identifier = phnp_newspaper_instance.paper_identifier
+            start_year = phnp_newspaper_instance.start_year
+            end_year = phnp_newspaper_instance.end_year
+            compressed_folder_path = phnp_newspaper_instance.compressed_folder_path
+            uncompressed_folder_path = phnp_newspaper_instance.uncompressed_folder_path
+            archive_file_name_prefix = phnp_newspaper_instance.archive_file_name_prefix
+            newspaper = phnp_newspaper_instance.newspaper
+            
+            # store in self
+            self.paper_identifier = paper_identifier_IN
+            self.paper_start_year = start_year
+            self.paper_end_year = end_year
+            self.source_paper_path = compressed_folder_path
+            self.destination_paper_path = uncompressed_folder_path
+            self.archive_file_name_prefix = archive_file_name_prefix
+            self.phnp_newspaper = phnp_newspaper_instance
+            self.newspaper = phnp_newspaper_instance.newspaper
+            
+        else:
+            
+            log_message = "In {}: ERROR - no Proquest_HNP_Newspaper record exists for paper_identifier \"{}\".  Returning None.".format( me, paper_identifier )
+            self.output_debug_message( log_message, do_print_IN = True )
+            phnp_newspaper_instance = None
+            
+        #-- END check if exists --#
+            
+        # return
+        instance_OUT = phnp_newspaper_instance
+        return instance_OUT
+        
+    #-- END method initialize_from_database() --#
+    
+
+    def is_archive_manifest_current( self, archive_instance_IN, manifest_dict_IN ):
+        
+        '''
+        Accepts a Proquest_HNP_Newspaper_Archive and a current manifest for the
+            archive (see build_archive_manifest()).  Returns True if the
+            manifest stored on the archive when it was last summarized matches
+            the one passed in, False if not (or if nothing is stored).
+        '''
+        
+        # return reference
+        is_current_OUT = None
+        
+        is_current_OUT = ( ( archive_instance_IN.manifest_fingerprint is not None )
+            and ( manifest_dict_IN is not None )
+            and ( archive_instance_IN.manifest_fingerprint == manifest_dict_IN.get( self.ARCHIVE_MANIFEST_FINGERPRINT, None ) )
+            and ( archive_instance_IN.manifest_file_count == manifest_dict_IN.get( self.ARCHIVE_MANIFEST_FILE_COUNT, None ) )
+            and ( archive_instance_IN.manifest_total_bytes == manifest_dict_IN.get( self.ARCHIVE_MANIFEST_TOTAL_BYTES, None ) )
+            and ( archive_instance_IN.manifest_newest_mtime_ns == manifest_dict_IN.get( self.ARCHIVE_MANIFEST_NEWEST_MTIME_NS, None ) ) )
+        
+        return is_current_OUT
+        
+    #-- END method is_archive_manifest_current() --#
+    
+
+    def is_output_enabled( self, print_logging_IN = True ):
+        
+        '''
+        Returns True if a progress message would go anywhere - it would be
+            printed (see get_do_print()), or this class's logger has DEBUG
+            enabled.  Check this before building expensive log messages.
+        '''
+        
+        # return reference
+        value_OUT = None
+        
+        value_OUT = ( ( self.get_do_print( print_logging_IN ) == True )
+                      or ( logging.getLogger( self.MY_LOGGER_NAME ).isEnabledFor( logging.DEBUG ) == True ) )
+        
+        return value_OUT
+        
+    #-- END method is_output_enabled() --#
+    
+
+
+    def iterate_paper_archives( self, use_zip_files_IN = False ):
+        
+        '''
+        Generator - streams the paper's archives (see iterate_folder_entries())
+            and yields an os.DirEntry for each: the archive folders in
+            destination_paper_path, or, if use_zip_files_IN is True, the
+            archive .zip files in source_paper_path.  If the paper has an
+            archive_file_name_prefix, only archives whose names start with it
+            are yielded.  Hidden entries (partial extracts, archive indexes)
+            are skipped.  Yields nothing if the path is not set.
+        '''
+        
+        # declare variables
+        paper_path = None
+        entry_iterator = None
+        
+        if ( use_zip_files_IN == True ):
+        
+            paper_path = self.source_paper_path
+            if ( ( paper_path is not None ) and ( paper_path != "" ) ):
+            
+                entry_iterator = self.iterate_folder_entries( paper_path,
+                                                              extension_IN = self.ZIP_FILE_EXTENSION,
+                                                              name_prefix_IN = self.archive_file_name_prefix,
+                                                              metrics_IN = self.metrics )
+                
+            #-- END check to see if path --#
+            
+        else:
+        
+            paper_path = self.destination_paper_path
+            if ( ( paper_path is not None ) and ( paper_path != "" ) ):
+            
+                entry_iterator = self.iterate_folder_entries( paper_path,
+                                                              name_prefix_IN = self.archive_file_name_prefix,
+                                                              folders_only_IN = True,
+                                                              metrics_IN = self.metrics )
+                
+            #-- END check to see if path --#
+            
+        #-- END check to see if reading zip files. --#
+        
+        if ( entry_iterator is not None ):
+        
+            yield from entry_iterator
+            
+        #-- END check to see if anything to list --#
+        
+    #-- END method iterate_paper_archives() --#
+    
+
+    def load_checkpoint_archive_summaries( self ):
+        
+        '''
+        Returns a dictionary that maps the identifier of each archive the
+            current checkpoint has recorded as finished (see get_checkpoint())
+            to a summary dictionary built from its stored archive dates and
+            PHNP_Newspaper_Archive_Object_Type counts (see
+            make_stored_archive_summary()).  Archives no longer in the database
+            are left out, so they are processed again.
+        '''
+        
+        # return reference
+        summary_map_OUT = None
+        
+        # declare variables
+        archive_qs = None
+        archive_instance = None
+        archive_type_qs = None
+        type_to_count_map_map = None
+        archive_identifier = None
+        object_type = None
+        object_type_count = None
+        
+        summary_map_OUT = {}
+        if ( ( self.checkpoint is not None ) and ( len( self.checkpoint_archive_identifier_set ) > 0 ) ):
+        
+            # the checkpoint's archives, and all their counts, in two queries.
+            archive_qs = Proquest_HNP_Newspaper_Archive.objects.filter( proquest_hnp_newspaper = self.get_PHNP_newspaper() )
+            archive_qs = archive_qs.filter( archive_identifier__in = self.checkpoint.phnp_checkpoint_archive_set.values( "archive_identifier" ) )
+            
+            type_to_count_map_map = {}
+            archive_type_qs = PHNP_Newspaper_Archive_Object_Type.objects.filter( proquest_hnp_newspaper_archive__in = archive_qs )
+            archive_type_qs = archive_type_qs.values_list( "proquest_hnp_newspaper_archive__archive_identifier", "proquest_hnp_object_type__raw_value", "item_count" )
+            for archive_identifier, object_type, object_type_count in archive_type_qs:
+            
+                type_to_count_map_map.setdefault( archive_identifier, {} )[ object_type ] = object_type_count
+                
+            #-- END loop over stored counts --#
+            
+            for archive_instance in archive_qs:
+            
+                summary_map_OUT[ archive_instance.archive_identifier ] = self.make_stored_archive_summary( archive_instance, type_to_count_map_map.get( archive_instance.archive_identifier, {} ) )
+                
+            #-- END loop over archives --#
+            
+        #-- END check to see if anything checkpointed --#
+        
+        return summary_map_OUT
+        
+    #-- END method load_checkpoint_archive_summaries() --#
+    
+
+    def load_unchanged_archive_summary( self, archive_identifier_IN, manifest_dict_IN ):
+        
+        '''
+        Accepts an archive identifier and a current manifest for the archive
+            (see build_archive_manifest()).  If the archive is already in the
+            database for this paper and its stored manifest matches the one
+            passed in, returns a summary dictionary built from the stored
+            archive dates and PHNP_Newspaper_Archive_Object_Type counts (see
+            make_stored_archive_summary()).  Otherwise returns None,
+            and the archive needs to be summarized.
+        '''
+        
+        # return reference
+        summary_dict_OUT = None
+        
+        # declare variables
+        archive_qs = None
+        archive_instance = None
+        is_unchanged = None
+        archive_type_qs = None
+        object_type_to_count_map = None
+        object_type = None
+        object_type_count = None
+        
+        # look for archive.
+        archive_qs = Proquest_HNP_Newspaper_Archive.objects.filter( proquest_hnp_newspaper = self.get_PHNP_newspaper() )
+        archive_qs = archive_qs.filter( archive_identifier = archive_identifier_IN )
+        archive_instance = archive_qs.first()
+        if ( archive_instance is not None ):
+        
+            # compare manifests
+            is_unchanged = self.is_archive_manifest_current( archive_instance, manifest_dict_IN )
+            
+            if ( is_unchanged == True ):
+            
+                # unchanged - reuse stored counts.
+                object_type_to_count_map = {}
+                archive_type_qs = archive_instance.phnp_newspaper_archive_object_type_set.all()
+                archive_type_qs = archive_type_qs.values_list( "proquest_hnp_object_type__raw_value", "item_count" )
+                for object_type, object_type_count in archive_type_qs:
+                
+                    object_type_to_count_map[ object_type ] = object_type_count
+                    
+                #-- END loop over stored counts --#
+                
+                summary_dict_OUT = self.make_stored_archive_summary( archive_instance, object_type_to_count_map, manifest_dict_IN )
+                
+            #-- END check to see if unchanged --#
+            
+        #-- END check to see if archive in database --#
+        
+        return summary_dict_OUT
+        
+    #-- END method load_unchanged_archive_summary() --#
+    
+
+    def make_dest_paper_folder( self ):
+        
+        # return reference
+        did_it_exist_OUT = False
+        
+        # declare variables
+        uncompressed_paper_path = None
+        did_uncomp_paper_folder_exist = False
+        log_message = None
+        
+        # get uncompressed paper path
+        uncompressed_paper_path = self.destination_paper_path
+        
+        # check if uncompressed paper folder exists.
+        if not os.path.exists( uncompressed_paper_path ):
+            
+            # no.  Make it.
+            os.makedirs( uncompressed_paper_path )
+            did_uncomp_paper_folder_exist = False
+            log_message = "CREATED - Uncompressed paper folder {}".format( uncompressed_paper_path )
+            self.output_debug_message( log_message, do_print_IN = True )
+            
+        else:
+            
+            # yes.  Set flag.
+            did_uncomp_paper_folder_exist = True
+            log_message = "EXISTS - Uncompressed paper folder {}".format( uncompressed_paper_path )
+            self.output_debug_message( log_message, do_print_IN = True )
+            
+        #-- END check to see if paper folder exists. --#
+        
+        self.did_destination_paper_path_exist = did_uncomp_paper_folder_exist
+        did_it_exist_OUT = did_uncomp_paper_folder_exist
+
+        return did_it_exist_OUT
+        
+    #-- END method make_dest_paper_folder() --#
+    
+
+    def make_stored_archive_summary( self, archive_instance_IN, object_type_to_count_map_IN, manifest_dict_IN = None ):
+        
+        '''
+        Accepts a Proquest_HNP_Newspaper_Archive, a map of its stored
+            ObjectType counts, and optionally its current manifest, and returns
+            an archive summary dictionary built from them, with
+            ARCHIVE_SUMMARY_IS_UNCHANGED set to True, to merge in place of
+            summarizing the archive again.
+        '''
+        
+        # return reference
+        summary_dict_OUT = None
+        
+        # declare variables
+        min_pub_date_int = None
+        max_pub_date_int = None
+        
+        # dates back to ints.
+        if ( archive_instance_IN.start_date is not None ):
+        
+            min_pub_date_int = int( archive_instance_IN.start_date.strftime( self.DATETIME_FORMAT_NUMERAL_PUB_DATE ) )
+            
+        #-- END check to see if start date --#
+        
+        if ( archive_instance_IN.end_date is not None ):
+        
+            max_pub_date_int = int( archive_instance_IN.end_date.strftime( self.DATETIME_FORMAT_NUMERAL_PUB_DATE ) )
+            
+        #-- END check to see if end date --#
+        
+        summary_dict_OUT = {}
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP ] = object_type_to_count_map_IN
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_MIN_PUB_DATE ] = min_pub_date_int
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_MAX_PUB_DATE ] = max_pub_date_int
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_FILE_COUNT ] = archive_instance_IN.manifest_file_count
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_NO_RECORD_COUNT ] = None
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_NO_OBJECT_TYPE_COUNT ] = None
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_NO_OBJECT_TYPE_VALUE_COUNT ] = None
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_MANIFEST ] = manifest_dict_IN
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_IS_UNCHANGED ] = True
+        summary_dict_OUT[ self.ARCHIVE_SUMMARY_INSTANCE ] = archive_instance_IN
+        
+        return summary_dict_OUT
+        
+    #-- END method make_stored_archive_summary() --#
+
+
+    
+
+    def map_archive_folder_files_to_types( self, archive_path_IN = None, print_logging_IN = True ):
+ 
+        '''
+        Maps the Record XML files in an archive folder to their ObjectType
+            values.  Returns a dictionary of ObjectType value to the list of
+            paths of files with that type.  Builds every path string - for
+            large archives or whole papers, use build_archive_file_type_map()
+            or map_paper_files_to_types(), which return a compact
+            ProquestHNPFileTypeMap.
+        '''
+ 
+        # return reference
+        type_to_file_path_list_map_OUT = None
+        
+        # declare variables
+        file_type_map = None
+        
+        file_type_map = self.build_archive_file_type_map( archive_path_IN, print_logging_IN = print_logging_IN )
+        type_to_file_path_list_map_OUT = file_type_map.to_dict()
+        
+        return type_to_file_path_list_map_OUT
+
+    #-- END method map_archive_folder_files_to_types() --#
+    
+
+    def map_paper_files_to_types( self, keep_file_paths_IN = False, print_logging_IN = False ):
+        
+        '''
+        Maps the Record XML files in every archive folder in
+            destination_paper_path to their ObjectType values, in a single
+            ProquestHNPFileTypeMap.  By default only per-type counts and
+            example paths are kept; with keep_file_paths_IN = True, every path
+            is kept in the map's arrays, a few dozen bytes per file.
+        '''
+        
+        # return reference
+        file_type_map_OUT = None
+        
+        # declare variables
+        me = "map_paper_files_to_types"
+        log_message = None
+        archive_path = None
+        
+        # init
+        file_type_map_OUT = ProquestHNPFileTypeMap( keep_file_paths_IN = keep_file_paths_IN,
+                                                    example_count_IN = self.LOG_EXAMPLE_FILE_PATH_COUNT )
+        
+        if ( ( self.destination_paper_path is not None ) and ( self.destination_paper_path != "" ) ):
+        
+            for archive_path in sorted( dir_entry.path for dir_entry in self.iterate_paper_archives() ):
+            
+                self.build_archive_file_type_map( archive_path,
+                                                  print_logging_IN = print_logging_IN,
+                                                  file_type_map_IN = file_type_map_OUT )
+                
+            #-- END loop over archive folders --#
+            
+        else:
+        
+            log_message = "In {}: ERROR - no folder path found, can't process.".format( me )
+            self.output_debug_message( log_message, do_print_IN = True )
+            
+        #-- END check to see if paper path --#
+        
+        return file_type_map_OUT
+        
+    #-- END method map_paper_files_to_types() --#
+
+
+
+    def merge_archive_summary( self, summary_dict_IN, object_type_to_count_map_IN ):
+        
+        '''
+        Adds the ObjectType counts from an archive summary dictionary into the
+            paper-level ObjectType to count map passed in, and widens the
+            instance's min_pub_date_int and max_pub_date_int to include the
+            archive's date range.
+        '''
+        
+        # declare variables
+        folder_type_to_count_map = None
+        folder_object_type_value = None
+        folder_object_type_count = None
+        object_type_count = None
+        folder_min_pub_date_int = None
+        folder_max_pub_date_int = None
+        
+        # merge results with main map.
+        folder_type_to_count_map = summary_dict_IN.get( self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP, {} )
+        for folder_object_type_value, folder_object_type_count in six.iteritems( folder_type_to_count_map ):
+        
+            # get count for this type from the master map.
+            object_type_count = object_type_to_count_map_IN.get( folder_object_type_value, 0 )
+            
+            # add the count from the folder.
+            object_type_count += folder_object_type_count
+            
+            # place back into master map
+            object_type_to_count_map_IN[ folder_object_type_value ] = object_type_count
+        
+        #-- END loop over results. --#
+        
+        # min and max pub dates
+        folder_min_pub_date_int = summary_dict_IN.get( self.ARCHIVE_SUMMARY_MIN_PUB_DATE, None )
+        if ( ( folder_min_pub_date_int is not None )
+            and ( ( self.min_pub_date_int is None ) or ( folder_min_pub_date_int < self.min_pub_date_int ) ) ):
+        
+            self.min_pub_date_int = folder_min_pub_date_int
+            
+        #-- END check to see if new min --#
+        
+        folder_max_pub_date_int = summary_dict_IN.get( self.ARCHIVE_SUMMARY_MAX_PUB_DATE, None )
+        if ( ( folder_max_pub_date_int is not None )
+            and ( ( self.max_pub_date_int is None ) or ( folder_max_pub_date_int > self.max_pub_date_int ) ) ):
+        
+            self.max_pub_date_int = folder_max_pub_date_int
+            
+        #-- END check to see if new max --#
+        
+    #-- END method merge_archive_summary() --#
+    
+
+    def output_archive_summary( self, summary_dict_IN, print_logging_IN = True ):
+        
+        '''
+        Outputs the counters and ObjectType counts from an archive summary
+            dictionary (see summarize_archive_folder()).
+        '''
+        
+        # declare variables
+        log_message = None
+        object_type_to_count_map = None
+        object_type = None
+        object_type_count = None
+        
+        # nothing to do if output is not enabled.
+        if ( self.is_output_enabled( print_logging_IN ) == True ):
+        
+            log_message = "----> XML file count: {}".format( summary_dict_IN.get( self.ARCHIVE_SUMMARY_FILE_COUNT, None ) )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            log_message = "\nCounters:"
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            log_message = "- Processed {} files".format( summary_dict_IN.get( self.ARCHIVE_SUMMARY_FILE_COUNT, None ) )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            log_message = "- No Record: {}".format( summary_dict_IN.get( self.ARCHIVE_SUMMARY_NO_RECORD_COUNT, None ) )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            log_message = "- No ObjectType: {}".format( summary_dict_IN.get( self.ARCHIVE_SUMMARY_NO_OBJECT_TYPE_COUNT, None ) )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            log_message = "- No ObjectType value: {}".format( summary_dict_IN.get( self.ARCHIVE_SUMMARY_NO_OBJECT_TYPE_VALUE_COUNT, None ) )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            log_message = "\nObjectType values and occurrence counts:"
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            object_type_to_count_map = summary_dict_IN.get( self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP, {} )
+            for object_type, object_type_count in six.iteritems( object_type_to_count_map ):
+            
+                # print type and count
+                log_message = "- {}: {}".format( object_type, object_type_count )
+                self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
+            
+            #-- END loop over object types. --#
+            
+        #-- END check to see if output enabled --#
+        
+    #-- END method output_archive_summary() --#
+    
+
+    def output_metrics_json_lines( self, run_name_IN = None, file_path_IN = None ):
+        
+        '''
+        Appends the current metrics to a file as JSON lines - one line per
+            archive, then one for the paper (see
+            ProquestHNPMetrics.to_json_lines()).  If no path is passed in, uses
+            metrics_json_lines_file_path.  Does nothing if there is no path.
+        '''
         
         # declare variables
-        me = "get_PHNP_newspaper"
+        file_path = None
+        line_list = None
+        json_lines_file = None
         
-        # if instance set, just return it.
-        if ( self.phnp_newspaper is not None ):
+        file_path = file_path_IN
+        if ( file_path is None ):
         
-            # already set.  Use it.
-            instance_OUT = self.phnp_newspaper
+            file_path = self.metrics_json_lines_file_path
             
-        else:
+        #-- END check to see if path passed in --#
         
-            # not already set.  Create, then return.        
-            instance_OUT = self.create_PHNP_newspaper()
+        if ( ( file_path is not None ) and ( file_path != "" ) ):
+        
+            line_list = self.metrics.to_json_lines( run_name_IN = run_name_IN, paper_identifier_IN = self.paper_identifier )
+            with open( file_path, "a" ) as json_lines_file:
             
-        #-- END check if instance already nested. --#
+                json_lines_file.write( "\n".join( line_list ) + "\n" )
+                
+            #-- END with open( file_path ) --#
+            
+        #-- END check to see if path --#
+        
+    #-- END method output_metrics_json_lines() --#
+    
 
-        return instance_OUT
+    def output_progress_message( self, message_IN, print_logging_IN = True ):
         
-    #-- END method get_PHNP_newspaper() --#
+        '''
+        Outputs a progress (non-error) message.  Not printed in quiet mode, and
+            skipped entirely if is_output_enabled() is False.
+        '''
+        
+        if ( self.is_output_enabled( print_logging_IN ) == True ):
+        
+            self.output_debug_message( message_IN, do_print_IN = self.get_do_print( print_logging_IN ) )
+            
+        #-- END check to see if output enabled --#
+        
+    #-- END method output_progress_message() --#
     
 
-    def initialize_from_database( self, paper_identifier_IN ):
+    def process_archive_object_types( self, archive_path_IN = None, print_logging_IN = True ):
+        
+        # return reference
+        object_type_to_count_map_OUT = None
+        
+        # declare variables
+        me = "process_archive_object_types"
+        archive_summary_dict = None
+        
+        # summarize archive
+        archive_summary_dict = self.summarize_archive_files( archive_path_IN, print_logging_IN )
+        
+        # pull out type-to-count map
+        object_type_to_count_map_OUT = archive_summary_dict.get( self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP, None )
+
+        return object_type_to_count_map_OUT
+                
+    #-- END method process_archive_object_types() --#
+        
+
+    def process_paper_object_types( self, print_archive_logging_IN = False, worker_count_IN = 1, use_zip_files_IN = False, skip_unchanged_IN = True, restart_IN = False ):
         
         '''
-        Instance must have paper_identifier set.  If set, start and end year and
-            source and destination paths will also be stored.
+        Summarizes each archive for the paper, stores archive and paper
+            ObjectType counts, and returns the paper-level ObjectType to count
+            map.  By default, summarizes the uncompressed archive folders under
+            destination_paper_path.  If use_zip_files_IN is True, reads the
+            archive .zip files in source_paper_path directly instead, so
+            uncompress_paper_zip_files() does not need to be run first.  If
+            worker_count_IN is greater than 1, the archives are read and parsed
+            in a pool of that many worker processes, and the results are merged
+            and written to the database here in the parent process as each
+            archive finishes.  If skip_unchanged_IN is True, archives whose
+            manifest (see build_archive_manifest()) matches the one stored when
+            they were last summarized are not re-read - their stored counts are
+            used instead.  If skip_duplicate_records is True, Records whose
+            RecordID is in an earlier archive are left out of the paper-level
+            counts (see find_duplicate_records()).  If use_checkpoints is True,
+            each archive is recorded in a checkpoint as it is stored, and a run
+            that was interrupted is resumed - archives it finished use their
+            stored counts, as long as their manifests still match the ones
+            stored with those counts (archives that changed since are
+            processed again).  If restart_IN is True, or the checkpoint is
+            older than checkpoint_max_age, it is ignored, and a new one is
+            started (see get_checkpoint()).
         '''
         
         # return reference
-        instance_OUT = None
+        object_type_to_count_map_OUT = None
         
         # declare variables
-        me = "initialize_from_database"
+        me = "process_paper_object_types"
         log_message = None
-        paper_qs = None
-        paper_count = -1
-        phnp_newspaper_instance = None
-        paper_identifier = None
-        start_year = None
-        end_year = None
-        compressed_folder_path = None
-        uncompressed_folder_path = None
-        newspaper = None
-        notes = None
-                
-        # try to retrieve from database
-        paper_qs = Proquest_HNP_Newspaper.objects.filter( paper_identifier = paper_identifier_IN )
-        paper_count = paper_qs.count()
+        object_type_to_count_map = None
+        paper_path = None
         
-        # anything returned?
-        if ( paper_count == 1 ):
+        # declare variables - archives
+        archive_path_list = None
+        archive_path = None
+        archive_count = None
+        archive_counter = None
+        changed_archive_path_list = None
+        archive_manifest_map = None
+        manifest_dict = None
+        unchanged_archive_counter = None
+        unchanged_archive_identifier_list = None
+        checkpoint_summary_map = None
+        resumed_archive_counter = None
+        archive_start_time = None
+        archive_end_time = None
+        archive_duration = None
         
-            # get instance
-            phnp_newspaper_instance = paper_qs.get()
-
-            # get needed information
-            paper_identifier = phnp_newspaper_instance.paper_identifier
-            start_year = phnp_newspaper_instance.start_year
-            end_year = phnp_newspaper_instance.end_year
-            compressed_folder_path = phnp_newspaper_instance.compressed_folder_path
-            uncompressed_folder_path = phnp_newspaper_instance.uncompressed_folder_path
-            newspaper = phnp_newspaper_instance.newspaper
+        # declare variables - parallel processing
+        worker_count = None
+        process_pool = None
+        future_list = None
+        future = None
+        
+        # declare variables - object types per archive
+        object_type_value = None
+        object_type_count = None
+        archive_identifier = None
+        archive_summary_dict = None
+        
+        # declare variables - update database
+        paper_instance = None
+        status_dict = None
+        
+        # declare variables - auditing
+        start_dt = None
+        end_dt = None
+        duration = None
+        start_time = None
+        
+        # init
+        object_type_to_count_map = {}
+        self.min_pub_date_int = None
+        self.max_pub_date_int = None
+        self.metrics = ProquestHNPMetrics()
+        start_dt = datetime.datetime.now()
+        archive_counter = 0
+        worker_count = worker_count_IN
+        if ( ( worker_count is None ) or ( worker_count < 1 ) ):
+        
+            worker_count = 1
             
-            # store in self
-            self.paper_identifier = paper_identifier_IN
-            self.paper_start_year = start_year
-            self.paper_end_year = end_year
-            self.source_paper_path = compressed_folder_path
-            self.destination_paper_path = uncompressed_folder_path
-            self.phnp_newspaper = phnp_newspaper_instance
-            self.newspaper = phnp_newspaper_instance.newspaper
+        #-- END check to see if valid worker count --#
+
+        # first, get paper path from instance.
+        if ( use_zip_files_IN == True ):
+        
+            # zip files in source folder.
+            paper_path = self.source_paper_path
             
         else:
+        
+            # uncompressed archive folders in destination folder.
+            paper_path = self.destination_paper_path
             
-            log_message = "In {}: ERROR - no Proquest_HNP_Newspaper record exists for paper_identifier \"{}\".  Returning None.".format( me, paper_identifier )
+        #-- END check to see if reading zip files. --#
+        
+        if ( ( paper_path is not None ) and ( paper_path != "" ) ):
+        
+            # first, get the list of archives for the current paper (timed as
+            #     "list").
+            archive_path_list = [ dir_entry.path for dir_entry in self.iterate_paper_archives( use_zip_files_IN ) ]
+            
+            archive_count = len( archive_path_list )
+            
+            log_message = "Processing {} archives in {} ( {} worker(s) )".format( archive_count, paper_path, worker_count )
+            self.output_progress_message( log_message )
+            
+            # make sure the paper's record exists before we start.
+            paper_instance = self.get_PHNP_newspaper()
+            
+            # resume an interrupted run, or start a new one.
+            self.get_checkpoint( Proquest_HNP_Checkpoint.RUN_TYPE_OBJECT_TYPES,
+                                 use_zip_files_IN = use_zip_files_IN,
+                                 archive_count_IN = archive_count,
+                                 restart_IN = restart_IN )
+            with self.metrics.time_phase( ProquestHNPMetrics.PHASE_DB_READ ):
+            
+                checkpoint_summary_map = self.load_checkpoint_archive_summaries()
+                
+            #-- END with metrics.time_phase() --#
+            
+            # skip archives already finished in this run, or that have not
+            #     changed since last summarized.
+            changed_archive_path_list = []
+            unchanged_archive_counter = 0
+            unchanged_archive_identifier_list = []
+            resumed_archive_counter = 0
+            archive_manifest_map = {}
+            for archive_path in archive_path_list:
+            
+                archive_summary_dict = None
+                archive_identifier = self.get_archive_identifier( archive_path )
+                
+                # one manifest per archive per run - used to check for
+                #     changes, stored with the summary, and to check indexes.
+                with self.metrics.time_phase( ProquestHNPMetrics.PHASE_LIST, archive_identifier ):
+                
+                    manifest_dict = self.build_archive_manifest( archive_path, is_zip_file_IN = use_zip_files_IN )
+                    
+                #-- END with metrics.time_phase() --#
+                
+                archive_manifest_map[ archive_path ] = manifest_dict
+                if ( archive_identifier in checkpoint_summary_map ):
+                
+                    # finished before the run was interrupted - if not changed
+                    #     since.
+                    archive_summary_dict = checkpoint_summary_map[ archive_identifier ]
+                    if ( self.is_archive_manifest_current( archive_summary_dict[ self.ARCHIVE_SUMMARY_INSTANCE ], manifest_dict ) == True ):
+                    
+                        archive_summary_dict[ self.ARCHIVE_SUMMARY_MANIFEST ] = manifest_dict
+                        
+                    else:
+                    
+                        # changed - process it again.
+                        del checkpoint_summary_map[ archive_identifier ]
+                        archive_summary_dict = None
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES_CHANGED_SINCE_CHECKPOINT, archive_identifier_IN = archive_identifier )
+                        log_message = "==> CHANGED since checkpointed, so processing again - archive {}".format( archive_path )
+                        self.output_progress_message( log_message )
+                        
+                    #-- END check to see if changed since checkpointed --#
+                    
+                elif ( skip_unchanged_IN == True ):
+                
+                    archive_summary_dict = self.get_unchanged_archive_summary( archive_path,
+                                                                               use_zip_files_IN = use_zip_files_IN,
+                                                                               manifest_dict_IN = manifest_dict )
+                    
+                #-- END check to see if checkpointed or skipping unchanged archives --#
+                
+                if ( archive_summary_dict is not None ):
+                
+                    # checkpointed or unchanged - use stored counts.
+                    archive_counter += 1
+                    if ( archive_identifier in checkpoint_summary_map ):
+                    
+                        resumed_archive_counter += 1
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED, archive_identifier_IN = archive_identifier )
+                        log_message = "==> CHECKPOINTED, so using stored counts - archive {} ( {} of {} )".format( archive_path, archive_counter, archive_count )
+                        
+                    else:
+                    
+                        unchanged_archive_counter += 1
+                        unchanged_archive_identifier_list.append( archive_identifier )
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES_UNCHANGED, archive_identifier_IN = archive_identifier )
+                        log_message = "==> UNCHANGED, so using stored counts - archive {} ( {} of {} )".format( archive_path, archive_counter, archive_count )
+                        
+                    #-- END check to see if checkpointed --#
+                    
+                    self.output_progress_message( log_message )
+                    with self.metrics.time_phase( ProquestHNPMetrics.PHASE_AGGREGATE ):
+                    
+                        self.merge_archive_summary( archive_summary_dict, object_type_to_count_map )
+                        
+                    #-- END with metrics.time_phase() --#
+                    
+                else:
+                
+                    # changed or new - process it.
+                    changed_archive_path_list.append( archive_path )
+                    
+                #-- END check to see if unchanged --#
+                
+            #-- END loop over archives to check for changes --#
+            
+            # unchanged archives are finished, too.
+            self.record_checkpoint_archives( unchanged_archive_identifier_list )
+            
+            log_message = "{} checkpointed and {} unchanged archives skipped, {} to process".format( resumed_archive_counter, unchanged_archive_counter, len( changed_archive_path_list ) )
+            self.output_progress_message( log_message )
+            
+            if ( worker_count > 1 ):
+            
+                # close database connections so forked workers don't share
+                #     them (workers never touch the database).
+                connections.close_all()
+                
+                # fan archives out to a process pool.
+                with concurrent.futures.ProcessPoolExecutor( max_workers = worker_count, initializer = django.setup ) as process_pool:
+                
+                    future_list = []
+                    for archive_path in changed_archive_path_list:
+                    
+                        future_list.append( process_pool.submit( summarize_archive_in_worker,
+                                                                 archive_path,
+                                                                 use_zip_files_IN,
+                                                                 self.write_archive_index,
+                                                                 self.read_ahead_count,
+                                                                 archive_manifest_map[ archive_path ],
+                                                                 self.get_archive_index_folder_path( use_zip_files_IN ) ) )
+                        
+                    #-- END loop over archives to submit --#
+                    
+                    # process results as they come in.
+                    for future in concurrent.futures.as_completed( future_list ):
+                    
+                        archive_counter += 1
+                        archive_path, archive_summary_dict = future.result()
+
+                        log_message = "==> Processed archive {} ( {} of {} ) @ {}".format( archive_path, archive_counter, archive_count, datetime.datetime.now() )
+                        self.output_progress_message( log_message )
+                        self.output_archive_summary( archive_summary_dict, print_logging_IN = print_archive_logging_IN )
+
+                        # store in database, from this process (batched).
+                        archive_identifier = self.get_archive_identifier( archive_path )
+                        if ( use_zip_files_IN == True ):
+
+                            self.queue_archive_summary( archive_identifier,
+                                                        archive_summary_dict,
+                                                        compressed_file_path_IN = archive_path )
+
+                        else:
+
+                            self.queue_archive_summary( archive_identifier,
+                                                        archive_summary_dict,
+                                                        compressed_file_path_IN = self.get_archive_zip_file_path( archive_identifier ),
+                                                        uncompressed_folder_path_IN = archive_path )
+
+                        #-- END check to see if zip file or folder --#
+                        
+                        # merge into paper totals.
+                        with self.metrics.time_phase( ProquestHNPMetrics.PHASE_AGGREGATE ):
+                        
+                            self.merge_archive_summary( archive_summary_dict, object_type_to_count_map )
+                            
+                        #-- END with metrics.time_phase() --#
+                        
+                    #-- END loop over completed futures --#
+                    
+                #-- END with ProcessPoolExecutor --#
+            
+            else:
+            
+                # loop over the archives
+                for archive_path in changed_archive_path_list:
+                    
+                    archive_counter += 1
+                    
+                    # log the archive
+                    archive_start_time = datetime.datetime.now()
+                    log_message = "==> Processing archive {} ( {} of {} ) @ {}".format( archive_path, archive_counter, archive_count, archive_start_time )
+                    self.output_progress_message( log_message )
+                    
+                    # call the method to process the object types in the archive
+                    if ( use_zip_files_IN == True ):
+                    
+                        archive_summary_dict = self.summarize_archive_zip_file( archive_path,
+                                                                                print_archive_logging_IN,
+                                                                                manifest_dict_IN = archive_manifest_map[ archive_path ] )
+                        
+                    else:
+                    
+                        archive_summary_dict = self.summarize_archive_files( archive_path,
+                                                                             print_archive_logging_IN,
+                                                                             manifest_dict_IN = archive_manifest_map[ archive_path ] )
+                        
+                    #-- END check to see if zip file or folder --#
+                    
+                    # merge results with main map.
+                    with self.metrics.time_phase( ProquestHNPMetrics.PHASE_AGGREGATE ):
+                    
+                        self.merge_archive_summary( archive_summary_dict, object_type_to_count_map )
+                        
+                    #-- END with metrics.time_phase() --#
+                    
+                    # log the archive
+                    archive_end_time = datetime.datetime.now()
+                    archive_duration = archive_end_time - archive_start_time
+                    log_message = "----> Processing complete @ {} ( duration {} )\n".format( archive_end_time, archive_duration )
+                    self.output_progress_message( log_message )
+                
+                #-- END loop over archives --#
+                
+            #-- END check to see if parallel --#
+            
+        else:
+        
+            log_message = "In {}: ERROR - no folder path found, can't process.".format( me )
             self.output_debug_message( log_message, do_print_IN = True )
-            phnp_newspaper_instance = None
+
+        #-- END check to see if paper path --#
+        
+        # write any archives still queued.
+        self.flush_archive_summaries()
+        
+        # take Records already counted in an earlier archive off the paper
+        #     totals (archive counts are left as-is).
+        if ( ( self.skip_duplicate_records == True ) and ( archive_counter > 0 ) ):
+        
+            self.remove_duplicate_record_counts( object_type_to_count_map,
+                                                 archive_path_list,
+                                                 use_zip_files_IN = use_zip_files_IN,
+                                                 archive_manifest_map_IN = archive_manifest_map )
+            
+        #-- END check to see if skipping duplicates --#
+            
+        log_message = "Archive count: {}".format( archive_counter )
+        self.output_progress_message( log_message )
+        
+        log_message = "NumericPubDate range: {} to {}".format( self.min_pub_date_int, self.max_pub_date_int )
+        self.output_progress_message( log_message )
+        
+        log_message = "\nObjectType values and occurrence counts:"
+        self.output_progress_message( log_message )
+
+        # loop over object type to count map
+        if ( self.is_output_enabled() == True ):
+        
+            for object_type, object_type_count in six.iteritems( object_type_to_count_map ):
+            
+                # print type and count
+                log_message = "- {}: {}".format( object_type, object_type_count )
+                self.output_progress_message( log_message )
+            
+            #-- END loop over object types --#
+            
+        #-- END check to see if output enabled --#
+        
+        # store paper-level counts - only remove types that are gone if we
+        #     actually looked at archives.
+        self.set_checkpoint_phase( Proquest_HNP_Checkpoint.PHASE_PAPER )
+        start_time = time.perf_counter()
+        paper_instance = self.get_PHNP_newspaper()
+        with transaction.atomic():
+        
+            status_dict = self.store_object_type_counts( PHNP_Newspaper_Object_Type,
+                                                         "proquest_hnp_newspaper",
+                                                         paper_instance,
+                                                         object_type_to_count_map,
+                                                         delete_missing_IN = ( archive_counter > 0 ) )
+            
+        #-- END with transaction.atomic() --#
+        
+        self.metrics.add_time( ProquestHNPMetrics.PHASE_DB_WRITE, time.perf_counter() - start_time )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_CREATED, status_dict[ "created" ] )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_UPDATED, status_dict[ "updated" ] )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_DELETED, status_dict[ "deleted" ] )
+        
+        # run is done - a later run starts over.
+        self.set_checkpoint_phase( Proquest_HNP_Checkpoint.PHASE_COMPLETE )
+        
+        # timing
+        end_dt = datetime.datetime.now()
+        duration = end_dt - start_dt
+        log_message = "Processing complete @ {} ( started at {}; duration: {} )\n".format( end_dt, start_dt, duration )
+        self.output_progress_message( log_message )
+        
+        # metrics
+        self.output_metrics_json_lines( run_name_IN = me )
+
+        object_type_to_count_map_OUT = object_type_to_count_map
+        return object_type_to_count_map_OUT
+                
+    #-- END method process_paper_object_types() --#
+        
+
+    def queue_archive_summary( self,
+                               archive_identifier_IN,
+                               summary_dict_IN,
+                               compressed_file_path_IN = None,
+                               uncompressed_folder_path_IN = None ):
+        
+        '''
+        Queues an archive summary to be stored (see store_archive_summary()).
+            Once archive_write_batch_size archives are queued, they are all
+            written in one transaction (see flush_archive_summaries()).  With
+            the default batch size of 1, each archive is written right away.
+            With a larger batch, call flush_archive_summaries() when done -
+            process_paper_object_types() does.  Returns True if the queue was
+            written.
+        '''
+        
+        # return reference
+        did_flush_OUT = None
+        
+        # declare variables
+        batch_size = None
+        
+        # init
+        batch_size = self.archive_write_batch_size
+        if ( ( batch_size is None ) or ( batch_size < 1 ) ):
+        
+            batch_size = 1
+            
+        #-- END check to see if valid batch size --#
+        
+        self.pending_archive_write_list.append( ( archive_identifier_IN, summary_dict_IN, compressed_file_path_IN, uncompressed_folder_path_IN ) )
+        did_flush_OUT = False
+        if ( len( self.pending_archive_write_list ) >= batch_size ):
+        
+            self.flush_archive_summaries()
+            did_flush_OUT = True
+            
+        #-- END check to see if batch is full --#
+        
+        return did_flush_OUT
+        
+    #-- END method queue_archive_summary() --#
+        
+
+    def record_checkpoint_archives( self, archive_identifier_list_IN ):
+        
+        '''
+        Records the archives in archive_identifier_list_IN as finished in the
+            current checkpoint (see get_checkpoint()), if there is one.
+            Archives already recorded are skipped.  Returns the number
+            recorded.
+        '''
+        
+        # return reference
+        record_count_OUT = None
+        
+        # declare variables
+        new_identifier_list = None
+        archive_identifier = None
+        
+        record_count_OUT = 0
+        if ( self.checkpoint is not None ):
+        
+            new_identifier_list = [ archive_identifier for archive_identifier in dict.fromkeys( archive_identifier_list_IN ) if ( archive_identifier not in self.checkpoint_archive_identifier_set ) ]
+            if ( len( new_identifier_list ) > 0 ):
             
-        #-- END check if exists --#
+                PHNP_Checkpoint_Archive.objects.bulk_create( [ PHNP_Checkpoint_Archive( proquest_hnp_checkpoint = self.checkpoint, archive_identifier = archive_identifier ) for archive_identifier in new_identifier_list ],
+                                                             ignore_conflicts = True )
+                self.checkpoint_archive_identifier_set.update( new_identifier_list )
+                record_count_OUT = len( new_identifier_list )
+                
+            #-- END check to see if anything new --#
             
-        # return
-        instance_OUT = phnp_newspaper_instance
-        return instance_OUT
+        #-- END check to see if checkpoint --#
+        
+        return record_count_OUT
+        
+    #-- END method record_checkpoint_archives() --#
         
-    #-- END method initialize_from_database() --#
-    
 
-    def make_dest_paper_folder( self ):
+    def remove_duplicate_record_counts( self, object_type_to_count_map_IN, archive_path_list_IN, use_zip_files_IN = False, archive_manifest_map_IN = None ):
+        
+        '''
+        Takes the duplicate Records in the archives passed in (see
+            find_duplicate_records(), which also explains
+            archive_manifest_map_IN) off of an ObjectType to count map, in
+            place.  Types left with no Records are removed.  Returns the map
+            of ObjectType value to number of duplicates removed.
+        '''
         
         # return reference
-        did_it_exist_OUT = False
+        duplicate_type_to_count_map_OUT = None
         
         # declare variables
-        uncompressed_paper_path = None
-        did_uncomp_paper_folder_exist = False
-        log_message = None
+        object_type = None
+        duplicate_count = None
+        object_type_count = None
         
-        # get uncompressed paper path
-        uncompressed_paper_path = self.destination_paper_path
+        duplicate_type_to_count_map_OUT = self.find_duplicate_records( archive_path_list_IN,
+                                                                       use_zip_files_IN = use_zip_files_IN,
+                                                                       archive_manifest_map_IN = archive_manifest_map_IN )
+        for object_type, duplicate_count in six.iteritems( duplicate_type_to_count_map_OUT ):
         
-        # check if uncompressed paper folder exists.
-        if not os.path.exists( uncompressed_paper_path ):
-            
-            # no.  Make it.
-            os.makedirs( uncompressed_paper_path )
-            did_uncomp_paper_folder_exist = False
-            log_message = "CREATED - Uncompressed paper folder {}".format( uncompressed_paper_path )
-            self.output_debug_message( log_message, do_print_IN = True )
+            object_type_count = object_type_to_count_map_IN.get( object_type, 0 ) - duplicate_count
+            if ( object_type_count > 0 ):
             
-        else:
+                object_type_to_count_map_IN[ object_type ] = object_type_count
+                
+            else:
             
-            # yes.  Set flag.
-            did_uncomp_paper_folder_exist = True
-            log_message = "EXISTS - Uncompressed paper folder {}".format( uncompressed_paper_path )
-            self.output_debug_message( log_message, do_print_IN = True )
+                object_type_to_count_map_IN.pop( object_type, None )
+                
+            #-- END check to see if any left --#
             
-        #-- END check to see if paper folder exists. --#
+        #-- END loop over duplicate counts --#
         
-        self.did_destination_paper_path_exist = did_uncomp_paper_folder_exist
-        did_it_exist_OUT = did_uncomp_paper_folder_exist
-
-        return did_it_exist_OUT
+        return duplicate_type_to_count_map_OUT
+        
+    #-- END method remove_duplicate_record_counts() --#
         
-    #-- END method make_dest_paper_folder() --#
-    
 
-    def map_archive_folder_files_to_types( self, archive_path_IN = None, print_logging_IN = True ):
- 
+    def rollup_paper_object_types( self, remove_duplicates_IN = False, use_zip_files_IN = False ):
+        
+        '''
+        Rebuilds the paper-level ObjectType counts (PHNP_Newspaper_Object_Type)
+            and the Proquest_HNP_Newspaper start and end year from the
+            archive-level rows already in the database, without reading any
+            archives: one SUM ... GROUP BY over the paper's
+            PHNP_Newspaper_Archive_Object_Type rows, and one MIN/MAX over its
+            archives' dates.  Paper-level rows for types no archive has any
+            more are deleted.  Writes are in one transaction.  Use after
+            summarizing some of a paper's archives to refresh its totals.
+            Archive counts include Records also in other archives - if
+            remove_duplicates_IN is True, they are taken off using the
+            archive indexes (see remove_duplicate_record_counts()), for the
+            archive folders, or, if use_zip_files_IN is True, the archive .zip
+            files.
+            
+        Returns the map of ObjectType raw value to count.
+        '''
+        
         # return reference
-        type_to_file_path_map_OUT = None
+        object_type_to_count_map_OUT = None
         
         # declare variables
-        me = "map_archive_folder_files_to_types"
-        uncompressed_archive_path = None
-        xml_file_list = None
-        xml_file_path = None
-        xml_file = None
-        xml_dict = None
-        xml_file_counter = None
-        record_node = None
-        object_type_node = None
-        object_type_list = None
+        me = "rollup_paper_object_types"
+        log_message = None
+        paper_instance = None
+        archive_type_qs = None
         object_type = None
+        object_type_count = None
+        object_type_to_count_map = None
+        date_range_dict = None
+        min_date = None
+        max_date = None
+        update_field_list = None
+        status_dict = None
+        start_time = None
         
-        # declare variables - auditing
-        xml_file_counter = None
-        no_record_counter = None
-        no_object_type_counter = None
-        no_object_type_text_counter = None
+        # init
+        self.metrics = ProquestHNPMetrics()
+        paper_instance = self.get_PHNP_newspaper()
         
-        # output
-        object_type_to_file_path_map = {}
-        object_type_list = None
-        file_path_list = None
-        file_path_list_count = None
-        file_path_example_list = None
+        with self.metrics.time_phase( ProquestHNPMetrics.PHASE_DB_READ ):
         
-        # get uncompressed archive path
-        uncompressed_archive_path = archive_path_IN
-        if ( ( uncompressed_archive_path is not None ) and ( uncompressed_archive_path != "" ) ):
+            # sum archive counts by type.
+            archive_type_qs = PHNP_Newspaper_Archive_Object_Type.objects.filter( proquest_hnp_newspaper_archive__proquest_hnp_newspaper = paper_instance )
+            archive_type_qs = archive_type_qs.values_list( "proquest_hnp_object_type__raw_value" )
+            archive_type_qs = archive_type_qs.annotate( item_count_sum = Sum( "item_count" ) ).order_by()
+            object_type_to_count_map = {}
+            for object_type, object_type_count in archive_type_qs:
+            
+                object_type_to_count_map[ object_type ] = object_type_count
+                
+            #-- END loop over type sums --#
+            
+            # archive date range.
+            date_range_dict = Proquest_HNP_Newspaper_Archive.objects.filter( proquest_hnp_newspaper = paper_instance ).aggregate( min_date = Min( "start_date" ), max_date = Max( "end_date" ) )
+            min_date = date_range_dict[ "min_date" ]
+            max_date = date_range_dict[ "max_date" ]
+            
+        #-- END with metrics.time_phase() --#
         
-            # loop over files in the current archive folder path.
+        # take off duplicate Records?
+        if ( remove_duplicates_IN == True ):
+        
+            self.remove_duplicate_record_counts( object_type_to_count_map,
+                                                 [ dir_entry.path for dir_entry in self.iterate_paper_archives( use_zip_files_IN ) ],
+                                                 use_zip_files_IN = use_zip_files_IN )
             
-            # get file list.
-            xml_file_list = glob.glob( "{}/*.xml".format( uncompressed_archive_path ) )
-            xml_file_count = len( xml_file_list )
+        #-- END check to see if removing duplicates --#
         
-            log_message = "Processing {} XML files in {}".format( xml_file_count, uncompressed_archive_path )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
+        start_time = time.perf_counter()
+        with transaction.atomic():
+        
+            # paper counts
+            status_dict = self.store_object_type_counts( PHNP_Newspaper_Object_Type,
+                                                         "proquest_hnp_newspaper",
+                                                         paper_instance,
+                                                         object_type_to_count_map )
             
-            # log the count
-            log_message = "----> XML file count: {}".format( xml_file_count )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-                    
-            # loop
-            xml_file_counter = 0
-            no_record_counter = 0
-            no_object_type_counter = 0
-            no_object_type_text_counter = 0
-            for xml_file_path in xml_file_list:
+            # paper year range
+            update_field_list = []
+            if ( ( min_date is not None ) and ( paper_instance.start_year != min_date.year ) ):
+            
+                paper_instance.start_year = min_date.year
+                update_field_list.append( "start_year" )
                 
-                xml_file_counter += 1
+            #-- END check to see if start year changed --#
+            
+            if ( ( max_date is not None ) and ( paper_instance.end_year != max_date.year ) ):
+            
+                paper_instance.end_year = max_date.year
+                update_field_list.append( "end_year" )
                 
-                # try to parse the file
-                with open( xml_file_path ) as xml_file:
+            #-- END check to see if end year changed --#
+            
+            if ( len( update_field_list ) > 0 ):
+            
+                paper_instance.save( update_fields = update_field_list )
                 
-                    # parse XML
-                    xml_dict = xmltodict.parse( xml_file.read() )
-                    
-                    # get root.Record.ObjectType value
-                    record_node = xml_dict.get( "Record", None )
-                    
-                    if ( record_node is not None ):
-                        
-                        # get object type (looks like xmltodict stores
-                        #     elements with no attributes and no child
-                        #     elements just as a string contents mapped
-                        #     to name in parent, no dictionary)
-                        #
-                        # so for:
-                        # <Record>
-                        #     ...
-                        #     <ObjectType>Advertisement</ObjectType>
-                        #     ...
-                        # </Record>
-                        #
-                        # to get value:
-                        #     record_node = xml_dict.get( "Record", None )
-                        #     object_type_list = record_node.get( "ObjectType", None )
-                        #     object_type = "|".join( object_type_list )
-                        #
-                        # NOT:
-                        #     record_node = xml_dict.get( "Record", None )
-                        #     object_type_node = record_node.get( "ObjectType", None )
-                        #     object_type = object_type_node.get( "#text", None )
-                        #
-                        # Doc that led me astray: https://docs.python-guide.org/scenarios/xml/
-                        object_type_list = record_node.get( "ObjectType", None )
-                        object_type = "|".join( object_type_list )
+            #-- END check to see if paper changed --#
             
-                        # got a type?
-                        if ( ( object_type is not None ) and ( object_type != "" ) ):
-            
-                            # we do.  Add path to appropriate list.
-                            file_path_list = object_type_to_file_path_map.get( object_type, [] )
-                            if ( xml_file_path not in file_path_list ):
-                                
-                                # not in list, add it.
-                                file_path_list.append( xml_file_path )
-                                
-                            #-- END check to see if file path in list. --#
-                                
-                            object_type_to_file_path_map[ object_type ] = file_path_list
+        #-- END with transaction.atomic() --#
+        
+        self.metrics.add_time( ProquestHNPMetrics.PHASE_DB_WRITE, time.perf_counter() - start_time )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_CREATED, status_dict[ "created" ] )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_UPDATED, status_dict[ "updated" ] )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_DELETED, status_dict[ "deleted" ] )
+        
+        # store in instance
+        self.object_type_to_count_map = object_type_to_count_map
+        self.paper_start_year = paper_instance.start_year
+        self.paper_end_year = paper_instance.end_year
+        self.min_pub_date_int = None
+        self.max_pub_date_int = None
+        if ( min_date is not None ):
+        
+            self.min_pub_date_int = int( min_date.strftime( self.DATETIME_FORMAT_NUMERAL_PUB_DATE ) )
             
-                        else:
+        #-- END check to see if min date --#
+        
+        if ( max_date is not None ):
+        
+            self.max_pub_date_int = int( max_date.strftime( self.DATETIME_FORMAT_NUMERAL_PUB_DATE ) )
             
-                            # object type is None
-                            no_object_type_text_counter += 1
+        #-- END check to see if max date --#
+        
+        log_message = "In {}: {} ObjectType values ( {} created, {} updated, {} deleted ), years {} to {}".format( me, len( object_type_to_count_map ), status_dict[ "created" ], status_dict[ "updated" ], status_dict[ "deleted" ], self.paper_start_year, self.paper_end_year )
+        self.output_progress_message( log_message )
+        
+        # metrics
+        self.output_metrics_json_lines( run_name_IN = me )
+        
+        object_type_to_count_map_OUT = object_type_to_count_map
+        return object_type_to_count_map_OUT
+        
+    #-- END method rollup_paper_object_types() --#
+        
+
+    def select_paper_records( self, object_type_list_IN = None, start_pub_date_int_IN = None, end_pub_date_int_IN = None, use_zip_files_IN = False ):
+        
+        '''
+        Finds the Records in the paper that match the filters passed in (see
+            ProquestHNPArchiveIndex.select()) using each archive's index, so no
+            XML is read.  Looks at the archive folders in
+            destination_paper_path, or, if use_zip_files_IN is True, the
+            archive .zip files in source_paper_path.  Archives with no current
+            index are skipped and logged - summarize them to build one.
             
-                        #-- END check for type value --#
-                        
-                    else:
-                        
-                        # increment counter
-                        no_record_counter += 1
-                        
-                    #-- END check if we found a "Record" node in root --#
+        Returns a map of archive identifier to the list of matching rows (see
+            ProquestHNPArchiveIndex.get_row()), for archives with matches.
+        '''
+        
+        # return reference
+        archive_to_row_list_map_OUT = None
+        
+        # declare variables
+        me = "select_paper_records"
+        log_message = None
+        paper_path = None
+        archive_path = None
+        archive_index = None
+        row_index_list = None
+        row_index = None
+        
+        # init
+        archive_to_row_list_map_OUT = {}
+        if ( use_zip_files_IN == True ):
+        
+            paper_path = self.source_paper_path
             
-                #-- END with open( xml_file_path )...: --#
-                
-            #-- END loop over XML files --#
+        else:
+        
+            paper_path = self.destination_paper_path
+            
+        #-- END check to see if reading zip files. --#
+        
+        if ( ( paper_path is not None ) and ( paper_path != "" ) ):
+        
+            for archive_path in sorted( dir_entry.path for dir_entry in self.iterate_paper_archives( use_zip_files_IN ) ):
             
-            log_message = "\nIn {}:".format( me )
-            log_message += "\nXML file count: {}".format( len( xml_file_list ) )
-            log_message += "\nCounters:"
-            log_message += "\n- Processed {} files".format( xml_file_counter )
-            log_message += "\n- No Record: {}".format( no_record_counter )
-            log_message += "\n- No ObjectType: {}".format( no_object_type_counter )
-            log_message += "\n- No ObjectType value: {}".format( no_object_type_text_counter )
-            log_message += "\n\nObjectType values and occurrence counts:"
-            object_type_list = list( six.iterkeys( object_type_to_file_path_map ) )
-            object_type_list.sort()
-            for object_type in object_type_list:
-                
-                # get file path list
-                file_path_list = object_type_to_file_path_map.get( object_type, [] )
+                archive_index = self.load_archive_index( archive_path,
+                                                         is_zip_file_IN = use_zip_files_IN,
+                                                         index_folder_path_IN = self.get_archive_index_folder_path( use_zip_files_IN ) )
+                if ( archive_index is not None ):
                 
-                # print type and count
-                file_path_list_count = len( file_path_list )
-                file_path_example_list = file_path_list[ : 10 ]
-                log_message += "\n- {} - {} files:".format( object_type, file_path_list_count )
-                for file_path in file_path_example_list:
+                    row_index_list = archive_index.select( object_type_list_IN, start_pub_date_int_IN, end_pub_date_int_IN )
+                    if ( len( row_index_list ) > 0 ):
                     
-                    log_message += "\n    - {}".format( file_path )
+                        archive_to_row_list_map_OUT[ self.get_archive_identifier( archive_path ) ] = [ archive_index.get_row( row_index ) for row_index in row_index_list ]
+                        
+                    #-- END check to see if any matches --#
                     
-                #-- END loop over example file paths. --#
+                else:
                 
-            #-- END loop over object types. --#
+                    log_message = "In {}: no current index for archive {}, so skipped it.".format( me, archive_path )
+                    self.output_debug_message( log_message, do_print_IN = True )
+                    
+                #-- END check to see if index --#
+                
+            #-- END loop over archives --#
             
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-        
         else:
         
-            log_message = "In {}: ERROR - no path passed in, can't process.".format( me )
+            log_message = "In {}: ERROR - no folder path found, can't select.".format( me )
             self.output_debug_message( log_message, do_print_IN = True )
+            
+        #-- END check to see if paper path --#
         
-        #-- END check to see if path passed in. --#
-
-        # return the map.        
-        type_to_file_path_map_OUT = object_type_to_file_path_map
+        return archive_to_row_list_map_OUT
         
-        return type_to_file_path_map_OUT
-
-    #-- END method map_archive_folder_files_to_types() --#
+    #-- END method select_paper_records() --#
     
 
+    def set_checkpoint_phase( self, phase_IN ):
+        
+        '''
+        Sets the current checkpoint's phase (one of the
+            Proquest_HNP_Checkpoint.PHASE_* values), if there is a checkpoint.
+            Once a run is complete or abandoned, it is no longer the current
+            checkpoint.
+        '''
+        
+        if ( self.checkpoint is not None ):
+        
+            self.checkpoint.phase = phase_IN
+            self.checkpoint.save( update_fields = [ "phase", "last_modified" ] )
+            if ( phase_IN in Proquest_HNP_Checkpoint.CLOSED_PHASE_LIST ):
+            
+                self.checkpoint = None
+                self.checkpoint_archive_identifier_set = set()
+                
+            #-- END check to see if run is over --#
+            
+        #-- END check to see if checkpoint --#
+        
+    #-- END method set_checkpoint_phase() --#
+        
 
-    def process_archive_object_types( self, archive_path_IN = None, print_logging_IN = True ):
+    def store_archive_summary( self,
+                               archive_identifier_IN,
+                               summary_dict_IN,
+                               compressed_file_path_IN = None,
+                               uncompressed_folder_path_IN = None ):
+        
+        '''
+        Accepts archive identifier and a summary dictionary from
+            summarize_archive_folder().  Creates or updates the
+            Proquest_HNP_Newspaper_Archive for the archive and its
+            PHNP_Newspaper_Archive_Object_Type counts, in one transaction (or
+            as part of the caller's, with no savepoint, when called inside a
+            batch - see flush_archive_summaries()) - counts that changed are
+            updated, and types the archive no longer has are deleted.  Stores the archive instance in the summary
+            dictionary and returns it.
+        '''
         
         # return reference
-        object_type_to_count_map_OUT = None
+        instance_OUT = None
         
         # declare variables
-        me = "process_archive_object_types"
-        archive_summary_dict = None
+        me = "store_archive_summary"
+        object_type_to_count_map = None
+        min_pub_date_int = None
+        min_pub_date = None
+        max_pub_date_int = None
+        max_pub_date = None
+        manifest_dict = None
         
-        # summarize archive
-        archive_summary_dict = self.summarize_archive_files( archive_path_IN, print_logging_IN )
+        # declare variables - update database
+        archive_instance = None
+        status_dict = None
+        start_time = None
         
-        # pull out type-to-count map
-        object_type_to_count_map_OUT = archive_summary_dict.get( self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP, None )
+        # record the archive's read/parse metrics.
+        self.metrics.merge_totals_dict( summary_dict_IN.get( self.ARCHIVE_SUMMARY_METRICS, None ), archive_identifier_IN )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES, archive_identifier_IN = archive_identifier_IN )
+        start_time = time.perf_counter()
+        
+        # get information from summary
+        object_type_to_count_map = summary_dict_IN.get( self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP, {} )
+        min_pub_date_int = summary_dict_IN.get( self.ARCHIVE_SUMMARY_MIN_PUB_DATE, None )
+        max_pub_date_int = summary_dict_IN.get( self.ARCHIVE_SUMMARY_MAX_PUB_DATE, None )
+        
+        # convert dates
+        if ( min_pub_date_int is not None ):
+        
+            min_pub_date = str( min_pub_date_int )
+            min_pub_date = datetime.datetime.strptime( min_pub_date, self.DATETIME_FORMAT_NUMERAL_PUB_DATE )
+            
+        #-- END check to see if min pub date --#
+        
+        if ( max_pub_date_int is not None ):
+        
+            max_pub_date = str( max_pub_date_int )
+            max_pub_date = datetime.datetime.strptime( max_pub_date, self.DATETIME_FORMAT_NUMERAL_PUB_DATE )
+            
+        #-- END check to see if max pub date --#
 
-        return object_type_to_count_map_OUT
-                
-    #-- END method process_archive_object_types() --#
+        with transaction.atomic( savepoint = False ):
+            
+            # get archive instance
+            archive_instance = self.get_archive_instance( archive_identifier_IN,
+                                                          compressed_file_path_IN = compressed_file_path_IN,
+                                                          uncompressed_folder_path_IN = uncompressed_folder_path_IN,
+                                                          start_date_IN = min_pub_date,
+                                                          end_date_IN = max_pub_date )
+
+            # update it
+            archive_instance.start_date = min_pub_date
+            archive_instance.end_date = max_pub_date
+            
+            # got a manifest?
+            manifest_dict = summary_dict_IN.get( self.ARCHIVE_SUMMARY_MANIFEST, None )
+            if ( manifest_dict is not None ):
+            
+                # store it, so we can tell if the archive changes.
+                archive_instance.manifest_file_count = manifest_dict.get( self.ARCHIVE_MANIFEST_FILE_COUNT, None )
+                archive_instance.manifest_total_bytes = manifest_dict.get( self.ARCHIVE_MANIFEST_TOTAL_BYTES, None )
+                archive_instance.manifest_newest_mtime_ns = manifest_dict.get( self.ARCHIVE_MANIFEST_NEWEST_MTIME_NS, None )
+                archive_instance.manifest_fingerprint = manifest_dict.get( self.ARCHIVE_MANIFEST_FINGERPRINT, None )
+                archive_instance.manifest_updated = timezone.now()
+            
+            #-- END check to see if manifest --#
+            
+            archive_instance.save()
+            
+            # store archive's object type counts.
+            status_dict = self.store_object_type_counts( PHNP_Newspaper_Archive_Object_Type,
+                                                         "proquest_hnp_newspaper_archive",
+                                                         archive_instance,
+                                                         object_type_to_count_map )
+            
+        #-- END with transaction.atomic() --#
+        
+        self.metrics.add_time( ProquestHNPMetrics.PHASE_DB_WRITE, time.perf_counter() - start_time, archive_identifier_IN )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_CREATED, status_dict[ "created" ], archive_identifier_IN )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_UPDATED, status_dict[ "updated" ], archive_identifier_IN )
+        self.metrics.increment( ProquestHNPMetrics.COUNTER_ROWS_DELETED, status_dict[ "deleted" ], archive_identifier_IN )
+        
+        # add to dict
+        summary_dict_IN[ self.ARCHIVE_SUMMARY_INSTANCE ] = archive_instance
+        
+        instance_OUT = archive_instance
+        return instance_OUT
         
+    #-- END method store_archive_summary() --#
+    
 
-    def process_paper_object_types( self, print_archive_logging_IN = False ):
+    def store_object_type_counts( self,
+                                  count_model_IN,
+                                  parent_field_name_IN,
+                                  parent_instance_IN,
+                                  object_type_to_count_map_IN,
+                                  delete_missing_IN = True ):
+        
+        '''
+        Writes ObjectType counts for an archive or a paper in bulk, as a delta
+            against what is stored.  Accepts the count model
+            (PHNP_Newspaper_Archive_Object_Type or PHNP_Newspaper_Object_Type),
+            the name of its foreign key to the parent, the parent instance, and
+            a map of ObjectType raw value to count.  Loads the parent's
+            existing count rows in one query, then creates missing rows with
+            bulk_create(), updates rows whose item_count has changed with
+            bulk_update(), and, if delete_missing_IN is True, deletes rows for
+            types not in the map.  Rows that are already right are not
+            touched.  Call inside a transaction to apply the delta atomically.
+            If another process creates some of the same rows first (the
+            parent and type pair is unique), those rows are updated instead.
+            
+        Returns a dictionary with the number of rows created, updated,
+            deleted, and unchanged.
+        '''
         
         # return reference
-        object_type_to_count_map_OUT = None
+        status_dict_OUT = None
         
         # declare variables
-        object_type_to_count_map = None
-        uncompressed_paper_path = None
-        
-        # declare variables - folders
-        xml_folder_list = None
-        xml_folder_path = None
-        xml_folder_count = None
-        xml_folder_counter = None
-        xml_folder_start_time = None
-        xml_folder_end_time = None
-        xml_folder_duration = None
-        
-        # declare variables - object types per folder
-        object_type_value = None
+        existing_qs = None
+        existing_instance = None
+        type_id_to_instance_map = None
+        type_id = None
+        seen_type_id_set = None
+        object_type = None
         object_type_count = None
-        folder_type_to_count_map = None
-        folder_object_type_value = None
-        folder_object_type_count = None
-        
-        # declare variables - update database
-        paper_instance = None
         object_type_instance = None
-        paper_type_qs = None
-        paper_type_count = None
-        paper_type_instance = None
+        count_instance = None
+        create_list = None
+        update_list = None
+        retry_create_list = None
+        delete_id_list = None
+        unchanged_count = None
         
-        # declare variables - auditing
-        start_dt = None
-        end_dt = None
-        duration = None
+        # load existing rows, keyed by object type ID.
+        existing_qs = count_model_IN.objects.filter( **{ parent_field_name_IN : parent_instance_IN } )
+        type_id_to_instance_map = {}
+        for existing_instance in existing_qs:
         
-        # first, get paper path from instance.
-        uncompressed_paper_path = self.destination_paper_path
-        if ( ( uncompressed_paper_path is not None ) and ( uncompressed_paper_path != "" ) ):
+            type_id_to_instance_map[ existing_instance.proquest_hnp_object_type_id ] = existing_instance
+            
+        #-- END loop over existing rows --#
+        
+        # figure out what needs to be created and updated.
+        create_list = []
+        update_list = []
+        unchanged_count = 0
+        seen_type_id_set = set()
+        for object_type, object_type_count in six.iteritems( object_type_to_count_map_IN ):
+        
+            # look up object type instance
+            object_type_instance = self.fetch_object_type_instance( object_type )
+            seen_type_id_set.add( object_type_instance.id )
+            
+            # already tied to parent?
+            count_instance = type_id_to_instance_map.get( object_type_instance.id, None )
+            if ( count_instance is None ):
+            
+                # not created yet.
+                count_instance = count_model_IN()
+                setattr( count_instance, parent_field_name_IN, parent_instance_IN )
+                count_instance.proquest_hnp_object_type = object_type_instance
+                count_instance.item_count = object_type_count
+                create_list.append( count_instance )
+                
+            elif ( count_instance.item_count != object_type_count ):
+            
+                # stale count - update it.
+                count_instance.item_count = object_type_count
+                update_list.append( count_instance )
+                
+            else:
+            
+                # already correct.
+                unchanged_count += 1
+                
+            #-- END check to see if associated. --#
+            
+        #-- END loop over object types --#
         
-            # init
-            object_type_to_count_map = {}
-            start_dt = datetime.datetime.now()
+        # rows for types that are gone.
+        delete_id_list = []
+        if ( delete_missing_IN == True ):
+        
+            for type_id, existing_instance in six.iteritems( type_id_to_instance_map ):
             
-            # first, get the list of folders for the current paper.
-            xml_folder_list = glob.glob( "{}/*".format( uncompressed_paper_path ) )
-            xml_folder_count = len( xml_folder_list )
+                if ( type_id not in seen_type_id_set ):
+                
+                    delete_id_list.append( existing_instance.id )
+                    
+                #-- END check to see if type still present --#
+                
+            #-- END loop over existing rows --#
             
-            log_message = "Processing {} XML folders in {}".format( xml_folder_count, uncompressed_paper_path )
-            self.output_debug_message( log_message, do_print_IN = True )
+        #-- END check to see if deleting missing types --#
+        
+        # write
+        if ( len( create_list ) > 0 ):
+        
+            try:
             
-            # loop over the folders
-            xml_folder_counter = 0
-            for xml_folder_path in xml_folder_list:
+                with transaction.atomic():
                 
-                xml_folder_counter += 1
+                    count_model_IN.objects.bulk_create( create_list )
+                    
+                #-- END with transaction.atomic() --#
                 
-                # log the folder
-                xml_folder_start_time = datetime.datetime.now()
-                log_message = "==> Processing XML folder {} ( {} of {} ) @ {}".format( xml_folder_path, xml_folder_counter, xml_folder_count, xml_folder_start_time )
-                self.output_debug_message( log_message, do_print_IN = True )
+            except IntegrityError as ie:
+            
+                # created by someone else in the meantime - update theirs.
+                existing_qs = count_model_IN.objects.filter( **{ parent_field_name_IN : parent_instance_IN } )
+                existing_qs = existing_qs.filter( proquest_hnp_object_type_id__in = [ count_instance.proquest_hnp_object_type_id for count_instance in create_list ] )
+                type_id_to_instance_map = {}
+                for existing_instance in existing_qs:
                 
-                # call the method to process the object types in the folder
-                folder_type_to_count_map = self.process_archive_object_types( xml_folder_path, print_archive_logging_IN )
+                    type_id_to_instance_map[ existing_instance.proquest_hnp_object_type_id ] = existing_instance
+                    
+                #-- END loop over rows created elsewhere --#
                 
-                # merge results with main map.
-                for folder_object_type_value, folder_object_type_count in six.iteritems( folder_type_to_count_map ):
+                retry_create_list = []
+                for count_instance in create_list:
                 
-                    # get count for this type from the master map.
-                    object_type_count = object_type_to_count_map.get( folder_object_type_value, 0 )
+                    existing_instance = type_id_to_instance_map.get( count_instance.proquest_hnp_object_type_id, None )
+                    if ( existing_instance is None ):
                     
-                    # add the count from the folder.
-                    object_type_count += folder_object_type_count
+                        retry_create_list.append( count_instance )
+                        
+                    elif ( existing_instance.item_count != count_instance.item_count ):
+                    
+                        existing_instance.item_count = count_instance.item_count
+                        update_list.append( existing_instance )
+                        
+                    #-- END check to see if created elsewhere --#
                     
-                    # place back into master map
-                    object_type_to_count_map[ folder_object_type_value ] = object_type_count
+                #-- END loop over rows we tried to create --#
                 
-                #-- END loop over results. --#
+                count_model_IN.objects.bulk_create( retry_create_list )
+                create_list = retry_create_list
                 
-                # log the folder
-                xml_folder_end_time = datetime.datetime.now()
-                xml_folder_duration = xml_folder_end_time - xml_folder_start_time
-                log_message = "----> Processing complete @ {} ( duration {} )\n".format( xml_folder_end_time, xml_folder_duration )
-                self.output_debug_message( log_message, do_print_IN = True )
+            #-- END try-except --#
             
-            #-- END loop over XML directories --#
-            
-        else:
-        
-            log_message = "In {}: ERROR - no folder path found, can't process.".format( me )
-            self.output_debug_message( log_message, do_print_IN = True )
-
-        #-- END check to see if paper path --#
-            
-        log_message = "XML folder count: {}".format( xml_folder_counter )
-        self.output_debug_message( log_message, do_print_IN = True )
+        #-- END check to see if anything to create --#
         
-        log_message = "\nObjectType values and occurrence counts:"
-        self.output_debug_message( log_message, do_print_IN = True )
-
-        # loop over object type to count map
-        for object_type, object_type_count in six.iteritems( object_type_to_count_map ):
+        if ( len( update_list ) > 0 ):
         
-            # print type and count
-            log_message = "- {}: {}".format( object_type, object_type_count )
-            self.output_debug_message( log_message, do_print_IN = True )
+            count_model_IN.objects.bulk_update( update_list, [ "item_count" ] )
+            
+        #-- END check to see if anything to update --#
         
-            # look up object type instance
-            paper_instance = self.get_PHNP_newspaper()
-            object_type_instance = self.fetch_object_type_instance( object_type )
+        if ( len( delete_id_list ) > 0 ):
         
-            # see if already tied to paper
-            paper_type_qs = paper_instance.phnp_newspaper_object_type_set.all()
-            paper_type_qs = paper_type_qs.filter( proquest_hnp_object_type = object_type_instance )
-            paper_type_count = paper_type_qs.count()
-            if ( paper_type_count == 0 ):
+            count_model_IN.objects.filter( id__in = delete_id_list ).delete()
             
-                # not created yet.  Create it now.
-                paper_type_instance = PHNP_Newspaper_Object_Type()
-                paper_type_instance.proquest_hnp_newspaper = paper_instance
-                paper_type_instance.proquest_hnp_object_type = object_type_instance
-                paper_type_instance.item_count = object_type_count
-                paper_type_instance.save()
-                
-            else:
-            
-                # ! TODO - should I update count?  Probably not.
-                pass
-                
-            #-- END check to see if associated. --#
-            
-        #-- END loop over object types --#
+        #-- END check to see if anything to delete --#
         
-        # timing
-        end_dt = datetime.datetime.now()
-        duration = end_dt - start_dt
-        log_message = "Processing complete @ {} ( started at {}; duration: {} )\n".format( end_dt, start_dt, duration )
-        self.output_debug_message( log_message, do_print_IN = True )
-
-        object_type_to_count_map_OUT = object_type_to_count_map
-        return object_type_to_count_map_OUT
-                
-    #-- END method process_archive_object_types() --#
+        status_dict_OUT = {}
+        status_dict_OUT[ "created" ] = len( create_list )
+        status_dict_OUT[ "updated" ] = len( update_list )
+        status_dict_OUT[ "deleted" ] = len( delete_id_list )
+        status_dict_OUT[ "unchanged" ] = unchanged_count
         
+        return status_dict_OUT
+        
+    #-- END method store_object_type_counts() --#
+    
 
-    def summarize_archive_files( self, archive_path_IN = None, print_logging_IN = True ):
+    def summarize_archive_files( self, archive_path_IN = None, print_logging_IN = True, manifest_dict_IN = None ):
         
         # return reference
         summary_dict_OUT = None
@@ -973,183 +4023,31 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
         me = "summarize_archive_files"
         log_message = None
         uncompressed_archive_path = None
-        archive_path_item_list = None
         archive_identifier = None
-        xml_file_list = None
-        xml_file_count = None
-        xml_file_path = None
-        xml_file = None
-        xml_dict = None
-        xml_file_counter = None
-        
-        # declare variables - within XML file
-        object_type_to_count_map = None
-        object_type_count = None
-        record_node = None
-        object_type_node = None
-        object_type_list = None
-        object_type = None
-        numeric_pub_date_list = None
-        numeric_pub_date = None
-        numeric_pub_date_int = None
-        
-        # declare variables - summary information
-        min_pub_date_int = None
-        min_pub_date = None
-        max_pub_date_int = None
-        max_pub_date = None
-        archive_instance = None
-                
-        # declare variables - auditing
-        xml_file_counter = None
-        no_record_counter = None
-        no_object_type_counter = None
-        no_object_type_text_counter = None
-        
-        # declare variables - update database
-        object_type_instance = None
-        compressed_paper_path = None
-        compressed_file_path = None
-        archive_instance = None
-        archive_type_qs = None
-        archive_type_count = None
-        archive_type_instance = None
         
         # get uncompressed archive path
         uncompressed_archive_path = archive_path_IN
-        archive_path_item_list = uncompressed_archive_path.split( "/" )
-        archive_identifier = archive_path_item_list[ -1 ]
         if ( ( uncompressed_archive_path is not None ) and ( uncompressed_archive_path != "" ) ):
         
-            # init
-            summary_dict_OUT = {}
-            object_type_to_count_map = {}
-            
-            # get file list.
-            xml_file_list = glob.glob( "{}/*.xml".format( uncompressed_archive_path ) )
-            xml_file_count = len( xml_file_list )
-        
-            log_message = " In {}: Processing {} XML files in {}".format( me, xml_file_count, uncompressed_archive_path )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            
-            # log the count
-            log_message = "----> XML file count: {}".format( xml_file_count )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
+            # archive identifier is the name of the archive folder.
+            archive_identifier = uncompressed_archive_path.split( "/" )[ -1 ]
         
-            # loop
-            xml_file_counter = 0
-            no_record_counter = 0
-            no_object_type_counter = 0
-            no_object_type_text_counter = 0
-            min_pub_date_int = None
-            max_pub_date_int = None
-            for xml_file_path in xml_file_list:
-                
-                xml_file_counter += 1
-                
-                # try to parse the file
-                with open( xml_file_path ) as xml_file:
-                
-                    # parse XML
-                    xml_dict = xmltodict.parse( xml_file.read() )
-                    
-                    # get root.Record.ObjectType value
-                    record_node = xml_dict.get( "Record", None )
-                    
-                    if ( record_node is not None ):
-                        
-                        # get object type (looks like xmltodict stores
-                        #     elements with no attributes and no child
-                        #     elements just as a string contents mapped
-                        #     to name in parent, no dictionary)
-                        #
-                        # so for:
-                        # <Record>
-                        #     ...
-                        #     <ObjectType>Advertisement</ObjectType>
-                        #     ...
-                        # </Record>
-                        #
-                        # to get value:
-                        #     record_node = xml_dict.get( "Record", None )
-                        #     object_type_list = record_node.get( "ObjectType", None )
-                        #     object_type = "|".join( object_type_list )
-                        #
-                        # NOT:
-                        #     record_node = xml_dict.get( "Record", None )
-                        #     object_type_node = record_node.get( "ObjectType", None )
-                        #     object_type = object_type_node.get( "#text", None )
-                        #
-                        # Doc that led me astray: https://docs.python-guide.org/scenarios/xml/
-                        object_type_list = record_node.get( "ObjectType", None )
-                        object_type = "|".join( object_type_list )
-            
-                        # got a type?
-                        if ( ( object_type is not None ) and ( object_type != "" ) ):
-            
-                            # we do.  Increment count.
-                            object_type_count = object_type_to_count_map.get( object_type, 0 )
-                            object_type_count += 1
-                            object_type_to_count_map[ object_type ] = object_type_count
-            
-                        else:
-            
-                            # object type is None
-                            no_object_type_text_counter += 1
-            
-                        #-- END check for type value --#
-                        
-                        # get NumericPubDate
-                        numeric_pub_date_list = record_node.get( "NumericPubDate", None )
-                        numeric_pub_date = "".join( numeric_pub_date_list )
-                        numeric_pub_date_int = int( numeric_pub_date )
-                        
-                        # is it largest...
-                        if ( ( max_pub_date_int is None ) or ( numeric_pub_date_int > max_pub_date_int ) ):
-                        
-                            # either max is empty, or largest thus far.
-                            max_pub_date_int = numeric_pub_date_int
-                            
-                        #-- END check to see if max --#                            
-
-                        # ...or smallest?
-                        if ( ( min_pub_date_int is None ) or ( numeric_pub_date_int < min_pub_date_int ) ):
-                        
-                            # either min is empty, or smallest thus far.
-                            min_pub_date_int = numeric_pub_date_int
-                            
-                        #-- END check to see if min --#                                                
-
-                    else:
-                        
-                        # increment counter
-                        no_record_counter += 1
-                        
-                    #-- END check if we found a "Record" node in root --#
+            log_message = " In {}: Processing XML files in {}".format( me, uncompressed_archive_path )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
             
-                #-- END with open( xml_file_path )...: --#
-                
-            #-- END loop over XML files --#
+            # read and summarize the XML files (no database access).
+            summary_dict_OUT = self.summarize_archive_folder( uncompressed_archive_path,
+                                                              write_index_IN = self.write_archive_index,
+                                                              read_ahead_count_IN = self.read_ahead_count,
+                                                              manifest_dict_IN = manifest_dict_IN,
+                                                              index_folder_path_IN = self.get_archive_index_folder_path() )
+            self.output_archive_summary( summary_dict_OUT, print_logging_IN = print_logging_IN )
             
-            log_message = "\nCounters:"
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            log_message = "- Processed {} files".format( xml_file_counter )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            log_message = "- No Record: {}".format( no_record_counter )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            log_message = "- No ObjectType: {}".format( no_object_type_counter )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            log_message = "- No ObjectType value: {}".format( no_object_type_text_counter )
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            log_message = "\nObjectType values and occurrence counts:"
-            self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-            for object_type, object_type_count in six.iteritems( object_type_to_count_map ):
-                
-                # print type and count
-                log_message = "- {}: {}".format( object_type, object_type_count )
-                self.output_debug_message( log_message, do_print_IN = print_logging_IN )
-                
-            #-- END loop over object types. --#
+            # store summary in database (batched - see queue_archive_summary()).
+            self.queue_archive_summary( archive_identifier,
+                                        summary_dict_OUT,
+                                        compressed_file_path_IN = self.get_archive_zip_file_path( archive_identifier ),
+                                        uncompressed_folder_path_IN = uncompressed_archive_path )
             
         else:
         
@@ -1157,102 +4055,126 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
             self.output_debug_message( log_message, do_print_IN = True )
         
         #-- END check to see if path passed in. --#
-        
-        # store information in summary
-        summary_dict_OUT[ self.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP ] = object_type_to_count_map
-        summary_dict_OUT[ self.ARCHIVE_SUMMARY_MIN_PUB_DATE ] = min_pub_date_int
-        summary_dict_OUT[ self.ARCHIVE_SUMMARY_MAX_PUB_DATE ] = max_pub_date_int
-        summary_dict_OUT[ self.ARCHIVE_SUMMARY_INSTANCE ] = None
-        
-        # get archive instance
-        min_pub_date = str( min_pub_date_int )
-        min_pub_date = datetime.datetime.strptime( min_pub_date, self.DATETIME_FORMAT_NUMERAL_PUB_DATE )
-        max_pub_date = str( max_pub_date_int )
-        max_pub_date = datetime.datetime.strptime( max_pub_date, self.DATETIME_FORMAT_NUMERAL_PUB_DATE )
 
-        compressed_paper_path = self.source_paper_path
-        if ( ( compressed_paper_path is not None ) and ( compressed_paper_path != "" ) ):
-        
-            compressed_file_path = "{}/{}.zip".format( compressed_paper_path, archive_identifier )
-            
-        else:
+        return summary_dict_OUT
+                
+    #-- END method summarize_archive_files() --#
+
+
+    def summarize_archive_zip_file( self, zip_file_path_IN = None, print_logging_IN = True, manifest_dict_IN = None ):
         
-            compressed_file_path = None
+        '''
+        Like summarize_archive_files(), but reads the Record XML files straight
+            from the archive's .zip file, without extracting them to disk.
+            Produces the same summary dictionary and database records.  If
+            the zip file's manifest was already built, pass it in
+            manifest_dict_IN (see summarize_archive_zip()).
+        '''
         
-        #-- END check to see if we have compressed paper path --#
+        # return reference
+        summary_dict_OUT = None
         
-        archive_instance = self.get_archive_instance( archive_identifier,
-                                                      compressed_file_path_IN = compressed_file_path,
-                                                      uncompressed_folder_path_IN = uncompressed_archive_path,
-                                                      start_date_IN = min_pub_date,
-                                                      end_date_IN = max_pub_date)
-
-        # update it
-        archive_instance.start_date = min_pub_date
-        archive_instance.end_date = max_pub_date
-        archive_instance.save()
+        # declare variables
+        me = "summarize_archive_zip_file"
+        log_message = None
+        archive_identifier = None
         
-        # loop over object type to count map
-        for object_type, object_type_count in six.iteritems( object_type_to_count_map ):
+        if ( ( zip_file_path_IN is not None ) and ( zip_file_path_IN != "" ) ):
         
-            # look up object type instance
-            object_type_instance = self.fetch_object_type_instance( object_type )
+            # archive identifier is the name of the zip file, minus ".zip".
+            archive_identifier = self.get_archive_identifier( zip_file_path_IN )
         
-            # see if already tied to archive
-            archive_type_qs = archive_instance.phnp_newspaper_archive_object_type_set.all()
-            archive_type_qs = archive_type_qs.filter( proquest_hnp_object_type = object_type_instance )
-            archive_type_count = archive_type_qs.count()
-            if ( archive_type_count == 0 ):
+            log_message = " In {}: Processing XML files in {}".format( me, zip_file_path_IN )
+            self.output_progress_message( log_message, print_logging_IN = print_logging_IN )
             
-                # not created yet.  Create it now.
-                archive_type_instance = PHNP_Newspaper_Archive_Object_Type()
-                archive_type_instance.proquest_hnp_newspaper_archive = archive_instance
-                archive_type_instance.proquest_hnp_object_type = object_type_instance
-                archive_type_instance.item_count = object_type_count
-                archive_type_instance.save()
-                
-            else:
+            # read and summarize the XML files (no database access).
+            summary_dict_OUT = self.summarize_archive_zip( zip_file_path_IN,
+                                                           write_index_IN = self.write_archive_index,
+                                                           read_ahead_count_IN = self.read_ahead_count,
+                                                           manifest_dict_IN = manifest_dict_IN,
+                                                           index_folder_path_IN = self.get_archive_index_folder_path( True ) )
+            self.output_archive_summary( summary_dict_OUT, print_logging_IN = print_logging_IN )
             
-                # ! TODO - should I update count?  Probably not.
-                pass
-                
-            #-- END check to see if associated. --#
+            # store summary in database (batched - see queue_archive_summary()).
+            self.queue_archive_summary( archive_identifier,
+                                        summary_dict_OUT,
+                                        compressed_file_path_IN = zip_file_path_IN )
             
-        #-- END loop over object types --#
+        else:
         
-        # add to dict
-        summary_dict_OUT[ self.ARCHIVE_SUMMARY_INSTANCE ] = archive_instance        
+            log_message = "In {}: ERROR - no path passed in, can't process.".format( me )
+            self.output_debug_message( log_message, do_print_IN = True )
+        
+        #-- END check to see if path passed in. --#
 
         return summary_dict_OUT
                 
-    #-- END method summarize_archive_files() --#
+    #-- END method summarize_archive_zip_file() --#
         
 
-    def uncompress_paper_zip_files( self ):
+    def uncompress_paper_zip_files( self, worker_count_IN = 1, restart_IN = False ):
     
-        # declare variables - papers
-        did_uncomp_paper_folder_exist = None
+        '''
+        Extracts each archive .zip file in source_paper_path into a folder
+            named for the archive inside destination_paper_path.  Each zip is
+            extracted into a temporary folder that is renamed into place only
+            once extraction succeeds (see extract_archive_zip_file()), so an
+            archive folder that exists is always complete, and a crash leaves
+            only a temporary folder that is cleaned up on the next run.  If
+            worker_count_IN is greater than 1, zips are extracted in a pool of
+            that many threads (zlib releases the GIL while it decompresses).
+            If use_checkpoints is True, each zip is recorded in a checkpoint
+            once extracted, and a run that was interrupted is resumed -
+            archives it finished are not extracted again, unless their folder
+            has since been removed.  If restart_IN is
+            True, or the checkpoint is older than checkpoint_max_age, it is
+            ignored, and a new one is started (see get_checkpoint()).
+            
+        Returns a list of the extraction result dictionaries for the zips
+            extracted (including per-zip throughput).
+        '''
         
+        # return reference
+        result_list_OUT = None
+    
         # declare variables archive (.zip) files.
         me = "uncompress_paper_zip_files"
+        log_message = None
         source_paper_path = None
         uncompressed_paper_path = None
         zip_file_list = None
+        zip_file_count = None
         zip_file_path = None
-        zip_file_path_parts_list = None
-        zip_file_name = None
-        zip_file_name_parts_list = None
         archive_identifier = None
         uc_archive_folder_path = None
-        zip_file = None
+        partial_folder_path = None
+        
+        # declare variables - parallel processing
+        worker_count = None
+        thread_pool = None
+        future_list = None
+        future = None
+        extract_result_dict = None
         
         # declare variables - auditing (uc = uncompressed)
         archive_file_counter = None
         did_uc_archive_folder_exist = None
         uc_folder_exists_counter = None
+        exists_archive_identifier_list = None
+        resumed_archive_counter = None
+        to_extract_list = None
         start_dt = None
         end_dt = None
-        time_delta = None
+        
+        # init
+        result_list_OUT = []
+        self.metrics = ProquestHNPMetrics()
+        worker_count = worker_count_IN
+        if ( ( worker_count is None ) or ( worker_count < 1 ) ):
+        
+            worker_count = 1
+            
+        #-- END check to see if valid worker count --#
         
         # get source paper path and output paper path.
         source_paper_path = self.source_paper_path
@@ -1261,102 +4183,138 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
             # get destination paper path
             uncompressed_paper_path = self.destination_paper_path
             if ( ( uncompressed_paper_path is not None ) and ( uncompressed_paper_path != "" ) ):
+            
+                # clean up temporary folders left by interrupted extracts.
+                for dir_entry in self.iterate_folder_entries( uncompressed_paper_path, folders_only_IN = True, include_hidden_IN = True ):
+                
+                    if ( ( dir_entry.name.startswith( "." ) == True ) and ( self.EXTRACT_PARTIAL_FOLDER_SUFFIX in dir_entry.name ) ):
+                    
+                        shutil.rmtree( dir_entry.path, ignore_errors = True )
+                        log_message = "REMOVED - partial extract folder {}".format( dir_entry.path )
+                        self.output_progress_message( log_message )
+                        
+                    #-- END check to see if partial extract folder --#
+                    
+                #-- END loop over partial extract folders --#
         
-                # use glob to get list of zip files in paper source folder.
-                zip_file_list = glob.glob( "{}/*.zip".format( source_paper_path ) )
+                # get list of zip files in paper source folder (timed as "list").
+                zip_file_list = [ dir_entry.path for dir_entry in self.iterate_paper_archives( use_zip_files_IN = True ) ]
+                
                 zip_file_count = len( zip_file_list )
                 
-                log_message = "==> zip file count: {}".format( zip_file_count )
-                self.output_debug_message( log_message, do_print_IN = True )
+                log_message = "==> zip file count: {} ( {} worker(s) )".format( zip_file_count, worker_count )
+                self.output_progress_message( log_message )
+                
+                # resume an interrupted run, or start a new one.
+                self.get_checkpoint( Proquest_HNP_Checkpoint.RUN_TYPE_UNCOMPRESS,
+                                     archive_count_IN = zip_file_count,
+                                     restart_IN = restart_IN )
                 
-                # loop over zip files.
+                # figure out which zip files still need to be extracted.
                 archive_file_counter = 0
                 did_uc_archive_folder_exist = False
                 uc_folder_exists_counter = 0
+                exists_archive_identifier_list = []
+                resumed_archive_counter = 0
+                to_extract_list = []
                 for zip_file_path in zip_file_list:
                     
-                    # increment counter
-                    archive_file_counter += 1
+                    # archive_identifier is zip file name with ".zip" removed.
+                    archive_identifier = self.get_archive_identifier( zip_file_path )
+                    uc_archive_folder_path = "{}/{}".format( uncompressed_paper_path, archive_identifier )
                     
-                    log_message = "----> processing file {} of {}".format( archive_file_counter, zip_file_count )
-                    self.output_debug_message( log_message, do_print_IN = True )
+                    # check if the uncompressed archive folder exists.
+                    did_uc_archive_folder_exist = os.path.exists( uc_archive_folder_path )
+                    if ( did_uc_archive_folder_exist == False ):
                     
-                    # get file name
+                        # no - extract it (even if checkpointed - the folder
+                        #     was removed after the run was interrupted).
+                        to_extract_list.append( ( zip_file_path, uc_archive_folder_path ) )
+                        
+                    elif ( archive_identifier in self.checkpoint_archive_identifier_set ):
                     
-                    # split path into parts on path separator.
-                    zip_file_path_parts_list = zip_file_path.split( "/" )
+                        # extracted before the run was interrupted.
+                        resumed_archive_counter += 1
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED, archive_identifier_IN = archive_identifier )
+                        
+                    else:
                 
-                    # file name is the last thing in the list.
-                    zip_file_name = zip_file_path_parts_list[ -1 ]
+                        # yes.  Set flag.
+                        uc_folder_exists_counter += 1
+                        exists_archive_identifier_list.append( archive_identifier )
+                        if ( self.is_output_enabled() == True ):
+                        
+                            log_message = "EXISTS, so moving on - Uncompressed archive folder {}".format( uc_archive_folder_path )
+                            self.output_progress_message( log_message )
+                            
+                        #-- END check to see if output enabled --#
                 
-                    # archive_identifier is name with ".zip" removed from end.
-                    zip_file_name_parts_list = zip_file_name.split( ".zip" )
-                    archive_identifier = zip_file_name_parts_list[ 0 ]
+                    #-- END check to see if archive folder exists. --#
                     
-                    # for now, log and print the things we've just created.
-                    log_message = "==> path: {}".format( zip_file_path )
-                    self.output_debug_message( log_message, do_print_IN = True )
-                    log_message = "==> file: {}".format( zip_file_name )
-                    self.output_debug_message( log_message, do_print_IN = True )
-                    log_message = "==> ID: {}".format( archive_identifier )
-                    self.output_debug_message( log_message, do_print_IN = True )
+                #-- END loop over zip files. --#
                 
-                    # check if uncompressed archive folder exists.
-                    uc_archive_folder_path = "{}/{}".format( uncompressed_paper_path, archive_identifier )
+                # archives already extracted are finished, too.
+                self.record_checkpoint_archives( exists_archive_identifier_list )
                 
-                    log_message = "==> TO: {}".format( uc_archive_folder_path )
-                    self.output_debug_message( log_message, do_print_IN = True )
+                # extract
+                start_dt = datetime.datetime.now()
+                log_message = "==> extracting {} zip files ( {} already extracted, {} checkpointed ), started at {}".format( len( to_extract_list ), uc_folder_exists_counter, resumed_archive_counter, start_dt )
+                self.output_progress_message( log_message )
                 
-                    # check if the uncompressed archive folder exists.
-                    did_uc_archive_folder_exist = os.path.exists( uc_archive_folder_path )
-                    if did_uc_archive_folder_exist == False:
+                with concurrent.futures.ThreadPoolExecutor( max_workers = worker_count ) as thread_pool:
                 
-                        # no.  Make it.
-                        os.makedirs( uc_archive_folder_path )
-                        log_message = "CREATED - Uncompressed archive folder {}".format( uc_archive_folder_path )
-                        self.output_debug_message( log_message, do_print_IN = True )
+                    future_list = []
+                    for zip_file_path, uc_archive_folder_path in to_extract_list:
+                    
+                        future_list.append( thread_pool.submit( self.extract_archive_zip_file, zip_file_path, uc_archive_folder_path ) )
                         
-                        # and uncompress archive to it.
-                        with zipfile.ZipFile( zip_file_path, 'r' ) as zip_file:
-                
-                            # starting extract.
-                            start_dt = datetime.datetime.now()
-                            log_message = "==> extract started at {}".format( start_dt )
-                            self.output_debug_message( log_message, do_print_IN = True )
-                            
-                            # unzip to uncompressed archive folder path.
-                            zip_file.extractall( uc_archive_folder_path )
-                            
-                            log_message = "EXTRACTED - {}".format( zip_file_path )
-                            self.output_debug_message( log_message, do_print_IN = True )
-                
-                            log_message = "TO uncompressed archive folder - {}".format( uc_archive_folder_path )
-                            self.output_debug_message( log_message, do_print_IN = True )
-                            
-                            # complete
-                            end_dt = datetime.datetime.now()
-                            
-                            log_message = "==> extract completed at {}".format( end_dt )
-                            self.output_debug_message( log_message, do_print_IN = True )
-                            
-                            log_message = "==> time elapsed: {}".format( end_dt - start_dt )
-                            self.output_debug_message( log_message, do_print_IN = True )
+                    #-- END loop over zip files to extract --#
+                    
+                    for future in concurrent.futures.as_completed( future_list ):
+                    
+                        # increment counter
+                        archive_file_counter += 1
+                        extract_result_dict = future.result()
+                        result_list_OUT.append( extract_result_dict )
+                        
+                        # metrics - extract time is measured in the worker thread.
+                        archive_identifier = self.get_archive_identifier( extract_result_dict[ self.EXTRACT_RESULT_ZIP_FILE_PATH ] )
+                        self.metrics.add_time( ProquestHNPMetrics.PHASE_EXTRACT, extract_result_dict[ self.EXTRACT_RESULT_SECONDS ], archive_identifier )
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_ARCHIVES, archive_identifier_IN = archive_identifier )
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_FILES_EXTRACTED, extract_result_dict[ self.EXTRACT_RESULT_FILE_COUNT ], archive_identifier )
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_BYTES_EXTRACTED, extract_result_dict[ self.EXTRACT_RESULT_UNCOMPRESSED_BYTES ], archive_identifier )
+                        self.metrics.increment( ProquestHNPMetrics.COUNTER_COMPRESSED_BYTES, extract_result_dict[ self.EXTRACT_RESULT_COMPRESSED_BYTES ], archive_identifier )
+                        
+                        # extracted - finished, as far as a restarted run is
+                        #     concerned.
+                        self.record_checkpoint_archives( [ archive_identifier ] )
+                        
+                        if ( self.is_output_enabled() == True ):
+                        
+                            log_message = "EXTRACTED - {} of {} - {} TO {} - {} files, {} bytes in {:.3f} seconds ( {:.2f} MB/sec )".format( archive_file_counter,
+                                len( to_extract_list ),
+                                extract_result_dict.get( self.EXTRACT_RESULT_ZIP_FILE_PATH, None ),
+                                extract_result_dict.get( self.EXTRACT_RESULT_FOLDER_PATH, None ),
+                                extract_result_dict.get( self.EXTRACT_RESULT_FILE_COUNT, None ),
+                                extract_result_dict.get( self.EXTRACT_RESULT_UNCOMPRESSED_BYTES, None ),
+                                extract_result_dict.get( self.EXTRACT_RESULT_SECONDS, None ),
+                                extract_result_dict.get( self.EXTRACT_RESULT_MB_PER_SECOND, None ) )
+                            self.output_progress_message( log_message )
                             
-                        #-- END with ZipFile --#
-                
-                    else:
-                
-                        # yes.  Set flag.
-                        uc_folder_exists_counter += 1
-                        log_message = "EXISTS, so moving on - Uncompressed archive folder {}".format( uc_archive_folder_path )
-                        self.output_debug_message( log_message, do_print_IN = True )
-                
-                    #-- END check to see if archive folder exists. --#
+                        #-- END check to see if output enabled --#
+                        
+                    #-- END loop over completed extracts --#
+                    
+                #-- END with ThreadPoolExecutor --#
                 
-                    log_message = "------------------------------"
-                    self.output_debug_message( log_message, do_print_IN = True )
+                # complete
+                self.set_checkpoint_phase( Proquest_HNP_Checkpoint.PHASE_COMPLETE )
+                end_dt = datetime.datetime.now()
+                log_message = "==> extract completed at {} ( time elapsed: {} )".format( end_dt, end_dt - start_dt )
+                self.output_progress_message( log_message )
                 
-                #-- END loop over zip files. --#
+                # metrics
+                self.output_metrics_json_lines( run_name_IN = me )
                 
             else:
                     
@@ -1371,8 +4329,43 @@ class ProquestHNPNewspaperHelper( ContextTextBase ):
             self.output_debug_message( log_message, do_print_IN = True )
         
         #-- END check to see if we have a source paper folder path --#
+        
+        return result_list_OUT
 
     #-- END method uncompress_paper_zip_files() --#
 
 
-#-- END class ProquestHNPNewspaperHelper --#
\ No newline at end of file
+#-- END class ProquestHNPNewspaperHelper --#
+
+
+#===============================================================================
+# functions (in alphabetical order by name)
+#===============================================================================
+
+
+def summarize_archive_in_worker( archive_path_IN, is_zip_file_IN = False, write_index_IN = True, read_ahead_count_IN = ProquestHNPNewspaperHelper.DEFAULT_READ_AHEAD_COUNT, manifest_dict_IN = None, index_folder_path_IN = None ):
+
+    '''
+    Process pool entry point for ProquestHNPNewspaperHelper parallel mode -
+        summarizes one archive folder or archive .zip file (no database access)
+        and returns a tuple of the archive path and its summary dictionary.
+        manifest_dict_IN is the manifest the parent already built, if any, and
+        index_folder_path_IN is where to write the archive's index.
+    '''
+
+    # return reference
+    result_OUT = None
+
+    if ( is_zip_file_IN == True ):
+
+        result_OUT = ( archive_path_IN, ProquestHNPNewspaperHelper.summarize_archive_zip( archive_path_IN, write_index_IN = write_index_IN, read_ahead_count_IN = read_ahead_count_IN, manifest_dict_IN = manifest_dict_IN, index_folder_path_IN = index_folder_path_IN ) )
+
+    else:
+
+        result_OUT = ( archive_path_IN, ProquestHNPNewspaperHelper.summarize_archive_folder( archive_path_IN, write_index_IN = write_index_IN, read_ahead_count_IN = read_ahead_count_IN, manifest_dict_IN = manifest_dict_IN, index_folder_path_IN = index_folder_path_IN ) )
+
+    #-- END check to see if zip file --#
+
+    return result_OUT
+
+#-- END function summarize_archive_in_worker() --#
@@ -0,0 +1,410 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import collections
+import functools
+
+# django classes
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Q
+
+# context_text_proquest_hnp
+from context_text_proquest_hnp.models import Proquest_HNP_Object_Type
+from context_text_proquest_hnp.models import Proquest_HNP_Object_Type_Raw_Value
+from context_text_proquest_hnp.models import make_raw_value_hash
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPObjectTypeCache( object ):
+
+    '''
+    Bounded, least-recently-used cache of ObjectType raw value to
+        Proquest_HNP_Object_Type instance.  preload() loads every object type
+        and every raw value synonym in two queries.  A miss costs one query if
+        the type exists, and creates it if not.  Hits, misses, evictions and
+        creates are counted - see get_stats().
+        
+    Instances looked up or created on a miss are only added to the cache once
+        the surrounding transaction commits (see get()), so a rolled back
+        transaction can not leave the cache holding a type whose row is gone.
+        Until then, they are kept in a pending map, so later lookups of the
+        same raw value in that transaction do not query again (see
+        add_pending()).
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # default maximum number of raw values to cache.
+    DEFAULT_MAX_SIZE = 10000
+
+    # stats
+    STAT_HITS = "hits"
+    STAT_MISSES = "misses"
+    STAT_EVICTIONS = "evictions"
+    STAT_CREATED = "created"
+    STAT_SIZE = "size"
+    STAT_MAX_SIZE = "max_size"
+    STAT_HIT_RATE = "hit_rate"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, max_size_IN = DEFAULT_MAX_SIZE ):
+
+        # declare variables
+        self.max_size = max_size_IN
+        self.raw_value_to_instance_map = collections.OrderedDict()
+        self.is_preloaded = False
+
+        # raw value to ( instance, on_commit function ) for instances from a
+        #     transaction that has not committed yet.
+        self.pending_raw_value_to_instance_map = {}
+
+        # stats
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+        self.created_count = 0
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add( self, raw_value_IN, instance_IN ):
+
+        '''
+        Adds raw value to instance mapping to the cache as most recently used,
+            evicting the least recently used entries if the cache is full.
+        '''
+
+        self.raw_value_to_instance_map[ raw_value_IN ] = instance_IN
+        self.raw_value_to_instance_map.move_to_end( raw_value_IN )
+
+        # over size?
+        while ( ( self.max_size is not None ) and ( len( self.raw_value_to_instance_map ) > self.max_size ) ):
+
+            # evict least recently used.
+            self.raw_value_to_instance_map.popitem( last = False )
+            self.eviction_count += 1
+
+        #-- END loop to evict --#
+
+    #-- END method add() --#
+
+
+    def add_pending( self, raw_value_IN, instance_IN ):
+
+        '''
+        Adds raw value to instance mapping to the cache once the current
+            transaction commits (right away if not in a transaction).  Until
+            then, it is in pending_raw_value_to_instance_map, where
+            get_pending_instance() finds it for as long as the transaction
+            (or savepoint) it came from has not been rolled back.
+        '''
+
+        # declare variables
+        commit_function = None
+
+        commit_function = functools.partial( self.promote_pending, raw_value_IN, instance_IN )
+        if ( transaction.get_connection().in_atomic_block == True ):
+
+            self.pending_raw_value_to_instance_map[ raw_value_IN ] = ( instance_IN, commit_function )
+
+        #-- END check to see if in a transaction --#
+
+        transaction.on_commit( commit_function )
+
+    #-- END method add_pending() --#
+
+
+    def clear( self ):
+
+        '''
+        Empties the cache and resets stats.  Call after object types are
+            changed outside of this cache (merged, deleted, etc.).
+        '''
+
+        self.raw_value_to_instance_map.clear()
+        self.pending_raw_value_to_instance_map.clear()
+        self.is_preloaded = False
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+        self.created_count = 0
+
+    #-- END method clear() --#
+
+
+    def get( self, raw_value_IN ):
+
+        '''
+        Returns the Proquest_HNP_Object_Type for the raw value passed in,
+            matching either the type's raw_value or one of its raw value
+            synonyms.  If the value is not in the database, creates a new type
+            for it.  On a miss, the instance is added to the cache from
+            transaction.on_commit(), so inside an atomic block it is only
+            cached if that block commits - until then, lookups in the same
+            transaction find it pending (counted as hits).  Returns None if no
+            value passed in.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # make sure value is passed in.
+        if ( ( raw_value_IN is not None ) and ( raw_value_IN != "" ) ):
+
+            # in cache?
+            instance_OUT = self.raw_value_to_instance_map.get( raw_value_IN, None )
+            if ( instance_OUT is not None ):
+
+                # hit
+                self.hit_count += 1
+                self.raw_value_to_instance_map.move_to_end( raw_value_IN )
+
+            else:
+
+                # from earlier in this transaction?
+                instance_OUT = self.get_pending_instance( raw_value_IN )
+                if ( instance_OUT is not None ):
+
+                    # hit
+                    self.hit_count += 1
+
+                else:
+
+                    # miss - cache it once it is committed (right away if not
+                    #     in a transaction; never, if the transaction rolls
+                    #     back).
+                    self.miss_count += 1
+                    instance_OUT = self.get_or_create_instance( raw_value_IN )
+                    self.add_pending( raw_value_IN, instance_OUT )
+
+                #-- END check to see if pending --#
+
+            #-- END check to see if in cache --#
+
+        #-- END check to see if value passed in --#
+
+        return instance_OUT
+
+    #-- END method get() --#
+
+
+    def get_or_create_instance( self, raw_value_IN ):
+
+        '''
+        Looks up the object type for a raw value in the database - one query,
+            matching the type's raw_value or a synonym by raw_value_hash (the
+            full value is compared only to confirm).  If not found, creates
+            it.  If another process creates it first, loads theirs.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        raw_value_hash = None
+        type_qs = None
+
+        # look for type with this raw value or synonym.
+        raw_value_hash = make_raw_value_hash( raw_value_IN )
+        type_qs = Proquest_HNP_Object_Type.objects.filter( Q( raw_value_hash = raw_value_hash, raw_value = raw_value_IN )
+                                                           | Q( raw_value_set__raw_value_hash = raw_value_hash, raw_value_set__raw_value = raw_value_IN ) )
+        type_qs = type_qs.order_by( "id" )
+        instance_OUT = type_qs.first()
+        if ( instance_OUT is None ):
+
+            # does not exist.  make one.
+            try:
+
+                with transaction.atomic():
+
+                    instance_OUT = Proquest_HNP_Object_Type()
+                    instance_OUT.set_raw_value( raw_value_IN )
+                    instance_OUT.save()
+
+                #-- END with transaction.atomic() --#
+
+                self.created_count += 1
+
+            except IntegrityError as ie:
+
+                # created by someone else in the meantime - use theirs.
+                instance_OUT = Proquest_HNP_Object_Type.objects.get( raw_value_hash = raw_value_hash, raw_value = raw_value_IN )
+
+            #-- END try-except --#
+
+        #-- END check to see if found --#
+
+        return instance_OUT
+
+    #-- END method get_or_create_instance() --#
+
+
+    def get_pending_instance( self, raw_value_IN ):
+
+        '''
+        Returns the instance for the raw value passed in from
+            pending_raw_value_to_instance_map (see add_pending()), or None if
+            there isn't one.  An entry is only returned while its on_commit
+            function is still registered with the connection - Django drops it
+            when the transaction or savepoint it was registered in rolls back,
+            so the entry is dropped, too.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        pending_entry = None
+        pending_instance = None
+        commit_function = None
+        connection = None
+
+        pending_entry = self.pending_raw_value_to_instance_map.get( raw_value_IN, None )
+        if ( pending_entry is not None ):
+
+            # still waiting for its transaction to commit?
+            pending_instance, commit_function = pending_entry
+            connection = transaction.get_connection()
+            if ( any( ( on_commit_function is commit_function ) for savepoint_id_set, on_commit_function in connection.run_on_commit ) == True ):
+
+                instance_OUT = pending_instance
+
+            else:
+
+                # rolled back.
+                del self.pending_raw_value_to_instance_map[ raw_value_IN ]
+
+            #-- END check to see if still pending --#
+
+        #-- END check to see if pending --#
+
+        return instance_OUT
+
+    #-- END method get_pending_instance() --#
+
+
+    def get_stats( self ):
+
+        '''
+        Returns a dictionary of cache stats: hits, misses, evictions, types
+            created, current size, max size, and hit rate.
+        '''
+
+        # return reference
+        stats_dict_OUT = None
+
+        # declare variables
+        lookup_count = None
+
+        lookup_count = self.hit_count + self.miss_count
+
+        stats_dict_OUT = {}
+        stats_dict_OUT[ self.STAT_HITS ] = self.hit_count
+        stats_dict_OUT[ self.STAT_MISSES ] = self.miss_count
+        stats_dict_OUT[ self.STAT_EVICTIONS ] = self.eviction_count
+        stats_dict_OUT[ self.STAT_CREATED ] = self.created_count
+        stats_dict_OUT[ self.STAT_SIZE ] = len( self.raw_value_to_instance_map )
+        stats_dict_OUT[ self.STAT_MAX_SIZE ] = self.max_size
+        stats_dict_OUT[ self.STAT_HIT_RATE ] = None
+        if ( lookup_count > 0 ):
+
+            stats_dict_OUT[ self.STAT_HIT_RATE ] = self.hit_count / lookup_count
+
+        #-- END check to see if any lookups --#
+
+        return stats_dict_OUT
+
+    #-- END method get_stats() --#
+
+
+    def preload( self ):
+
+        '''
+        Loads all object types and their raw value synonyms into the cache, in
+            two queries.  If there are more raw values than max_size, the
+            cache keeps the last max_size loaded.
+        '''
+
+        # declare variables
+        type_id_to_instance_map = None
+        type_instance = None
+        synonym_qs = None
+        raw_value = None
+        type_id = None
+
+        # all object types
+        type_id_to_instance_map = {}
+        for type_instance in Proquest_HNP_Object_Type.objects.all():
+
+            type_id_to_instance_map[ type_instance.id ] = type_instance
+            self.add( type_instance.raw_value, type_instance )
+
+        #-- END loop over object types --#
+
+        # and all synonyms
+        synonym_qs = Proquest_HNP_Object_Type_Raw_Value.objects.values_list( "raw_value", "proquest_hnp_object_type_id" )
+        for raw_value, type_id in synonym_qs:
+
+            # don't replace a type's own raw value with a synonym.
+            if ( ( raw_value not in self.raw_value_to_instance_map ) and ( type_id in type_id_to_instance_map ) ):
+
+                self.add( raw_value, type_id_to_instance_map[ type_id ] )
+
+            #-- END check to see if already mapped --#
+
+        #-- END loop over synonyms --#
+
+        self.is_preloaded = True
+
+    #-- END method preload() --#
+
+
+    def promote_pending( self, raw_value_IN, instance_IN ):
+
+        '''
+        transaction.on_commit() function for add_pending() - moves the raw
+            value from pending_raw_value_to_instance_map into the cache.
+        '''
+
+        self.pending_raw_value_to_instance_map.pop( raw_value_IN, None )
+        self.add( raw_value_IN, instance_IN )
+
+    #-- END method promote_pending() --#
+
+
+#-- END class ProquestHNPObjectTypeCache --#
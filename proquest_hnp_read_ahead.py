@@ -0,0 +1,311 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import asyncio
+import collections
+import concurrent.futures
+import io
+import time
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.proquest_hnp_metrics import ProquestHNPMetrics
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPReadAhead( object ):
+
+    '''
+    Read-ahead pipeline for Record XML files, so time spent waiting on the
+        disk (network storage, especially) overlaps with parsing, rather than
+        alternating with it.
+
+        - reads are jobs - ( name, size in bytes, function that returns the
+            file's bytes ).  size can be None if it is not known up front
+            (a file on disk, where asking costs a stat() call of its own) -
+            the read job's len( bytes ) is used once the read is done.
+        - an asyncio event loop hands jobs to a thread pool with
+            run_in_executor(), and keeps up to read_ahead_count of them in
+            flight, in a queue of futures.
+        - the consumer (the parse loop, in the calling thread) takes the
+            oldest future, waits for it, and gets the file's bytes, in the
+            same order the jobs were listed.
+        - backpressure: no new read is started while read_ahead_count are
+            queued, or while the queued files add up to max_buffer_bytes (one
+            file is always allowed, however big).  Files whose size is not
+            known yet are limited only by read_ahead_count until their reads
+            finish, and then count against max_buffer_bytes.  Memory is
+            capped at about max_buffer_bytes (or read_ahead_count files, if
+            sizes aren't known) plus the file being parsed.
+
+    Time the consumer spends waiting on a read that has not finished is the
+        part of reading that was not hidden, and is recorded as "read" in the
+        ProquestHNPMetrics passed in.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # defaults
+    DEFAULT_READ_AHEAD_COUNT = 16
+    DEFAULT_MAX_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def read_file( cls, file_path_IN ):
+
+        '''
+        Read job function for a file on disk - returns its bytes.
+        '''
+
+        # return reference
+        file_bytes_OUT = None
+
+        # declare variables
+        input_file = None
+
+        with open( file_path_IN, "rb" ) as input_file:
+
+            file_bytes_OUT = input_file.read()
+
+        #-- END with open( file_path_IN )...: --#
+
+        return file_bytes_OUT
+
+    #-- END class method read_file() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self,
+                  read_ahead_count_IN = DEFAULT_READ_AHEAD_COUNT,
+                  max_buffer_bytes_IN = DEFAULT_MAX_BUFFER_BYTES,
+                  metrics_IN = None ):
+
+        # declare variables
+        self.read_ahead_count = max( read_ahead_count_IN, 1 )
+        self.max_buffer_bytes = max_buffer_bytes_IN
+        self.metrics = metrics_IN
+
+        # queue of ( name, size, future ), oldest first, and the size in bytes
+        #     of the queued files whose size was known when they were queued.
+        self.read_queue = collections.deque()
+        self.queued_byte_count = 0
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def fill_read_queue( self, event_loop_IN, executor_IN, read_job_iterator_IN, next_job_IN ):
+
+        '''
+        Starts reads for jobs from read_job_iterator_IN until the queue is full
+            (see class docstring).  next_job_IN is a job already taken from the
+            iterator but not started (or None).  Returns the next job not
+            started - None if the iterator is exhausted.
+        '''
+
+        # return reference
+        next_job_OUT = None
+
+        # declare variables
+        name = None
+        size = None
+        read_function = None
+
+        next_job_OUT = next_job_IN
+        while ( len( self.read_queue ) < self.read_ahead_count ):
+
+            # next job
+            if ( next_job_OUT is None ):
+
+                next_job_OUT = next( read_job_iterator_IN, None )
+                if ( next_job_OUT is None ):
+
+                    # no more jobs.
+                    break
+
+                #-- END check to see if any jobs left --#
+
+            #-- END check to see if job waiting --#
+
+            name, size, read_function = next_job_OUT
+
+            # room for it?  (If size is not known, only the count limits it.)
+            if ( ( len( self.read_queue ) > 0 )
+                and ( self.max_buffer_bytes is not None )
+                and ( ( self.get_queued_byte_count() + ( size or 0 ) ) > self.max_buffer_bytes ) ):
+
+                # no - wait for the consumer to catch up.
+                break
+
+            #-- END check to see if room in buffer --#
+
+            self.read_queue.append( ( name, size, event_loop_IN.run_in_executor( executor_IN, read_function ) ) )
+            if ( size is not None ):
+
+                self.queued_byte_count += size
+
+            #-- END check to see if size known --#
+
+            next_job_OUT = None
+
+        #-- END loop to fill queue --#
+
+        return next_job_OUT
+
+    #-- END method fill_read_queue() --#
+
+
+    def get_queued_byte_count( self ):
+
+        '''
+        Returns the size in bytes of the files in the read queue - sizes given
+            with their jobs, plus the len() of reads that are done for jobs
+            whose size was not known.  Reads of unknown size still in flight
+            are not counted.
+        '''
+
+        # return reference
+        byte_count_OUT = None
+
+        # declare variables
+        name = None
+        size = None
+        read_future = None
+
+        byte_count_OUT = self.queued_byte_count
+        for name, size, read_future in self.read_queue:
+
+            if ( ( size is None ) and ( read_future.done() == True )
+                and ( read_future.cancelled() == False ) and ( read_future.exception() is None ) ):
+
+                byte_count_OUT += len( read_future.result() )
+
+            #-- END check to see if unknown size now known --#
+
+        #-- END loop over queued reads --#
+
+        return byte_count_OUT
+
+    #-- END method get_queued_byte_count() --#
+
+
+    def iterate( self, read_job_iterator_IN ):
+
+        '''
+        Generator - accepts an iterator over read jobs ( name, size in bytes
+            or None, function that returns the file's bytes ), and yields ( name,
+            binary file object, size ) for each, in order, like
+            ProquestHNPNewspaperHelper.iterate_archive_folder_files().  Reads
+            run ahead of the consumer as described in the class docstring.
+            Reads still queued when the generator is closed are cancelled or
+            waited for before it returns.
+        '''
+
+        # declare variables
+        event_loop = None
+        executor = None
+        read_job_iterator = None
+        next_job = None
+        name = None
+        size = None
+        read_future = None
+        start_time = None
+        file_bytes = None
+
+        event_loop = asyncio.new_event_loop()
+        executor = concurrent.futures.ThreadPoolExecutor( max_workers = self.read_ahead_count )
+        read_job_iterator = iter( read_job_iterator_IN )
+        self.read_queue = collections.deque()
+        self.queued_byte_count = 0
+        try:
+
+            next_job = self.fill_read_queue( event_loop, executor, read_job_iterator, None )
+            while ( len( self.read_queue ) > 0 ):
+
+                # wait for the oldest read.
+                name, size, read_future = self.read_queue.popleft()
+                start_time = time.perf_counter()
+                file_bytes = event_loop.run_until_complete( read_future )
+                if ( self.metrics is not None ):
+
+                    self.metrics.add_time( ProquestHNPMetrics.PHASE_READ, time.perf_counter() - start_time )
+
+                #-- END check to see if metrics --#
+
+                # top up the queue before handing the file over, so reads
+                #     continue while it is parsed.
+                if ( size is not None ):
+
+                    self.queued_byte_count -= size
+
+                else:
+
+                    size = len( file_bytes )
+
+                #-- END check to see if size known --#
+
+                next_job = self.fill_read_queue( event_loop, executor, read_job_iterator, next_job )
+
+                yield ( name, io.BytesIO( file_bytes ), size )
+
+            #-- END loop over queued reads --#
+
+        finally:
+
+            # stop what has not started (the loop has to run for the
+            #     cancellation to reach the executor), wait for what has.
+            for name, size, read_future in self.read_queue:
+
+                read_future.cancel()
+
+            #-- END loop over unfinished reads --#
+
+            event_loop.run_until_complete( asyncio.sleep( 0 ) )
+            self.read_queue = collections.deque()
+            self.queued_byte_count = 0
+            executor.shutdown( wait = True )
+            event_loop.run_until_complete( event_loop.shutdown_asyncgens() )
+            event_loop.close()
+
+        #-- END try-finally --#
+
+    #-- END method iterate() --#
+
+
+#-- END class ProquestHNPReadAhead --#
@@ -0,0 +1,263 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import array
+import bisect
+import heapq
+
+# numpy is optional - without it, buffers are merged in Python.
+try:
+
+    import numpy
+
+except ImportError as ie:
+
+    numpy = None
+
+#-- END try-except to import numpy --#
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPRecordIdSet( object ):
+
+    '''
+    Exact set of RecordIDs, for finding Records that appear more than once
+        across a paper's archives (re-issued or corrected deliveries).  HNP
+        RecordIDs are integers, so they are kept in a sorted array.array of
+        8-byte ints (looked up with bisect), plus a small set of IDs added
+        since the array was last rebuilt.  When the set reaches
+        max( buffer_size, 1/8 of the array ), it is merged into the array, so
+        the total cost of merging stays proportional to the number of IDs.
+        Any non-numeric IDs are kept in a plain set.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # minimum number of IDs to buffer before merging into the sorted array.
+    DEFAULT_BUFFER_SIZE = 65536
+
+    # array typecode, and the largest ID it holds.
+    TYPECODE = "q"
+    MAX_RECORD_ID = ( 2 ** 63 ) - 1
+
+    # buffer can grow to this fraction of the sorted array before a merge.
+    BUFFER_GROWTH_DIVISOR = 8
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, buffer_size_IN = DEFAULT_BUFFER_SIZE, use_numpy_IN = True ):
+
+        # declare variables
+        self.buffer_size = max( buffer_size_IN, 1 )
+        self.sorted_array = array.array( self.TYPECODE )
+        self.buffer_set = set()
+        self.other_id_set = set()
+
+        # only use numpy if it is installed.
+        self.use_numpy = ( ( use_numpy_IN == True ) and ( numpy is not None ) )
+
+    #-- END method __init__() --#
+
+
+    def __contains__( self, record_id_IN ):
+
+        # return reference
+        is_present_OUT = None
+
+        # declare variables
+        record_id = None
+        position = None
+
+        record_id = self.normalize_record_id( record_id_IN )
+        if ( isinstance( record_id, int ) == True ):
+
+            is_present_OUT = ( record_id in self.buffer_set )
+            if ( is_present_OUT == False ):
+
+                position = bisect.bisect_left( self.sorted_array, record_id )
+                is_present_OUT = ( ( position < len( self.sorted_array ) ) and ( self.sorted_array[ position ] == record_id ) )
+
+            #-- END check to see if in buffer --#
+
+        else:
+
+            is_present_OUT = ( record_id in self.other_id_set )
+
+        #-- END check to see if numeric ID --#
+
+        return is_present_OUT
+
+    #-- END method __contains__() --#
+
+
+    def __len__( self ):
+
+        return len( self.sorted_array ) + len( self.buffer_set ) + len( self.other_id_set )
+
+    #-- END method __len__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add( self, record_id_IN ):
+
+        '''
+        Adds a RecordID (int or string).  Returns True if it was new, False if
+            it was already in the set (a duplicate).
+        '''
+
+        # return reference
+        is_new_OUT = None
+
+        # declare variables
+        record_id = None
+
+        record_id = self.normalize_record_id( record_id_IN )
+        is_new_OUT = ( record_id not in self )
+        if ( is_new_OUT == True ):
+
+            if ( isinstance( record_id, int ) == True ):
+
+                self.buffer_set.add( record_id )
+                if ( len( self.buffer_set ) >= max( self.buffer_size, len( self.sorted_array ) // self.BUFFER_GROWTH_DIVISOR ) ):
+
+                    self.compact()
+
+                #-- END check to see if buffer is full --#
+
+            else:
+
+                self.other_id_set.add( record_id )
+
+            #-- END check to see if numeric ID --#
+
+        #-- END check to see if new --#
+
+        return is_new_OUT
+
+    #-- END method add() --#
+
+
+    def compact( self ):
+
+        '''
+        Merges the buffered IDs into the sorted array.
+        '''
+
+        # declare variables
+        merged_array = None
+        sorted_numpy_array = None
+        buffer_numpy_array = None
+
+        if ( len( self.buffer_set ) > 0 ):
+
+            merged_array = array.array( self.TYPECODE )
+            if ( self.use_numpy == True ):
+
+                # insert the sorted buffer at its positions in the array.
+                buffer_numpy_array = numpy.fromiter( self.buffer_set, dtype = numpy.int64, count = len( self.buffer_set ) )
+                buffer_numpy_array.sort()
+                sorted_numpy_array = numpy.frombuffer( self.sorted_array, dtype = numpy.int64 ) if ( len( self.sorted_array ) > 0 ) else numpy.zeros( 0, dtype = numpy.int64 )
+                merged_array.frombytes( numpy.insert( sorted_numpy_array, numpy.searchsorted( sorted_numpy_array, buffer_numpy_array ), buffer_numpy_array ).tobytes() )
+
+            else:
+
+                merged_array.extend( heapq.merge( self.sorted_array, sorted( self.buffer_set ) ) )
+
+            #-- END check to see if numpy --#
+
+            self.sorted_array = merged_array
+            self.buffer_set = set()
+
+        #-- END check to see if anything buffered --#
+
+    #-- END method compact() --#
+
+
+    def normalize_record_id( self, record_id_IN ):
+
+        '''
+        Returns the RecordID as an int if it is numeric (and fits in an
+            8-byte int), else as a stripped string.
+        '''
+
+        # return reference
+        record_id_OUT = None
+
+        record_id_OUT = record_id_IN
+        if ( ( isinstance( record_id_OUT, int ) == False ) or ( record_id_OUT > self.MAX_RECORD_ID ) ):
+
+            record_id_OUT = str( record_id_OUT ).strip()
+            if ( ( record_id_OUT.isdigit() == True ) and ( int( record_id_OUT ) <= self.MAX_RECORD_ID ) ):
+
+                record_id_OUT = int( record_id_OUT )
+
+            #-- END check to see if numeric and fits in the array --#
+
+        #-- END check to see if already int --#
+
+        return record_id_OUT
+
+    #-- END method normalize_record_id() --#
+
+
+    def update( self, record_id_iterable_IN ):
+
+        '''
+        Adds each RecordID in an iterable.  Returns the number that were new.
+        '''
+
+        # return reference
+        new_count_OUT = None
+
+        # declare variables
+        record_id = None
+
+        new_count_OUT = 0
+        for record_id in record_id_iterable_IN:
+
+            if ( self.add( record_id ) == True ):
+
+                new_count_OUT += 1
+
+            #-- END check to see if new --#
+
+        #-- END loop over IDs --#
+
+        return new_count_OUT
+
+    #-- END method update() --#
+
+
+#-- END class ProquestHNPRecordIdSet --#
@@ -0,0 +1,1014 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import contextlib
+import datetime
+import os
+import socket
+import threading
+import time
+import uuid
+
+# django imports
+from django.db import connections
+from django.db import DatabaseError
+from django.db import router
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Max
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.utils import timezone
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.models import PHNP_Archive_Work_Item
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPWorkQueue( object ):
+
+    '''
+    Database-backed work queue for one phase of a paper's processing (one of
+        the PHNP_Archive_Work_Item.PHASE_* values), so any number of worker
+        processes, on one host or on several that share the database and the
+        archive storage, can split the paper's archives between them.
+
+        - enqueue_paper_archives() adds a PHNP_Archive_Work_Item for each of
+            the paper's archives.
+        - claim_work_item() leases the next queued item to this worker.  Where
+            the database supports it (PostgreSQL, MySQL 8, Oracle), the item
+            is picked with SELECT ... FOR UPDATE SKIP LOCKED, so workers never
+            wait on each other.  Elsewhere (SQLite), the lease is taken with a
+            conditional UPDATE that only one worker can win, and the others
+            move on to the next item.
+        - while an item is processed, a heartbeat thread renews its lease.  If
+            the worker dies, the lease expires, and
+            requeue_expired_work_items() queues the item again, or marks it
+            failed once it has been tried max_attempts times.
+        - complete_work_item() marks the item done, if this worker still holds
+            the lease.
+
+    Processing an item twice (a lease expired while its worker was still
+        running) just extracts nothing, or stores the same counts again.
+        Summarizing an archive folder waits for the archive's uncompress item,
+        if it has one, to be done.  Once every summarize item is done, the
+        worker that finished last rebuilds the paper's totals (see
+        ProquestHNPNewspaperHelper.rollup_paper_object_types()) - it has to
+        lease the paper's rollup item first, so two workers that finish at
+        the same moment don't both roll up (see run_rollup()).  If any
+        summarize items failed, the rollup is skipped, with a message - queue
+        them again with requeue_failed_work_items(), or force the rollup with
+        run_rollup( force_IN = True ).  With SQLite, workers writing at the
+        same moment can get "database is locked" - the item is retried like
+        any other failure, so allow a few attempts.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # defaults
+    DEFAULT_LEASE_SECONDS = 300
+    DEFAULT_MAX_ATTEMPTS = 3
+    DEFAULT_POLL_SECONDS = 10
+
+    # heartbeats per lease.
+    HEARTBEATS_PER_LEASE = 3
+
+    # without SKIP LOCKED, number of queued items to try per claim query.
+    CLAIM_CANDIDATE_COUNT = 10
+
+    # error message for items whose lease expired on their last attempt.
+    ERROR_LEASE_EXPIRED = "Lease expired"
+
+    # run_worker() status counts
+    STATUS_PROCESSED = "processed"
+    STATUS_FAILED = "failed"
+    STATUS_LOST_LEASE = "lost_lease"
+    STATUS_LIST = [ STATUS_PROCESSED, STATUS_FAILED, STATUS_LOST_LEASE ]
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def make_worker_id( cls ):
+
+        '''
+        Returns an ID for a worker that is unique across hosts and processes -
+            host name, process ID, and a random suffix.
+        '''
+
+        return "{}:{}:{}".format( socket.gethostname(), os.getpid(), uuid.uuid4().hex[ : 8 ] )
+
+    #-- END class method make_worker_id() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self,
+                  newspaper_helper_IN,
+                  phase_IN,
+                  use_zip_files_IN = False,
+                  worker_id_IN = None,
+                  lease_seconds_IN = DEFAULT_LEASE_SECONDS,
+                  max_attempts_IN = DEFAULT_MAX_ATTEMPTS ):
+
+        # declare variables
+        self.newspaper_helper = newspaper_helper_IN
+        self.phase = phase_IN
+        self.lease_seconds = lease_seconds_IN
+        self.max_attempts = max_attempts_IN
+
+        # summarize the archive .zip files rather than the archive folders?
+        #     (uncompress always reads the zip files.)
+        self.use_zip_files = ( ( use_zip_files_IN == True ) or ( phase_IN == PHNP_Archive_Work_Item.PHASE_UNCOMPRESS ) )
+
+        # leave archives unchanged since they were last summarized alone?
+        self.skip_unchanged = True
+
+        # rebuild paper totals once every summarize item is done?
+        self.rollup_when_done = True
+
+        # this worker, and the database the queue is in.
+        self.worker_id = worker_id_IN
+        if ( self.worker_id is None ):
+
+            self.worker_id = self.make_worker_id()
+
+        #-- END check to see if worker ID passed in --#
+
+        self.db_alias = router.db_for_write( PHNP_Archive_Work_Item )
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def claim_rollup_work_item( self, force_IN = False ):
+
+        '''
+        Leases the paper's rollup item (PHNP_Archive_Work_Item.PHASE_ROLLUP,
+            added the first time) to this worker, with a conditional UPDATE
+            that only one worker can win, and returns it.  Returns None if
+            another worker holds an unexpired lease on it, or if it was done
+            after the last of this (summarize) queue's items changed (the
+            totals are current) - unless force_IN is True.
+        '''
+
+        # return reference
+        work_item_OUT = None
+
+        # declare variables
+        paper_instance = None
+        paper_path = None
+        now = None
+        last_summarized_dt = None
+        claimable_q = None
+        rollup_item_qs = None
+        update_count = None
+
+        paper_instance = self.newspaper_helper.get_PHNP_newspaper()
+        paper_path = self.newspaper_helper.destination_paper_path
+        if ( self.use_zip_files == True ):
+
+            paper_path = self.newspaper_helper.source_paper_path
+
+        #-- END check to see if reading zip files --#
+
+        PHNP_Archive_Work_Item.objects.bulk_create( [ PHNP_Archive_Work_Item( proquest_hnp_newspaper = paper_instance,
+                                                                              phase = PHNP_Archive_Work_Item.PHASE_ROLLUP,
+                                                                              archive_identifier = paper_instance.paper_identifier,
+                                                                              archive_path = ( paper_path or "" ),
+                                                                              use_zip_files = self.use_zip_files ) ],
+                                                    ignore_conflicts = True )
+
+        # claimable if not leased (or its lease expired), and not done since
+        #     the last summarize item changed.
+        now = timezone.now()
+        claimable_q = Q( status__in = [ PHNP_Archive_Work_Item.STATUS_QUEUED, PHNP_Archive_Work_Item.STATUS_FAILED ] )
+        claimable_q |= Q( status = PHNP_Archive_Work_Item.STATUS_LEASED, lease_expires__lt = now )
+        if ( force_IN == True ):
+
+            claimable_q |= Q( status = PHNP_Archive_Work_Item.STATUS_DONE )
+
+        else:
+
+            last_summarized_dt = self.get_work_item_qs().aggregate( last_summarized_dt = Max( "last_modified" ) )[ "last_summarized_dt" ]
+            if ( last_summarized_dt is not None ):
+
+                claimable_q |= Q( status = PHNP_Archive_Work_Item.STATUS_DONE, last_modified__lt = last_summarized_dt )
+
+            #-- END check to see if anything summarized --#
+
+        #-- END check to see if forcing --#
+
+        # attempts start over each time a done rollup is run again.
+        rollup_item_qs = PHNP_Archive_Work_Item.objects.filter( proquest_hnp_newspaper = paper_instance, phase = PHNP_Archive_Work_Item.PHASE_ROLLUP )
+        update_count = rollup_item_qs.filter( claimable_q ).update( status = PHNP_Archive_Work_Item.STATUS_LEASED,
+                                                                    lease_owner = self.worker_id,
+                                                                    lease_expires = now + datetime.timedelta( seconds = self.lease_seconds ),
+                                                                    heartbeat = now,
+                                                                    use_zip_files = self.use_zip_files,
+                                                                    attempt_count = Case( When( status = PHNP_Archive_Work_Item.STATUS_DONE, then = Value( 1 ) ), default = F( "attempt_count" ) + 1 ),
+                                                                    last_modified = now )
+        if ( update_count == 1 ):
+
+            # ours.
+            work_item_OUT = rollup_item_qs.get()
+
+        #-- END check to see if leased --#
+
+        return work_item_OUT
+
+    #-- END method claim_rollup_work_item() --#
+
+
+    def claim_work_item( self ):
+
+        '''
+        Leases the oldest claimable item (see get_claimable_qs()) to this
+            worker, and returns it - None if there is nothing to claim.
+        '''
+
+        # return reference
+        work_item_OUT = None
+
+        # declare variables
+        claimable_qs = None
+        candidate_id_list = None
+
+        claimable_qs = self.get_claimable_qs()
+        if ( self.is_skip_locked_supported() == True ):
+
+            # lock one row other workers have not locked - the lock is held
+            #     until the lease is written.
+            with transaction.atomic( using = self.db_alias ):
+
+                candidate_id_list = list( claimable_qs.select_for_update( skip_locked = True ).values_list( "id", flat = True )[ : 1 ] )
+                work_item_OUT = self.lease_work_item( candidate_id_list )
+
+            #-- END with transaction.atomic() --#
+
+        else:
+
+            # no row locks to skip - race for the first few queued items until
+            #     one is won, or none are left.
+            candidate_id_list = None
+            while ( ( work_item_OUT is None ) and ( candidate_id_list != [] ) ):
+
+                candidate_id_list = list( claimable_qs.values_list( "id", flat = True )[ : self.CLAIM_CANDIDATE_COUNT ] )
+                work_item_OUT = self.lease_work_item( candidate_id_list )
+
+            #-- END loop until leased or none left --#
+
+        #-- END check to see if SKIP LOCKED --#
+
+        return work_item_OUT
+
+    #-- END method claim_work_item() --#
+
+
+    def complete_work_item( self, work_item_IN ):
+
+        '''
+        Marks an item this worker has leased done.  Returns False if the lease
+            was lost (it expired and was requeued) - the item is left alone.
+        '''
+
+        # return reference
+        is_complete_OUT = None
+
+        # declare variables
+        update_count = None
+
+        update_count = self.get_leased_qs( work_item_IN ).update( status = PHNP_Archive_Work_Item.STATUS_DONE,
+                                                                  lease_owner = None,
+                                                                  lease_expires = None,
+                                                                  error_message = None,
+                                                                  last_modified = timezone.now() )
+        is_complete_OUT = ( update_count == 1 )
+
+        return is_complete_OUT
+
+    #-- END method complete_work_item() --#
+
+
+    def enqueue_paper_archives( self ):
+
+        '''
+        Adds a queued item for each of the paper's archives that does not have
+            one in this phase yet: the archive .zip files in source_paper_path
+            if use_zip_files (always, to uncompress), otherwise the archive
+            folders in destination_paper_path, plus the folders still to be
+            extracted by the paper's uncompress items.  Returns the number of
+            items added.
+        '''
+
+        # return reference
+        new_count_OUT = None
+
+        # declare variables
+        helper = None
+        paper_instance = None
+        archive_path_map = None
+        dir_entry = None
+        archive_identifier = None
+        uncompress_item_qs = None
+        existing_identifier_set = None
+        work_item_list = None
+        archive_path = None
+
+        helper = self.newspaper_helper
+        paper_instance = helper.get_PHNP_newspaper()
+
+        # archives on disk.
+        archive_path_map = {}
+        for dir_entry in helper.iterate_paper_archives( use_zip_files_IN = self.use_zip_files ):
+
+            archive_path_map[ helper.get_archive_identifier( dir_entry.path ) ] = dir_entry.path
+
+        #-- END loop over archives --#
+
+        # archive folders that will exist once extracted.
+        if ( self.use_zip_files == False ):
+
+            uncompress_item_qs = PHNP_Archive_Work_Item.objects.filter( proquest_hnp_newspaper = paper_instance, phase = PHNP_Archive_Work_Item.PHASE_UNCOMPRESS )
+            for archive_identifier in uncompress_item_qs.values_list( "archive_identifier", flat = True ):
+
+                archive_path_map.setdefault( archive_identifier, "{}/{}".format( helper.destination_paper_path, archive_identifier ) )
+
+            #-- END loop over archives to be extracted --#
+
+        #-- END check to see if archive folders --#
+
+        # add the ones not already queued.
+        existing_identifier_set = set( self.get_work_item_qs().values_list( "archive_identifier", flat = True ) )
+        work_item_list = []
+        for archive_identifier, archive_path in sorted( archive_path_map.items() ):
+
+            if ( archive_identifier not in existing_identifier_set ):
+
+                work_item_list.append( PHNP_Archive_Work_Item( proquest_hnp_newspaper = paper_instance,
+                                                               phase = self.phase,
+                                                               archive_identifier = archive_identifier,
+                                                               archive_path = archive_path,
+                                                               use_zip_files = self.use_zip_files ) )
+
+            #-- END check to see if new --#
+
+        #-- END loop over archives --#
+
+        PHNP_Archive_Work_Item.objects.bulk_create( work_item_list, batch_size = 500, ignore_conflicts = True )
+        new_count_OUT = len( work_item_list )
+
+        return new_count_OUT
+
+    #-- END method enqueue_paper_archives() --#
+
+
+    def fail_work_item( self, work_item_IN, error_message_IN ):
+
+        '''
+        Records an error on an item this worker has leased, and queues it
+            again - or marks it failed, if it has been tried max_attempts
+            times.  Returns False if the lease was lost.
+        '''
+
+        # return reference
+        is_updated_OUT = None
+
+        # declare variables
+        status = None
+        update_count = None
+
+        status = PHNP_Archive_Work_Item.STATUS_QUEUED
+        if ( work_item_IN.attempt_count >= self.max_attempts ):
+
+            status = PHNP_Archive_Work_Item.STATUS_FAILED
+
+        #-- END check to see if out of attempts --#
+
+        update_count = self.get_leased_qs( work_item_IN ).update( status = status,
+                                                                  lease_owner = None,
+                                                                  lease_expires = None,
+                                                                  error_message = error_message_IN,
+                                                                  last_modified = timezone.now() )
+        is_updated_OUT = ( update_count == 1 )
+
+        return is_updated_OUT
+
+    #-- END method fail_work_item() --#
+
+
+    def get_claimable_qs( self ):
+
+        '''
+        Returns this phase's queued items, oldest first, leaving out archive
+            folders whose prerequisite item (see
+            PHNP_Archive_Work_Item.PHASE_PREREQUISITE_MAP) is not done yet.
+        '''
+
+        # return reference
+        work_item_qs_OUT = None
+
+        # declare variables
+        prerequisite_phase = None
+        pending_identifier_qs = None
+
+        work_item_qs_OUT = self.get_work_item_qs().filter( status = PHNP_Archive_Work_Item.STATUS_QUEUED )
+        prerequisite_phase = PHNP_Archive_Work_Item.PHASE_PREREQUISITE_MAP.get( self.phase, None )
+        if ( prerequisite_phase is not None ):
+
+            pending_identifier_qs = PHNP_Archive_Work_Item.objects.filter( proquest_hnp_newspaper = self.newspaper_helper.get_PHNP_newspaper(), phase = prerequisite_phase )
+            pending_identifier_qs = pending_identifier_qs.exclude( status = PHNP_Archive_Work_Item.STATUS_DONE ).values( "archive_identifier" )
+            work_item_qs_OUT = work_item_qs_OUT.exclude( use_zip_files = False, archive_identifier__in = pending_identifier_qs )
+
+        #-- END check to see if prerequisite phase --#
+
+        work_item_qs_OUT = work_item_qs_OUT.order_by( "id" )
+
+        return work_item_qs_OUT
+
+    #-- END method get_claimable_qs() --#
+
+
+    def get_leased_qs( self, work_item_IN ):
+
+        '''
+        Returns a QuerySet of the item passed in, if it is still leased to this
+            worker - for updates that only the lease holder may make.
+        '''
+
+        return PHNP_Archive_Work_Item.objects.filter( id = work_item_IN.id, status = PHNP_Archive_Work_Item.STATUS_LEASED, lease_owner = self.worker_id )
+
+    #-- END method get_leased_qs() --#
+
+
+    def get_status_map( self ):
+
+        '''
+        Returns a map of each PHNP_Archive_Work_Item status to the number of
+            this phase's items in it.
+        '''
+
+        # return reference
+        status_map_OUT = None
+
+        # declare variables
+        status = None
+        status_count = None
+
+        status_map_OUT = { status : 0 for status in PHNP_Archive_Work_Item.STATUS_LIST }
+        for status, status_count in self.get_work_item_qs().order_by().values_list( "status" ).annotate( status_count = Count( "id" ) ):
+
+            status_map_OUT[ status ] = status_count
+
+        #-- END loop over status counts --#
+
+        return status_map_OUT
+
+    #-- END method get_status_map() --#
+
+
+    def get_work_item_qs( self ):
+
+        '''
+        Returns a QuerySet of the paper's items in this phase.
+        '''
+
+        return PHNP_Archive_Work_Item.objects.filter( proquest_hnp_newspaper = self.newspaper_helper.get_PHNP_newspaper(), phase = self.phase )
+
+    #-- END method get_work_item_qs() --#
+
+
+    def is_skip_locked_supported( self ):
+
+        '''
+        Returns True if the queue's database supports SELECT ... FOR UPDATE
+            SKIP LOCKED.
+        '''
+
+        return ( connections[ self.db_alias ].features.has_select_for_update_skip_locked == True )
+
+    #-- END method is_skip_locked_supported() --#
+
+
+    @contextlib.contextmanager
+    def keep_lease_alive( self, work_item_IN ):
+
+        '''
+        Context manager - renews the lease on work_item_IN from a heartbeat
+            thread (see run_heartbeat()) while the code inside the with block
+            runs.
+        '''
+
+        # declare variables
+        stop_event = None
+        heartbeat_thread = None
+
+        stop_event = threading.Event()
+        heartbeat_thread = threading.Thread( target = self.run_heartbeat, args = ( work_item_IN, stop_event ), daemon = True )
+        heartbeat_thread.start()
+        try:
+
+            yield work_item_IN
+
+        finally:
+
+            stop_event.set()
+            heartbeat_thread.join()
+
+        #-- END try-finally --#
+
+    #-- END method keep_lease_alive() --#
+
+
+    def lease_work_item( self, work_item_id_list_IN ):
+
+        '''
+        Tries to lease each queued item in work_item_id_list_IN to this worker
+            in turn, with an UPDATE that only succeeds if the item is still
+            queued.  Returns the first item leased, or None if other workers
+            got them all first.
+        '''
+
+        # return reference
+        work_item_OUT = None
+
+        # declare variables
+        work_item_id = None
+        queued_qs = None
+        now = None
+        update_count = None
+
+        for work_item_id in work_item_id_list_IN:
+
+            now = timezone.now()
+            queued_qs = PHNP_Archive_Work_Item.objects.filter( id = work_item_id, status = PHNP_Archive_Work_Item.STATUS_QUEUED )
+            update_count = queued_qs.update( status = PHNP_Archive_Work_Item.STATUS_LEASED,
+                                             lease_owner = self.worker_id,
+                                             lease_expires = now + datetime.timedelta( seconds = self.lease_seconds ),
+                                             heartbeat = now,
+                                             attempt_count = F( "attempt_count" ) + 1,
+                                             last_modified = now )
+            if ( update_count == 1 ):
+
+                # ours.
+                work_item_OUT = PHNP_Archive_Work_Item.objects.get( id = work_item_id )
+                break
+
+            #-- END check to see if leased --#
+
+        #-- END loop over candidate items --#
+
+        return work_item_OUT
+
+    #-- END method lease_work_item() --#
+
+
+    def process_work_item( self, work_item_IN ):
+
+        '''
+        Does the work for an item - extracts its archive .zip file into
+            destination_paper_path (unless an earlier attempt already did),
+            summarizes its archive and stores the counts (unless it is
+            unchanged since last summarized and skip_unchanged is True), or,
+            for the paper's rollup item, rebuilds the paper totals.  Returns
+            the extract result or archive summary dictionary, or the rollup's
+            map of ObjectType to count (None if there was nothing to do).
+        '''
+
+        # return reference
+        result_dict_OUT = None
+
+        # declare variables
+        helper = None
+        archive_folder_path = None
+        manifest_dict = None
+
+        helper = self.newspaper_helper
+        if ( work_item_IN.phase == PHNP_Archive_Work_Item.PHASE_UNCOMPRESS ):
+
+            # folders are renamed into place once complete, so one that exists
+            #     is done.
+            archive_folder_path = "{}/{}".format( helper.destination_paper_path, work_item_IN.archive_identifier )
+            if ( os.path.exists( archive_folder_path ) == False ):
+
+                result_dict_OUT = helper.extract_archive_zip_file( work_item_IN.archive_path, archive_folder_path )
+
+            #-- END check to see if already extracted --#
+
+        elif ( work_item_IN.phase == PHNP_Archive_Work_Item.PHASE_SUMMARIZE ):
+
+            # one manifest, for the change check and the summary.
+            manifest_dict = helper.build_archive_manifest( work_item_IN.archive_path, is_zip_file_IN = work_item_IN.use_zip_files )
+            if ( self.skip_unchanged == True ):
+
+                result_dict_OUT = helper.get_unchanged_archive_summary( work_item_IN.archive_path,
+                                                                        use_zip_files_IN = work_item_IN.use_zip_files,
+                                                                        manifest_dict_IN = manifest_dict )
+
+            #-- END check to see if skipping unchanged archives --#
+
+            if ( result_dict_OUT is None ):
+
+                if ( work_item_IN.use_zip_files == True ):
+
+                    result_dict_OUT = helper.summarize_archive_zip_file( work_item_IN.archive_path, print_logging_IN = False, manifest_dict_IN = manifest_dict )
+
+                else:
+
+                    result_dict_OUT = helper.summarize_archive_files( work_item_IN.archive_path, print_logging_IN = False, manifest_dict_IN = manifest_dict )
+
+                #-- END check to see if zip file or folder --#
+
+                helper.flush_archive_summaries()
+
+            #-- END check to see if unchanged --#
+
+        elif ( work_item_IN.phase == PHNP_Archive_Work_Item.PHASE_ROLLUP ):
+
+            result_dict_OUT = helper.rollup_paper_object_types( remove_duplicates_IN = helper.skip_duplicate_records, use_zip_files_IN = work_item_IN.use_zip_files )
+
+        #-- END check to see which phase --#
+
+        return result_dict_OUT
+
+    #-- END method process_work_item() --#
+
+
+    def renew_lease( self, work_item_IN ):
+
+        '''
+        Pushes the lease on an item this worker holds lease_seconds into the
+            future.  Returns False if the lease was lost.
+        '''
+
+        # return reference
+        is_renewed_OUT = None
+
+        # declare variables
+        now = None
+        update_count = None
+
+        now = timezone.now()
+        update_count = self.get_leased_qs( work_item_IN ).update( lease_expires = now + datetime.timedelta( seconds = self.lease_seconds ),
+                                                                  heartbeat = now )
+        is_renewed_OUT = ( update_count == 1 )
+
+        return is_renewed_OUT
+
+    #-- END method renew_lease() --#
+
+
+    def requeue_expired_work_items( self ):
+
+        '''
+        Queues this phase's items whose lease has expired (their worker died
+            or hung) again, or marks them failed if they have been tried
+            max_attempts times.  Returns the number queued again.
+        '''
+
+        # return reference
+        requeue_count_OUT = None
+
+        # declare variables
+        now = None
+        expired_qs = None
+
+        now = timezone.now()
+        expired_qs = self.get_work_item_qs().filter( status = PHNP_Archive_Work_Item.STATUS_LEASED, lease_expires__lt = now )
+        expired_qs.filter( attempt_count__gte = self.max_attempts ).update( status = PHNP_Archive_Work_Item.STATUS_FAILED,
+                                                                            lease_owner = None,
+                                                                            lease_expires = None,
+                                                                            error_message = self.ERROR_LEASE_EXPIRED,
+                                                                            last_modified = now )
+        requeue_count_OUT = expired_qs.update( status = PHNP_Archive_Work_Item.STATUS_QUEUED,
+                                               lease_owner = None,
+                                               lease_expires = None,
+                                               last_modified = now )
+
+        return requeue_count_OUT
+
+    #-- END method requeue_expired_work_items() --#
+
+
+    def requeue_failed_work_items( self ):
+
+        '''
+        Queues this phase's failed items again, with their attempts reset, so
+            workers try each up to max_attempts more times.  Returns the number
+            queued again.
+        '''
+
+        # return reference
+        requeue_count_OUT = None
+
+        requeue_count_OUT = self.get_work_item_qs().filter( status = PHNP_Archive_Work_Item.STATUS_FAILED ).update( status = PHNP_Archive_Work_Item.STATUS_QUEUED,
+                                                                                                                   lease_owner = None,
+                                                                                                                   lease_expires = None,
+                                                                                                                   attempt_count = 0,
+                                                                                                                   last_modified = timezone.now() )
+
+        return requeue_count_OUT
+
+    #-- END method requeue_failed_work_items() --#
+
+
+    def reset_work_items( self ):
+
+        '''
+        Deletes the paper's items in this phase, so enqueue_paper_archives()
+            starts a new queue.  Returns the number deleted.
+        '''
+
+        # return reference
+        delete_count_OUT = None
+
+        # declare variables
+        delete_count_map = None
+
+        delete_count_OUT, delete_count_map = self.get_work_item_qs().delete()
+
+        return delete_count_OUT
+
+    #-- END method reset_work_items() --#
+
+
+    def run_heartbeat( self, work_item_IN, stop_event_IN ):
+
+        '''
+        Heartbeat thread (see keep_lease_alive()) - renews the lease on
+            work_item_IN HEARTBEATS_PER_LEASE times per lease, until
+            stop_event_IN is set or the lease is lost.  Database errors are
+            logged, and the renewal is tried again next time.
+        '''
+
+        # declare variables
+        heartbeat_seconds = None
+        is_done = None
+        log_message = None
+
+        heartbeat_seconds = max( self.lease_seconds / self.HEARTBEATS_PER_LEASE, 1 )
+        is_done = False
+        try:
+
+            while ( ( is_done == False ) and ( stop_event_IN.wait( heartbeat_seconds ) == False ) ):
+
+                try:
+
+                    if ( self.renew_lease( work_item_IN ) == False ):
+
+                        log_message = "LOST LEASE - {} {} - another worker may be processing it".format( work_item_IN.phase, work_item_IN.archive_identifier )
+                        self.newspaper_helper.output_debug_message( log_message, do_print_IN = True )
+                        is_done = True
+
+                    #-- END check to see if renewed --#
+
+                except DatabaseError as de:
+
+                    log_message = "HEARTBEAT FAILED - {} {} - {}".format( work_item_IN.phase, work_item_IN.archive_identifier, de )
+                    self.newspaper_helper.output_debug_message( log_message, do_print_IN = True )
+
+                #-- END try-except --#
+
+            #-- END loop until stopped --#
+
+        finally:
+
+            # this thread's database connection.
+            connections.close_all()
+
+        #-- END try-finally --#
+
+    #-- END method run_heartbeat() --#
+
+
+    def run_rollup( self, force_IN = False ):
+
+        '''
+        For a summarize queue - rebuilds the paper totals from the rollup item
+            (see claim_rollup_work_item() and process_work_item()) if every
+            summarize item is done - or, if force_IN is True, whatever state
+            they are in, and even if the totals are current.  If items are
+            not all done, logs that the rollup was skipped, and why.  Returns
+            a run_worker() status for the rollup item, or None if it was not
+            run (skipped, leased to another worker, or already current).
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        log_message = None
+        queue_status_map = None
+        is_all_done = None
+        work_item = None
+
+        queue_status_map = self.get_status_map()
+        is_all_done = ( queue_status_map[ PHNP_Archive_Work_Item.STATUS_DONE ] == sum( queue_status_map.values() ) )
+        log_message = "{} summarize items failed, {} queued, {} leased".format( queue_status_map[ PHNP_Archive_Work_Item.STATUS_FAILED ],
+                                                                                 queue_status_map[ PHNP_Archive_Work_Item.STATUS_QUEUED ],
+                                                                                 queue_status_map[ PHNP_Archive_Work_Item.STATUS_LEASED ] )
+        if ( ( is_all_done == False ) and ( force_IN == False ) ):
+
+            # not yet - say why, in case it is failures no one will retry.
+            log_message = "ROLLUP SKIPPED - paper totals not rebuilt: {}.  Queue failed items again (run_hnp_worker --retry-failed), or rebuild the totals anyway (run_hnp_worker --rollup).".format( log_message )
+            self.newspaper_helper.output_debug_message( log_message, do_print_IN = True )
+
+        else:
+
+            if ( is_all_done == False ):
+
+                log_message = "ROLLUP FORCED - {} - totals use the counts last stored for those archives, if any.".format( log_message )
+                self.newspaper_helper.output_debug_message( log_message, do_print_IN = True )
+
+            #-- END check to see if forced --#
+
+            work_item = self.claim_rollup_work_item( force_IN = force_IN )
+            if ( work_item is not None ):
+
+                status_OUT = self.run_work_item( work_item )
+
+            else:
+
+                log_message = "ROLLUP NOT RUN - another worker is rolling up the paper, or its totals are already current."
+                self.newspaper_helper.output_progress_message( log_message )
+
+            #-- END check to see if rollup leased --#
+
+        #-- END check to see if all done --#
+
+        return status_OUT
+
+    #-- END method run_rollup() --#
+
+
+    def run_work_item( self, work_item_IN ):
+
+        '''
+        Processes a leased item (see process_work_item()) while keeping its
+            lease alive, then marks it done, or records the error.  Returns a
+            run_worker() status - STATUS_PROCESSED, STATUS_FAILED, or
+            STATUS_LOST_LEASE if the item was done but the lease had been
+            lost.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        log_message = None
+
+        log_message = "==> {} {} ( attempt {} ) @ {}".format( work_item_IN.phase, work_item_IN.archive_path, work_item_IN.attempt_count, datetime.datetime.now() )
+        self.newspaper_helper.output_progress_message( log_message )
+        try:
+
+            with self.keep_lease_alive( work_item_IN ):
+
+                self.process_work_item( work_item_IN )
+
+            #-- END with keep_lease_alive() --#
+
+        except Exception as e:
+
+            log_message = "ERROR - {} {} - {}: {}".format( work_item_IN.phase, work_item_IN.archive_identifier, type( e ).__name__, e )
+            self.newspaper_helper.output_debug_message( log_message, do_print_IN = True )
+            self.fail_work_item( work_item_IN, "{}: {}".format( type( e ).__name__, e ) )
+            status_OUT = self.STATUS_FAILED
+
+        else:
+
+            if ( self.complete_work_item( work_item_IN ) == True ):
+
+                status_OUT = self.STATUS_PROCESSED
+
+            else:
+
+                status_OUT = self.STATUS_LOST_LEASE
+
+            #-- END check to see if still ours --#
+
+        #-- END try-except-else --#
+
+        return status_OUT
+
+    #-- END method run_work_item() --#
+
+
+    def run_worker( self, max_item_count_IN = None, wait_IN = False, poll_seconds_IN = DEFAULT_POLL_SECONDS ):
+
+        '''
+        Worker loop - claims and processes items until none are left to claim
+            (or max_item_count_IN have been processed).  Expired leases are
+            requeued whenever the queue looks empty.  If wait_IN is True, and
+            items are still queued (waiting on a prerequisite) or leased to
+            other workers, checks again every poll_seconds_IN until they are
+            done.  If this worker processed any summarize items, and
+            rollup_when_done is True, rebuilds the paper totals once every
+            summarize item is done (see run_rollup()).  Returns a map of
+            run_worker() status to the number of items this worker left in
+            it.
+        '''
+
+        # return reference
+        status_map_OUT = None
+
+        # declare variables
+        is_done = None
+        item_counter = None
+        work_item = None
+        status = None
+        queue_status_map = None
+
+        status_map_OUT = { status : 0 for status in self.STATUS_LIST }
+        is_done = False
+        item_counter = 0
+        while ( is_done == False ):
+
+            work_item = self.claim_work_item()
+            if ( ( work_item is None ) and ( self.requeue_expired_work_items() > 0 ) ):
+
+                # took back items from workers that stopped renewing leases.
+                work_item = self.claim_work_item()
+
+            #-- END check to see if anything to claim --#
+
+            if ( work_item is not None ):
+
+                status = self.run_work_item( work_item )
+                status_map_OUT[ status ] += 1
+                item_counter += 1
+                if ( ( max_item_count_IN is not None ) and ( item_counter >= max_item_count_IN ) ):
+
+                    is_done = True
+
+                #-- END check to see if done enough --#
+
+            else:
+
+                queue_status_map = self.get_status_map()
+                if ( ( wait_IN == True )
+                    and ( ( queue_status_map[ PHNP_Archive_Work_Item.STATUS_QUEUED ] + queue_status_map[ PHNP_Archive_Work_Item.STATUS_LEASED ] ) > 0 ) ):
+
+                    time.sleep( poll_seconds_IN )
+
+                else:
+
+                    is_done = True
+
+                #-- END check to see if waiting for other workers --#
+
+            #-- END check to see if claimed anything --#
+
+        #-- END worker loop --#
+
+        # paper totals, once the whole phase is done.
+        if ( ( self.phase == PHNP_Archive_Work_Item.PHASE_SUMMARIZE )
+            and ( self.rollup_when_done == True )
+            and ( status_map_OUT[ self.STATUS_PROCESSED ] > 0 ) ):
+
+            self.run_rollup()
+
+        #-- END check to see if rolling up --#
+
+        return status_map_OUT
+
+    #-- END method run_worker() --#
+
+
+#-- END class ProquestHNPWorkQueue --#
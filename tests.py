@@ -1,3 +1,1137 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2019 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text_proquest_hnp.
+
+context_text_proquest_hnp is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text_proquest_hnp is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text_proquest_hnp. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import zipfile
+
+# xmltodict - what Records were parsed with before extract_record_fields().
+try:
+
+    import xmltodict
+
+except ImportError:
+
+    xmltodict = None
+
+#-- END try to import xmltodict --#
+
+# django imports
+from django.db import transaction
+from django.test import SimpleTestCase
 from django.test import TestCase
+from django.utils import timezone
+
+# context_text imports
+from context_text.models import Article
+from context_text.models import Article_Text
+from context_text.models import Newspaper
+
+# context_text_proquest_hnp imports
+from context_text_proquest_hnp.models import PHNP_Archive_Work_Item
+from context_text_proquest_hnp.models import PHNP_Checkpoint_Archive
+from context_text_proquest_hnp.models import PHNP_Newspaper_Archive_Object_Type
+from context_text_proquest_hnp.models import PHNP_Newspaper_Object_Type
+from context_text_proquest_hnp.models import Proquest_HNP_Checkpoint
+from context_text_proquest_hnp.models import Proquest_HNP_Object_Type
+from context_text_proquest_hnp.proquest_hnp_article_loader import ProquestHNPArticleLoader
+from context_text_proquest_hnp.proquest_hnp_metrics import ProquestHNPMetrics
+from context_text_proquest_hnp.proquest_hnp_newspaper_helper import ProquestHNPNewspaperHelper
+from context_text_proquest_hnp.proquest_hnp_object_type_cache import ProquestHNPObjectTypeCache
+from context_text_proquest_hnp.proquest_hnp_work_queue import ProquestHNPWorkQueue
+
+#===============================================================================
+# functions (in alphabetical order by name)
+#===============================================================================
+
+def make_record_xml( record_id_IN, object_type_list_IN, numeric_pub_date_IN, title_IN = None, author_list_IN = None ):
+
+    '''
+    Returns the text of a minimal HNP Record XML file with the values passed
+        in, in the element order HNP uses.
+    '''
+
+    # return reference
+    xml_OUT = None
+
+    # declare variables
+    element_list = None
+    object_type = None
+    author = None
+
+    element_list = [ "<Version>1</Version>", "<RecordID>{}</RecordID>".format( record_id_IN ) ]
+    element_list.append( "<RecordTitle>{}</RecordTitle>".format( title_IN or "Title {}".format( record_id_IN ) ) )
+    for object_type in object_type_list_IN:
+
+        element_list.append( "<ObjectType>{}</ObjectType>".format( object_type ) )
+
+    #-- END loop over object types --#
+
+    for author in ( author_list_IN or [] ):
+
+        element_list.append( "<Contributor><OriginalForm>{}</OriginalForm></Contributor>".format( author ) )
+
+    #-- END loop over authors --#
+
+    if ( numeric_pub_date_IN is not None ):
+
+        element_list.append( "<NumericPubDate>{}</NumericPubDate>".format( numeric_pub_date_IN ) )
+
+    #-- END check to see if pub date --#
+
+    element_list.append( "<StartPage>1</StartPage>" )
+    element_list.append( "<FullText>Text of record {}.</FullText>".format( record_id_IN ) )
+    xml_OUT = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<Record>{}</Record>".format( "".join( element_list ) )
+
+    return xml_OUT
+
+#-- END function make_record_xml() --#
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ProquestHNPTestCase( TestCase ):
+
+    '''
+    Base for tests that need a paper - a temporary source (archive .zip
+        files) and destination folder for each test, and helpers to write
+        archives of Record XML files and make a helper for the paper.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    PAPER_IDENTIFIER = "TestPaper"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def get_count_map( self, count_qs_IN ):
+
+        '''
+        Returns a map of ObjectType raw value to item_count for a QuerySet of
+            PHNP_Newspaper_Object_Type or PHNP_Newspaper_Archive_Object_Type.
+        '''
+
+        return dict( count_qs_IN.values_list( "proquest_hnp_object_type__raw_value", "item_count" ) )
+
+    #-- END method get_count_map() --#
+
+
+    def make_archive_zip( self, archive_identifier_IN, record_list_IN ):
+
+        '''
+        Writes an archive .zip file named for archive_identifier_IN into the
+            source folder (replacing it if it exists), with one Record file
+            per ( RecordID, ObjectType list, NumericPubDate ) tuple in
+            record_list_IN.  Returns its path.
+        '''
+
+        # return reference
+        zip_file_path_OUT = None
+
+        # declare variables
+        zip_file = None
+        record_id = None
+        object_type_list = None
+        numeric_pub_date = None
+
+        zip_file_path_OUT = os.path.join( self.source_folder_path, "{}.zip".format( archive_identifier_IN ) )
+        with zipfile.ZipFile( zip_file_path_OUT, "w", zipfile.ZIP_DEFLATED ) as zip_file:
+
+            for record_id, object_type_list, numeric_pub_date in record_list_IN:
+
+                zip_file.writestr( "{}/{}.xml".format( archive_identifier_IN, record_id ), make_record_xml( record_id, object_type_list, numeric_pub_date ) )
+
+            #-- END loop over records --#
+
+        #-- END with ZipFile --#
+
+        return zip_file_path_OUT
+
+    #-- END method make_archive_zip() --#
+
+
+    def make_helper( self ):
+
+        '''
+        Returns a quiet ProquestHNPNewspaperHelper for the test paper, with the
+            temporary folders as its paths.
+        '''
+
+        # return reference
+        helper_OUT = None
+
+        helper_OUT = ProquestHNPNewspaperHelper()
+        helper_OUT.is_quiet = True
+        helper_OUT.paper_identifier = self.PAPER_IDENTIFIER
+        helper_OUT.paper_start_year = 1960
+        helper_OUT.paper_end_year = 1969
+        helper_OUT.source_paper_path = self.source_folder_path
+        helper_OUT.destination_paper_path = self.destination_folder_path
+
+        return helper_OUT
+
+    #-- END method make_helper() --#
+
+
+    def setUp( self ):
+
+        # class-level cache outlives each test's rolled-back transaction.
+        ProquestHNPNewspaperHelper.object_type_cache.clear()
+
+        self.temp_folder_path = tempfile.mkdtemp()
+        self.source_folder_path = os.path.join( self.temp_folder_path, "source" )
+        self.destination_folder_path = os.path.join( self.temp_folder_path, "destination" )
+        os.makedirs( self.source_folder_path )
+        os.makedirs( self.destination_folder_path )
+
+    #-- END method setUp() --#
+
+
+    def tearDown( self ):
+
+        shutil.rmtree( self.temp_folder_path, ignore_errors = True )
+
+    #-- END method tearDown() --#
+
+
+#-- END class ProquestHNPTestCase --#
+
+
+class ArticleLoaderTestCase( ProquestHNPTestCase ):
+
+    '''
+    ProquestHNPArticleLoader - filters, Records repeated across archives, and
+        loading again without creating duplicates, with and without archive
+        indexes to pick the files.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def get_loaded_record_id_list( self ):
+
+        '''
+        Returns the sorted RecordIDs (Article.archive_id) of the articles
+            loaded from HNP.
+        '''
+
+        return sorted( Article.objects.filter( archive_source = ProquestHNPArticleLoader.ARCHIVE_SOURCE ).values_list( "archive_id", flat = True ) )
+
+    #-- END method get_loaded_record_id_list() --#
+
+
+    def load_paper( self, object_type_list_IN = None, start_pub_date_int_IN = None, end_pub_date_int_IN = None ):
+
+        '''
+        Loads the test paper's archive .zip files with a new loader, 2 articles
+            per batch, and returns the status map.
+        '''
+
+        # return reference
+        status_map_OUT = None
+
+        # declare variables
+        article_loader = None
+
+        article_loader = ProquestHNPArticleLoader( self.make_helper(),
+                                                   object_type_list_IN = object_type_list_IN,
+                                                   start_pub_date_int_IN = start_pub_date_int_IN,
+                                                   end_pub_date_int_IN = end_pub_date_int_IN,
+                                                   batch_size_IN = 2 )
+        status_map_OUT = article_loader.load_paper( use_zip_files_IN = True, print_logging_IN = False )
+
+        return status_map_OUT
+
+    #-- END method load_paper() --#
+
+
+    def setUp( self ):
+
+        # declare variables
+        paper_instance = None
+
+        super( ArticleLoaderTestCase, self ).setUp()
+
+        # paper, with a context_text newspaper.
+        paper_instance = self.make_helper().get_PHNP_newspaper()
+        paper_instance.newspaper = Newspaper.objects.create( name = "Test Paper" )
+        paper_instance.save()
+
+        # two archives - Record 1 is in both.
+        self.make_archive_zip( "TestPaper_1960", [ ( 1, [ "Article" ], "19600102" ), ( 2, [ "Advertisement" ], "19600103" ), ( 3, [ "Article", "Front Page" ], "19600104" ) ] )
+        self.make_archive_zip( "TestPaper_1961", [ ( 1, [ "Article" ], "19600102" ), ( 4, [ "Article" ], "19610105" ), ( 5, [ "Article" ], "19611231" ) ] )
+
+    #-- END method setUp() --#
+
+
+    def test_filters( self ):
+
+        # declare variables
+        status_map = None
+
+        status_map = self.load_paper( object_type_list_IN = [ "Article" ], start_pub_date_int_IN = 19600101, end_pub_date_int_IN = 19611130 )
+        self.assertEqual( self.get_loaded_record_id_list(), [ "1", "4" ] )
+        self.assertEqual( Article_Text.objects.count(), 2 )
+        self.assertEqual( status_map[ ProquestHNPArticleLoader.STATUS_CREATED ], 2 )
+        self.assertEqual( status_map[ ProquestHNPArticleLoader.STATUS_SKIPPED_FILTERED ], 3 )
+
+    #-- END method test_filters() --#
+
+
+    def test_filters_with_archive_indexes( self ):
+
+        # summarizing writes the indexes the loader picks files with.
+        self.make_helper().process_paper_object_types( use_zip_files_IN = True )
+        self.load_paper( object_type_list_IN = [ "Article" ], start_pub_date_int_IN = 19600101, end_pub_date_int_IN = 19611130 )
+        self.assertEqual( self.get_loaded_record_id_list(), [ "1", "4" ] )
+        self.assertEqual( Article_Text.objects.count(), 2 )
+
+    #-- END method test_filters_with_archive_indexes() --#
+
+
+    def test_load_again( self ):
+
+        # declare variables
+        status_map = None
+
+        # Record 1 once, though it is in both archives.
+        status_map = self.load_paper()
+        self.assertEqual( self.get_loaded_record_id_list(), [ "1", "2", "3", "4", "5" ] )
+        self.assertEqual( status_map[ ProquestHNPArticleLoader.STATUS_SKIPPED_DUPLICATE ], 1 )
+
+        # again - nothing new.
+        status_map = self.load_paper()
+        self.assertEqual( status_map[ ProquestHNPArticleLoader.STATUS_CREATED ], 0 )
+        self.assertEqual( self.get_loaded_record_id_list(), [ "1", "2", "3", "4", "5" ] )
+        self.assertEqual( Article_Text.objects.count(), 5 )
+
+    #-- END method test_load_again() --#
+
+
+#-- END class ArticleLoaderTestCase --#
+
+
+class CheckpointTestCase( ProquestHNPTestCase ):
+
+    '''
+    Resuming interrupted runs from their Proquest_HNP_Checkpoint, starting
+        over with restart_IN, and not trusting checkpoints that are stale or
+        whose archives changed (see ProquestHNPNewspaperHelper.get_checkpoint()).
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    ARCHIVE_RECORD_MAP = {
+        "TestPaper_1960" : [ ( 1, [ "Article" ], "19600102" ), ( 2, [ "Advertisement" ], "19600103" ) ],
+        "TestPaper_1961" : [ ( 3, [ "Article" ], "19610102" ) ],
+        "TestPaper_1962" : [ ( 4, [ "Article" ], "19620102" ), ( 5, [ "Advertisement" ], "19620103" ) ],
+    }
+    PAPER_COUNT_MAP = { "Article" : 3, "Advertisement" : 2 }
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def get_counter( self, helper_IN, counter_name_IN ):
+
+        '''
+        Returns the value of a metrics counter from the helper's last run (0 if
+            it was never incremented).
+        '''
+
+        return helper_IN.metrics.to_dict()[ "totals" ][ "counters" ].get( counter_name_IN, 0 )
+
+    #-- END method get_counter() --#
+
+
+    def process_paper( self, restart_IN = False ):
+
+        '''
+        Summarizes the test paper's archive .zip files, and returns the
+            helper.
+        '''
+
+        # return reference
+        helper_OUT = None
+
+        helper_OUT = self.make_helper()
+        helper_OUT.process_paper_object_types( use_zip_files_IN = True, skip_unchanged_IN = False, restart_IN = restart_IN )
+
+        return helper_OUT
+
+    #-- END method process_paper() --#
+
+
+    def process_paper_interrupted( self ):
+
+        '''
+        Summarizes the test paper's archive .zip files, with the run
+            interrupted while storing the second archive.
+        '''
+
+        # declare variables
+        original_method = None
+        call_list = None
+
+        original_method = ProquestHNPNewspaperHelper.store_archive_summary
+        call_list = []
+
+        def store_or_interrupt( helper_IN, *args, **kwargs ):
+
+            call_list.append( args )
+            if ( len( call_list ) == 2 ):
+
+                raise RuntimeError( "interrupted" )
+
+            #-- END check to see if time to interrupt --#
+
+            return original_method( helper_IN, *args, **kwargs )
+
+        #-- END function store_or_interrupt() --#
+
+        with mock.patch.object( ProquestHNPNewspaperHelper, "store_archive_summary", store_or_interrupt ):
+
+            with self.assertRaises( RuntimeError ):
+
+                self.make_helper().process_paper_object_types( use_zip_files_IN = True, skip_unchanged_IN = False )
+
+            #-- END with assertRaises() --#
+
+        #-- END with mock.patch.object() --#
+
+    #-- END method process_paper_interrupted() --#
+
+
+    def setUp( self ):
+
+        # declare variables
+        archive_identifier = None
+        record_list = None
+
+        super( CheckpointTestCase, self ).setUp()
+
+        for archive_identifier, record_list in self.ARCHIVE_RECORD_MAP.items():
+
+            self.make_archive_zip( archive_identifier, record_list )
+
+        #-- END loop over archives --#
+
+    #-- END method setUp() --#
+
+
+    def test_changed_archive_processed_again( self ):
+
+        # declare variables
+        archive_identifier = None
+        helper = None
+
+        self.process_paper_interrupted()
+
+        # the archive finished before the interruption changes.
+        archive_identifier = PHNP_Checkpoint_Archive.objects.get().archive_identifier
+        self.make_archive_zip( archive_identifier, self.ARCHIVE_RECORD_MAP[ archive_identifier ] + [ ( 6, [ "Article" ], "19600104" ) ] )
+        helper = self.process_paper()
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED ), 0 )
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES_CHANGED_SINCE_CHECKPOINT ), 1 )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Article" : 4, "Advertisement" : 2 } )
+
+    #-- END method test_changed_archive_processed_again() --#
+
+
+    def test_removed_folder_extracted_again( self ):
+
+        # declare variables
+        original_method = None
+        call_list = None
+        helper = None
+        checkpoint_identifier_list = None
+        removed_folder_path = None
+        archive_identifier = None
+
+        # interrupt extracting the second archive.
+        original_method = ProquestHNPNewspaperHelper.extract_archive_zip_file
+        call_list = []
+
+        def extract_or_interrupt( helper_IN, *args, **kwargs ):
+
+            call_list.append( args )
+            if ( len( call_list ) == 2 ):
+
+                raise RuntimeError( "interrupted" )
+
+            #-- END check to see if time to interrupt --#
+
+            return original_method( *args, **kwargs )
+
+        #-- END function extract_or_interrupt() --#
+
+        with mock.patch.object( ProquestHNPNewspaperHelper, "extract_archive_zip_file", extract_or_interrupt ):
+
+            with self.assertRaises( RuntimeError ):
+
+                self.make_helper().uncompress_paper_zip_files()
+
+            #-- END with assertRaises() --#
+
+        #-- END with mock.patch.object() --#
+
+        # a checkpointed archive's folder is removed before the run resumes.
+        checkpoint_identifier_list = list( PHNP_Checkpoint_Archive.objects.values_list( "archive_identifier", flat = True ) )
+        self.assertGreater( len( checkpoint_identifier_list ), 0 )
+        removed_folder_path = os.path.join( self.destination_folder_path, checkpoint_identifier_list[ 0 ] )
+        shutil.rmtree( removed_folder_path )
+
+        helper = self.make_helper()
+        helper.uncompress_paper_zip_files()
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED ), len( checkpoint_identifier_list ) - 1 )
+        for archive_identifier in self.ARCHIVE_RECORD_MAP:
+
+            self.assertTrue( os.path.isdir( os.path.join( self.destination_folder_path, archive_identifier ) ) )
+
+        #-- END loop over archives --#
+
+    #-- END method test_removed_folder_extracted_again() --#
+
+
+    def test_restart( self ):
+
+        # declare variables
+        helper = None
+
+        self.process_paper_interrupted()
+        helper = self.process_paper( restart_IN = True )
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED ), 0 )
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES ), 3 )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), self.PAPER_COUNT_MAP )
+        self.assertEqual( sorted( Proquest_HNP_Checkpoint.objects.values_list( "phase", flat = True ) ), [ Proquest_HNP_Checkpoint.PHASE_ABANDONED, Proquest_HNP_Checkpoint.PHASE_COMPLETE ] )
+
+    #-- END method test_restart() --#
+
+
+    def test_resume( self ):
+
+        # declare variables
+        helper = None
+
+        self.process_paper_interrupted()
+        self.assertEqual( PHNP_Checkpoint_Archive.objects.count(), 1 )
+
+        # finished archive from its stored counts, the other two summarized.
+        helper = self.process_paper()
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED ), 1 )
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES ), 2 )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), self.PAPER_COUNT_MAP )
+        self.assertEqual( list( Proquest_HNP_Checkpoint.objects.values_list( "phase", flat = True ) ), [ Proquest_HNP_Checkpoint.PHASE_COMPLETE ] )
+
+    #-- END method test_resume() --#
+
+
+    def test_stale_checkpoint_not_resumed( self ):
+
+        # declare variables
+        long_ago = None
+        helper = None
+
+        self.process_paper_interrupted()
+        long_ago = timezone.now() - ProquestHNPNewspaperHelper.DEFAULT_CHECKPOINT_MAX_AGE - datetime.timedelta( days = 1 )
+        Proquest_HNP_Checkpoint.objects.update( last_modified = long_ago )
+        PHNP_Checkpoint_Archive.objects.update( create_date = long_ago )
+        helper = self.process_paper()
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES_RESUMED ), 0 )
+        self.assertEqual( self.get_counter( helper, ProquestHNPMetrics.COUNTER_ARCHIVES ), 3 )
+        self.assertEqual( sorted( Proquest_HNP_Checkpoint.objects.values_list( "phase", flat = True ) ), [ Proquest_HNP_Checkpoint.PHASE_ABANDONED, Proquest_HNP_Checkpoint.PHASE_COMPLETE ] )
+
+    #-- END method test_stale_checkpoint_not_resumed() --#
+
+
+#-- END class CheckpointTestCase --#
+
+
+class DuplicateRecordTestCase( ProquestHNPTestCase ):
+
+    '''
+    Records whose RecordID is in more than one of a paper's archives - counted
+        in every archive unless skip_duplicate_records is True, and then left
+        out of the paper totals the same way with or without readable archive
+        indexes (see ProquestHNPNewspaperHelper.find_duplicate_records()).
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # paper totals with and without Records 1 and 3, repeated in 1961.
+    ALL_RECORDS_COUNT_MAP = { "Article" : 4, "Advertisement" : 2 }
+    UNIQUE_RECORDS_COUNT_MAP = { "Article" : 2, "Advertisement" : 2 }
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def process_paper( self, skip_duplicate_records_IN = True, write_archive_index_IN = True ):
+
+        '''
+        Summarizes every archive of the test paper from its .zip file, and
+            returns the helper.
+        '''
+
+        # return reference
+        helper_OUT = None
+
+        helper_OUT = self.make_helper()
+        helper_OUT.skip_duplicate_records = skip_duplicate_records_IN
+        helper_OUT.write_archive_index = write_archive_index_IN
+        helper_OUT.process_paper_object_types( use_zip_files_IN = True, skip_unchanged_IN = False )
+
+        return helper_OUT
+
+    #-- END method process_paper() --#
+
+
+    def setUp( self ):
+
+        super( DuplicateRecordTestCase, self ).setUp()
+
+        # 1961 was re-issued with two of 1960's Records.
+        self.make_archive_zip( "TestPaper_1960", [ ( 1, [ "Article" ], "19600102" ), ( 2, [ "Advertisement" ], "19600103" ), ( 3, [ "Article" ], "19600104" ) ] )
+        self.make_archive_zip( "TestPaper_1961", [ ( 1, [ "Article" ], "19600102" ), ( 3, [ "Article" ], "19600104" ), ( 4, [ "Advertisement" ], "19610105" ) ] )
+
+    #-- END method setUp() --#
+
+
+    def test_duplicates_counted_by_default( self ):
+
+        self.process_paper( skip_duplicate_records_IN = False )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), self.ALL_RECORDS_COUNT_MAP )
+
+    #-- END method test_duplicates_counted_by_default() --#
+
+
+    def test_duplicates_skipped( self ):
+
+        # declare variables
+        helper = None
+
+        helper = self.process_paper()
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), self.UNIQUE_RECORDS_COUNT_MAP )
+        self.assertEqual( helper.metrics.to_dict()[ "totals" ][ "counters" ][ ProquestHNPMetrics.COUNTER_DUPLICATE_RECORDS ], 2 )
+
+        # archive rows still count everything in the archive.
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Archive_Object_Type.objects.filter( proquest_hnp_newspaper_archive__archive_identifier = "TestPaper_1961" ) ), { "Article" : 2, "Advertisement" : 1 } )
+
+    #-- END method test_duplicates_skipped() --#
+
+
+    def test_duplicates_skipped_with_corrupt_indexes( self ):
+
+        # declare variables
+        dir_entry = None
+        index_file = None
+
+        self.process_paper()
+        for dir_entry in os.scandir( self.destination_folder_path ):
+
+            with open( dir_entry.path, "wb" ) as index_file:
+
+                index_file.write( b"not an index" )
+
+            #-- END with open() --#
+
+        #-- END loop over index files --#
+
+        self.process_paper( write_archive_index_IN = False )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), self.UNIQUE_RECORDS_COUNT_MAP )
+
+    #-- END method test_duplicates_skipped_with_corrupt_indexes() --#
+
+
+    def test_duplicates_skipped_without_indexes( self ):
+
+        self.process_paper( write_archive_index_IN = False )
+        self.assertEqual( os.listdir( self.destination_folder_path ), [] )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), self.UNIQUE_RECORDS_COUNT_MAP )
+
+    #-- END method test_duplicates_skipped_without_indexes() --#
+
+
+#-- END class DuplicateRecordTestCase --#
+
+
+class ObjectTypeCacheTestCase( TestCase ):
+
+    '''
+    ProquestHNPObjectTypeCache inside a transaction - the test case's own,
+        which never commits, so every instance looked up stays pending.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def test_pending_instance_reused( self ):
+
+        # declare variables
+        type_cache = None
+        type_instance = None
+
+        # one lookup, then found pending, not looked up again.
+        type_cache = ProquestHNPObjectTypeCache()
+        type_instance = type_cache.get( "Article" )
+        with self.assertNumQueries( 0 ):
+
+            self.assertEqual( type_cache.get( "Article" ), type_instance )
+
+        #-- END with assertNumQueries() --#
+
+        self.assertEqual( ( type_cache.miss_count, type_cache.hit_count, type_cache.created_count ), ( 1, 1, 1 ) )
+        self.assertEqual( type_cache.get_stats()[ ProquestHNPObjectTypeCache.STAT_SIZE ], 0 )
+
+    #-- END method test_pending_instance_reused() --#
+
+
+    def test_rolled_back_instance_dropped( self ):
+
+        # declare variables
+        type_cache = None
+        type_instance = None
+
+        type_cache = ProquestHNPObjectTypeCache()
+        with self.assertRaises( RuntimeError ):
+
+            with transaction.atomic():
+
+                type_instance = type_cache.get( "Editorial" )
+                raise RuntimeError( "rolled back" )
+
+            #-- END with transaction.atomic() --#
+
+        #-- END with assertRaises() --#
+
+        # the row is gone - so is the pending instance, and it is created again.
+        self.assertFalse( Proquest_HNP_Object_Type.objects.filter( id = type_instance.id ).exists() )
+        type_instance = type_cache.get( "Editorial" )
+        self.assertTrue( Proquest_HNP_Object_Type.objects.filter( id = type_instance.id ).exists() )
+        self.assertEqual( ( type_cache.miss_count, type_cache.hit_count, type_cache.created_count ), ( 2, 0, 2 ) )
+
+    #-- END method test_rolled_back_instance_dropped() --#
+
+
+#-- END class ObjectTypeCacheTestCase --#
+
+
+class ObjectTypeCountDeltaTestCase( ProquestHNPTestCase ):
+
+    '''
+    Stored ObjectType counts are written as a delta against what is stored -
+        rows created, updated, and deleted (see
+        ProquestHNPNewspaperHelper.store_object_type_counts()).
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def test_resummarize_drops_vanished_type( self ):
+
+        # declare variables
+        helper = None
+
+        self.make_archive_zip( "TestPaper_1960", [ ( 1, [ "Article" ], "19600102" ), ( 2, [ "Advertisement" ], "19600103" ) ] )
+        self.make_helper().process_paper_object_types( use_zip_files_IN = True )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Article" : 1, "Advertisement" : 1 } )
+
+        # the archive changes - its advertisement is gone.
+        self.make_archive_zip( "TestPaper_1960", [ ( 1, [ "Article" ], "19600102" ), ( 3, [ "Article" ], "19600104" ) ] )
+        helper = self.make_helper()
+        helper.process_paper_object_types( use_zip_files_IN = True )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Archive_Object_Type.objects.all() ), { "Article" : 2 } )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Article" : 2 } )
+        self.assertEqual( helper.metrics.to_dict()[ "totals" ][ "counters" ][ ProquestHNPMetrics.COUNTER_ROWS_DELETED ], 2 )
+
+    #-- END method test_resummarize_drops_vanished_type() --#
+
+
+    def test_store_object_type_counts( self ):
+
+        # declare variables
+        helper = None
+        paper_instance = None
+        status_dict = None
+
+        helper = self.make_helper()
+        paper_instance = helper.get_PHNP_newspaper()
+
+        # create
+        status_dict = helper.store_object_type_counts( PHNP_Newspaper_Object_Type, "proquest_hnp_newspaper", paper_instance, { "Article" : 2, "Advertisement" : 3 } )
+        self.assertEqual( status_dict, { "created" : 2, "updated" : 0, "deleted" : 0, "unchanged" : 0 } )
+
+        # update one, add one, leave one.
+        status_dict = helper.store_object_type_counts( PHNP_Newspaper_Object_Type, "proquest_hnp_newspaper", paper_instance, { "Article" : 2, "Advertisement" : 5, "Obituary" : 1 } )
+        self.assertEqual( status_dict, { "created" : 1, "updated" : 1, "deleted" : 0, "unchanged" : 1 } )
+
+        # types not in the map are kept, if asked.
+        status_dict = helper.store_object_type_counts( PHNP_Newspaper_Object_Type, "proquest_hnp_newspaper", paper_instance, { "Advertisement" : 5 }, delete_missing_IN = False )
+        self.assertEqual( status_dict, { "created" : 0, "updated" : 0, "deleted" : 0, "unchanged" : 1 } )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Article" : 2, "Advertisement" : 5, "Obituary" : 1 } )
+
+        # delete the rest.
+        status_dict = helper.store_object_type_counts( PHNP_Newspaper_Object_Type, "proquest_hnp_newspaper", paper_instance, { "Advertisement" : 5 } )
+        self.assertEqual( status_dict, { "created" : 0, "updated" : 0, "deleted" : 2, "unchanged" : 1 } )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Advertisement" : 5 } )
+
+    #-- END method test_store_object_type_counts() --#
+
+
+#-- END class ObjectTypeCountDeltaTestCase --#
+
+
+class RecordFieldsTestCase( SimpleTestCase ):
+
+    '''
+    ProquestHNPNewspaperHelper.extract_record_fields() against the xmltodict
+        parse it replaced, and summarize_record_files()'s handling of bad
+        NumericPubDates.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def get_xmltodict_value_list( self, record_node_IN, field_name_IN ):
+
+        '''
+        Returns the text values of a field ("Contributor/OriginalForm") in an
+            xmltodict Record dictionary, as a list, in document order.
+        '''
+
+        # return reference
+        value_list_OUT = None
+
+        # declare variables
+        node_list = None
+        element_name = None
+        next_node_list = None
+        node = None
+        child_node = None
+
+        node_list = [ record_node_IN ]
+        for element_name in field_name_IN.split( ProquestHNPNewspaperHelper.RECORD_FIELD_PATH_SEPARATOR ):
+
+            # xmltodict maps a repeated element to a list, a single one to
+            #     its value.
+            next_node_list = []
+            for node in node_list:
+
+                child_node = node.get( element_name, None )
+                if ( isinstance( child_node, list ) == True ):
+
+                    next_node_list.extend( child_node )
+
+                elif ( child_node is not None ):
+
+                    next_node_list.append( child_node )
+
+                #-- END check to see if repeated --#
+
+            #-- END loop over nodes --#
+
+            node_list = next_node_list
+
+        #-- END loop over path elements --#
+
+        value_list_OUT = [ node or "" for node in node_list ]
+
+        return value_list_OUT
+
+    #-- END method get_xmltodict_value_list() --#
+
+
+    @unittest.skipIf( xmltodict is None, "xmltodict is not installed" )
+    def test_extract_record_fields_matches_xmltodict( self ):
+
+        # declare variables
+        field_name_list = None
+        xml_list = None
+        xml_string = None
+        record_node = None
+        field_to_value_list_map = None
+        field_name = None
+
+        field_name_list = ProquestHNPNewspaperHelper.RECORD_SUMMARY_FIELD_LIST + [ "RecordTitle", "Contributor/OriginalForm", "FullText" ]
+        xml_list = [
+            make_record_xml( 1, [ "Article" ], "19600102", author_list_IN = [ "Bob" ] ),
+            make_record_xml( 2, [ "Article", "Front Page" ], "19600103", author_list_IN = [ "Bob", "Al" ] ),
+            make_record_xml( 3, [], "19600104" ),
+            make_record_xml( 4, [ "Advertisement" ], None, title_IN = "Tom &amp; Jerry" ),
+        ]
+        for xml_string in xml_list:
+
+            record_node = xmltodict.parse( xml_string )[ "Record" ]
+            field_to_value_list_map = ProquestHNPNewspaperHelper.extract_record_fields( io.BytesIO( xml_string.encode( "utf-8" ) ), field_name_list )
+            for field_name in field_name_list:
+
+                self.assertEqual( field_to_value_list_map[ field_name ], self.get_xmltodict_value_list( record_node, field_name ), field_name )
+
+            #-- END loop over fields --#
+
+        #-- END loop over records --#
+
+    #-- END method test_extract_record_fields_matches_xmltodict() --#
+
+
+    def test_extract_record_fields_not_record( self ):
+
+        # declare variables
+        xml_file = None
+
+        xml_file = io.BytesIO( b"<?xml version=\"1.0\"?>\n<Other><ObjectType>Article</ObjectType></Other>" )
+        self.assertIsNone( ProquestHNPNewspaperHelper.extract_record_fields( xml_file, [ "ObjectType" ] ) )
+
+    #-- END method test_extract_record_fields_not_record() --#
+
+
+    def test_summarize_record_files_bad_pub_date( self ):
+
+        # declare variables
+        record_list = None
+        record_file_list = None
+        metrics = None
+        summary_dict = None
+
+        # a good date, one that is not a number, and one that is not a date.
+        record_list = [ ( 1, [ "Article" ], "19600102" ), ( 2, [ "Article" ], "1960-01-03" ), ( 3, [ "Advertisement" ], "19601301" ) ]
+        record_file_list = [ ( "{}.xml".format( record_id ), io.BytesIO( make_record_xml( record_id, object_type_list, numeric_pub_date ).encode( "utf-8" ) ), None ) for record_id, object_type_list, numeric_pub_date in record_list ]
+        metrics = ProquestHNPMetrics()
+        summary_dict = ProquestHNPNewspaperHelper.summarize_record_files( record_file_list, metrics_IN = metrics )
+
+        # every Record counted, only the good date used.
+        self.assertEqual( summary_dict[ ProquestHNPNewspaperHelper.ARCHIVE_SUMMARY_TYPE_TO_COUNT_MAP ], { "Article" : 2, "Advertisement" : 1 } )
+        self.assertEqual( summary_dict[ ProquestHNPNewspaperHelper.ARCHIVE_SUMMARY_MIN_PUB_DATE ], 19600102 )
+        self.assertEqual( summary_dict[ ProquestHNPNewspaperHelper.ARCHIVE_SUMMARY_MAX_PUB_DATE ], 19600102 )
+        self.assertEqual( metrics.to_dict()[ "totals" ][ "counters" ][ ProquestHNPMetrics.COUNTER_BAD_PUB_DATE ], 2 )
+
+    #-- END method test_summarize_record_files_bad_pub_date() --#
+
+
+#-- END class RecordFieldsTestCase --#
+
+
+class WorkQueueTestCase( ProquestHNPTestCase ):
+
+    '''
+    ProquestHNPWorkQueue on SQLite (no SELECT ... SKIP LOCKED): claims,
+        lease expiry, max_attempts, requeueing failed items, and the paper's
+        rollup.  Leases are left at the default length, so the heartbeat
+        thread never renews one mid-test.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def make_queue( self, worker_id_IN, max_attempts_IN = ProquestHNPWorkQueue.DEFAULT_MAX_ATTEMPTS ):
+
+        '''
+        Returns a summarize queue over the test paper's archive .zip files,
+            for worker worker_id_IN.
+        '''
+
+        return ProquestHNPWorkQueue( self.make_helper(),
+                                     PHNP_Archive_Work_Item.PHASE_SUMMARIZE,
+                                     use_zip_files_IN = True,
+                                     worker_id_IN = worker_id_IN,
+                                     max_attempts_IN = max_attempts_IN )
+
+    #-- END method make_queue() --#
+
+
+    def setUp( self ):
+
+        super( WorkQueueTestCase, self ).setUp()
+
+        self.make_archive_zip( "TestPaper_1960", [ ( 1, [ "Article" ], "19600102" ), ( 2, [ "Advertisement" ], "19600103" ) ] )
+        self.make_archive_zip( "TestPaper_1961", [ ( 3, [ "Article" ], "19610102" ) ] )
+
+    #-- END method setUp() --#
+
+
+    def test_claim( self ):
+
+        # declare variables
+        queue_a = None
+        queue_b = None
+        work_item_a = None
+        work_item_b = None
+
+        queue_a = self.make_queue( "worker-a" )
+        queue_b = self.make_queue( "worker-b" )
+        self.assertEqual( queue_a.enqueue_paper_archives(), 2 )
+        self.assertEqual( queue_b.enqueue_paper_archives(), 0 )
+
+        # each worker leases a different item, then there are none left.
+        work_item_a = queue_a.claim_work_item()
+        work_item_b = queue_b.claim_work_item()
+        self.assertEqual( ( work_item_a.status, work_item_a.lease_owner, work_item_a.attempt_count ), ( PHNP_Archive_Work_Item.STATUS_LEASED, "worker-a", 1 ) )
+        self.assertEqual( ( work_item_b.status, work_item_b.lease_owner, work_item_b.attempt_count ), ( PHNP_Archive_Work_Item.STATUS_LEASED, "worker-b", 1 ) )
+        self.assertNotEqual( work_item_a.id, work_item_b.id )
+        self.assertIsNone( queue_a.claim_work_item() )
+
+        # only the lease holder can finish an item.
+        self.assertFalse( queue_b.complete_work_item( work_item_a ) )
+        self.assertTrue( queue_a.complete_work_item( work_item_a ) )
+        self.assertEqual( PHNP_Archive_Work_Item.objects.get( id = work_item_a.id ).status, PHNP_Archive_Work_Item.STATUS_DONE )
+
+    #-- END method test_claim() --#
+
+
+    def test_expired_lease( self ):
+
+        # declare variables
+        queue_a = None
+        queue_b = None
+        work_item = None
+        long_ago = None
+
+        queue_a = self.make_queue( "worker-a", max_attempts_IN = 2 )
+        queue_b = self.make_queue( "worker-b", max_attempts_IN = 2 )
+        queue_a.enqueue_paper_archives()
+        work_item = queue_a.claim_work_item()
+        self.assertEqual( queue_b.requeue_expired_work_items(), 0 )
+
+        # worker a stops renewing - its item goes back in the queue.
+        long_ago = timezone.now() - datetime.timedelta( hours = 1 )
+        PHNP_Archive_Work_Item.objects.filter( id = work_item.id ).update( lease_expires = long_ago )
+        self.assertEqual( queue_b.requeue_expired_work_items(), 1 )
+        self.assertEqual( queue_b.claim_work_item().id, work_item.id )
+        self.assertFalse( queue_a.complete_work_item( work_item ) )
+        self.assertEqual( PHNP_Archive_Work_Item.objects.get( id = work_item.id ).lease_owner, "worker-b" )
+
+        # out of attempts - failed, not queued.
+        PHNP_Archive_Work_Item.objects.filter( id = work_item.id ).update( lease_expires = long_ago )
+        self.assertEqual( queue_a.requeue_expired_work_items(), 0 )
+        work_item = PHNP_Archive_Work_Item.objects.get( id = work_item.id )
+        self.assertEqual( ( work_item.status, work_item.error_message ), ( PHNP_Archive_Work_Item.STATUS_FAILED, ProquestHNPWorkQueue.ERROR_LEASE_EXPIRED ) )
+
+    #-- END method test_expired_lease() --#
+
+
+    def test_max_attempts_and_retry_failed( self ):
+
+        # declare variables
+        bad_zip_path = None
+        queue = None
+        status_map = None
+        work_item = None
+
+        # not a zip file.
+        bad_zip_path = os.path.join( self.source_folder_path, "TestPaper_1961.zip" )
+        with open( bad_zip_path, "wb" ) as bad_zip_file:
+
+            bad_zip_file.write( b"not a zip file" )
+
+        #-- END with open() --#
+
+        # tried twice, then failed - and no rollup.
+        queue = self.make_queue( "worker-a", max_attempts_IN = 2 )
+        queue.enqueue_paper_archives()
+        status_map = queue.run_worker()
+        self.assertEqual( status_map, { ProquestHNPWorkQueue.STATUS_PROCESSED : 1, ProquestHNPWorkQueue.STATUS_FAILED : 2, ProquestHNPWorkQueue.STATUS_LOST_LEASE : 0 } )
+        work_item = queue.get_work_item_qs().get( archive_identifier = "TestPaper_1961" )
+        self.assertEqual( ( work_item.status, work_item.attempt_count ), ( PHNP_Archive_Work_Item.STATUS_FAILED, 2 ) )
+        self.assertFalse( PHNP_Archive_Work_Item.objects.filter( phase = PHNP_Archive_Work_Item.PHASE_ROLLUP ).exists() )
+        self.assertEqual( PHNP_Newspaper_Object_Type.objects.count(), 0 )
+
+        # fixed and retried - done, and the paper rolled up.
+        self.make_archive_zip( "TestPaper_1961", [ ( 3, [ "Article" ], "19610102" ) ] )
+        self.assertEqual( queue.requeue_failed_work_items(), 1 )
+        self.assertEqual( queue.get_work_item_qs().get( archive_identifier = "TestPaper_1961" ).attempt_count, 0 )
+        status_map = queue.run_worker()
+        self.assertEqual( status_map[ ProquestHNPWorkQueue.STATUS_PROCESSED ], 1 )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Article" : 2, "Advertisement" : 1 } )
+
+    #-- END method test_max_attempts_and_retry_failed() --#
+
+
+    def test_rollup_claimed_once( self ):
+
+        # declare variables
+        queue_a = None
+        queue_b = None
+        rollup_item = None
+
+        queue_a = self.make_queue( "worker-a" )
+        queue_b = self.make_queue( "worker-b" )
+        queue_a.rollup_when_done = False
+        queue_a.enqueue_paper_archives()
+        queue_a.run_worker()
+
+        # one worker at a time.
+        rollup_item = queue_a.claim_rollup_work_item()
+        self.assertIsNotNone( rollup_item )
+        self.assertIsNone( queue_b.claim_rollup_work_item() )
+        self.assertEqual( queue_a.run_work_item( rollup_item ), ProquestHNPWorkQueue.STATUS_PROCESSED )
+        self.assertEqual( self.get_count_map( PHNP_Newspaper_Object_Type.objects.all() ), { "Article" : 2, "Advertisement" : 1 } )
+
+        # totals current - not again, unless forced.
+        self.assertIsNone( queue_b.run_rollup() )
+        self.assertEqual( queue_b.run_rollup( force_IN = True ), ProquestHNPWorkQueue.STATUS_PROCESSED )
+        self.assertEqual( PHNP_Archive_Work_Item.objects.get( phase = PHNP_Archive_Work_Item.PHASE_ROLLUP ).attempt_count, 1 )
+
+    #-- END method test_rollup_claimed_once() --#
+
 
-# Create your tests here.
+#-- END class WorkQueueTestCase --#